@@ -0,0 +1,346 @@
+import argparse
+import hashlib
+import json
+import os
+import re
+import sqlite3
+import threading
+import time
+import urllib.request
+from collections import deque
+from datetime import datetime
+
+import numpy as np
+import pandas as pd
+
+from lifecycle import carry_unit_keys, unit_keys
+from listing_store import ARCHIVE_DIR, open_archive, read_manifest
+from listings_grid import listing_age_to_days
+from materialize import bedroom_label
+
+ALERTS_DIR = os.path.join('results', 'alerts')
+
+# Rules evaluated when no rules file is given; each entry names a rule in RULES plus its parameters
+DEFAULT_RULES = [
+    {'rule': 'ppsf_below_percentile', 'percentile': 10},
+    {'rule': 'below_original_price', 'min_pct': 10},
+    {'rule': 'new_listing', 'max_days': 7}
+]
+
+BELOW_OP_PATTERN = re.compile(
+    r'(\d+(?:\.\d+)?)\s*%\s*(?:below|under|lower(?:\s+than)?)\s+(?:the\s+)?(?:op|original\s+price)\b', re.IGNORECASE)
+
+# Latency samples kept per rule for the metrics summary
+LATENCY_WINDOW = 1000
+
+
+def parse_below_op(descriptions):
+    """Percentage below original price stated in each description, NaN when none is given"""
+    return pd.Series(descriptions).str.extract(BELOW_OP_PATTERN)[0].astype(float).to_numpy()
+
+
+def ppsf_below_percentile(rows, watcher, percentile=10):
+    """Listings whose price/sq.ft is below the given percentile for their unit type"""
+    ppsf = rows['price_per_sqft'].to_numpy(dtype=float)
+    thresholds = np.array([watcher.ppsf_percentile(bedrooms, percentile) for bedrooms in rows['bedrooms']])
+    mask = ppsf < thresholds
+    details = [f"AED {value:,.0f}/sq.ft is below the P{percentile:g} of AED {threshold:,.0f}/sq.ft"
+               for value, threshold in zip(ppsf, thresholds)]
+    return mask, details
+
+
+def below_original_price(rows, watcher, min_pct=10):
+    """Listings advertised at least min_pct below original price"""
+    below_pct = parse_below_op(rows['description'])
+    mask = below_pct >= min_pct
+    details = [f"{pct:g}% below original price" for pct in below_pct]
+    return mask, details
+
+
+def new_listing(rows, watcher, max_days=7):
+    """Listings first listed within the last max_days days"""
+    age_days = rows['listing_age_days'].to_numpy(dtype=float) if 'listing_age_days' in rows else listing_age_to_days(rows['listing_days'])
+    mask = age_days <= max_days
+    details = [f"Listed {age:g} days ago" for age in age_days]
+    return mask, details
+
+
+RULES = {
+    'ppsf_below_percentile': ppsf_below_percentile,
+    'below_original_price': below_original_price,
+    'new_listing': new_listing
+}
+
+
+def load_rules(path=None):
+    """Read rule configurations from a JSON file, falling back to DEFAULT_RULES"""
+    if not path:
+        return list(DEFAULT_RULES)
+    with open(path) as f:
+        rules = json.load(f)
+    unknown = [rule['rule'] for rule in rules if rule['rule'] not in RULES]
+    if unknown:
+        raise ValueError(f"Unknown alert rule(s): {', '.join(unknown)}")
+    return rules
+
+
+def rule_name(rule):
+    """Display name for a configured rule, including its parameters"""
+    params = ','.join(f"{key}={value}" for key, value in rule.items() if key not in ('rule', 'name'))
+    return rule.get('name') or (f"{rule['rule']}({params})" if params else rule['rule'])
+
+
+class FileOutbox:
+    """Append alerts to a JSON lines file"""
+
+    def __init__(self, path=os.path.join(ALERTS_DIR, 'outbox.jsonl')):
+        self.path = path
+        self._lock = threading.Lock()
+        os.makedirs(os.path.dirname(path) or '.', exist_ok=True)
+
+    def send(self, alerts):
+        with self._lock, open(self.path, 'a') as f:
+            for alert in alerts:
+                f.write(json.dumps(alert, default=str) + '\n')
+        return len(alerts)
+
+
+class SQLiteOutbox:
+    """Store alerts in a SQLite table, ignoring alerts that were already delivered"""
+
+    def __init__(self, path=os.path.join(ALERTS_DIR, 'outbox.sqlite')):
+        self.path = path
+        os.makedirs(os.path.dirname(path) or '.', exist_ok=True)
+        self._conn = sqlite3.connect(path, check_same_thread=False)
+        self._conn.execute('PRAGMA journal_mode=WAL')
+        self._conn.execute('CREATE TABLE IF NOT EXISTS alerts (alert_id TEXT PRIMARY KEY, rule TEXT, project TEXT, '
+                           'unit_key TEXT, created_at TEXT, payload TEXT)')
+        self._lock = threading.Lock()
+
+    def send(self, alerts):
+        rows = [(alert['alert_id'], alert['rule'], alert['project'], alert['unit_key'], alert['created_at'],
+                 json.dumps(alert, default=str)) for alert in alerts]
+        with self._lock, self._conn:
+            before = self._conn.total_changes
+            self._conn.executemany('INSERT OR IGNORE INTO alerts VALUES (?, ?, ?, ?, ?, ?)', rows)
+            return self._conn.total_changes - before
+
+
+class WebhookOutbox:
+    """Webhook delivery stub
+
+    Alerts are batched into one JSON payload per cycle. Without a URL the payloads are only
+    kept in `pending`, which lets the watcher run without a receiving endpoint.
+    """
+
+    def __init__(self, url=None, timeout=5):
+        self.url = url
+        self.timeout = timeout
+        self.pending = []
+
+    def send(self, alerts):
+        payload = json.dumps({'alerts': alerts}, default=str).encode()
+        if not self.url:
+            self.pending.append(payload)
+            return len(alerts)
+        request = urllib.request.Request(self.url, data=payload, headers={'Content-Type': 'application/json'})
+        with urllib.request.urlopen(request, timeout=self.timeout):
+            return len(alerts)
+
+
+def get_outbox(kind='file', target=None):
+    """Create an outbox by name: 'file', 'sqlite' or 'webhook'"""
+    if kind == 'file':
+        return FileOutbox(target) if target else FileOutbox()
+    if kind == 'sqlite':
+        return SQLiteOutbox(target) if target else SQLiteOutbox()
+    if kind == 'webhook':
+        return WebhookOutbox(target)
+    raise ValueError(f"Unknown outbox: {kind}")
+
+
+class RuleMetrics:
+    """Evaluation counters and recent latencies for one rule"""
+
+    def __init__(self):
+        self.evaluations = 0
+        self.rows = 0
+        self.alerts = 0
+        self.latencies = deque(maxlen=LATENCY_WINDOW)
+
+    def record(self, seconds, rows, alerts):
+        self.evaluations += 1
+        self.rows += rows
+        self.alerts += alerts
+        self.latencies.append(seconds)
+
+    def as_dict(self):
+        latencies = np.array(self.latencies) * 1000
+        return {
+            'evaluations': self.evaluations,
+            'rows_evaluated': self.rows,
+            'alerts': self.alerts,
+            'last_ms': float(latencies[-1]) if len(latencies) else 0.0,
+            'mean_ms': float(latencies.mean()) if len(latencies) else 0.0,
+            'p95_ms': float(np.percentile(latencies, 95)) if len(latencies) else 0.0
+        }
+
+
+class AlertWatcher:
+    """Evaluate alert rules against listings as new archive snapshots are ingested
+
+    The watcher keeps the unit keys of every project's current snapshot and, per unit type, a
+    sorted array of active price/sq.ft values. Unit keys are carried forward from the previous
+    snapshot by nearest price, so each ingest only evaluates new units and units whose price
+    changed, and the percentile reference is updated by removing the old values of delisted and
+    repriced units and inserting the values of new and repriced ones.
+    """
+
+    def __init__(self, projects, outbox, rules=None, base_dir=ARCHIVE_DIR):
+        self.projects = list(projects)
+        self.outbox = outbox
+        self.rules = rules or list(DEFAULT_RULES)
+        self.base_dir = base_dir
+        self.snapshots = {}
+        self.active = {}
+        self.ppsf_by_type = {}
+        self.metrics = {rule_name(rule): RuleMetrics() for rule in self.rules}
+
+    def ppsf_percentile(self, bedrooms, percentile):
+        """Percentile of active price/sq.ft for a unit type, from its sorted reference array"""
+        values = self.ppsf_by_type.get(bedrooms)
+        if values is None or not len(values):
+            return np.nan
+        return np.percentile(values, percentile, method='linear')
+
+    def _update_reference(self, added, removed):
+        for bedrooms, group in removed.groupby('bedrooms'):
+            values = self.ppsf_by_type[bedrooms]
+            old_values = np.sort(group['price_per_sqft'].to_numpy(dtype=float))
+            # Equal values removed together map to consecutive positions of their run; positions
+            # that don't hold the value being removed are skipped rather than deleting a neighbour
+            run_offset = np.arange(len(old_values)) - np.searchsorted(old_values, old_values)
+            positions = np.searchsorted(values, old_values) + run_offset
+            in_range = positions < len(values)
+            positions, old_values = positions[in_range], old_values[in_range]
+            self.ppsf_by_type[bedrooms] = np.delete(values, positions[values[positions] == old_values])
+        for bedrooms, group in added.groupby('bedrooms'):
+            values = self.ppsf_by_type.get(bedrooms, np.array([], dtype=float))
+            new_values = np.sort(group['price_per_sqft'].to_numpy(dtype=float))
+            self.ppsf_by_type[bedrooms] = np.insert(values, np.searchsorted(values, new_values), new_values)
+
+    def ingest(self, project_name, snapshot, df, evaluate=True):
+        """Fold a new snapshot of a project into the watcher and evaluate rules on its new and repriced rows"""
+        df = df.reset_index(drop=True)
+        previous = self.active.get(project_name)
+        if previous is None:
+            df = df.assign(unit_key=unit_keys(df))
+            previous = df.iloc[:0]
+        else:
+            df = df.assign(unit_key=carry_unit_keys(previous, df))
+
+        previous_price = df['unit_key'].map(previous.set_index('unit_key')['price'])
+        is_new = previous_price.isna().to_numpy()
+        is_repriced = ~is_new & (df['price'] != previous_price).to_numpy()
+        is_gone = ~previous['unit_key'].isin(df['unit_key']).to_numpy()
+        was_repriced = previous['unit_key'].isin(df.loc[is_repriced, 'unit_key']).to_numpy()
+
+        self._update_reference(df[is_new | is_repriced], previous[is_gone | was_repriced])
+        self.active[project_name] = df
+        self.snapshots[project_name] = snapshot
+        return self.evaluate(project_name, snapshot, df[is_new | is_repriced]) if evaluate else []
+
+    def evaluate(self, project_name, snapshot, rows):
+        """Run every rule on the given rows and deliver the resulting alerts"""
+        alerts = []
+        created_at = datetime.now().isoformat(timespec='seconds')
+        for rule in self.rules:
+            name = rule_name(rule)
+            params = {key: value for key, value in rule.items() if key not in ('rule', 'name')}
+            start = time.perf_counter()
+            if len(rows):
+                mask, details = RULES[rule['rule']](rows, self, **params)
+            else:
+                mask, details = np.zeros(0, dtype=bool), []
+            matched = np.flatnonzero(mask)
+            self.metrics[name].record(time.perf_counter() - start, len(rows), len(matched))
+
+            for position in matched:
+                row = rows.iloc[position]
+                alert_id = hashlib.sha1(f"{name}|{row['unit_key']}|{row['price']}".encode()).hexdigest()[:16]
+                alerts.append({
+                    'alert_id': alert_id,
+                    'rule': name,
+                    'project': project_name,
+                    'snapshot': snapshot,
+                    'unit_key': row['unit_key'],
+                    'bedrooms': row['bedrooms'],
+                    'price': float(row['price']),
+                    'area_sqft': float(row['area_sqft']),
+                    'price_per_sqft': float(row['price_per_sqft']),
+                    'description': row['description'],
+                    'detail': details[position],
+                    'created_at': created_at
+                })
+        if alerts:
+            self.outbox.send(alerts)
+        return alerts
+
+    def prime(self):
+        """Load every project's current snapshot as the baseline without raising alerts"""
+        for project_name in self.projects:
+            snapshot = read_manifest(project_name, self.base_dir)['current']
+            if snapshot:
+                self.ingest(project_name, snapshot, open_archive(project_name, snapshot, self.base_dir).to_pandas(),
+                            evaluate=False)
+
+    def poll(self):
+        """Ingest any project whose current archive snapshot changed since the last poll"""
+        alerts = []
+        for project_name in self.projects:
+            snapshot = read_manifest(project_name, self.base_dir)['current']
+            if snapshot and snapshot != self.snapshots.get(project_name):
+                df = open_archive(project_name, snapshot, self.base_dir).to_pandas()
+                alerts += self.ingest(project_name, snapshot, df)
+        return alerts
+
+    def metrics_summary(self):
+        """Per-rule evaluation latency and alert counts"""
+        return pd.DataFrame([dict(rule=name, **metrics.as_dict()) for name, metrics in self.metrics.items()])
+
+
+def write_metrics(watcher, path=os.path.join(ALERTS_DIR, 'metrics.json')):
+    """Write the watcher's per-rule metrics for other processes to read"""
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    with open(path + '.tmp', 'w') as f:
+        json.dump({'updated_at': datetime.now().isoformat(timespec='seconds'),
+                   'rules': watcher.metrics_summary().to_dict('records')}, f, indent=2)
+    os.replace(path + '.tmp', path)
+
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description="Watch listing archives and raise alerts for under-priced listings")
+    parser.add_argument('--rules', help="JSON file with rule configurations")
+    parser.add_argument('--outbox', choices=['file', 'sqlite', 'webhook'], default='file')
+    parser.add_argument('--target', help="Outbox file path or webhook URL")
+    parser.add_argument('--interval', type=float, default=60, help="Seconds between archive polls")
+    parser.add_argument('--all', action='store_true', help="Alert on listings already in the current snapshots")
+    parser.add_argument('--once', action='store_true', help="Poll once and exit")
+    args = parser.parse_args()
+
+    from projects import PROJECT_DATA, ingest_projects
+
+    watcher = AlertWatcher(PROJECT_DATA, get_outbox(args.outbox, args.target), load_rules(args.rules))
+    if not args.all:
+        watcher.prime()
+    while True:
+        # Archive project data that has not been ingested yet, then pick up every new snapshot
+        ingest_projects()
+        for alert in watcher.poll():
+            print(f"[{alert['rule']}] {alert['project']} {bedroom_label(alert['bedrooms'])} "
+                  f"AED {alert['price']:,.0f}: {alert['detail']}")
+        write_metrics(watcher)
+        if args.once:
+            print(watcher.metrics_summary().to_string(index=False))
+            break
+        time.sleep(args.interval)
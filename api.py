@@ -0,0 +1,272 @@
+import argparse
+import hashlib
+import json
+import threading
+from functools import lru_cache
+
+import numpy as np
+import pandas as pd
+import pyarrow as pa
+from starlette.applications import Starlette
+from starlette.concurrency import run_in_threadpool
+from starlette.responses import JSONResponse, Response
+from starlette.routing import Mount, Route
+
+from cache_backend import get_cache_backend, make_key
+from comparables import ComparablesIndex
+from listing_age import DEFAULT_BUCKETS
+from listing_store import ARCHIVE_DIR, current_archive_version, list_projects, list_snapshots, open_archive
+from listings_grid import SORT_COLUMNS, grid_window
+from materialize import load_aggregates
+from shared_data import SharedDataset, get_shared_dataset
+from text_search import SearchIndex
+
+ARROW_MEDIA_TYPE = 'application/vnd.apache.arrow.stream'
+JSON_MEDIA_TYPE = 'application/json'
+
+# Listing columns returned by the API; features_html is dashboard markup
+LISTING_COLUMNS = ['row', 'project', 'bedrooms', 'bathrooms', 'area_sqft', 'price', 'price_per_sqft',
+                   'listing_age_days', 'description', 'features']
+COMPARABLE_COLUMNS = LISTING_COLUMNS[:-1] + ['distance']
+
+MAX_LIMIT = 1000
+
+_response_cache = None
+_response_cache_lock = threading.Lock()
+
+
+class NotFound(LookupError):
+    """An unknown project or listing row"""
+
+
+def get_response_cache():
+    """Cache for rendered response bodies (see SAFA_CACHE_* settings), shared by every request"""
+    global _response_cache
+    with _response_cache_lock:
+        if _response_cache is None:
+            _response_cache = get_cache_backend()
+    return _response_cache
+
+
+def dataset_key(archive_dir=ARCHIVE_DIR):
+    """Current (project, data version) pairs, the same key the dashboard shares its dataset under"""
+    key = tuple((name, current_archive_version(name, archive_dir)) for name in list_projects(archive_dir))
+    if not key:
+        raise FileNotFoundError("No archived listings yet; open the dashboard or run api.py to ingest them")
+    return key
+
+
+def get_api_dataset(key):
+    """The process-wide dataset for a key, loaded from the archives and materialized aggregates"""
+    def load(key):
+        archives = {}
+        for name, version in key:
+            snapshot = [entry for entry in list_snapshots(name) if entry['version'] == version][-1]
+            archives[name] = open_archive(name, snapshot['snapshot'])
+        return SharedDataset(key, archives, {name: load_aggregates(name, version) for name, version in key})
+    return get_shared_dataset(key, load)
+
+
+@lru_cache(maxsize=8)
+def get_search_index(project_name, snapshot):
+    """Description index with bedroom and default listing age postings for one snapshot"""
+    archive = open_archive(project_name, snapshot)
+    index = SearchIndex(archive.table.column('description').to_pylist())
+    index.add_field('bedrooms', archive.table.column('bedrooms').to_pylist())
+    age_days = np.asarray(archive.numeric('listing_age_days'), dtype=float)
+    for listing_age_filter in DEFAULT_BUCKETS.filters:
+        index.add_postings('listing_age', listing_age_filter, np.flatnonzero(DEFAULT_BUCKETS.filter_mask(age_days, listing_age_filter)))
+    return index
+
+
+@lru_cache(maxsize=2)
+def get_comparables_index(key):
+    """Nearest-neighbour index over every project's listings for one dataset key"""
+    return ComparablesIndex(get_api_dataset(key).listings)
+
+
+def _project(dataset, request):
+    project_name = request.path_params['project']
+    if project_name not in dataset.archives:
+        raise NotFound(f"Unknown project: {project_name}")
+    return project_name
+
+
+def _number(params, name, default=None, cast=float):
+    value = params.get(name)
+    if value in (None, ''):
+        return default
+    try:
+        return cast(value)
+    except ValueError:
+        raise ValueError(f"{name} must be a number, got {value!r}") from None
+
+
+def _with_rows(dataset, listings):
+    """Add each listing's row within its project's archive, the id used for comparables"""
+    positions = listings.index.to_numpy()
+    offsets = listings['project'].map(dataset.offsets).to_numpy(dtype=np.int64)
+    return listings.assign(row=positions - offsets)
+
+
+def project_list(dataset, request):
+    rows = [{'project': name, 'data_version': version, 'snapshot': dataset.archives[name].snapshot,
+             'listings': dataset.sizes[name]} for name, version in dataset.key]
+    return rows, {}
+
+
+def project_stats(dataset, request):
+    project_name = _project(dataset, request)
+    return [dict(dataset.aggregates[project_name]['stats_overall'])], {'project': project_name}
+
+
+def bedroom_stats(dataset, request):
+    project_name = _project(dataset, request)
+    return dataset.aggregates[project_name]['bedroom_stats'], {'project': project_name}
+
+
+def bathroom_stats(dataset, request):
+    project_name = _project(dataset, request)
+    return dataset.aggregates[project_name]['bathroom_stats'], {'project': project_name}
+
+
+def filtered_listings(dataset, request):
+    """Listings matching the search and filters, sorted and paged like the dashboard grid
+
+    Query parameters: q (description search), bedrooms, listing_age (a default bucket filter
+    such as "Last 1 month"), min_price, max_price, min_area, max_area, sort (price,
+    price_per_sqft, area_sqft or listing_age_days), desc, offset and limit.
+    """
+    project_name = _project(dataset, request)
+    params = request.query_params
+    archive = dataset.archives[project_name]
+
+    filters = {}
+    if params.get('bedrooms'):
+        filters['bedrooms'] = params['bedrooms']
+    if params.get('listing_age'):
+        if params['listing_age'] not in DEFAULT_BUCKETS.filters:
+            raise ValueError(f"listing_age must be one of {', '.join(DEFAULT_BUCKETS.filters)}")
+        filters['listing_age'] = params['listing_age']
+    row_mask = np.zeros(archive.num_rows, dtype=bool)
+    row_mask[get_search_index(project_name, archive.snapshot).search(params.get('q', ''), filters)] = True
+
+    for column, low, high in [('price', 'min_price', 'max_price'), ('area_sqft', 'min_area', 'max_area')]:
+        values = np.asarray(archive.numeric(column))
+        row_mask &= values >= _number(params, low, -np.inf)
+        row_mask &= values <= _number(params, high, np.inf)
+
+    sort_column = params.get('sort', 'price')
+    if sort_column not in SORT_COLUMNS.values():
+        raise ValueError(f"sort must be one of {', '.join(SORT_COLUMNS.values())}")
+    offset = max(_number(params, 'offset', 0, int), 0)
+    limit = min(max(_number(params, 'limit', 50, int), 0), MAX_LIMIT)
+    rows, total = grid_window(archive, row_mask, sort_column, params.get('desc', '').lower() in ('1', 'true'),
+                              offset, limit)
+
+    listings = dataset.rows(dataset.offsets[project_name] + rows)
+    return _with_rows(dataset, listings)[LISTING_COLUMNS], {'project': project_name, 'total': int(total),
+                                                           'offset': offset, 'limit': limit}
+
+
+def listing_comparables(dataset, request):
+    """The k most similar listings of the same unit type, from any project"""
+    project_name = _project(dataset, request)
+    row = request.path_params['row']
+    if not 0 <= row < dataset.sizes[project_name]:
+        raise NotFound(f"{project_name} has no listing row {row}")
+    k = min(max(_number(request.query_params, 'k', 5, int), 1), 50)
+    comparables = get_comparables_index(dataset.key).query(dataset.position(project_name, row), k=k)
+    return _with_rows(dataset, comparables)[COMPARABLE_COLUMNS], {'project': project_name, 'row': row, 'k': k}
+
+
+def _response_format(request):
+    fmt = request.query_params.get('format')
+    if fmt is None:
+        fmt = 'arrow' if ARROW_MEDIA_TYPE in request.headers.get('accept', '') else 'json'
+    if fmt not in ('json', 'arrow'):
+        raise ValueError("format must be json or arrow")
+    return fmt
+
+
+def render(rows, metadata, fmt):
+    """Serialize result rows plus metadata as JSON or as an Arrow IPC stream"""
+    frame = pd.DataFrame(rows) if isinstance(rows, list) else rows
+    if fmt == 'arrow':
+        table = pa.Table.from_pandas(frame, preserve_index=False)
+        table = table.replace_schema_metadata({name: json.dumps(value) for name, value in metadata.items()})
+        sink = pa.BufferOutputStream()
+        with pa.ipc.new_stream(sink, table.schema) as writer:
+            writer.write_table(table)
+        return sink.getvalue().to_pybytes()
+    return json.dumps(dict(metadata, rows=json.loads(frame.to_json(orient='records')))).encode()
+
+
+def _error(status_code, message):
+    return JSONResponse({'error': message}, status_code=status_code)
+
+
+def endpoint(build):
+    """Async handler around build(dataset, request) -> (rows, metadata) with conditional responses
+
+    The ETag is derived from the data versions and the request, so it is known before any work
+    is done: a matching If-None-Match is answered with 304 straight away, and rendered bodies
+    are kept in the shared response cache under the same key.
+    """
+    async def handler(request):
+        try:
+            fmt = _response_format(request)
+            key = await run_in_threadpool(dataset_key)
+        except ValueError as exc:
+            return _error(400, str(exc))
+        except FileNotFoundError as exc:
+            return _error(503, str(exc))
+
+        cache_key = make_key('api', fmt, request.url.path, str(sorted(request.query_params.multi_items())),
+                             *(version for _, version in key))
+        etag = f'"{hashlib.sha1(cache_key.encode()).hexdigest()[:20]}"'
+        headers = {'ETag': etag, 'Cache-Control': 'no-cache',
+                   'X-Data-Version': ','.join(f"{name}={version}" for name, version in key)}
+        if etag in [tag.strip() for tag in request.headers.get('if-none-match', '').split(',')]:
+            return Response(status_code=304, headers=headers)
+
+        def compute():
+            rows, metadata = build(get_api_dataset(key), request)
+            return render(rows, metadata, fmt)
+        try:
+            body = await run_in_threadpool(get_response_cache().get_or_compute, cache_key, compute)
+        except NotFound as exc:
+            return _error(404, str(exc))
+        except ValueError as exc:
+            return _error(400, str(exc))
+        except FileNotFoundError as exc:
+            return _error(503, str(exc))
+        return Response(body, media_type=ARROW_MEDIA_TYPE if fmt == 'arrow' else JSON_MEDIA_TYPE, headers=headers)
+    return handler
+
+
+routes = [
+    Route('/projects', endpoint(project_list)),
+    Route('/projects/{project}/stats', endpoint(project_stats)),
+    Route('/projects/{project}/bedrooms', endpoint(bedroom_stats)),
+    Route('/projects/{project}/bathrooms', endpoint(bathroom_stats)),
+    Route('/projects/{project}/listings', endpoint(filtered_listings)),
+    Route('/projects/{project}/listings/{row:int}/comparables', endpoint(listing_comparables))
+]
+
+# Standalone app; server.py mounts the same routes next to the dashboard
+app = Starlette(routes=[Mount('/api', routes=routes)])
+
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description="Serve project stats, listings and comparables as JSON or Arrow")
+    parser.add_argument('--host', default='127.0.0.1')
+    parser.add_argument('--port', type=int, default=8600)
+    args = parser.parse_args()
+
+    import uvicorn
+    from projects import ingest_projects
+
+    # Archive and materialize project data that has not been ingested yet
+    ingest_projects()
+    uvicorn.run(app, host=args.host, port=args.port)
@@ -0,0 +1,416 @@
+import fcntl
+import hashlib
+import json
+import os
+import pickle
+import sqlite3
+import tempfile
+import threading
+import time
+from collections import OrderedDict
+from contextlib import contextmanager
+
+import pandas as pd
+
+# Bump when the shape of cached analysis outputs changes so stale entries are ignored
+CACHE_SCHEMA_VERSION = 3
+
+
+def data_version(data):
+    """Return a short content hash identifying a version of the listing data"""
+    digest = hashlib.sha1()
+    if isinstance(data, pd.DataFrame):
+        digest.update(','.join(map(str, data.columns)).encode())
+        digest.update(pd.util.hash_pandas_object(data, index=False).to_numpy().tobytes())
+    else:
+        digest.update(json.dumps(data, sort_keys=True, default=str).encode())
+    return digest.hexdigest()[:16]
+
+
+def make_key(namespace, *parts):
+    """Build a cache key from a namespace and any number of key parts"""
+    return ':'.join([namespace, f"v{CACHE_SCHEMA_VERSION}"] + [str(part) for part in parts])
+
+
+class CacheStats:
+    """Hit/miss/eviction counters for a cache backend"""
+
+    def __init__(self):
+        self.hits = 0
+        self.misses = 0
+        self.sets = 0
+        self.evictions = 0
+        self.expirations = 0
+
+    def as_dict(self):
+        lookups = self.hits + self.misses
+        return {
+            'hits': self.hits,
+            'misses': self.misses,
+            'sets': self.sets,
+            'evictions': self.evictions,
+            'expirations': self.expirations,
+            'hit_rate': self.hits / lookups if lookups else 0.0,
+        }
+
+
+class CacheBackend:
+    """Base class for the analysis result caches
+
+    Values are pickled so every backend enforces the same byte budget. Subclasses implement
+    _load, _store, delete and clear; get/set/get_or_compute and the metrics are shared.
+    """
+
+    def __init__(self, max_bytes=256 * 1024 * 1024, default_ttl=None):
+        self.max_bytes = max_bytes
+        self.default_ttl = default_ttl
+        self.stats = CacheStats()
+
+    def _expires_at(self, ttl):
+        ttl = self.default_ttl if ttl is None else ttl
+        return time.time() + ttl if ttl else None
+
+    def get(self, key, default=None):
+        """Return the cached value for key, or default on a miss"""
+        payload = self._load(key)
+        if payload is None:
+            self.stats.misses += 1
+            return default
+        self.stats.hits += 1
+        return pickle.loads(payload)
+
+    def set(self, key, value, ttl=None):
+        """Store value under key, evicting least recently used entries if over budget"""
+        payload = pickle.dumps(value, protocol=pickle.HIGHEST_PROTOCOL)
+        if len(payload) > self.max_bytes:
+            return False
+        self._store(key, payload, self._expires_at(ttl))
+        self.stats.sets += 1
+        return True
+
+    def get_or_compute(self, key, compute, ttl=None):
+        """Return the cached value for key, computing and storing it on a miss"""
+        missing = object()
+        value = self.get(key, missing)
+        if value is missing:
+            value = compute()
+            self.set(key, value, ttl)
+        return value
+
+    def metrics(self):
+        """Return hit/miss counters together with the current cache size"""
+        metrics = self.stats.as_dict()
+        metrics.update({'backend': type(self).__name__, 'size_bytes': self.size_bytes(),
+                        'max_bytes': self.max_bytes})
+        return metrics
+
+    def _load(self, key):
+        raise NotImplementedError
+
+    def _store(self, key, payload, expires_at):
+        raise NotImplementedError
+
+    def delete(self, key):
+        raise NotImplementedError
+
+    def clear(self):
+        raise NotImplementedError
+
+    def size_bytes(self):
+        raise NotImplementedError
+
+
+class MemoryCache(CacheBackend):
+    """In-process LRU cache bounded by total pickled size"""
+
+    def __init__(self, max_bytes=256 * 1024 * 1024, default_ttl=None):
+        super().__init__(max_bytes, default_ttl)
+        self._entries = OrderedDict()
+        self._size = 0
+        self._lock = threading.Lock()
+
+    def _load(self, key):
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                return None
+            payload, expires_at = entry
+            if expires_at is not None and expires_at < time.time():
+                self._remove(key)
+                self.stats.expirations += 1
+                return None
+            self._entries.move_to_end(key)
+            return payload
+
+    def _store(self, key, payload, expires_at):
+        with self._lock:
+            if key in self._entries:
+                self._remove(key)
+            self._entries[key] = (payload, expires_at)
+            self._size += len(payload)
+            while self._size > self.max_bytes:
+                oldest = next(iter(self._entries))
+                self._remove(oldest)
+                self.stats.evictions += 1
+
+    def _remove(self, key):
+        payload, _ = self._entries.pop(key)
+        self._size -= len(payload)
+
+    def delete(self, key):
+        with self._lock:
+            if key in self._entries:
+                self._remove(key)
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+            self._size = 0
+
+    def size_bytes(self):
+        return self._size
+
+
+class SQLiteCache(CacheBackend):
+    """On-disk cache in a single SQLite file, shared by every process that opens it
+
+    WAL journaling lets readers in other processes proceed while one process writes, and
+    reads go through SQLite's memory-mapped I/O so repeated lookups hit the page cache.
+    Hits stay read-only: access times are collected in memory and written in one batch with
+    the next store, or at most every ACCESS_FLUSH_SECONDS.
+    """
+
+    ACCESS_FLUSH_SECONDS = 30
+
+    def __init__(self, path, max_bytes=1024 * 1024 * 1024, default_ttl=None, mmap_bytes=256 * 1024 * 1024):
+        super().__init__(max_bytes, default_ttl)
+        self.path = path
+        self.mmap_bytes = mmap_bytes
+        self._local = threading.local()
+        self._accessed = {}
+        self._accessed_lock = threading.Lock()
+        self._last_flush = time.time()
+        directory = os.path.dirname(os.path.abspath(path))
+        os.makedirs(directory, exist_ok=True)
+        with self._connection() as conn:
+            conn.execute("""
+                CREATE TABLE IF NOT EXISTS cache_entries (
+                    key TEXT PRIMARY KEY,
+                    value BLOB NOT NULL,
+                    size INTEGER NOT NULL,
+                    expires_at REAL,
+                    accessed_at REAL NOT NULL
+                )
+            """)
+            conn.execute("CREATE INDEX IF NOT EXISTS cache_entries_accessed ON cache_entries (accessed_at)")
+
+    @contextmanager
+    def _connection(self):
+        # sqlite3 connections cannot be shared across threads, so keep one per thread
+        conn = getattr(self._local, 'conn', None)
+        if conn is None:
+            conn = sqlite3.connect(self.path, timeout=30, isolation_level=None)
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.execute("PRAGMA synchronous=NORMAL")
+            conn.execute(f"PRAGMA mmap_size={int(self.mmap_bytes)}")
+            self._local.conn = conn
+        yield conn
+
+    def _load(self, key):
+        now = time.time()
+        with self._connection() as conn:
+            row = conn.execute("SELECT value, expires_at FROM cache_entries WHERE key = ?", (key,)).fetchone()
+            if row is None:
+                return None
+            payload, expires_at = row
+            if expires_at is not None and expires_at < now:
+                conn.execute("DELETE FROM cache_entries WHERE key = ?", (key,))
+                self.stats.expirations += 1
+                return None
+            with self._accessed_lock:
+                self._accessed[key] = now
+            if now - self._last_flush > self.ACCESS_FLUSH_SECONDS:
+                conn.execute("BEGIN IMMEDIATE")
+                try:
+                    self._flush_accessed(conn)
+                    conn.execute("COMMIT")
+                except Exception:
+                    conn.execute("ROLLBACK")
+                    raise
+            return payload
+
+    def _flush_accessed(self, conn):
+        """Write the access times collected since the last flush, inside the caller's transaction"""
+        with self._accessed_lock:
+            accessed, self._accessed = self._accessed, {}
+            self._last_flush = time.time()
+        if accessed:
+            conn.executemany("UPDATE cache_entries SET accessed_at = ? WHERE key = ?",
+                             [(accessed_at, key) for key, accessed_at in accessed.items()])
+
+    def _store(self, key, payload, expires_at):
+        now = time.time()
+        with self._connection() as conn:
+            conn.execute("BEGIN IMMEDIATE")
+            try:
+                conn.execute(
+                    "INSERT OR REPLACE INTO cache_entries (key, value, size, expires_at, accessed_at) VALUES (?, ?, ?, ?, ?)",
+                    (key, sqlite3.Binary(payload), len(payload), expires_at, now),
+                )
+                conn.execute("DELETE FROM cache_entries WHERE expires_at IS NOT NULL AND expires_at < ?", (now,))
+                self._flush_accessed(conn)
+                self._evict(conn)
+                conn.execute("COMMIT")
+            except Exception:
+                conn.execute("ROLLBACK")
+                raise
+
+    def _evict(self, conn):
+        """Drop least recently used entries until the total size fits the budget"""
+        total = conn.execute("SELECT COALESCE(SUM(size), 0) FROM cache_entries").fetchone()[0]
+        if total <= self.max_bytes:
+            return
+        for key, size in conn.execute("SELECT key, size FROM cache_entries ORDER BY accessed_at").fetchall():
+            if total <= self.max_bytes:
+                break
+            conn.execute("DELETE FROM cache_entries WHERE key = ?", (key,))
+            total -= size
+            self.stats.evictions += 1
+
+    def delete(self, key):
+        with self._connection() as conn:
+            conn.execute("DELETE FROM cache_entries WHERE key = ?", (key,))
+
+    def clear(self):
+        with self._connection() as conn:
+            conn.execute("DELETE FROM cache_entries")
+
+    def size_bytes(self):
+        with self._connection() as conn:
+            return conn.execute("SELECT COALESCE(SUM(size), 0) FROM cache_entries").fetchone()[0]
+
+
+class SharedDirectoryCache(CacheBackend):
+    """File-per-entry cache in a shared directory, safe across processes
+
+    Entries are written to a temp file and renamed into place, so readers never see a partial
+    file. Each file holds a small (expires_at, key) header pickle followed by the payload, so
+    eviction can check expiry without reading payloads. Eviction holds an exclusive fcntl lock
+    on the directory lock file; file mtimes track recency for LRU ordering.
+    """
+
+    def __init__(self, directory, max_bytes=1024 * 1024 * 1024, default_ttl=None):
+        super().__init__(max_bytes, default_ttl)
+        self.directory = directory
+        os.makedirs(directory, exist_ok=True)
+        self._lock_path = os.path.join(directory, '.lock')
+
+    @contextmanager
+    def _locked(self, exclusive):
+        with open(self._lock_path, 'a') as lock_file:
+            fcntl.flock(lock_file, fcntl.LOCK_EX if exclusive else fcntl.LOCK_SH)
+            try:
+                yield
+            finally:
+                fcntl.flock(lock_file, fcntl.LOCK_UN)
+
+    def _path(self, key):
+        return os.path.join(self.directory, hashlib.sha1(key.encode()).hexdigest() + '.pkl')
+
+    def _entry_paths(self):
+        return [os.path.join(self.directory, name) for name in os.listdir(self.directory) if name.endswith('.pkl')]
+
+    def _load(self, key):
+        path = self._path(key)
+        with self._locked(exclusive=False):
+            try:
+                with open(path, 'rb') as f:
+                    expires_at, stored_key = pickle.load(f)
+                    payload = pickle.load(f)
+            except (FileNotFoundError, EOFError, pickle.UnpicklingError, ValueError):
+                return None
+        if stored_key != key:
+            return None
+        if expires_at is not None and expires_at < time.time():
+            self.delete(key)
+            self.stats.expirations += 1
+            return None
+        try:
+            os.utime(path)
+        except FileNotFoundError:
+            pass
+        return payload
+
+    def _store(self, key, payload, expires_at):
+        fd, tmp_path = tempfile.mkstemp(dir=self.directory, suffix='.tmp')
+        with os.fdopen(fd, 'wb') as f:
+            pickle.dump((expires_at, key), f, protocol=pickle.HIGHEST_PROTOCOL)
+            pickle.dump(payload, f, protocol=pickle.HIGHEST_PROTOCOL)
+        with self._locked(exclusive=True):
+            os.replace(tmp_path, self._path(key))
+            self._evict()
+
+    def _evict(self):
+        """Drop expired entries, then the oldest ones until the directory fits the budget"""
+        now = time.time()
+        entries = []
+        for path in self._entry_paths():
+            try:
+                stat = os.stat(path)
+                with open(path, 'rb') as f:
+                    expires_at, _ = pickle.load(f)
+            except FileNotFoundError:
+                continue
+            except (EOFError, pickle.UnpicklingError, ValueError):
+                # Unreadable or written in an older entry format
+                expires_at = now - 1
+            if expires_at is not None and expires_at < now:
+                os.remove(path)
+                self.stats.expirations += 1
+                continue
+            entries.append((stat.st_mtime, stat.st_size, path))
+        total = sum(size for _, size, _ in entries)
+        for _, size, path in sorted(entries):
+            if total <= self.max_bytes:
+                break
+            os.remove(path)
+            total -= size
+            self.stats.evictions += 1
+
+    def delete(self, key):
+        with self._locked(exclusive=True):
+            try:
+                os.remove(self._path(key))
+            except FileNotFoundError:
+                pass
+
+    def clear(self):
+        with self._locked(exclusive=True):
+            for path in self._entry_paths():
+                os.remove(path)
+
+    def size_bytes(self):
+        return sum(os.path.getsize(path) for path in self._entry_paths())
+
+
+def get_cache_backend(backend=None, path=None, max_mb=None, ttl=None):
+    """Create the cache backend selected by arguments or SAFA_CACHE_* environment variables
+
+    SAFA_CACHE_BACKEND is one of memory (default), sqlite or directory; SAFA_CACHE_PATH sets
+    the SQLite file or shared directory, SAFA_CACHE_MAX_MB the size budget and
+    SAFA_CACHE_TTL the default time-to-live in seconds.
+    """
+    backend = backend or os.environ.get('SAFA_CACHE_BACKEND', 'memory')
+    max_mb = float(max_mb or os.environ.get('SAFA_CACHE_MAX_MB', 256))
+    ttl = ttl if ttl is not None else float(os.environ.get('SAFA_CACHE_TTL', 0)) or None
+    max_bytes = int(max_mb * 1024 * 1024)
+
+    if backend == 'memory':
+        return MemoryCache(max_bytes=max_bytes, default_ttl=ttl)
+    if backend == 'sqlite':
+        path = path or os.environ.get('SAFA_CACHE_PATH', os.path.join('results', 'analysis_cache.sqlite'))
+        return SQLiteCache(path, max_bytes=max_bytes, default_ttl=ttl)
+    if backend == 'directory':
+        path = path or os.environ.get('SAFA_CACHE_PATH', os.path.join('results', 'analysis_cache'))
+        return SharedDirectoryCache(path, max_bytes=max_bytes, default_ttl=ttl)
+    raise ValueError(f"Unknown cache backend: {backend}")
@@ -0,0 +1,207 @@
+import itertools
+import re
+
+import numpy as np
+import pandas as pd
+
+PERIODS_PER_YEAR = 4  # Cash flows are modelled quarterly
+MONTHS_PER_PERIOD = 12 // PERIODS_PER_YEAR
+
+# Assumptions used when the caller does not supply scenarios
+DEFAULT_SCENARIO = {
+    'rent_psf': 120.0,          # Net annual rent, AED per sq.ft
+    'appreciation': 0.05,       # Annual price growth
+    'exit_years': 5,            # Holding period after handover
+    'discount_rate': 0.08       # Annual discount rate for NPV
+}
+
+IRR_BOUNDS = (-0.99, 5.0)
+IRR_GRID_POINTS = 128
+IRR_BISECTION_STEPS = 40  # Bracket width (5.99 / 2**40) is far below display precision
+
+
+def parse_payment_plan(payment_plan):
+    """Split a plan such as "20/40/40" into booking, construction and handover fractions"""
+    parts = [float(part) for part in re.findall(r'\d+(?:\.\d+)?', payment_plan)]
+    if len(parts) != 3 or not np.isclose(sum(parts), 100):
+        raise ValueError(f"Unsupported payment plan: {payment_plan}")
+    return np.array(parts) / 100
+
+
+def parse_delivery_date(delivery_date):
+    """Turn a delivery quarter such as "Q2 2026" into the last day of that quarter"""
+    match = re.match(r'Q([1-4])\s+(\d{4})', delivery_date.strip())
+    if not match:
+        raise ValueError(f"Unsupported delivery date: {delivery_date}")
+    quarter, year = int(match.group(1)), int(match.group(2))
+    return pd.Timestamp(year=year, month=quarter * 3, day=1) + pd.offsets.MonthEnd(0)
+
+
+def make_scenarios(**assumptions):
+    """Build the cartesian product of scenario assumptions
+
+    Each keyword takes a scalar or a list, e.g. make_scenarios(appreciation=[0.02, 0.05, 0.08]).
+    Missing assumptions fall back to DEFAULT_SCENARIO.
+    """
+    values = {key: np.atleast_1d(assumptions.get(key, default)) for key, default in DEFAULT_SCENARIO.items()}
+    rows = list(itertools.product(*values.values()))
+    return pd.DataFrame(rows, columns=list(values))
+
+
+def _delivery_periods(delivery_date, valuation_date):
+    months = (delivery_date.year - valuation_date.year) * 12 + delivery_date.month - valuation_date.month
+    return max(int(np.ceil(months / MONTHS_PER_PERIOD)), 0)
+
+
+def project_profiles(project_info, scenarios, valuation_date):
+    """Per-AED-of-price and per-sq.ft cash flow profiles for every project and scenario
+
+    A listing's cash flows are price * A[p, s, t] + area * B[p, s, t]: the payment plan and the
+    exit sale scale with price while rent scales with area. Returns (projects, A, B, periods).
+    """
+    projects = list(project_info)
+    delivery = np.array([_delivery_periods(parse_delivery_date(project_info[p]['delivery_date']), valuation_date)
+                         for p in projects])
+    plans = np.array([parse_payment_plan(project_info[p]['payment_plan']) for p in projects])
+
+    exit_periods = (scenarios['exit_years'].to_numpy() * PERIODS_PER_YEAR).astype(int)
+    exit_at = delivery[:, None] + exit_periods[None, :]                               # (P, S)
+    n_periods = int(exit_at.max()) + 1
+    t = np.arange(n_periods)
+
+    # Payment plan: booking now, construction share spread evenly until handover, rest at handover
+    payments = np.zeros((len(projects), n_periods))
+    for i, (booking, construction, handover) in enumerate(plans):
+        if delivery[i] <= 1:
+            payments[i, 0] = 1.0
+            continue
+        payments[i, 0] = booking
+        payments[i, 1:delivery[i]] = construction / (delivery[i] - 1)
+        payments[i, delivery[i]] = handover
+
+    appreciation = scenarios['appreciation'].to_numpy()
+    exit_value = (1 + appreciation)[None, :] ** (exit_at / PERIODS_PER_YEAR)             # (P, S)
+
+    A = np.broadcast_to(-payments[:, None, :], (len(projects), len(scenarios), n_periods)).copy()
+    A += np.where(t[None, None, :] == exit_at[:, :, None], exit_value[:, :, None], 0.0)
+
+    renting = (t[None, None, :] > delivery[:, None, None]) & (t[None, None, :] <= exit_at[:, :, None])
+    B = renting * (scenarios['rent_psf'].to_numpy() / PERIODS_PER_YEAR)[None, :, None]
+    return projects, A, B, n_periods
+
+
+def _discount_factors(annual_rate, n_periods):
+    periodic = (1 + np.asarray(annual_rate)) ** (1 / PERIODS_PER_YEAR)
+    return periodic[..., None] ** -np.arange(n_periods)
+
+
+def _irr_grid(A, B, q_grid):
+    """Annual IRR of A + q * B for every project, scenario and grid ratio, by vectorized bisection"""
+    flows = A[:, :, None, :] + q_grid[:, None, :, None] * B[:, :, None, :]            # (P, S, Q, T)
+    low = np.full(flows.shape[:3], IRR_BOUNDS[0])
+    high = np.full(flows.shape[:3], IRR_BOUNDS[1])
+    t = np.arange(flows.shape[-1])
+    npv_low = (flows * (1 + low[..., None]) ** (-t / PERIODS_PER_YEAR)).sum(axis=-1)
+    for _ in range(IRR_BISECTION_STEPS):
+        mid = (low + high) / 2
+        npv_mid = (flows * (1 + mid[..., None]) ** (-t / PERIODS_PER_YEAR)).sum(axis=-1)
+        same_sign = np.sign(npv_mid) == np.sign(npv_low)
+        low = np.where(same_sign, mid, low)
+        npv_low = np.where(same_sign, npv_mid, npv_low)
+        high = np.where(same_sign, high, mid)
+    irr = (low + high) / 2
+    # No sign change inside the bounds means the IRR is undefined for that combination
+    npv_high = (flows * (1 + high[..., None]) ** (-t / PERIODS_PER_YEAR)).sum(axis=-1)
+    return np.where(np.sign(npv_low) == np.sign(npv_high), np.nan, irr)
+
+
+def _row_quantile(sorted_values, q):
+    """Linear-interpolated quantile of each row of a row-sorted array, ignoring trailing NaNs
+
+    np.nanpercentile falls back to a per-row Python loop, which dominates at 100k rows.
+    """
+    valid = (~np.isnan(sorted_values)).sum(axis=1)
+    position = np.maximum(valid - 1, 0) * q
+    lower = np.floor(position).astype(int)
+    upper = np.minimum(lower + 1, np.maximum(valid - 1, 0))
+    rows = np.arange(len(sorted_values))
+    weight = position - lower
+    result = sorted_values[rows, lower] * (1 - weight) + sorted_values[rows, upper] * weight
+    return np.where(valid > 0, result, np.nan)
+
+
+def evaluate_listings(df, project_info, scenarios=None, valuation_date=None):
+    """NPV and IRR of every listing under every scenario
+
+    NPV is exact: price * PV(A) + area * PV(B). IRR depends only on area/price within a project
+    and scenario, so it is solved once on a grid of that ratio and interpolated per listing.
+    Returns a dict with 'npv' and 'irr' arrays of shape (listings, scenarios) plus a per-listing
+    'summary' frame.
+    """
+    scenarios = make_scenarios() if scenarios is None else scenarios.reset_index(drop=True)
+    valuation_date = pd.Timestamp(valuation_date or pd.Timestamp.today()).normalize()
+    projects, A, B, n_periods = project_profiles(project_info, scenarios, valuation_date)
+
+    lookup = {p: i for i, p in enumerate(projects)}
+    codes = df['project'].map(lookup)
+    if codes.isna().any():
+        missing = sorted(df.loc[codes.isna(), 'project'].unique())
+        raise ValueError(f"No payment plan for project(s): {', '.join(missing)}")
+    codes = codes.to_numpy(dtype=int)
+    price = df['price'].to_numpy(dtype=float)
+    area = df['area_sqft'].to_numpy(dtype=float)
+
+    # Exact NPV through per-project present values of the two profiles
+    discount = _discount_factors(scenarios['discount_rate'].to_numpy(), n_periods)      # (S, T)
+    pv_a = (A * discount[None]).sum(axis=-1)                                           # (P, S)
+    pv_b = (B * discount[None]).sum(axis=-1)
+    npv = price[:, None] * pv_a[codes] + area[:, None] * pv_b[codes]
+
+    # IRR via a per-project grid over area/price
+    ratio = area / price
+    q_grid = np.empty((len(projects), IRR_GRID_POINTS))
+    for i in range(len(projects)):
+        project_ratio = ratio[codes == i]
+        lo, hi = (project_ratio.min(), project_ratio.max()) if len(project_ratio) else (1e-4, 1e-3)
+        q_grid[i] = np.geomspace(lo * 0.99, hi * 1.01, IRR_GRID_POINTS)
+    irr_grid = _irr_grid(A, B, q_grid)                                                # (P, S, Q)
+
+    irr = np.empty((len(df), len(scenarios)))
+    for i in range(len(projects)):
+        rows = np.flatnonzero(codes == i)
+        if not len(rows):
+            continue
+        position = np.clip(np.searchsorted(q_grid[i], ratio[rows]) - 1, 0, IRR_GRID_POINTS - 2)
+        weight = (ratio[rows] - q_grid[i, position]) / (q_grid[i, position + 1] - q_grid[i, position])
+        irr[rows] = (irr_grid[i][:, position] * (1 - weight) + irr_grid[i][:, position + 1] * weight).T
+
+    sorted_irr = np.sort(irr, axis=1)
+    summary = pd.DataFrame({
+        'median_irr': _row_quantile(sorted_irr, 0.5),
+        'p10_irr': _row_quantile(sorted_irr, 0.1),
+        'median_npv': np.median(npv, axis=1)
+    }, index=df.index)
+    return {'scenarios': scenarios, 'npv': npv, 'irr': irr, 'summary': summary}
+
+
+def rank_listings(df, evaluation, top_n=10):
+    """Listings ranked by median IRR across scenarios"""
+    return df.join(evaluation['summary']).sort_values('median_irr', ascending=False).head(top_n)
+
+
+def cash_flow_schedule(price, area, project, project_info, scenario=None, valuation_date=None):
+    """Dated cash flow schedule for one listing under one scenario"""
+    scenario = dict(DEFAULT_SCENARIO, **(scenario or {}))
+    valuation_date = pd.Timestamp(valuation_date or pd.Timestamp.today()).normalize()
+    scenarios = pd.DataFrame([scenario])
+    projects, A, B, n_periods = project_profiles({project: project_info[project]}, scenarios, valuation_date)
+
+    flows = price * A[0, 0] + area * B[0, 0]
+    schedule = pd.DataFrame({
+        'date': [valuation_date + pd.DateOffset(months=MONTHS_PER_PERIOD * t) for t in range(n_periods)],
+        'payment': np.minimum(price * A[0, 0], 0),
+        'rent': area * B[0, 0],
+        'sale': np.maximum(price * A[0, 0], 0),
+        'net_cash_flow': flows
+    })
+    return schedule[schedule['net_cash_flow'] != 0].reset_index(drop=True)
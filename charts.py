@@ -0,0 +1,292 @@
+import pandas as pd
+import plotly.express as px
+
+from currency import AED_SQFT
+from materialize import bedroom_label
+
+PROJECT_COLORS = {'Safa One': '#1E3A8A', 'Safa Two': '#3B82F6'}
+
+UNIT_TYPE_COLUMNS = ['Bedrooms', 'Count', 'Min Price', 'Max Price', 'Avg Price', 'Median Price',
+                     'Min Area', 'Max Area', 'Avg Area', 'Min Price/{area_unit}',
+                     'Max Price/{area_unit}', 'Avg Price/{area_unit}']
+
+
+def format_currency(value, currency='AED'):
+    """Format currency values for display"""
+    if pd.isna(value):
+        return "N/A"
+    if isinstance(value, (int, float)):
+        if value >= 1000000:
+            return f"{currency} {value/1000000:.2f}M"
+        return f"{currency} {value:,.0f}"
+    return value
+
+
+def format_area(value, area_unit='sq.ft'):
+    """Format area values for display"""
+    if pd.isna(value):
+        return "N/A"
+    if isinstance(value, (int, float)):
+        return f"{value:,.0f} {area_unit}"
+    return value
+
+
+def unit_type_table(bedroom_stats, units=AED_SQFT):
+    """Format the bedroom statistics table for display (values already in the display units)"""
+    table = bedroom_stats.copy(deep=False)
+    for col in ['min_price', 'max_price', 'avg_price', 'median_price']:
+        table[col] = table[col].apply(format_currency, currency=units.currency)
+
+    for col in ['min_area', 'max_area', 'avg_area']:
+        table[col] = table[col].apply(format_area, area_unit=units.area_unit)
+
+    for col in ['min_price_per_sqft', 'max_price_per_sqft', 'avg_price_per_sqft']:
+        table[col] = table[col].apply(lambda x: f"{units.currency} {x:,.0f}")
+
+    table.columns = [column.format(area_unit=units.area_unit) for column in UNIT_TYPE_COLUMNS]
+    return table
+
+
+def investment_column(project_info, summary, units=AED_SQFT):
+    """Format one project's column of the investment comparison table"""
+    return [
+        project_info['delivery_date'],
+        project_info['payment_plan'],
+        format_currency(summary['avg_1br_price'], units.currency),
+        format_currency(summary['avg_2br_price'], units.currency),
+        format_currency(summary['avg_3br_price'], units.currency),
+        f"{units.currency} {summary['min_price_per_sqft']:,.0f} - {summary['max_price_per_sqft']:,.0f}",
+        project_info['location']
+    ]
+
+
+def investment_table(project_infos, summaries, units=AED_SQFT):
+    """Investment comparison table with one column per project"""
+    investment_data = {
+        'Metric': [
+            'Expected Delivery',
+            'Payment Plan',
+            'Avg. 1BR Price',
+            'Avg. 2BR Price',
+            'Avg. 3BR Price',
+            f"Price per {units.area_unit} Range",
+            'Location'
+        ]
+    }
+    for project_name, summary in summaries.items():
+        investment_data[project_name] = investment_column(project_infos[project_name], summary, units)
+    return pd.DataFrame(investment_data)
+
+
+def listing_days_chart(listing_days_stats, project_name):
+    """Bar chart of a project's listings by listing period, with the cumulative share when available"""
+    fig = px.bar(
+        listing_days_stats,
+        x='listing_period',
+        y='count',
+        color_discrete_sequence=['#0d3b66'],
+        labels={'listing_period': 'Listing Period', 'count': 'Number of Properties'},
+        title=f'Distribution of Properties by Listing Period in {project_name}'
+    )
+
+    fig.update_layout(
+        font_family="Arial",
+        title_font_size=18,
+        title_font_color='#1E3A8A',
+        plot_bgcolor='#f8fafc',
+        paper_bgcolor='white',
+        height=400,
+        xaxis_title="Listing Period",
+        yaxis_title="Number of Properties"
+    )
+
+    # Share of listings at or below each bucket, on a secondary axis
+    if 'cumulative_share' in listing_days_stats.columns:
+        fig.add_scatter(
+            x=listing_days_stats['listing_period'],
+            y=listing_days_stats['cumulative_share'],
+            mode='lines+markers',
+            name='Cumulative Share',
+            line=dict(color='#3B82F6'),
+            yaxis='y2'
+        )
+        fig.update_layout(
+            yaxis2=dict(title="Cumulative Share", overlaying='y', side='right', tickformat='.0%', range=[0, 1.05]),
+            legend=dict(orientation='h', y=-0.2)
+        )
+
+    return fig
+
+
+def price_comparison_chart(comparison_rows, units=AED_SQFT, error_column=None):
+    """Grouped bar chart of average price per sq.ft by bedroom type and project
+
+    error_column names a column of margins of error to draw as error bars (sampled previews).
+    """
+    fig = px.bar(
+        comparison_rows,
+        x='Bedroom Type',
+        y='Avg Price/sq.ft',
+        color='Project',
+        barmode='group',
+        error_y=error_column,
+        title=f"Average Price per {units.area_unit} Comparison",
+        labels={'Avg Price/sq.ft': f"Average Price per {units.area_unit} ({units.currency})"},
+        color_discrete_map=PROJECT_COLORS
+    )
+
+    # Format axes and layout
+    fig.update_layout(
+        font_family="Arial",
+        title_font_size=20,
+        title_font_color='#1E3A8A',
+        legend_title_font_color='#1E3A8A',
+        plot_bgcolor='#EFF6FF',
+        paper_bgcolor='white',
+        height=500
+    )
+
+    fig.update_yaxes(tickformat=',', title_font=dict(size=14, color='#1F2937'))
+    fig.update_xaxes(title_font=dict(size=14, color='#1F2937'))
+
+    return fig
+
+
+def listing_age_comparison_chart(combined_listing):
+    """Grouped bar chart of listing periods per project (listing_days_stats rows with a Project column)"""
+    fig = px.bar(
+        combined_listing,
+        x='listing_period',
+        y='count',
+        color='Project',
+        barmode='group',
+        title='Distribution of Listings by Age',
+        labels={'listing_period': 'Listing Period', 'count': 'Number of Properties'},
+        color_discrete_map=PROJECT_COLORS
+    )
+
+    fig.update_layout(
+        font_family="Arial",
+        title_font_size=18,
+        title_font_color='#1E3A8A',
+        legend_title_font_color='#1E3A8A',
+        plot_bgcolor='#EFF6FF',
+        paper_bgcolor='white',
+        height=450
+    )
+
+    return fig
+
+
+def listing_age_pie(listing_days_stats, project_name):
+    """Pie chart of a project's listings by listing period"""
+    fig = px.pie(
+        listing_days_stats,
+        values='count',
+        names='listing_period',
+        title=f'{project_name} Listings by Age',
+        color_discrete_sequence=px.colors.sequential.Blues_r
+    )
+    # Keep the buckets in age order rather than by size
+    fig.update_traces(sort=False, direction='clockwise')
+
+    fig.update_layout(
+        font_family="Arial",
+        title_font_color='#1E3A8A',
+        legend_title_text='Listing Period',
+        height=400
+    )
+
+    return fig
+
+
+def simplified_unit_types(bedroom_stats, units=AED_SQFT):
+    """One row per unit type with size range, price range, price/sq.ft and unit count"""
+    rows = []
+    for bed_type in ['studio', '1', '2', '3', '4']:
+        bed_data = bedroom_stats[bedroom_stats['bedrooms'] == bed_type]
+        if bed_data.empty:
+            continue
+        rows.append({
+            'Unit Type': bedroom_label(bed_type),
+            f"Size Range ({units.area_unit})": f"{bed_data['min_area'].values[0]:.0f} - {bed_data['max_area'].values[0]:.0f}",
+            f"Price Range ({units.currency})": f"{units.currency} {bed_data['min_price'].values[0]/1000000:.2f}M - {bed_data['max_price'].values[0]/1000000:.2f}M",
+            f"Average Price/{units.area_unit}": f"{units.currency} {bed_data['avg_price_per_sqft'].values[0]:.0f}",
+            'Available Units': f"{bed_data['count'].values[0]:.0f}"
+        })
+    return pd.DataFrame(rows, columns=['Unit Type', f"Size Range ({units.area_unit})", f"Price Range ({units.currency})",
+                                       f"Average Price/{units.area_unit}", 'Available Units'])
+
+
+def project_map(grid, projects, units=AED_SQFT):
+    """Map of geohash cells sized by listing count and colored by average price/sq.ft, with project labels
+
+    grid is already in the display units.
+    """
+    fig = px.scatter_map(
+        grid,
+        lat='latitude',
+        lon='longitude',
+        size='listings',
+        color='avg_price_per_sqft',
+        color_continuous_scale='Blues',
+        hover_name='projects',
+        hover_data={'listings': True, 'avg_price_per_sqft': ':,.0f', 'avg_price': ':,.0f',
+                    'latitude': False, 'longitude': False},
+        labels={'avg_price_per_sqft': f"Avg Price/{units.area_unit} ({units.currency})",
+                'avg_price': f"Avg Price ({units.currency})", 'listings': 'Listings'},
+        size_max=40,
+        zoom=11,
+        center={'lat': projects['latitude'].mean(), 'lon': projects['longitude'].mean()},
+        map_style='carto-positron',
+        title='Listings by Location'
+    )
+    fig.add_scattermap(
+        lat=projects['latitude'],
+        lon=projects['longitude'],
+        mode='text',
+        text=projects['project'],
+        textposition='top center',
+        textfont=dict(size=14, color='#1E3A8A'),
+        hoverinfo='skip',
+        showlegend=False
+    )
+
+    fig.update_layout(
+        font_family="Arial",
+        title_font_size=18,
+        title_font_color='#1E3A8A',
+        paper_bgcolor='white',
+        height=450,
+        margin=dict(l=0, r=0, t=50, b=0)
+    )
+
+    return fig
+
+
+def price_index_chart(series, title):
+    """Line chart of chained price/sq.ft index levels per segment (base 100)"""
+    fig = px.line(
+        series,
+        x='period',
+        y='index',
+        color='segment',
+        markers=True,
+        title=title,
+        labels={'period': 'Snapshot Date', 'index': 'Price/sq.ft Index', 'segment': 'Segment'},
+        color_discrete_map=PROJECT_COLORS,
+        hover_data={'listings': True}
+    )
+
+    fig.update_layout(
+        font_family="Arial",
+        title_font_size=18,
+        title_font_color='#1E3A8A',
+        legend_title_font_color='#1E3A8A',
+        plot_bgcolor='#EFF6FF',
+        paper_bgcolor='white',
+        height=450
+    )
+    fig.add_hline(y=100, line_dash='dot', line_color='#94A3B8')
+
+    return fig
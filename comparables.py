@@ -0,0 +1,71 @@
+import numpy as np
+import pandas as pd
+from scipy.spatial import cKDTree
+
+from fair_value import parse_listing_features
+
+# Numeric features compared between listings; parsed description flags are added to these
+NUMERIC_FEATURES = ['area_sqft', 'bathroom_count', 'price_per_sqft']
+
+# Relative importance of each feature after standardization
+FEATURE_WEIGHTS = {'area_sqft': 2.0, 'price_per_sqft': 1.5, 'bathroom_count': 0.5}
+FLAG_WEIGHT = 0.5
+
+
+class ComparablesIndex:
+    """Nearest-neighbour index of listings, partitioned by bedroom type
+
+    Each bedroom type gets its own KD-tree over standardized, weighted features, so a listing's
+    comparables always share its unit type but may come from any project. Build it once per
+    data version; queries only walk the tree.
+    """
+
+    def __init__(self, df):
+        self.listings = df.reset_index(drop=True)
+        features = pd.DataFrame({
+            'area_sqft': self.listings['area_sqft'].astype(float),
+            'bathroom_count': pd.to_numeric(self.listings['bathrooms'], errors='coerce').fillna(0).astype(float),
+            'price_per_sqft': self.listings['price_per_sqft'].astype(float)
+        }).join(parse_listing_features(self.listings))
+
+        # Standardize numeric features, keep 0/1 flags as they are
+        scale = features[NUMERIC_FEATURES].std(ddof=0).replace(0, 1)
+        features[NUMERIC_FEATURES] = (features[NUMERIC_FEATURES] - features[NUMERIC_FEATURES].mean()) / scale
+        weights = np.array([FEATURE_WEIGHTS.get(column, FLAG_WEIGHT) for column in features.columns])
+        self.points = features.to_numpy() * weights
+
+        self.partitions = {}
+        for bedrooms, rows in self.listings.groupby('bedrooms').indices.items():
+            self.partitions[bedrooms] = (rows, cKDTree(self.points[rows]))
+
+    def query(self, position, k=5):
+        """Top-k comparables for the listing at the given position, excluding itself"""
+        rows, tree = self.partitions[self.listings.at[position, 'bedrooms']]
+        k_query = min(k + 1, len(rows))
+        distances, local = tree.query(self.points[position], k=k_query)
+        distances, neighbours = np.atleast_1d(distances), rows[np.atleast_1d(local)]
+        keep = neighbours != position
+        result = self.listings.iloc[neighbours[keep][:k]].copy()
+        result['distance'] = distances[keep][:k]
+        return result
+
+    def annotate(self, k=5):
+        """Batch mode: attach the positions of every listing's k comparables and their median price/sq.ft"""
+        comparables = np.full((len(self.listings), k), -1, dtype=np.int64)
+        for rows, tree in self.partitions.values():
+            k_query = min(k + 1, len(rows))
+            _, local = tree.query(self.points[rows], k=k_query)
+            neighbours = rows[np.asarray(local).reshape(len(rows), k_query)]
+
+            # Drop each listing from its own result, keeping the remaining neighbours in distance order
+            is_other = neighbours != rows[:, None]
+            order = np.argsort(~is_other, axis=1, kind='stable')[:, :k]
+            taken = np.take_along_axis(neighbours, order, axis=1)
+            valid = np.take_along_axis(is_other, order, axis=1)
+            comparables[rows, :taken.shape[1]] = np.where(valid, taken, -1)
+
+        ppsf = self.listings['price_per_sqft'].to_numpy(dtype=float)
+        annotated = self.listings.copy()
+        annotated['comparables'] = list(comparables)
+        annotated['comparable_median_ppsf'] = np.nanmedian(np.where(comparables >= 0, ppsf[comparables], np.nan), axis=1)
+        return annotated
@@ -0,0 +1,61 @@
+import os
+
+import streamlit as st
+
+# Enhanced custom CSS styling, shared by every page section. Served as a static file
+# (see .streamlit/config.toml) so the browser fetches it once and caches it
+STYLESHEET_PATH = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'static', 'styles.css')
+STYLESHEET_URL = 'app/static/styles.css'
+
+
+def inject_styles():
+    """Link the global stylesheet from the page
+
+    A full rerun has to emit it again because Streamlit drops elements that a run does not
+    produce, but that is a one-line link the browser resolves from its cache. Without static
+    serving the stylesheet goes out inline instead.
+    """
+    if st.get_option('server.enableStaticServing'):
+        st.markdown(f'<link rel="stylesheet" href="{STYLESHEET_URL}">', unsafe_allow_html=True)
+    else:
+        with open(STYLESHEET_PATH) as f:
+            st.markdown(f"<style>\n{f.read()}</style>", unsafe_allow_html=True)
+
+
+def metric_card(value, label):
+    """HTML for a single metric card"""
+    return (f'<div class="metric-card"><div class="metric-value">{value}</div>'
+            f'<div class="metric-label">{label}</div></div>')
+
+
+def comparison_card(title, entries):
+    """HTML for a metric card comparing one value across projects; entries are (name, color, value)"""
+    columns = ''.join(f'<div><p style="font-weight: 600; color: {color};">{name}</p>'
+                      f'<p style="font-size: 20px;">{value}</p></div>' for name, color, value in entries)
+    return (f'<div class="metric-card"><h3 style="color: #1E3A8A; text-align: center; margin-bottom: 15px;">{title}</h3>'
+            f'<div style="display: flex; justify-content: space-between;">{columns}</div></div>')
+
+
+def summary_card(title, rows):
+    """HTML for a metric card listing labelled values; rows are (label, value)"""
+    lines = ''.join(f'<p><span class="highlight">{label}:</span> {value}</p>' for label, value in rows)
+    return f'<div class="metric-card"><h3 style="color: #1E3A8A; margin-bottom: 10px;">{title}</h3>{lines}</div>'
+
+
+def html_table(columns, rows, wide_column=None):
+    """HTML for a data table; columns is a list, rows are sequences of already formatted cells"""
+    header = ''.join(f'<th>{column}</th>' for column in columns)
+    wide = columns.index(wide_column) if wide_column in columns else None
+    body = ''.join(
+        '<tr>' + ''.join(f'<td style="max-width:300px;">{cell}</td>' if i == wide else f'<td>{cell}</td>'
+                         for i, cell in enumerate(row)) + '</tr>'
+        for row in rows
+    )
+    return f'<table class="dataframe" style="width:100%;"><thead><tr>{header}</tr></thead><tbody>{body}</tbody></table>'
+
+
+def metric_cards(cards):
+    """Render (value, label) metric cards side by side"""
+    for col, (value, label) in zip(st.columns(len(cards)), cards):
+        with col:
+            st.markdown(metric_card(value, label), unsafe_allow_html=True)
@@ -0,0 +1,215 @@
+import threading
+from collections import OrderedDict
+
+import numpy as np
+import pandas as pd
+
+from fair_value import parse_listing_features
+from listing_age import DEFAULT_BUCKETS
+
+# Dimensions listings can be grouped by, with their display names
+DIMENSIONS = {
+    'project': 'Project',
+    'bedrooms': 'Bedrooms',
+    'bathrooms': 'Bathrooms',
+    'view': 'View',
+    'floor_band': 'Floor',
+    'listing_age_bucket': 'Listing Age',
+    'snapshot_date': 'Snapshot Date'
+}
+
+# Numeric columns aggregated in the cube, and the aggregations a measure can ask for
+MEASURE_COLUMNS = ['price', 'area_sqft', 'price_per_sqft']
+AGGREGATIONS = ['count', 'sum', 'avg', 'min', 'max', 'std']
+
+# Display order for dimension values that have a natural order
+DIMENSION_ORDER = {
+    'bedrooms': ['studio', '1', '2', '3', '4'],
+    'floor_band': ['Penthouse', 'High Floor', 'Mid Floor', 'Unspecified'],
+    'listing_age_bucket': DEFAULT_BUCKETS.order
+}
+
+# Query results kept per cube
+QUERY_CACHE_SIZE = 256
+
+
+def add_dimension_columns(df):
+    """Derive the view, floor band and listing age bucket dimensions from a listings frame"""
+    flags = parse_listing_features(df).astype(bool)
+    view = np.select([flags['sea_view'], flags['landmark_view'], flags['canal_park_view']],
+                     ['Sea View', 'Landmark View', 'Canal/Park View'], 'Other')
+    floor_band = np.select([flags['penthouse'], flags['high_floor'], flags['mid_floor']],
+                           ['Penthouse', 'High Floor', 'Mid Floor'], 'Unspecified')
+
+    listing_age_bucket = DEFAULT_BUCKETS.label(df['listing_age_days'].to_numpy(dtype=float))
+
+    return df.assign(view=view, floor_band=floor_band, listing_age_bucket=listing_age_bucket)
+
+
+def measure_parts(measure):
+    """Split a measure name such as "avg_price_per_sqft" into (aggregation, column)"""
+    if measure == 'count':
+        return 'count', None
+    aggregation, _, column = measure.partition('_')
+    if aggregation not in AGGREGATIONS or column not in MEASURE_COLUMNS:
+        raise ValueError(f"Unknown measure: {measure}")
+    return aggregation, column
+
+
+class ListingCube:
+    """Pre-aggregated partials of listings at the finest grain of every dimension
+
+    Each cell holds count, sum, sum of squares, min and max of every measure column, which
+    is enough to roll up to any coarser grouping: queries regroup the (small) cell table
+    instead of the listings. Medians are not decomposable and are not offered. Snapshots can
+    be added incrementally; query results are cached until the cube changes.
+
+    A unit listed in several snapshots would be counted once per snapshot, so queries that
+    neither filter nor group by snapshot_date only read each project's latest snapshot. A
+    project keeps one snapshot per date: adding another one for the same date replaces it,
+    so snapshots are added in archive order (as list_snapshots returns them).
+    """
+
+    def __init__(self):
+        self.cells = None
+        self._queries = OrderedDict()
+        self._lock = threading.Lock()
+
+    def add(self, df, snapshot_date=None):
+        """Fold a listings frame (one snapshot) into the cube, replacing its project's snapshot of that date"""
+        df = add_dimension_columns(df)
+        if snapshot_date is not None or 'snapshot_date' not in df:
+            df = df.assign(snapshot_date=str(snapshot_date or 'Current'))
+        keys = [df[dimension].astype(str) for dimension in DIMENSIONS]
+        values = df[MEASURE_COLUMNS].astype(float)
+        values = values.join(np.square(values).add_prefix('sq_'))
+        grouped = values.groupby(keys, observed=True, dropna=False)
+
+        parts = {'count': grouped.size()}
+        for column in MEASURE_COLUMNS:
+            parts[f"sum_{column}"] = grouped[column].sum()
+            parts[f"sumsq_{column}"] = grouped[f"sq_{column}"].sum()
+            parts[f"min_{column}"] = grouped[column].min()
+            parts[f"max_{column}"] = grouped[column].max()
+        cells = pd.DataFrame(parts).reset_index()
+        cells.columns = list(DIMENSIONS) + list(parts)
+
+        with self._lock:
+            if self.cells is not None:
+                # A later version archived on the same day supersedes the earlier one
+                snapshots = pd.MultiIndex.from_frame(cells[['project', 'snapshot_date']])
+                kept = ~pd.MultiIndex.from_frame(self.cells[['project', 'snapshot_date']]).isin(snapshots)
+                cells = self._combine(pd.concat([self.cells[kept], cells], ignore_index=True), list(DIMENSIONS))
+            self.cells = cells
+            self._queries.clear()
+        return self
+
+    @staticmethod
+    def _combine(cells, dimensions):
+        """Roll cells up to the given dimensions by merging their partials"""
+        how = {'count': 'sum'}
+        for column in MEASURE_COLUMNS:
+            how.update({f"sum_{column}": 'sum', f"sumsq_{column}": 'sum',
+                        f"min_{column}": 'min', f"max_{column}": 'max'})
+        if not dimensions:
+            return cells.agg(how).to_frame().T
+        return cells.groupby(dimensions, as_index=False, sort=False).agg(how)
+
+    def values(self, dimension, filters=None):
+        """Distinct values of a dimension among cells matching the filters, in display order"""
+        cells = self._filter(filters, [dimension])
+        return self._sorted(pd.DataFrame({dimension: cells[dimension].unique()}), [dimension])[dimension].tolist()
+
+    @staticmethod
+    def latest_only(dimensions, filters=None):
+        """Whether a query over these dimensions and filters reads only the latest snapshots"""
+        return 'snapshot_date' not in dimensions and 'snapshot_date' not in (filters or {})
+
+    def _filter(self, filters, dimensions=()):
+        if self.cells is None:
+            raise ValueError("The cube is empty")
+        cells = self.cells
+        if self.latest_only(dimensions, filters):
+            latest = cells.groupby('project')['snapshot_date'].transform('max')
+            cells = cells[cells['snapshot_date'] == latest]
+        for dimension, value in (filters or {}).items():
+            values = value if isinstance(value, (list, tuple, set)) else [value]
+            cells = cells[cells[dimension].isin([str(v) for v in values])]
+        return cells
+
+    @staticmethod
+    def _sorted(result, dimensions):
+        if not dimensions:
+            return result
+        sort_keys = {}
+        for dimension in dimensions:
+            order = DIMENSION_ORDER.get(dimension)
+            if order:
+                rank = {value: i for i, value in enumerate(order)}
+                sort_keys[dimension] = result[dimension].map(lambda value: (rank.get(value, len(rank)), value))
+            else:
+                sort_keys[dimension] = result[dimension]
+        order = pd.DataFrame(sort_keys).sort_values(dimensions).index
+        return result.loc[order].reset_index(drop=True)
+
+    def query(self, dimensions, measures=('count', 'avg_price', 'avg_price_per_sqft'), filters=None):
+        """Aggregate measures by any combination of dimensions
+
+        dimensions is a list of DIMENSIONS keys, measures are "count" or "<aggregation>_<column>"
+        (e.g. "avg_price_per_sqft", "max_area_sqft"), and filters maps a dimension to one value
+        or a list of values. Unless snapshot_date is grouped or filtered on, only each
+        project's latest snapshot is aggregated.
+        """
+        dimensions, measures = list(dimensions), list(measures)
+        unknown = [dimension for dimension in dimensions if dimension not in DIMENSIONS]
+        if unknown:
+            raise ValueError(f"Unknown dimension(s): {', '.join(unknown)}")
+        key = (tuple(dimensions), tuple(measures), tuple(sorted((d, str(v)) for d, v in (filters or {}).items())))
+        with self._lock:
+            if key in self._queries:
+                self._queries.move_to_end(key)
+                return self._queries[key].copy()
+
+        rolled = self._combine(self._filter(filters, dimensions), dimensions)
+        count = rolled['count'].to_numpy(dtype=float)
+        result = rolled[dimensions].copy()
+        for measure in measures:
+            aggregation, column = measure_parts(measure)
+            if aggregation == 'count':
+                result[measure] = count.astype(int)
+            elif aggregation == 'sum':
+                result[measure] = rolled[f"sum_{column}"].to_numpy(dtype=float)
+            elif aggregation == 'avg':
+                result[measure] = rolled[f"sum_{column}"].to_numpy(dtype=float) / count
+            elif aggregation in ('min', 'max'):
+                result[measure] = rolled[f"{aggregation}_{column}"].to_numpy(dtype=float)
+            else:
+                mean = rolled[f"sum_{column}"].to_numpy(dtype=float) / count
+                variance = rolled[f"sumsq_{column}"].to_numpy(dtype=float) / count - mean ** 2
+                result[measure] = np.sqrt(np.maximum(variance, 0))
+        result = self._sorted(result, dimensions)
+
+        with self._lock:
+            self._queries[key] = result
+            if len(self._queries) > QUERY_CACHE_SIZE:
+                self._queries.popitem(last=False)
+        return result.copy()
+
+    def drill_down(self, path, selections, measures=('count', 'avg_price', 'avg_price_per_sqft')):
+        """Aggregate at the first level of a drill-down path that has no selected value
+
+        path is an ordered list of dimensions and selections the values chosen so far, one per
+        level. Returns (dimension, result) for the level being shown.
+        """
+        filters = dict(zip(path, selections))
+        level = path[min(len(selections), len(path) - 1)]
+        filters.pop(level, None)
+        return level, self.query([level], measures, filters)
+
+
+def build_cube(snapshots):
+    """Build a cube from (snapshot_date, listings DataFrame) pairs"""
+    cube = ListingCube()
+    for snapshot_date, df in snapshots:
+        cube.add(df, snapshot_date)
+    return cube
@@ -0,0 +1,107 @@
+import numbers
+import os
+from collections import namedtuple
+from datetime import date
+from functools import lru_cache
+
+import pandas as pd
+
+# Local FX table: AED per unit of each currency, one row per (date, currency)
+FX_RATES_PATH = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'fx_rates.csv')
+
+BASE_CURRENCY = 'AED'
+CURRENCIES = ['AED', 'USD', 'EUR', 'GBP']
+
+SQFT_PER_SQM = 10.7639
+# Multiplier from square feet to each display unit
+AREA_UNITS = {'sq.ft': 1.0, 'm²': 1 / SQFT_PER_SQM}
+
+DisplayUnits = namedtuple('DisplayUnits', ['currency', 'area_unit', 'price_factor', 'area_factor', 'rates_date'])
+
+AED_SQFT = DisplayUnits(BASE_CURRENCY, 'sq.ft', 1.0, 1.0, None)
+
+
+@lru_cache(maxsize=4)
+def _read_fx_table(path, modified):
+    table = pd.read_csv(path, parse_dates=['date'])
+    return table.sort_values('date')
+
+
+def load_fx_table(path=FX_RATES_PATH):
+    """The FX rate table, read again only when the file changes"""
+    return _read_fx_table(path, os.path.getmtime(path))
+
+
+@lru_cache(maxsize=64)
+def _fx_rates(on_date, path, modified):
+    table = _read_fx_table(path, modified)
+    table = table[table['date'] <= pd.Timestamp(on_date)]
+    if table.empty:
+        raise ValueError(f"No FX rates on or before {on_date} in {path}")
+    # Latest rate per currency as of the date
+    latest = table.groupby('currency').last()
+    return latest['date'].max().date(), latest['aed_per_unit'].to_dict()
+
+
+def fx_rates(on_date=None, path=FX_RATES_PATH):
+    """(rates date, {currency: AED per unit}) as of a date, cached per date and file version"""
+    return _fx_rates(on_date or date.today(), path, os.path.getmtime(path))
+
+
+def display_units(currency=BASE_CURRENCY, area_unit='sq.ft', on_date=None, path=FX_RATES_PATH):
+    """Conversion factors from AED and sq.ft to the chosen currency and area unit"""
+    if area_unit not in AREA_UNITS:
+        raise ValueError(f"Unknown area unit {area_unit!r}; expected one of {', '.join(AREA_UNITS)}")
+    if currency == BASE_CURRENCY:
+        return DisplayUnits(currency, area_unit, 1.0, AREA_UNITS[area_unit], None)
+    rates_date, rates = fx_rates(on_date, path)
+    if currency not in rates:
+        raise ValueError(f"No FX rate for {currency} as of {rates_date}")
+    return DisplayUnits(currency, area_unit, 1 / rates[currency], AREA_UNITS[area_unit], rates_date)
+
+
+def column_factor(column, units):
+    """Multiplier for a price, area or price-per-area column, or None for columns left as they are"""
+    name = column.lower().replace('/', '_per_').replace(' ', '_').replace('.', '')
+    if 'price_per_sqft' in name:
+        return units.price_factor / units.area_factor
+    if 'price' in name:
+        return units.price_factor
+    if 'area' in name:
+        return units.area_factor
+    return None
+
+
+def convert_frame(df, units):
+    """Scale the price and area columns of a frame; other columns are shared, not copied"""
+    if units == AED_SQFT:
+        return df
+    scaled = {}
+    for column in df.columns:
+        factor = column_factor(column, units)
+        if factor is not None and factor != 1.0 and pd.api.types.is_numeric_dtype(df[column]):
+            scaled[column] = df[column] * factor
+    return df.assign(**scaled) if scaled else df
+
+
+def convert_stats(stats, units):
+    """Scale the price and area entries of a statistics dict"""
+    converted = dict(stats)
+    for key, value in stats.items():
+        factor = column_factor(key, units)
+        if factor is not None and isinstance(value, numbers.Number) and not isinstance(value, bool):
+            converted[key] = value * factor
+    return converted
+
+
+def convert_aggregates(aggregates, units):
+    """Materialized aggregates in display units, scaling only the price and area columns"""
+    converted = {}
+    for name, value in aggregates.items():
+        if isinstance(value, pd.DataFrame):
+            converted[name] = convert_frame(value, units)
+        elif hasattr(value, 'items') and name in ('stats_overall', 'investment_summary'):
+            converted[name] = convert_stats(value, units)
+        else:
+            converted[name] = value
+    return converted
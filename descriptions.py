@@ -0,0 +1,43 @@
+import html
+import re
+
+import pandas as pd
+
+from listings_grid import listing_age_to_days
+
+# "Listed 3 Months ago", "listed 1 day ago", ...
+LISTING_AGE_PATTERN = re.compile(r'[Ll]isted\s+(\d+)\s+([Dd]ays?|[Mm]onths?|[Ww]eeks?)\s+[Aa]go')
+LISTING_BADGE_PATTERN = re.compile(r'([Ll]isted\s+\d+\s+(?:[Dd]ays?|[Mm]onths?|[Ww]eeks?)\s+[Aa]go)')
+
+FEATURE_SEPARATOR = re.compile(r'\s*\|\s*')
+
+STANDARD_UNITS = {'day': 'days', 'days': 'days', 'week': 'weeks', 'weeks': 'weeks', 'month': 'months', 'months': 'months'}
+
+# Columns added to the listings by process_descriptions
+DESCRIPTION_COLUMNS = ['listing_days', 'listing_age_days', 'features', 'features_html']
+
+
+def process_descriptions(descriptions):
+    """Derive every description-based column in one vectorized pass
+
+    Returns a frame aligned with the input holding the standardized listing period
+    ("3 months"), its approximate age in days, the feature bullets and the bullet list as an
+    HTML fragment with the listing age highlighted. Run it once per data version; the
+    dashboard only reads the resulting columns.
+    """
+    descriptions = pd.Series(descriptions, dtype=object).fillna('').astype(str)
+
+    parts = descriptions.str.extract(LISTING_AGE_PATTERN)
+    listing_days = (parts[0] + ' ' + parts[1].str.lower().map(STANDARD_UNITS)).astype(object)
+    listing_days = listing_days.where(listing_days.notna(), None)
+
+    features = descriptions.str.strip().str.split(FEATURE_SEPARATOR, regex=True).map(lambda items: [item for item in items if item])
+    features_html = features.map(lambda items: '• ' + '<br>• '.join(html.escape(item) for item in items) if items else '')
+    features_html = features_html.str.replace(LISTING_BADGE_PATTERN, r'<span class="listing-badge">\1</span>', regex=True)
+
+    return pd.DataFrame({
+        'listing_days': listing_days,
+        'listing_age_days': listing_age_to_days(listing_days),
+        'features': features,
+        'features_html': features_html
+    }, index=descriptions.index)
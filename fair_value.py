@@ -0,0 +1,133 @@
+import numpy as np
+import pandas as pd
+
+# Description keywords turned into 0/1 hedonic features
+FEATURE_PATTERNS = {
+    'sea_view': r'\bsea\b',
+    'landmark_view': r'burj|palm|skyline',
+    'canal_park_view': r'canal|park',
+    'high_floor': r'high(?:er)?\s*floor',
+    'mid_floor': r'mid\s*floor',
+    'penthouse': r'penthouse|full\s*floor|duplex',
+}
+
+FEATURE_COLUMNS = ['intercept', 'area_sqft', 'bedroom_count', 'bathroom_count'] + list(FEATURE_PATTERNS)
+
+# Small ridge term keeps per-project systems solvable when a feature never varies; it is
+# scaled by each column's own sum of squares, so area and the 0/1 flags are penalized alike
+RIDGE = 1e-6
+
+
+def parse_listing_features(df):
+    """Parse view/floor flags from the listing descriptions"""
+    description = df['description'].fillna('')
+    features = pd.DataFrame(index=df.index)
+    for name, pattern in FEATURE_PATTERNS.items():
+        features[name] = description.str.contains(pattern, case=False, regex=True).astype(float)
+    return features
+
+
+def build_design_matrix(df):
+    """Build the numeric design matrix used by the fair-value model"""
+    bedrooms = df['bedrooms'].replace('studio', '0')
+    X = pd.DataFrame({
+        'intercept': 1.0,
+        'area_sqft': df['area_sqft'].astype(float),
+        'bedroom_count': pd.to_numeric(bedrooms, errors='coerce').fillna(0).astype(float),
+        'bathroom_count': pd.to_numeric(df['bathrooms'], errors='coerce').fillna(0).astype(float),
+    }, index=df.index)
+    # Assign by position so listings with a repeated index (e.g. concatenated snapshots) line up
+    for name, flags in parse_listing_features(df).items():
+        X[name] = flags.to_numpy()
+    return X[FEATURE_COLUMNS].to_numpy()
+
+
+class FairValueModel:
+    """Hedonic price model (price ~ area + bedrooms + bathrooms + features) fitted per project
+
+    The model keeps the per-project normal equations (X'X, X'y) so new snapshot rows can be
+    folded in with partial_fit (or update, per snapshot) without revisiting the rows already
+    seen. The project term of the hedonic formula is the per-project intercept.
+    """
+
+    def __init__(self):
+        self.snapshots = set()
+        self.projects = []
+        self.xtx = np.zeros((0, len(FEATURE_COLUMNS), len(FEATURE_COLUMNS)))
+        self.xty = np.zeros((0, len(FEATURE_COLUMNS)))
+        self.n_obs = np.zeros(0, dtype=int)
+        self.coefficients = None
+
+    def _project_codes(self, projects):
+        """Map project names to row indices, growing the state for unseen projects"""
+        new_projects = [p for p in pd.unique(projects) if p not in self.projects]
+        if new_projects:
+            k = len(FEATURE_COLUMNS)
+            self.projects.extend(new_projects)
+            self.xtx = np.concatenate([self.xtx, np.zeros((len(new_projects), k, k))])
+            self.xty = np.concatenate([self.xty, np.zeros((len(new_projects), k))])
+            self.n_obs = np.concatenate([self.n_obs, np.zeros(len(new_projects), dtype=int)])
+        lookup = {p: i for i, p in enumerate(self.projects)}
+        return np.array([lookup[p] for p in projects], dtype=int)
+
+    def partial_fit(self, df):
+        """Fold new listing rows into the per-project sufficient statistics and refit"""
+        if df.empty:
+            return self
+        codes = self._project_codes(df['project'].to_numpy())
+        X = build_design_matrix(df)
+        y = df['price'].to_numpy(dtype=float)
+
+        # Accumulate X'X and X'y for every project in one batched pass
+        np.add.at(self.xtx, codes, X[:, :, None] * X[:, None, :])
+        np.add.at(self.xty, codes, X * y[:, None])
+        np.add.at(self.n_obs, codes, 1)
+
+        self._solve()
+        return self
+
+    def update(self, snapshots):
+        """Fold in the rows of every snapshot not seen yet; snapshots maps snapshot ids to listings"""
+        new_rows = [rows for snapshot, rows in snapshots.items() if snapshot not in self.snapshots]
+        self.snapshots.update(snapshots)
+        if new_rows:
+            self.partial_fit(pd.concat(new_rows, ignore_index=True))
+        return self
+
+    def fit(self, df):
+        """Fit the model from scratch on the given listings"""
+        self.__init__()
+        return self.partial_fit(df)
+
+    def _solve(self):
+        """Solve all per-project least squares systems in one batched call"""
+        k = len(FEATURE_COLUMNS)
+        column_scale = np.maximum(np.diagonal(self.xtx, axis1=1, axis2=2), 1.0)
+        ridge = (RIDGE * column_scale)[:, :, None] * np.eye(k)
+        ridge[:, 0, 0] = 0.0  # Leave the intercept unpenalized
+        self.coefficients = np.linalg.solve(self.xtx + ridge, self.xty[:, :, None])[:, :, 0]
+
+    def predict(self, df):
+        """Return fair price and residual columns for the given listings"""
+        if self.coefficients is None:
+            raise ValueError("FairValueModel has not been fitted")
+        lookup = {p: i for i, p in enumerate(self.projects)}
+        codes = df['project'].map(lookup)
+        if codes.isna().any():
+            missing = sorted(df.loc[codes.isna(), 'project'].unique())
+            raise ValueError(f"No fair-value fit for project(s): {', '.join(missing)}")
+
+        X = build_design_matrix(df)
+        fair_price = np.einsum('ij,ij->i', X, self.coefficients[codes.to_numpy(dtype=int)])
+
+        result = pd.DataFrame(index=df.index)
+        result['fair_price'] = fair_price
+        result['residual'] = df['price'] - fair_price
+        result['residual_pct'] = result['residual'] / fair_price * 100
+        return result
+
+
+def rank_underpriced(df, model, top_n=10):
+    """Rank listings by how far they sit below their predicted fair price"""
+    ranked = df.join(model.predict(df))
+    return ranked.sort_values('residual_pct').head(top_n)
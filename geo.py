@@ -0,0 +1,94 @@
+import numpy as np
+import pandas as pd
+
+GEOHASH_ALPHABET = np.array(list('0123456789bcdefghjkmnpqrstuvwxyz'))
+
+# Geohash length of the map grid; 6 characters is a cell of roughly 1.2 x 0.6 km
+GRID_PRECISION = 6
+
+GRID_COLUMNS = ['geohash', 'latitude', 'longitude', 'listings', 'avg_price', 'avg_price_per_sqft', 'projects']
+
+
+def geohash_cells(latitude, longitude, precision=GRID_PRECISION):
+    """Vectorized geohash of each point plus the centre of its cell
+
+    Returns (geohash strings, cell centre latitudes, cell centre longitudes).
+    """
+    latitude = np.asarray(latitude, dtype=float)
+    longitude = np.asarray(longitude, dtype=float)
+    bits = 5 * precision
+    lon_bits, lat_bits = (bits + 1) // 2, bits // 2
+
+    # Quantize each axis, then interleave the bits starting with longitude
+    lon_q = np.clip(((longitude + 180) / 360 * 2 ** lon_bits).astype(np.int64), 0, 2 ** lon_bits - 1)
+    lat_q = np.clip(((latitude + 90) / 180 * 2 ** lat_bits).astype(np.int64), 0, 2 ** lat_bits - 1)
+    code = np.zeros(len(latitude), dtype=np.int64)
+    for i in range(bits):
+        axis, shift = (lon_q, lon_bits - 1 - i // 2) if i % 2 == 0 else (lat_q, lat_bits - 1 - i // 2)
+        code = (code << 1) | ((axis >> shift) & 1)
+
+    # Spell out each distinct cell once
+    cell_codes, inverse = np.unique(code, return_inverse=True)
+    chars = [GEOHASH_ALPHABET[(cell_codes >> (5 * (precision - 1 - i))) & 31] for i in range(precision)]
+    geohashes = np.array([''.join(cell) for cell in zip(*chars)], dtype=object)[inverse]
+    center_lat = (lat_q + 0.5) * 180 / 2 ** lat_bits - 90
+    center_lon = (lon_q + 0.5) * 360 / 2 ** lon_bits - 180
+    return geohashes, center_lat, center_lon
+
+
+def listing_coordinates(listings, project_info):
+    """Latitude and longitude of each listing, from its own columns or its project's location"""
+    if {'latitude', 'longitude'} <= set(listings.columns):
+        return listings['latitude'].to_numpy(dtype=float), listings['longitude'].to_numpy(dtype=float)
+    projects = listings['project']
+    latitude = projects.map({name: info['latitude'] for name, info in project_info.items()})
+    longitude = projects.map({name: info['longitude'] for name, info in project_info.items()})
+    return latitude.to_numpy(dtype=float), longitude.to_numpy(dtype=float)
+
+
+def build_geo_grid(listings, project_info, precision=GRID_PRECISION):
+    """Aggregate listings into geohash cells: count, average price and price/sq.ft per cell
+
+    Build it once per data version; the map then draws one marker per occupied cell, however
+    many listings there are.
+    """
+    latitude, longitude = listing_coordinates(listings, project_info)
+    located = ~(np.isnan(latitude) | np.isnan(longitude))
+    if not located.any():
+        return pd.DataFrame(columns=GRID_COLUMNS)
+
+    geohashes, center_lat, center_lon = geohash_cells(latitude[located], longitude[located], precision)
+    cells = pd.DataFrame({
+        'geohash': geohashes,
+        'latitude': center_lat,
+        'longitude': center_lon,
+        'price': listings['price'].to_numpy(dtype=float)[located],
+        'price_per_sqft': listings['price_per_sqft'].to_numpy(dtype=float)[located],
+        'project': listings['project'].to_numpy()[located]
+    })
+    grid = cells.groupby('geohash', sort=True).agg(
+        latitude=('latitude', 'first'),
+        longitude=('longitude', 'first'),
+        listings=('price', 'size'),
+        avg_price=('price', 'mean'),
+        avg_price_per_sqft=('price_per_sqft', 'mean'),
+        projects=('project', lambda names: ', '.join(pd.unique(names)))
+    ).reset_index()
+    return grid[GRID_COLUMNS]
+
+
+def project_locations(listings, project_info):
+    """One row per project with its coordinates, listing count and average price/sq.ft"""
+    stats = listings.groupby('project', sort=False).agg(
+        listings=('price', 'size'),
+        avg_price_per_sqft=('price_per_sqft', 'mean')
+    )
+    rows = [{
+        'project': name,
+        'location': info['location'],
+        'latitude': info['latitude'],
+        'longitude': info['longitude'],
+        'listings': int(stats.loc[name, 'listings']) if name in stats.index else 0,
+        'avg_price_per_sqft': stats.loc[name, 'avg_price_per_sqft'] if name in stats.index else np.nan
+    } for name, info in project_info.items()]
+    return pd.DataFrame(rows)
@@ -0,0 +1,237 @@
+import numpy as np
+import pandas as pd
+
+from listings_grid import listing_age_to_days
+
+DAYS_PER_MONTH = 30
+
+
+def _unit_base(df):
+    return (df['project'].astype(str) + '|' + df['bedrooms'].astype(str) + '|'
+            + df['area_sqft'].round().astype(int).astype(str)).to_numpy()
+
+
+def unit_keys(df):
+    """Deduplicated unit key per listing row
+
+    Listings carry no unit id, so a unit is identified by project, bedrooms and area. Rows that
+    share those within one snapshot are told apart by their price rank, which keeps re-listings
+    of the same physical unit (e.g. with a different bathroom count) on a single key. Later
+    snapshots carry keys forward with carry_unit_keys rather than ranking again.
+    """
+    base = pd.Series(_unit_base(df), index=df.index)
+    rank = df.assign(_base=base).groupby('_base')['price'].rank(method='first').astype(int)
+    return (base + '#' + rank.astype(str)).to_numpy()
+
+
+def carry_unit_keys(previous, df):
+    """Unit keys for a new snapshot, matched against the previous snapshot's keys and prices
+
+    Within each project, bedrooms and area group, rows are paired with previous units by
+    nearest price (closest pair first) and inherit their keys, so a price move never swaps
+    the keys of two otherwise identical units. Unmatched rows are new units and take the
+    lowest key suffixes not held by a matched unit, cheapest first, so a unit coming back
+    after a delisting gets its old key again.
+    """
+    base = _unit_base(df)
+    keys = np.empty(len(df), dtype=object)
+    prev_keys = np.asarray(previous['unit_key'], dtype=object)
+    prev_base = pd.Series(prev_keys, dtype=object).str.rsplit('#', n=1).str[0].to_numpy()
+
+    curr = pd.DataFrame({'base': base, 'price': df['price'].to_numpy(dtype=float), 'row': np.arange(len(df))})
+    prev = pd.DataFrame({'base': prev_base, 'prev_price': np.asarray(previous['price'], dtype=float),
+                         'prev_row': np.arange(len(prev_keys))})
+
+    # Unchanged prices pair up directly, in order; only the remaining rows are compared
+    curr['nth'] = curr.groupby(['base', 'price']).cumcount()
+    prev['nth'] = prev.groupby(['base', 'prev_price']).cumcount()
+    same = curr.merge(prev, left_on=['base', 'price', 'nth'], right_on=['base', 'prev_price', 'nth'])
+    keys[same['row'].to_numpy()] = prev_keys[same['prev_row'].to_numpy()]
+
+    pairs = curr[~curr['row'].isin(same['row'])].drop(columns='nth').merge(
+        prev[~prev['prev_row'].isin(same['prev_row'])].drop(columns='nth'), on='base')
+    pairs['diff'] = (pairs['price'] - pairs['prev_price']).abs()
+    pairs = pairs.sort_values(['diff', 'prev_row', 'row'], kind='stable')
+    # Closest-pair-first matching in rounds: a pair that is the nearest for both its row and its
+    # previous unit is part of that matching; the overall closest pair always is one
+    while len(pairs):
+        mutual = pairs[~pairs.duplicated('row') & ~pairs.duplicated('prev_row')]
+        keys[mutual['row'].to_numpy()] = prev_keys[mutual['prev_row'].to_numpy()]
+        pairs = pairs[~pairs['row'].isin(mutual['row']) & ~pairs['prev_row'].isin(mutual['prev_row'])]
+
+    new_rows = np.flatnonzero(pd.isna(keys))
+    if len(new_rows):
+        new = pd.DataFrame({'base': base[new_rows], 'price': df['price'].to_numpy(dtype=float)[new_rows]}, index=new_rows)
+        new['rank'] = new.groupby('base')['price'].rank(method='first').astype(int)
+        new['suffix'] = new['rank']
+        matched = np.flatnonzero(~pd.isna(keys))
+        held = {}
+        for key in keys[matched[np.isin(base[matched], new['base'].unique())]]:
+            key_base, suffix = key.rsplit('#', 1)
+            held.setdefault(key_base, set()).add(int(suffix))
+        # Groups that still hold matched units fill the gaps between their suffixes
+        for key_base, group in new[new['base'].isin(held)].groupby('base'):
+            free = [n for n in range(1, len(held[key_base]) + len(group) + 1) if n not in held[key_base]]
+            new.loc[group.index, 'suffix'] = np.asarray(free)[group['rank'].to_numpy() - 1]
+        keys[new_rows] = (new['base'] + '#' + new['suffix'].astype(str)).to_numpy()
+    return keys
+
+
+def _listing_age_days(df):
+    if 'listing_age_days' in df:
+        return df['listing_age_days'].to_numpy(dtype=float)
+    return listing_age_to_days(df['listing_days']) if 'listing_days' in df else np.nan
+
+
+def _snapshot_frame(snapshot_date, df, previous=None):
+    frame = pd.DataFrame({
+        'unit_key': unit_keys(df) if previous is None else carry_unit_keys(previous, df),
+        'project': df['project'].to_numpy(),
+        'bedrooms': df['bedrooms'].to_numpy(),
+        'price': df['price'].to_numpy(dtype=float),
+        'listing_age_days': _listing_age_days(df)
+    })
+    frame['snapshot_date'] = pd.Timestamp(snapshot_date)
+    return frame.sort_values('unit_key', kind='stable').reset_index(drop=True)
+
+
+def merge_snapshots(prev, curr):
+    """Merge join two key-sorted snapshot frames
+
+    Each key of curr is located in the already sorted keys of prev by binary search, so neither
+    side is sorted again. Returns (prev_idx, curr_idx) of units present in both, plus the
+    positions of units that disappeared from prev and units that are new in curr.
+    """
+    prev_keys = prev['unit_key'].to_numpy()
+    curr_keys = curr['unit_key'].to_numpy()
+    positions = np.minimum(np.searchsorted(prev_keys, curr_keys), max(len(prev_keys) - 1, 0))
+    found = prev_keys[positions] == curr_keys if len(prev_keys) else np.zeros(len(curr_keys), dtype=bool)
+    prev_idx, curr_idx = positions[found], np.flatnonzero(found)
+
+    delisted = np.ones(len(prev), dtype=bool)
+    delisted[prev_idx] = False
+    new = np.ones(len(curr), dtype=bool)
+    new[curr_idx] = False
+    return prev_idx, curr_idx, np.flatnonzero(delisted), np.flatnonzero(new)
+
+
+def build_lifecycle(snapshots):
+    """Join consecutive snapshots into unit lifecycles, price events and absorption rates
+
+    snapshots is an iterable of (snapshot_date, listings DataFrame). Each consecutive pair is
+    joined once, so the cost grows linearly with the number and size of snapshots.
+    """
+    frames = []
+    for snapshot_date, df in sorted(snapshots, key=lambda s: pd.Timestamp(s[0])):
+        frames.append(_snapshot_frame(snapshot_date, df, frames[-1] if frames else None))
+    if not frames:
+        raise ValueError("No snapshots to build a lifecycle from")
+
+    first = frames[0]
+    # A listing's description tells us how long it was already on the market when first seen
+    estimated_listing = first['snapshot_date'] - pd.to_timedelta(first['listing_age_days'].fillna(0), unit='D')
+    units = pd.DataFrame({
+        'unit_key': first['unit_key'],
+        'project': first['project'],
+        'bedrooms': first['bedrooms'],
+        'first_seen': estimated_listing,
+        'last_seen': first['snapshot_date'],
+        'initial_price': first['price'],
+        'last_price': first['price'],
+        'price_changes': 0,
+        'delisted_on': pd.NaT
+    })
+
+    price_events = []
+    delistings = []
+    absorption = []
+
+    for prev, curr in zip(frames, frames[1:]):
+        prev_idx, curr_idx, gone_idx, new_idx = merge_snapshots(prev, curr)
+        curr_date = curr['snapshot_date'].iloc[0] if len(curr) else pd.NaT
+        period_days = max((curr_date - prev['snapshot_date'].iloc[0]).days, 1)
+
+        # Price changes on units present in both snapshots
+        old_price = prev['price'].to_numpy()[prev_idx]
+        new_price = curr['price'].to_numpy()[curr_idx]
+        changed = old_price != new_price
+        if changed.any():
+            price_events.append(pd.DataFrame({
+                'unit_key': curr['unit_key'].to_numpy()[curr_idx][changed],
+                'project': curr['project'].to_numpy()[curr_idx][changed],
+                'bedrooms': curr['bedrooms'].to_numpy()[curr_idx][changed],
+                'date': curr_date,
+                'old_price': old_price[changed],
+                'new_price': new_price[changed],
+                'change_pct': (new_price[changed] - old_price[changed]) / old_price[changed] * 100
+            }))
+
+        gone = prev.iloc[gone_idx]
+        if len(gone):
+            delistings.append(gone[['unit_key', 'project', 'bedrooms', 'price']].assign(date=curr_date))
+
+        # Absorption: share of the starting inventory that left the market, scaled to a month
+        inventory = prev.groupby(['project', 'bedrooms']).size().rename('inventory')
+        absorbed = gone.groupby(['project', 'bedrooms']).size().rename('delisted')
+        period = pd.concat([inventory, absorbed], axis=1).fillna(0).reset_index()
+        period['period_start'] = prev['snapshot_date'].iloc[0]
+        period['period_end'] = curr_date
+        period['period_days'] = period_days
+        absorption.append(period)
+
+        # Fold the period into the per-unit state
+        units = units.set_index('unit_key')
+        matched_keys = curr['unit_key'].to_numpy()[curr_idx]
+        units.loc[matched_keys, 'last_seen'] = curr_date
+        units.loc[matched_keys, 'last_price'] = new_price
+        units.loc[matched_keys[changed], 'price_changes'] += 1
+        units.loc[gone['unit_key'].to_numpy(), 'delisted_on'] = curr_date
+
+        # Units that come back after a delisting are re-listings, not new units
+        new_units = curr.iloc[new_idx]
+        relisted = new_units['unit_key'].isin(units.index).to_numpy()
+        relisted_keys = new_units['unit_key'].to_numpy()[relisted]
+        units.loc[relisted_keys, 'last_seen'] = curr_date
+        units.loc[relisted_keys, 'last_price'] = new_units['price'].to_numpy()[relisted]
+        units.loc[relisted_keys, 'delisted_on'] = pd.NaT
+        new_units = new_units[~relisted]
+
+        units = pd.concat([units.reset_index(), pd.DataFrame({
+            'unit_key': new_units['unit_key'],
+            'project': new_units['project'],
+            'bedrooms': new_units['bedrooms'],
+            'first_seen': new_units['snapshot_date'] - pd.to_timedelta(new_units['listing_age_days'].fillna(0), unit='D'),
+            'last_seen': new_units['snapshot_date'],
+            'initial_price': new_units['price'],
+            'last_price': new_units['price'],
+            'price_changes': 0,
+            'delisted_on': pd.NaT
+        })], ignore_index=True)
+
+    latest_date = frames[-1]['snapshot_date'].iloc[0]
+    end = units['delisted_on'].fillna(latest_date)
+    units['active'] = units['delisted_on'].isna()
+    units['days_on_market'] = (end - units['first_seen']).dt.days
+    units['total_change_pct'] = (units['last_price'] - units['initial_price']) / units['initial_price'] * 100
+
+    return {
+        'units': units,
+        'price_events': pd.concat(price_events, ignore_index=True) if price_events else pd.DataFrame(
+            columns=['unit_key', 'project', 'bedrooms', 'date', 'old_price', 'new_price', 'change_pct']),
+        'delistings': pd.concat(delistings, ignore_index=True) if delistings else pd.DataFrame(
+            columns=['unit_key', 'project', 'bedrooms', 'price', 'date']),
+        'absorption': summarize_absorption(absorption)
+    }
+
+
+def summarize_absorption(periods):
+    """Monthly absorption rate per project and bedroom type across all snapshot periods"""
+    columns = ['project', 'bedrooms', 'delisted', 'inventory_months', 'monthly_absorption_rate']
+    if not periods:
+        return pd.DataFrame(columns=columns)
+    periods = pd.concat(periods, ignore_index=True)
+    periods['inventory_months'] = periods['inventory'] * periods['period_days'] / DAYS_PER_MONTH
+    summary = periods.groupby(['project', 'bedrooms'], as_index=False)[['delisted', 'inventory_months']].sum()
+    summary['delisted'] = summary['delisted'].astype(int)
+    summary['monthly_absorption_rate'] = summary['delisted'] / summary['inventory_months'].where(summary['inventory_months'] > 0)
+    return summary[columns]
@@ -0,0 +1,100 @@
+import numpy as np
+import pandas as pd
+
+# Inclusive upper edges, in days, of the default listing-age buckets
+DEFAULT_EDGES = (7, 30, 90)
+UNKNOWN_BUCKET = 'Unknown'
+
+HISTOGRAM_COLUMNS = ['listing_period', 'count', 'share', 'cumulative_count', 'cumulative_share']
+
+
+def format_days(days):
+    """Readable duration for a bucket edge: whole months, whole weeks, else days"""
+    days = int(days)
+    for unit_days, unit in [(30, 'month'), (7, 'week'), (1, 'day')]:
+        if days % unit_days == 0:
+            number = days // unit_days
+            return f"{number} {unit}{'s' if number != 1 else ''}"
+
+
+def parse_edges(text):
+    """Bucket edges from a comma-separated list of days, e.g. "7, 30, 90"
+
+    Raises ValueError unless there is at least one positive whole number of days.
+    """
+    edges = sorted({int(part) for part in text.replace(';', ',').split(',') if part.strip()})
+    if not edges or edges[0] <= 0:
+        raise ValueError("Listing age edges must be positive whole numbers of days")
+    return tuple(edges)
+
+
+class ListingAgeBuckets:
+    """Ordered listing-age buckets over the numeric listing age in days
+
+    `edges` are inclusive upper bounds: (7, 30, 90) gives up to 1 week, 1 week - 1 month,
+    1 month - 3 months and over 3 months, plus Unknown for listings without a parsable age.
+    Buckets are assigned with one searchsorted pass, and every count, share and filter is
+    derived from those bucket codes.
+    """
+
+    def __init__(self, edges=DEFAULT_EDGES):
+        self.edges = tuple(sorted(int(edge) for edge in edges))
+        self._bounds = np.asarray(self.edges, dtype=float)
+        names = [format_days(edge) for edge in self.edges]
+        self.labels = ([f"Up to {names[0]}"]
+                       + [f"{low} - {high}" for low, high in zip(names[:-1], names[1:])]
+                       + [f"Over {names[-1]}"])
+        self.filters = [f"Last {name}" for name in names] + [f"Older than {names[-1]}"]
+
+    @property
+    def order(self):
+        """Bucket labels in display order, Unknown last"""
+        return self.labels + [UNKNOWN_BUCKET]
+
+    def assign(self, age_days):
+        """Bucket code per listing; len(labels) marks an unknown age"""
+        age_days = np.asarray(age_days, dtype=float)
+        codes = np.searchsorted(self._bounds, age_days, side='left')
+        return np.where(np.isnan(age_days), len(self.labels), codes)
+
+    def label(self, age_days):
+        """Bucket label per listing"""
+        return np.array(self.order, dtype=object)[self.assign(age_days)]
+
+    def filter_mask(self, age_days, listing_age_filter):
+        """Rows matching a filter option: a cumulative "Last ..." view or the oldest bucket"""
+        if listing_age_filter not in self.filters:
+            return np.ones(len(age_days), dtype=bool)
+        codes = self.assign(age_days)
+        position = self.filters.index(listing_age_filter)
+        if position == len(self.edges):
+            return codes == len(self.edges)
+        return codes <= position
+
+    def histogram(self, age_days):
+        """Counts, shares and cumulative views per bucket, in bucket order with Unknown last"""
+        counts = np.bincount(self.assign(age_days), minlength=len(self.order))
+        return _histogram_frame(self.order, counts)
+
+    def histograms(self, age_days, groups):
+        """One histogram per group (e.g. project), all from a single bucketing pass"""
+        codes = self.assign(age_days)
+        group_codes, group_names = pd.factorize(pd.Series(groups), sort=False)
+        width = len(self.order)
+        counts = np.bincount(group_codes * width + codes, minlength=len(group_names) * width).reshape(-1, width)
+        return {name: _histogram_frame(self.order, counts[i]) for i, name in enumerate(group_names)}
+
+
+def _histogram_frame(order, counts):
+    total = counts.sum()
+    cumulative = np.cumsum(counts)
+    return pd.DataFrame({
+        'listing_period': order,
+        'count': counts,
+        'share': counts / total if total else np.zeros(len(counts)),
+        'cumulative_count': cumulative,
+        'cumulative_share': cumulative / total if total else np.zeros(len(counts))
+    }, columns=HISTOGRAM_COLUMNS)
+
+
+DEFAULT_BUCKETS = ListingAgeBuckets()
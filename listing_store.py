@@ -0,0 +1,199 @@
+import fcntl
+import json
+import os
+import threading
+from contextlib import contextmanager
+from datetime import date, datetime
+
+import numpy as np
+import pyarrow as pa
+import pyarrow.compute as pc
+
+from materialize import project_slug
+
+ARCHIVE_DIR = os.path.join('results', 'archive')
+
+# Numeric columns also stored as .npy files so they can be mapped straight into NumPy arrays
+NUMERIC_COLUMNS = ['price', 'area_sqft', 'price_per_sqft', 'listing_age_days']
+
+# Open archives are shared by every session in the process; snapshot directories never change
+# once written, so an open mapping stays valid for as long as the directory exists
+_open_archives = {}
+_open_lock = threading.Lock()
+
+
+def _project_dir(project_name, base_dir):
+    return os.path.join(base_dir, project_slug(project_name))
+
+
+def _manifest_path(project_name, base_dir):
+    return os.path.join(_project_dir(project_name, base_dir), 'manifest.json')
+
+
+@contextmanager
+def _manifest_lock(project_name, base_dir):
+    """Exclusive fcntl lock serializing manifest updates across processes and threads"""
+    project_dir = _project_dir(project_name, base_dir)
+    os.makedirs(project_dir, exist_ok=True)
+    with open(os.path.join(project_dir, '.manifest.lock'), 'a') as lock_file:
+        fcntl.flock(lock_file, fcntl.LOCK_EX)
+        try:
+            yield
+        finally:
+            fcntl.flock(lock_file, fcntl.LOCK_UN)
+
+
+def read_manifest(project_name, base_dir=ARCHIVE_DIR):
+    """Return the archive manifest for a project, or an empty one if nothing is archived yet"""
+    try:
+        with open(_manifest_path(project_name, base_dir)) as f:
+            return json.load(f)
+    except FileNotFoundError:
+        return {'project': project_name, 'current': None, 'snapshots': []}
+
+
+def current_archive_version(project_name, base_dir=ARCHIVE_DIR):
+    """Data version of the current snapshot for a project, if any"""
+    manifest = read_manifest(project_name, base_dir)
+    for snapshot in manifest['snapshots']:
+        if snapshot['snapshot'] == manifest['current']:
+            return snapshot['version']
+    return None
+
+
+def list_projects(base_dir=ARCHIVE_DIR):
+    """Names of every project with an archive, sorted"""
+    if not os.path.isdir(base_dir):
+        return []
+    projects = []
+    for slug in os.listdir(base_dir):
+        manifest_path = os.path.join(base_dir, slug, 'manifest.json')
+        if os.path.exists(manifest_path):
+            with open(manifest_path) as f:
+                projects.append(json.load(f)['project'])
+    return sorted(projects)
+
+
+def _archive_order(snapshot):
+    # Snapshots of one day are ordered by when they were archived; the version hash in the
+    # name says nothing about order. Entries from before archived_at was recorded sort first.
+    return snapshot['snapshot_date'], snapshot.get('archived_at', ''), snapshot['snapshot']
+
+
+def list_snapshots(project_name, base_dir=ARCHIVE_DIR):
+    """List archived snapshots for a project, oldest first"""
+    return sorted(read_manifest(project_name, base_dir)['snapshots'], key=_archive_order)
+
+
+def write_archive(project_name, df, version, snapshot_date=None, base_dir=ARCHIVE_DIR, quarantined=None):
+    """Archive a listings snapshot as an Arrow IPC file plus .npy numeric columns
+
+    Files are written uncompressed so readers can memory-map them; a snapshot directory is
+    filled completely before the manifest is switched to point at it. `quarantined` records how
+    many listings validation held back from the snapshot.
+    """
+    snapshot_date = snapshot_date or date.today().isoformat()
+    snapshot = f"{snapshot_date}-{version}"
+    snapshot_dir = os.path.join(_project_dir(project_name, base_dir), snapshot)
+    os.makedirs(snapshot_dir, exist_ok=True)
+    tmp_suffix = f".{os.getpid()}.tmp"
+
+    table = pa.Table.from_pandas(df.reset_index(drop=True), preserve_index=False)
+    arrow_path = os.path.join(snapshot_dir, 'listings.arrow')
+    with pa.OSFile(arrow_path + tmp_suffix, 'wb') as sink:
+        with pa.ipc.new_file(sink, table.schema) as writer:
+            writer.write_table(table)
+    os.replace(arrow_path + tmp_suffix, arrow_path)
+
+    for column in NUMERIC_COLUMNS:
+        if column in df.columns:
+            npy_path = os.path.join(snapshot_dir, f"{column}.npy")
+            with open(npy_path + tmp_suffix, 'wb') as f:
+                np.save(f, df[column].to_numpy(dtype=np.float64))
+            os.replace(npy_path + tmp_suffix, npy_path)
+
+    # Read, update and replace the manifest under the lock so concurrent writers don't drop snapshots
+    with _manifest_lock(project_name, base_dir):
+        manifest = read_manifest(project_name, base_dir)
+        manifest['snapshots'] = [s for s in manifest['snapshots'] if s['snapshot'] != snapshot]
+        manifest['snapshots'].append({'snapshot': snapshot, 'snapshot_date': snapshot_date,
+                                      'version': version, 'rows': len(df), 'quarantined': quarantined,
+                                      'archived_at': datetime.now().isoformat(timespec='microseconds')})
+        manifest['current'] = max(manifest['snapshots'], key=_archive_order)['snapshot']
+        manifest_path = _manifest_path(project_name, base_dir)
+        with open(manifest_path + tmp_suffix, 'w') as f:
+            json.dump(manifest, f, indent=2)
+        os.replace(manifest_path + tmp_suffix, manifest_path)
+
+    # A rewritten snapshot must not be served from a mapping of its previous files
+    with _open_lock:
+        _open_archives.pop(snapshot_dir, None)
+    return snapshot
+
+
+class ListingArchive:
+    """Read-only, memory-mapped view of one archived listings snapshot
+
+    The Arrow table and the .npy columns reference the mapped files directly, so processes
+    reading the same snapshot share the OS page cache and slicing does not copy numeric data.
+    """
+
+    def __init__(self, project_name, snapshot, snapshot_dir, version):
+        self.project_name = project_name
+        self.snapshot = snapshot
+        self.version = version
+        self.snapshot_dir = snapshot_dir
+        source = pa.memory_map(os.path.join(snapshot_dir, 'listings.arrow'), 'r')
+        self.table = pa.ipc.open_file(source).read_all()
+        self._numeric = {}
+
+    @property
+    def num_rows(self):
+        return self.table.num_rows
+
+    def numeric(self, column):
+        """Memory-mapped NumPy array for a numeric column"""
+        if column not in self._numeric:
+            npy_path = os.path.join(self.snapshot_dir, f"{column}.npy")
+            if os.path.exists(npy_path):
+                self._numeric[column] = np.load(npy_path, mmap_mode='r')
+            else:
+                self._numeric[column] = self.table.column(column).to_numpy()
+        return self._numeric[column]
+
+    def equals_mask(self, column, value):
+        """Boolean row mask for column == value, evaluated on the Arrow buffers"""
+        return pc.equal(self.table.column(column), value).to_numpy(zero_copy_only=False)
+
+    def unique(self, column):
+        """Distinct values of a column in order of first appearance"""
+        return pc.unique(self.table.column(column)).to_pylist()
+
+    def take(self, indices, columns=None):
+        """Materialize only the selected rows as a DataFrame"""
+        table = self.table if columns is None else self.table.select(columns)
+        return table.take(pa.array(np.asarray(indices, dtype=np.int64))).to_pandas()
+
+    def to_pandas(self, columns=None):
+        """Full DataFrame view; numeric columns without nulls stay backed by the mapping"""
+        table = self.table if columns is None else self.table.select(columns)
+        return table.to_pandas(split_blocks=True)
+
+
+def open_archive(project_name, snapshot=None, base_dir=ARCHIVE_DIR):
+    """Open (or reuse) the memory-mapped archive for a snapshot, defaulting to the current one"""
+    manifest = read_manifest(project_name, base_dir)
+    snapshot = snapshot or manifest['current']
+    if snapshot is None:
+        raise FileNotFoundError(f"No archived listings for {project_name}")
+    entry = next((s for s in manifest['snapshots'] if s['snapshot'] == snapshot), None)
+    if entry is None:
+        raise FileNotFoundError(f"Snapshot {snapshot} not found for {project_name}")
+
+    snapshot_dir = os.path.join(_project_dir(project_name, base_dir), snapshot)
+    with _open_lock:
+        archive = _open_archives.get(snapshot_dir)
+        if archive is None:
+            archive = ListingArchive(project_name, snapshot, snapshot_dir, entry['version'])
+            _open_archives[snapshot_dir] = archive
+    return archive
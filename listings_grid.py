@@ -0,0 +1,68 @@
+import threading
+
+import numpy as np
+import pandas as pd
+
+# Sort options offered by the listings grid, mapped to archive columns
+SORT_COLUMNS = {
+    'Price': 'price',
+    'Price/sq.ft': 'price_per_sqft',
+    'Area': 'area_sqft',
+    'Listing Age': 'listing_age_days'
+}
+
+PAGE_SIZES = [25, 50, 100]
+
+DAYS_PER_UNIT = {'days': 1, 'weeks': 7, 'months': 30}
+
+# Presorted row orders per archive snapshot, shared by every session in the process, stored
+# with the archive they were computed from: write_archive drops the open archive of a rewritten
+# snapshot, so a reopened archive never reuses the orders of the previous files
+_sort_orders = {}
+_sort_lock = threading.Lock()
+
+
+def listing_age_to_days(listing_days):
+    """Convert standardized listing periods ("2 months") to an approximate age in days"""
+    parts = pd.Series(listing_days).str.extract(r'^(\d+)\s+(days|weeks|months)$')
+    return (pd.to_numeric(parts[0]) * parts[1].map(DAYS_PER_UNIT)).to_numpy(dtype=float)
+
+
+def _sort_values(archive, column):
+    if column == 'listing_age_days' and column not in archive.table.column_names:
+        return listing_age_to_days(archive.table.column('listing_days').to_pandas())
+    return np.asarray(archive.numeric(column))
+
+
+def get_sort_orders(archive):
+    """Ascending row orders for every sortable column, computed once per snapshot
+
+    Each entry is (order, known) where known flags positions in the order whose value is not
+    missing; rows without a value (e.g. no parsable listing age) sort last in both directions.
+    """
+    with _sort_lock:
+        cached_archive, orders = _sort_orders.get(archive.snapshot_dir, (None, None))
+    if cached_archive is not archive:
+        orders = {}
+        for column in SORT_COLUMNS.values():
+            values = _sort_values(archive, column)
+            order = np.argsort(values, kind='stable')
+            orders[column] = (order, ~np.isnan(values[order]))
+        with _sort_lock:
+            _sort_orders[archive.snapshot_dir] = (archive, orders)
+    return orders
+
+
+def grid_window(archive, row_mask, sort_column, descending=False, offset=0, limit=50):
+    """Return (row indices for the visible window, total matching rows)
+
+    Walks the presorted order for sort_column and keeps rows selected by row_mask, then slices
+    out only the requested window, so each interaction sends a bounded number of rows.
+    """
+    order, known = get_sort_orders(archive)[sort_column]
+    keep = row_mask[order]
+    selected = order[keep & known]
+    if descending:
+        selected = selected[::-1]
+    selected = np.concatenate([selected, order[keep & ~known]])
+    return selected[offset:offset + limit], len(selected)
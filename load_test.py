@@ -0,0 +1,169 @@
+import argparse
+import json
+import os
+import random
+import resource
+import threading
+import time
+from concurrent.futures import ProcessPoolExecutor
+
+import numpy as np
+import pandas as pd
+
+APP_PATH = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'property_scraper.py')
+PROJECTS = ['Safa One', 'Safa Two']
+
+# Widgets a simulated user changes, as key suffixes of the per-project listing filters
+FILTER_WIDGETS = ['bedroom_filter', 'price_sort', 'listing_filter']
+
+
+def current_rss_mb():
+    """Resident set size of this process in MB (Linux /proc, else peak RSS)"""
+    try:
+        with open('/proc/self/statm') as f:
+            return int(f.read().split()[1]) * os.sysconf('SC_PAGE_SIZE') / 2 ** 20
+    except (OSError, ValueError):
+        return resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024
+
+
+def simulate_user(user_id, actions, think_time, seed, timeout):
+    """Open one session and perform random tab switches and filter changes, timing every rerun"""
+    from streamlit.testing.v1 import AppTest
+
+    rng = random.Random(seed + user_id)
+    app = AppTest.from_file(APP_PATH, default_timeout=timeout)
+    timings = []
+
+    start = time.perf_counter()
+    app.run()
+    timings.append(('initial_load', time.perf_counter() - start))
+    errors = len(app.exception)
+
+    for _ in range(actions):
+        time.sleep(rng.uniform(0, think_time))
+        project = rng.choice(PROJECTS)
+        action = rng.choice(FILTER_WIDGETS + ['switch_tab'])
+        if action == 'switch_tab':
+            # Tabs are rendered client-side; opening one triggers a rerun without widget changes
+            start = time.perf_counter()
+            app.run()
+        else:
+            widget = app.selectbox(key=f"{project}_{action}")
+            widget.select_index(rng.randrange(len(widget.options)))
+            start = time.perf_counter()
+            widget.run()
+        timings.append((action, time.perf_counter() - start))
+        errors += len(app.exception)
+    return timings, errors
+
+
+def run_worker(worker_id, users, actions, think_time, seed, timeout):
+    """Run a group of simulated users concurrently in one process and report its resource use"""
+    usage_before = resource.getrusage(resource.RUSAGE_SELF)
+    rss_before = current_rss_mb()
+    wall_start = time.perf_counter()
+
+    results = [None] * users
+    rss_samples = []
+    done = threading.Event()
+
+    def sample_rss():
+        while not done.wait(0.5):
+            rss_samples.append(current_rss_mb())
+
+    def user(index):
+        results[index] = simulate_user(worker_id * users + index, actions, think_time, seed, timeout)
+
+    sampler = threading.Thread(target=sample_rss, daemon=True)
+    sampler.start()
+    threads = [threading.Thread(target=user, args=(i,)) for i in range(users)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    done.set()
+
+    wall = time.perf_counter() - wall_start
+    usage_after = resource.getrusage(resource.RUSAGE_SELF)
+    cpu = (usage_after.ru_utime - usage_before.ru_utime) + (usage_after.ru_stime - usage_before.ru_stime)
+    return {
+        'worker': worker_id,
+        'users': users,
+        'timings': [timing for timings, _ in results for timing in timings],
+        'errors': sum(errors for _, errors in results),
+        'wall_seconds': wall,
+        'cpu_seconds': cpu,
+        'rss_start_mb': rss_before,
+        'rss_end_mb': current_rss_mb(),
+        'rss_peak_mb': max(rss_samples + [current_rss_mb()])
+    }
+
+
+def latency_summary(timings):
+    """p50/p95/p99 rerun latency in milliseconds, overall and per action"""
+    frame = pd.DataFrame(timings, columns=['action', 'seconds'])
+    frame['ms'] = frame['seconds'] * 1000
+    reruns = frame[frame['action'] != 'initial_load']
+
+    def percentiles(group):
+        return pd.Series({
+            'reruns': len(group),
+            'p50_ms': np.percentile(group['ms'], 50),
+            'p95_ms': np.percentile(group['ms'], 95),
+            'p99_ms': np.percentile(group['ms'], 99),
+            'max_ms': group['ms'].max()
+        })
+
+    by_action = frame.groupby('action')[['ms']].apply(percentiles)
+    if len(reruns):
+        by_action.loc['all reruns'] = percentiles(reruns)
+    return by_action
+
+
+def run_load_test(users=10, workers=1, actions=20, think_time=0.5, seed=0, timeout=120):
+    """Simulate users spread over worker processes and collect latency and resource figures"""
+    per_worker = [users // workers + (1 if i < users % workers else 0) for i in range(workers)]
+    args = [(i, n, actions, think_time, seed, timeout) for i, n in enumerate(per_worker) if n]
+    if len(args) == 1:
+        reports = [run_worker(*args[0])]
+    else:
+        with ProcessPoolExecutor(max_workers=len(args)) as pool:
+            reports = list(pool.map(run_worker, *zip(*args)))
+
+    worker_table = pd.DataFrame([{
+        'worker': report['worker'],
+        'users': report['users'],
+        'reruns': len(report['timings']),
+        'errors': report['errors'],
+        'cpu_seconds': report['cpu_seconds'],
+        'cpu_pct': report['cpu_seconds'] / report['wall_seconds'] * 100,
+        'rss_start_mb': report['rss_start_mb'],
+        'rss_peak_mb': report['rss_peak_mb'],
+        'rss_end_mb': report['rss_end_mb']
+    } for report in reports])
+    latency = latency_summary([timing for report in reports for timing in report['timings']])
+    return {'workers': worker_table, 'latency': latency}
+
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description="Drive the dashboard headlessly with simulated concurrent users")
+    parser.add_argument('--users', type=int, default=10, help="Total simulated users")
+    parser.add_argument('--workers', type=int, default=1, help="Worker processes the users are spread over")
+    parser.add_argument('--actions', type=int, default=20, help="Widget changes / tab switches per user")
+    parser.add_argument('--think-time', type=float, default=0.5, help="Maximum random pause between actions (s)")
+    parser.add_argument('--seed', type=int, default=0)
+    parser.add_argument('--timeout', type=float, default=120, help="Per-rerun timeout (s)")
+    parser.add_argument('--json', help="Also write the report to this JSON file")
+    args = parser.parse_args()
+
+    report = run_load_test(args.users, args.workers, args.actions, args.think_time, args.seed, args.timeout)
+    pd.set_option('display.width', 160)
+    print("Rerun latency")
+    print(report['latency'].round(1).to_string())
+    print("\nWorkers")
+    print(report['workers'].round(1).to_string(index=False))
+
+    if args.json:
+        with open(args.json, 'w') as f:
+            json.dump({'latency': report['latency'].reset_index().to_dict('records'),
+                       'workers': report['workers'].to_dict('records')}, f, indent=2)
@@ -0,0 +1,152 @@
+import json
+import os
+import re
+
+import numpy as np
+import pandas as pd
+
+AGGREGATES_DIR = os.path.join('results', 'aggregates')
+
+# Bump when the shape of a materialized table changes; aggregates written under another
+# schema version are never served and are materialized again
+MATERIALIZE_SCHEMA_VERSION = 2
+
+# Tables written for every project version, read back by the dashboard instead of recomputing
+AGGREGATE_TABLES = ['stats_overall', 'bedroom_stats', 'bathroom_stats', 'listing_days_stats',
+                    'comparison_rows', 'investment_summary', 'quarantine', 'validation_issues']
+
+
+def project_slug(project_name):
+    """Turn a project name into a directory-safe slug"""
+    return re.sub(r'[^a-z0-9]+', '_', project_name.lower()).strip('_')
+
+
+def _version_dir(project_name, version, base_dir):
+    return os.path.join(base_dir, project_slug(project_name), f"schema{MATERIALIZE_SCHEMA_VERSION}", version)
+
+
+def _manifest_path(project_name, base_dir):
+    return os.path.join(base_dir, project_slug(project_name), 'manifest.json')
+
+
+def bedroom_label(bedroom_type):
+    """Display name for a bedroom type"""
+    return 'Studio' if bedroom_type == 'studio' else f"{bedroom_type} Bedroom"
+
+
+def build_comparison_rows(project_name, bedroom_stats):
+    """Price per sq.ft rows used by the project comparison chart"""
+    return pd.DataFrame({
+        'Project': project_name,
+        'Bedroom Type': bedroom_stats['bedrooms'].map(bedroom_label).to_numpy(),
+        'Avg Price/sq.ft': bedroom_stats['avg_price_per_sqft'].to_numpy(),
+        'Min Price/sq.ft': bedroom_stats['min_price_per_sqft'].to_numpy(),
+        'Max Price/sq.ft': bedroom_stats['max_price_per_sqft'].to_numpy()
+    })
+
+
+def build_investment_summary(stats_overall, bedroom_stats):
+    """Numeric inputs of the investment comparison table for one project"""
+    avg_price = bedroom_stats.set_index('bedrooms')['avg_price']
+    return pd.DataFrame([{
+        'avg_1br_price': avg_price.get('1', np.nan),
+        'avg_2br_price': avg_price.get('2', np.nan),
+        'avg_3br_price': avg_price.get('3', np.nan),
+        'min_price_per_sqft': stats_overall['min_price_per_sqft'],
+        'max_price_per_sqft': stats_overall['max_price_per_sqft']
+    }])
+
+
+def is_materialized(project_name, version, base_dir=AGGREGATES_DIR):
+    """Check whether aggregates for this project data version are already on disk"""
+    version_dir = _version_dir(project_name, version, base_dir)
+    return all(os.path.exists(os.path.join(version_dir, f"{table}.feather")) for table in AGGREGATE_TABLES)
+
+
+def materialize_aggregates(project_name, version, analysis_results, base_dir=AGGREGATES_DIR):
+    """Write the dashboard aggregates for one project version as compact Feather tables"""
+    version_dir = _version_dir(project_name, version, base_dir)
+    os.makedirs(version_dir, exist_ok=True)
+
+    stats_overall = analysis_results['stats_overall']
+    bedroom_stats = analysis_results['bedroom_stats']
+    tables = {
+        'stats_overall': pd.DataFrame([stats_overall]),
+        'bedroom_stats': bedroom_stats,
+        'bathroom_stats': analysis_results['bathroom_stats'],
+        'listing_days_stats': analysis_results['listing_days_stats'],
+        'comparison_rows': build_comparison_rows(project_name, bedroom_stats),
+        'investment_summary': build_investment_summary(stats_overall, bedroom_stats),
+        'quarantine': analysis_results['quarantine'],
+        'validation_issues': analysis_results['validation_issues']
+    }
+
+    for name, table in tables.items():
+        # Write to a temp file first so concurrent readers never see a half-written table
+        path = os.path.join(version_dir, f"{name}.feather")
+        tmp_path = f"{path}.{os.getpid()}.tmp"
+        table.reset_index(drop=True).to_feather(tmp_path, compression='uncompressed')
+        os.replace(tmp_path, path)
+
+    manifest_path = _manifest_path(project_name, base_dir)
+    tmp_path = f"{manifest_path}.{os.getpid()}.tmp"
+    with open(tmp_path, 'w') as f:
+        json.dump({'project': project_name, 'current_version': version, 'schema_version': MATERIALIZE_SCHEMA_VERSION,
+                   'rows': int(stats_overall['total_listings'])}, f)
+    os.replace(tmp_path, manifest_path)
+    return version_dir
+
+
+def current_version(project_name, base_dir=AGGREGATES_DIR):
+    """Return the most recently materialized data version for a project under the current schema, if any"""
+    try:
+        with open(_manifest_path(project_name, base_dir)) as f:
+            manifest = json.load(f)
+    except FileNotFoundError:
+        return None
+    if manifest.get('schema_version') != MATERIALIZE_SCHEMA_VERSION:
+        return None
+    return manifest['current_version']
+
+
+def load_aggregates(project_name, version=None, base_dir=AGGREGATES_DIR):
+    """Read the materialized aggregates for a project in the same shape analyze_data returns"""
+    version = version or current_version(project_name, base_dir)
+    if version is None:
+        raise FileNotFoundError(f"No materialized aggregates for {project_name}")
+    version_dir = _version_dir(project_name, version, base_dir)
+
+    aggregates = {name: pd.read_feather(os.path.join(version_dir, f"{name}.feather")) for name in AGGREGATE_TABLES}
+    aggregates['stats_overall'] = aggregates['stats_overall'].iloc[0].to_dict()
+    aggregates['investment_summary'] = aggregates['investment_summary'].iloc[0].to_dict()
+    aggregates['data_version'] = version
+    return aggregates
+
+
+def analyze_once(analyze):
+    """Wrap analyze so repeated calls for the same project data reuse the first result
+
+    Lets the listings archive and the aggregates of a new data version share one analysis.
+    """
+    results = {}
+
+    def analyze_cached(property_data):
+        key = id(property_data)
+        if key not in results:
+            results[key] = (property_data, analyze(property_data))
+        return results[key][1]
+    return analyze_cached
+
+
+def ingest(project_name, property_data, analyze, version, base_dir=AGGREGATES_DIR):
+    """Materialize aggregates for new project data; a no-op when this version is already on disk"""
+    if not is_materialized(project_name, version, base_dir):
+        materialize_aggregates(project_name, version, analyze(property_data), base_dir)
+    return version
+
+
+if __name__ == '__main__':
+    from projects import ingest_projects
+
+    for name, version in ingest_projects().items():
+        print(f"{name}: aggregates at version {version}")
@@ -0,0 +1,165 @@
+import hashlib
+import json
+from concurrent.futures import ProcessPoolExecutor
+
+import numpy as np
+import pandas as pd
+
+from cache_backend import make_key
+
+# Simulation assumptions used when the caller does not override them; appreciation is replaced
+# by the drift and volatility fitted on the project's price history when there is enough of it
+DEFAULT_ASSUMPTIONS = {
+    'appreciation_mean': 0.05,     # Expected annual price growth
+    'appreciation_vol': 0.12,      # Annual volatility of price growth
+    'rent_psf': 120.0,             # Net annual rent, AED per sq.ft
+    'rent_sd': 0.15,               # Relative dispersion of rent between units
+    'exit_min_years': 3,           # Exit timing is uniform over whole years in this range
+    'exit_max_years': 10
+}
+
+# A fit needs at least this many price observations spanning this many days
+MIN_HISTORY_POINTS = 3
+MIN_HISTORY_DAYS = 60
+DAYS_PER_YEAR = 365.25
+
+# Annualized returns are aggregated into fixed bins so chunks merge without keeping every path
+RETURN_BINS = np.linspace(-0.5, 0.5, 401)
+DEFAULT_CHUNK_SIZE = 100_000
+
+
+def _simulate_chunk(start_ppsf, assumptions, n_paths, seed):
+    """Simulate one chunk of paths and return its histogram and running sums"""
+    rng = np.random.default_rng(seed)
+    p0 = rng.choice(start_ppsf, size=n_paths)
+    years = rng.integers(assumptions['exit_min_years'], assumptions['exit_max_years'] + 1, size=n_paths)
+
+    # Geometric Brownian motion in annual steps collapses to one normal draw per path
+    mu, sigma = assumptions['appreciation_mean'], assumptions['appreciation_vol']
+    log_growth = rng.normal((mu - sigma ** 2 / 2) * years, sigma * np.sqrt(years))
+    exit_ppsf = p0 * np.exp(log_growth)
+
+    # Rent is earned per sq.ft, so the yield on the entry price/sq.ft differs between projects and units
+    rent = assumptions['rent_psf'] * np.maximum(rng.normal(1, assumptions['rent_sd'], size=n_paths), 0)
+    total_multiple = (exit_ppsf + rent * years) / p0
+    annual_return = total_multiple ** (1 / years) - 1
+
+    histogram, _ = np.histogram(np.clip(annual_return, RETURN_BINS[0], RETURN_BINS[-1]), bins=RETURN_BINS)
+    return {
+        'histogram': histogram,
+        'n': n_paths,
+        'sum_return': annual_return.sum(),
+        'sum_return_sq': np.square(annual_return).sum(),
+        'losses': int((total_multiple < 1).sum()),
+        'sum_exit_ppsf': exit_ppsf.sum(),
+        'sum_years': int(years.sum())
+    }
+
+
+def _merge_chunks(chunks):
+    merged = {'histogram': np.zeros(len(RETURN_BINS) - 1, dtype=np.int64)}
+    for chunk in chunks:
+        merged['histogram'] += chunk['histogram']
+        for key in ['n', 'sum_return', 'sum_return_sq', 'losses', 'sum_exit_ppsf', 'sum_years']:
+            merged[key] = merged.get(key, 0) + chunk[key]
+    return merged
+
+
+def _histogram_quantile(histogram, q):
+    """Approximate quantile from binned counts by interpolating inside the bin"""
+    cumulative = np.cumsum(histogram)
+    target = q * cumulative[-1]
+    index = int(np.searchsorted(cumulative, target))
+    before = cumulative[index - 1] if index > 0 else 0
+    fraction = (target - before) / histogram[index] if histogram[index] else 0.0
+    return RETURN_BINS[index] + fraction * (RETURN_BINS[index + 1] - RETURN_BINS[index])
+
+
+def fit_appreciation(price_history):
+    """Annual drift and volatility of a price/sq.ft level series indexed by date
+
+    Fits geometric Brownian motion to the log changes between observations, weighting each by
+    the time it spans. Returns overrides for appreciation_mean and appreciation_vol, or an empty
+    dict when the history is too short to fit.
+    """
+    history = pd.Series(price_history, dtype=float).dropna()
+    history = history[history > 0]
+    history.index = pd.to_datetime(history.index)
+    history = history.sort_index()
+    if len(history) < MIN_HISTORY_POINTS or (history.index[-1] - history.index[0]).days < MIN_HISTORY_DAYS:
+        return {}
+
+    dt = np.diff(history.index.to_numpy()).astype('timedelta64[s]').astype(float) / (DAYS_PER_YEAR * 86_400)
+    log_change = np.diff(np.log(history.to_numpy()))
+    keep = dt > 0
+    dt, log_change = dt[keep], log_change[keep]
+    log_drift = log_change.sum() / dt.sum()
+    variance = np.sum((log_change - log_drift * dt) ** 2 / dt) / max(len(dt) - 1, 1)
+    volatility = float(np.sqrt(variance))
+    # The simulation takes the arithmetic drift mu of dS/S = mu dt + sigma dW
+    return {'appreciation_mean': float(log_drift + variance / 2), 'appreciation_vol': volatility}
+
+
+def simulation_key(start_ppsf, assumptions, n_paths, seed, chunk_size):
+    """Cache key for a simulation run, derived from every input that affects its result
+
+    The chunk size is part of it because each chunk draws from its own random stream.
+    """
+    digest = hashlib.sha1(np.ascontiguousarray(start_ppsf, dtype=np.float64).tobytes())
+    digest.update(json.dumps([assumptions, n_paths, seed, chunk_size], sort_keys=True).encode())
+    return make_key('monte_carlo', digest.hexdigest()[:16])
+
+
+def simulate_project(start_ppsf, assumptions=None, n_paths=100_000, seed=0,
+                     chunk_size=DEFAULT_CHUNK_SIZE, workers=1, cache=None, price_history=None):
+    """Simulate appreciation, rental income and exit timing for one project
+
+    Paths start from prices drawn from the project's current price/sq.ft listings and are run
+    in chunks of chunk_size, so memory stays bounded regardless of n_paths. With workers > 1
+    chunks run in a process pool. When price_history (price/sq.ft levels by date) is long
+    enough, the drift and volatility fitted on it replace the appreciation assumptions; the
+    result's 'fitted' flag says which were used. Results are reproducible for a given seed and
+    chunk size and are cached in the given cache backend by their inputs.
+    """
+    fitted = fit_appreciation(price_history) if price_history is not None else {}
+    assumptions = {**DEFAULT_ASSUMPTIONS, **(assumptions or {}), **fitted}
+    start_ppsf = np.asarray(start_ppsf, dtype=np.float64)
+    if not len(start_ppsf):
+        raise ValueError("No price/sq.ft values to start the simulation from")
+
+    key = simulation_key(start_ppsf, assumptions, n_paths, seed, chunk_size)
+    if cache is not None:
+        cached = cache.get(key)
+        if cached is not None:
+            return cached
+
+    sizes = [chunk_size] * (n_paths // chunk_size) + ([n_paths % chunk_size] if n_paths % chunk_size else [])
+    seeds = np.random.SeedSequence(seed).spawn(len(sizes))
+    args = [(start_ppsf, assumptions, size, chunk_seed) for size, chunk_seed in zip(sizes, seeds)]
+    if workers > 1 and len(args) > 1:
+        with ProcessPoolExecutor(max_workers=workers) as pool:
+            chunks = list(pool.map(_simulate_chunk, *zip(*args)))
+    else:
+        chunks = [_simulate_chunk(*chunk_args) for chunk_args in args]
+    merged = _merge_chunks(chunks)
+
+    n = merged['n']
+    mean = merged['sum_return'] / n
+    result = {
+        'assumptions': assumptions,
+        'fitted': bool(fitted),
+        'n_paths': n,
+        'mean_return': mean,
+        'std_return': np.sqrt(max(merged['sum_return_sq'] / n - mean ** 2, 0)),
+        'probability_of_loss': merged['losses'] / n,
+        'mean_exit_ppsf': merged['sum_exit_ppsf'] / n,
+        'mean_exit_years': merged['sum_years'] / n,
+        'quantiles': {q: float(_histogram_quantile(merged['histogram'], q)) for q in [0.05, 0.25, 0.5, 0.75, 0.95]},
+        'distribution': pd.DataFrame({
+            'annual_return': (RETURN_BINS[:-1] + RETURN_BINS[1:]) / 2,
+            'probability': merged['histogram'] / n
+        })
+    }
+    if cache is not None:
+        cache.set(key, result)
+    return result
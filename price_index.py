@@ -0,0 +1,169 @@
+import json
+import os
+
+import numpy as np
+import pandas as pd
+
+from listing_store import ARCHIVE_DIR, list_snapshots, open_archive
+
+INDEX_DIR = os.path.join('results', 'index')
+INDEX_BASE = 100.0
+
+# Bump when the index method or its stored shape changes; an index written under another
+# schema version is ignored and rebuilt from the first snapshot date
+INDEX_SCHEMA_VERSION = 2
+
+SEGMENT_TYPES = {'market': 'Market', 'location': 'Location', 'project': 'Project'}
+SEGMENT_KEYS = ['segment_type', 'segment', 'bedrooms']
+INDEX_COLUMNS = ['period'] + SEGMENT_KEYS + ['listings', 'log_ppsf', 'index']
+
+
+def _index_path(base_dir):
+    return os.path.join(base_dir, 'price_index.feather')
+
+
+def _manifest_path(base_dir):
+    return os.path.join(base_dir, 'manifest.json')
+
+
+def load_price_index(base_dir=INDEX_DIR):
+    """Read the stored index, or an empty one before the first update or after a schema change"""
+    path = _index_path(base_dir)
+    if not os.path.exists(path) or read_index_manifest(base_dir).get('schema_version') != INDEX_SCHEMA_VERSION:
+        return pd.DataFrame({column: pd.Series(dtype=float if column in ('log_ppsf', 'index') else object)
+                             for column in INDEX_COLUMNS})
+    return pd.read_feather(path)
+
+
+def segment_rows(frame, locations):
+    """Repeat each row of a frame once per segment it counts towards, keyed by SEGMENT_KEYS
+
+    A row (a listing, or a project and unit type cell) counts towards the market, its
+    location and its project, each both overall ('All') and for its bedroom type.
+    """
+    all_values = np.full(len(frame), 'All', dtype=object)
+    segments = {
+        'market': all_values,
+        'location': frame['project'].map(locations).fillna('Unknown').to_numpy(dtype=object),
+        'project': frame['project'].to_numpy(dtype=object)
+    }
+    frames = []
+    for segment_type, segment in segments.items():
+        for bedrooms in (all_values, frame['bedrooms'].to_numpy(dtype=object)):
+            frames.append(frame.assign(segment_type=segment_type, segment=segment, bedrooms=bedrooms))
+    return pd.concat(frames, ignore_index=True)
+
+
+def period_stats(listings, locations):
+    """Listing count and mean log price/sq.ft per segment for one period"""
+    rows = segment_rows(listings[['project', 'bedrooms']].assign(
+        log_ppsf=np.log(listings['price_per_sqft'].to_numpy(dtype=float))), locations)
+    return rows.groupby(SEGMENT_KEYS, sort=True)['log_ppsf'].agg(listings='size', log_ppsf='mean').reset_index()
+
+
+def _cells(stats):
+    # Project and unit type segments: the strata every other segment is chained over
+    cells = stats[(stats['segment_type'] == 'project') & (stats['bedrooms'] != 'All')]
+    return cells.rename(columns={'segment': 'project'})[['project', 'bedrooms', 'listings', 'log_ppsf']]
+
+
+def chain_period(stats, previous, locations):
+    """Link one period's segment stats to the latest index level of each segment
+
+    Within a project and unit type the link is the ratio of geometric mean price/sq.ft
+    between the two periods (a Jevons index). Every other segment chains the links of the
+    project and unit type cells it contains, seen in both periods, weighted by their listing
+    counts in the earlier period, so a shift in the mix of unit types or projects listed is
+    not read as a price change. Segments seen for the first time start at INDEX_BASE; a
+    segment with no cell seen in both periods keeps its level.
+    """
+    matched = _cells(stats).merge(_cells(previous), on=['project', 'bedrooms'], suffixes=('', '_previous'))
+    change = matched['log_ppsf'].to_numpy(dtype=float) - matched['log_ppsf_previous'].to_numpy(dtype=float)
+    weight = matched['listings_previous'].to_numpy(dtype=float)
+    matched = matched.assign(weight=weight, weighted_change=weight * change)
+    links = segment_rows(matched[['project', 'bedrooms', 'weight', 'weighted_change']], locations)
+    links = links.groupby(SEGMENT_KEYS)[['weight', 'weighted_change']].sum()
+    links = (links['weighted_change'] / links['weight']).rename('log_change').reset_index()
+
+    linked = stats.merge(previous[SEGMENT_KEYS + ['index']], on=SEGMENT_KEYS, how='left').merge(
+        links, on=SEGMENT_KEYS, how='left')
+    linked['index'] = np.where(linked['index'].isna(), INDEX_BASE,
+                               linked['index'] * np.exp(linked['log_change'].to_numpy(dtype=float, na_value=0.0)))
+    return linked.drop(columns=['log_change'])
+
+
+def read_index_manifest(base_dir=INDEX_DIR):
+    """Return the index manifest, or an empty one before the first update"""
+    try:
+        with open(_manifest_path(base_dir)) as f:
+            return json.load(f)
+    except FileNotFoundError:
+        return {}
+
+
+def period_sources(snapshots, period):
+    """Snapshot each project contributes to a period: its latest one on or before the date"""
+    sources = {}
+    for name, entries in snapshots.items():
+        current = [snapshot for snapshot in entries if snapshot['snapshot_date'] <= period]
+        if current:
+            sources[name] = current[-1]['snapshot']
+    return sources
+
+
+def update_price_index(projects, locations, archive_dir=ARCHIVE_DIR, base_dir=INDEX_DIR):
+    """Extend the stored index with every snapshot date not indexed yet and return it
+
+    A period is a snapshot date. Each project contributes its latest snapshot on or before
+    the date, so a project that was not re-scraped that day still counts at its last
+    known listings. The last indexed period is recomputed when a newer snapshot was archived
+    for it; earlier periods are never recomputed.
+    """
+    stored = load_price_index(base_dir)
+    last_period = stored['period'].max() if len(stored) else None
+    snapshots = {name: list_snapshots(name, archive_dir) for name in projects}
+    periods = sorted({snapshot['snapshot_date'] for entries in snapshots.values() for snapshot in entries})
+    new_periods = [period for period in periods if last_period is None or period >= last_period]
+    if (new_periods and new_periods[0] == last_period
+            and period_sources(snapshots, last_period) == read_index_manifest(base_dir).get('sources')):
+        new_periods = new_periods[1:]
+    if not new_periods:
+        return stored
+
+    # The last period's rows are replaced when it is indexed again
+    stored = stored[stored['period'] != new_periods[0]]
+    # Latest index level per segment to chain from
+    previous = stored.sort_values('period').groupby(SEGMENT_KEYS, sort=False).tail(1)
+    new_rows = []
+    for period in new_periods:
+        frames = [open_archive(name, snapshot, archive_dir).to_pandas(columns=['project', 'bedrooms', 'price_per_sqft'])
+                  for name, snapshot in period_sources(snapshots, period).items()]
+        linked = chain_period(period_stats(pd.concat(frames, ignore_index=True), locations), previous, locations)
+        linked.insert(0, 'period', period)
+        new_rows.append(linked)
+        previous = pd.concat([previous, linked]).groupby(SEGMENT_KEYS, sort=False).tail(1)
+
+    index = pd.concat(([stored] if len(stored) else []) + new_rows, ignore_index=True)[INDEX_COLUMNS]
+    index['listings'] = index['listings'].astype(np.int32)
+    index['index'] = index['index'].astype(np.float64)
+
+    # Write to temp files first so readers never see a half-written index
+    os.makedirs(base_dir, exist_ok=True)
+    tmp_suffix = f".{os.getpid()}.tmp"
+    path = _index_path(base_dir)
+    index.to_feather(path + tmp_suffix, compression='zstd')
+    os.replace(path + tmp_suffix, path)
+    manifest_path = _manifest_path(base_dir)
+    with open(manifest_path + tmp_suffix, 'w') as f:
+        json.dump({'schema_version': INDEX_SCHEMA_VERSION, 'periods': sorted(index['period'].unique().tolist()),
+                   'rows': len(index), 'sources': period_sources(snapshots, new_periods[-1])}, f)
+    os.replace(manifest_path + tmp_suffix, manifest_path)
+    return index
+
+
+def index_series(index, segment_type, bedrooms='All', segments=None):
+    """Index rows for one segment type and bedroom type, optionally limited to some segments"""
+    rows = index[(index['segment_type'] == segment_type) & (index['bedrooms'] == bedrooms)]
+    if segments is not None:
+        rows = rows[rows['segment'].isin(segments)]
+    return rows.sort_values(['segment', 'period']).reset_index(drop=True)
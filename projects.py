@@ -0,0 +1,274 @@
+import pandas as pd
+
+from cache_backend import data_version
+from descriptions import DESCRIPTION_COLUMNS, process_descriptions
+from listing_age import DEFAULT_BUCKETS
+from listing_store import list_snapshots, open_archive, write_archive
+from materialize import analyze_once, ingest
+from validation import validate_listings
+
+# Hard-coded property data from Safa Two
+SAFA_TWO_DATA = [
+    # Studios
+     {"project": "Safa Two", "property_type": "Apartment", "price": 949000, "area_sqft": 358, "bedrooms": "studio", "bathrooms": "1", "location": "Business Bay, Dubai", "developer": "Damac Properties", "description": "Spacious Layout | High Floor | Listed 6 Days ago"},
+    {"project": "Safa Two", "property_type": "Apartment", "price": 1280000, "area_sqft": 626, "bedrooms": "studio", "bathrooms": "1", "location": "Business Bay, Dubai", "developer": "Damac Properties", "description": "2% commission | 6% BELOW OP | Listed 2 Months ago"},
+    {"project": "Safa Two", "property_type": "Apartment", "price": 1320000, "area_sqft": 470, "bedrooms": "studio", "bathrooms": "1", "location": "Business Bay, Dubai", "developer": "Damac Properties", "description": "Stunning Views |Studio Apartment | Listed 1 Month ago"},
+    {"project": "Safa Two", "property_type": "Apartment", "price": 1507000, "area_sqft": 730, "bedrooms": "studio", "bathrooms": "1", "location": "Business Bay, Dubai", "developer": "Damac Properties", "description": "Branded and Spacious Studio | High Floor | Listed 5 Months ago"},
+    {"project": "Safa Two", "property_type": "Apartment", "price": 1715000, "area_sqft": 697, "bedrooms": "studio", "bathrooms": "1", "location": "Business Bay, Dubai", "developer": "Damac Properties", "description": "Canal View | Mid Floor | 3.75% Payment Plan | Listed 2 Months ago"},
+    
+    # 1 Bedroom
+    {"project": "Safa Two", "property_type": "Apartment", "price": 1490000, "area_sqft": 791, "bedrooms": "1", "bathrooms": "1", "location": "Business Bay, Dubai", "developer": "Damac Properties", "description": "Super Distress Deal | Premium project | Listed 2 Months ago"},
+    {"project": "Safa Two", "property_type": "Apartment", "price": 1595000, "area_sqft": 683, "bedrooms": "1", "bathrooms": "1", "location": "Business Bay, Dubai", "developer": "Damac Properties", "description": "Luxurious Design | Amazing View | Listed 23 Days Ago"},
+    {"project": "Safa Two", "property_type": "Apartment", "price": 1600000, "area_sqft": 789, "bedrooms": "1", "bathrooms": "1", "location": "Business Bay, Dubai", "developer": "Damac Properties", "description": "12% Under OP | Investor Deal | Premium View |Listed 1 Month ago"},
+    {"project": "Safa Two", "property_type": "Apartment", "price": 1634880, "area_sqft": 714, "bedrooms": "1", "bathrooms": "1", "location": "Business Bay, Dubai", "developer": "Damac Properties", "description": "Stunning Safa Views| High Floor | Listed 2 Months ago"},
+    {"project": "Safa Two", "property_type": "Apartment", "price": 1660000, "area_sqft": 713, "bedrooms": "1", "bathrooms": "1", "location": "Business Bay, Dubai", "developer": "Damac Properties", "description": "ULTRA LUXURY | INCREDIBLE VIEW | Listed 11 Days Ago "},
+    {"project": "Safa Two", "property_type": "Apartment", "price": 1700000, "area_sqft": 792, "bedrooms": "1", "bathrooms": "1", "location": "Business Bay, Dubai", "developer": "Damac Properties", "description": "BELOW OP | SEA VIEW | HIGH FLOOR | Listed 2 Months Ago"},
+    {"project": "Safa Two", "property_type": "Apartment", "price": 1700000, "area_sqft": 792, "bedrooms": "1", "bathrooms": "1", "location": "Business Bay, Dubai", "developer": "Damac Properties", "description": "SEA VIEW | HIGH FLOOR | Q2 2027 | Listed 10 Days Ago"},
+    {"project": "Safa Two", "property_type": "Apartment", "price": 1780000, "area_sqft": 830, "bedrooms": "1", "bathrooms": "1", "location": "Business Bay, Dubai", "developer": "Damac Properties", "description": "Prime location | Listed 24 Days Ago"},
+    {"project": "Safa Two", "property_type": "Apartment", "price": 1800000, "area_sqft": 744, "bedrooms": "1", "bathrooms": "1", "location": "Business Bay, Dubai", "developer": "Damac Properties", "description": "1 Bed | High Floor | Payment Plan | Listed 1 Month Ago"},
+    {"project": "Safa Two", "property_type": "Apartment", "price": 1825000, "area_sqft": 831, "bedrooms": "1", "bathrooms": "1", "location": "Business Bay, Dubai", "developer": "Damac Properties", "description": "INVESTOR DEAL | PRIME LOCATION | Listed 1 Month Ago"},
+    {"project": "Safa Two", "property_type": "Apartment", "price": 1843500, "area_sqft": 758, "bedrooms": "1", "bathrooms": "1", "location": "Business Bay, Dubai", "developer": "Damac Properties", "description": "Premium View | Luxurious | Listed 1 Month Ago"},
+    {"project": "Safa Two", "property_type": "Apartment", "price": 1850000, "area_sqft": 775, "bedrooms": "1", "bathrooms": "1", "location": "Business Bay, Dubai", "developer": "Damac Properties", "description": "1BR with Spectacular View | High Floor | Listed 26 Days Ago"},
+    {"project": "Safa Two", "property_type": "Apartment", "price": 1900000, "area_sqft": 745, "bedrooms": "1", "bathrooms": "1", "location": "Business Bay, Dubai", "developer": "Damac Properties", "description": "Sea view | Safa 2 | Q3 2027 | Listed 6 Days Ago"},
+    {"project": "Safa Two", "property_type": "Apartment", "price": 1900000, "area_sqft": 753, "bedrooms": "1", "bathrooms": "2", "location": "Business Bay, Dubai", "developer": "Damac Properties", "description": "Spacious >> Canal view >> Listed 8 Days Ago"},
+    {"project": "Safa Two", "property_type": "Apartment", "price": 1990000, "area_sqft": 771, "bedrooms": "1", "bathrooms": "1", "location": "Business Bay, Dubai", "developer": "Damac Properties", "description": "Branded and fully furnished | Listed 16 Days Ago"},
+    {"project": "Safa Two", "property_type": "Apartment", "price": 1999989, "area_sqft": 827, "bedrooms": "1", "bathrooms": "1", "location": "Business Bay, Dubai", "developer": "Damac Properties", "description": "High Floor | Motivated Seller | Listed 16 Days Ago"},
+    {"project": "Safa Two", "property_type": "Apartment", "price": 2000000, "area_sqft": 803, "bedrooms": "1", "bathrooms": "1", "location": "Business Bay, Dubai", "developer": "Damac Properties", "description": "Distressed Deal Motivated Seller | Listed 2 Months Ago"},
+    {"project": "Safa Two", "property_type": "Apartment", "price": 2000000, "area_sqft": 744, "bedrooms": "1", "bathrooms": "1", "location": "Business Bay, Dubai", "developer": "Damac Properties", "description": "Damac | Safa Two | High floor | Listed 1 Month Ago"},
+    {"project": "Safa Two", "property_type": "Apartment", "price": 2170000, "area_sqft": 775, "bedrooms": "1", "bathrooms": "1", "location": "Business Bay, Dubai", "developer": "Damac Properties", "description": "Higher Floor || Modern Unit 1 Bedroom || Listed 2 Months Ago"},
+    {"project": "Safa Two", "property_type": "Apartment", "price": 2175000, "area_sqft": 762, "bedrooms": "1", "bathrooms": "1", "location": "Business Bay, Dubai", "developer": "Damac Properties", "description": "LOW PRICE | PARK & SEA VIEW | Listed 1 Month Ago"},
+    {"project": "Safa Two", "property_type": "Apartment", "price": 2200000, "area_sqft": 812, "bedrooms": "1", "bathrooms": "1", "location": "Business Bay, Dubai", "developer": "Damac Properties", "description": " Listed 2 Days Ago"},
+    {"project": "Safa Two", "property_type": "Apartment", "price": 2200000, "area_sqft": 829, "bedrooms": "1", "bathrooms": "2", "location": "Business Bay, Dubai", "developer": "Damac Properties", "description": "Premium layout | High floor | Listed 19 Days Ago"},
+    {"project": "Safa Two", "property_type": "Apartment", "price": 2222000, "area_sqft": 744, "bedrooms": "1", "bathrooms": "1", "location": "Business Bay, Dubai", "developer": "Damac Properties", "description": "Damac | Safa Two | Sea view | Listed 20 Days Ago"},
+    {"project": "Safa Two", "property_type": "Apartment", "price": 2222000, "area_sqft": 771, "bedrooms": "1", "bathrooms": "1", "location": "Business Bay, Dubai", "developer": "Damac Properties", "description": "Damac | Safa Two | Sea view | High floor | Listed 3 Months Ago"},
+    
+    # 1 Bedroom with 2 Bathrooms
+    {"project": "Safa Two", "property_type": "Apartment", "price": 1599000, "area_sqft": 757, "bedrooms": "1", "bathrooms": "2", "location": "Business Bay, Dubai", "developer": "Damac Properties", "description": "High ROI | Burj-Palm Views| Listed 23 Days Ago"},
+    {"project": "Safa Two", "property_type": "Apartment", "price": 1650000, "area_sqft": 794, "bedrooms": "1", "bathrooms": "2", "location": "Business Bay, Dubai", "developer": "Damac Properties", "description": "Below OP | High Floor | City View | Listed 13 Days Ago"},
+    {"project": "Safa Two", "property_type": "Apartment", "price": 1690000, "area_sqft": 795, "bedrooms": "1", "bathrooms": "2", "location": "Business Bay, Dubai", "developer": "Damac Properties", "description": "Sea View | High Floor | LIsted 10 Days Ago "},
+    {"project": "Safa Two", "property_type": "Apartment", "price": 1800000, "area_sqft": 776, "bedrooms": "1", "bathrooms": "2", "location": "Business Bay, Dubai", "developer": "Damac Properties", "description": "High Floor | Sea View | Listed 1 Month Ago"},
+    {"project": "Safa Two", "property_type": "Apartment", "price": 1850000, "area_sqft": 776, "bedrooms": "1", "bathrooms": "2", "location": "Business Bay, Dubai", "developer": "Damac Properties", "description": "Sea View | Negotiable | Urgent Sale | Listed 2 Months Ago"},
+    {"project": "Safa Two", "property_type": "Apartment", "price": 1889999, "area_sqft": 774, "bedrooms": "1", "bathrooms": "2", "location": "Business Bay, Dubai", "developer": "Damac Properties", "description": "Original Price | Very High Floor | Listed 1 Month ago"},
+    {"project": "Safa Two", "property_type": "Apartment", "price": 1900000, "area_sqft": 688, "bedrooms": "1", "bathrooms": "2", "location": "Business Bay, Dubai", "developer": "Damac Properties", "description": "Multiple Units | 1-Bedroom Apartment | Listed 8 Days Ago"},
+    {"project": "Safa Two", "property_type": "Apartment", "price": 2800000, "area_sqft": 744, "bedrooms": "1", "bathrooms": "2", "location": "Business Bay, Dubai", "developer": "Damac Properties", "description": "Ultra Luxury Unit /Above 70th Floor / Listed 2 Days ago"},
+    
+    # 2 Bedrooms
+    {"project": "Safa Two", "property_type": "Apartment", "price": 2293200, "area_sqft": 1154, "bedrooms": "2", "bathrooms": "2", "location": "Business Bay, Dubai", "developer": "Damac Properties", "description": "Luxury 2-bedroom | Middle Floor | Lisetd 19 Days Ago"},
+    {"project": "Safa Two", "property_type": "Apartment", "price": 2405000, "area_sqft": 1208, "bedrooms": "2", "bathrooms": "2", "location": "Business Bay, Dubai", "developer": "Damac Properties", "description": "Sleek Design | Community View |Listed 2 Months ago"},
+    {"project": "Safa Two", "property_type": "Apartment", "price": 2436525, "area_sqft": 1172, "bedrooms": "2", "bathrooms": "2", "location": "Business Bay, Dubai", "developer": "Damac Properties", "description": "15% Below Original Price | Above 55TH Floor |Listed 12 Dasy Ago"},
+    {"project": "Safa Two", "property_type": "Apartment", "price": 2450000, "area_sqft": 1054, "bedrooms": "2", "bathrooms": "2", "location": "Business Bay, Dubai", "developer": "Damac Properties", "description": "Eminence Homes Real Estate| Lisetd 1 Month ago"},
+    {"project": "Safa Two", "property_type": "Apartment", "price": 2550000, "area_sqft": 1208, "bedrooms": "2", "bathrooms": "2", "location": "Business Bay, Dubai", "developer": "Damac Properties", "description": "Resale Payment Plan Branded Residence I High Floor | Listed 2 Months ago"},
+    {"project": "Safa Two", "property_type": "Apartment", "price": 2700000, "area_sqft": 1138, "bedrooms": "2", "bathrooms": "2", "location": "Business Bay, Dubai", "developer": "Damac Properties", "description": "Luxury Unit | Payment Plan | Exclusive Resale | Listed 10 Days ago"},
+    {"project": "Safa Two", "property_type": "Apartment", "price": 2750000, "area_sqft": 1355, "bedrooms": "2", "bathrooms": "2", "location": "Business Bay, Dubai", "developer": "Damac Properties", "description": "Distress | Lower OP | Damac Luxury 2br | Listed 4 Days ago"},
+    {"project": "Safa Two", "property_type": "Apartment", "price": 2850000, "area_sqft": 1138, "bedrooms": "2", "bathrooms": "2", "location": "Business Bay, Dubai", "developer": "Damac Properties", "description": "PERFECT LAYOUT l LUXURY UNIT | Listed 23 Days ago"},
+    {"project": "Safa Two", "property_type": "Apartment", "price": 2900000, "area_sqft": 1144, "bedrooms": "2", "bathrooms": "2", "location": "Business Bay, Dubai", "developer": "Damac Properties", "description": "Iconic Design | Unique Feature | Listed 1 Month ago"},
+    {"project": "Safa Two", "property_type": "Apartment", "price": 2900000, "area_sqft": 1172, "bedrooms": "2", "bathrooms": "2", "location": "Business Bay, Dubai", "developer": "Damac Properties", "description": "Resale| High floor| Dubai Canal and Park view| Listed 6 Months ago"},
+    {"project": "Safa Two", "property_type": "Apartment", "price": 3050000, "area_sqft": 1145, "bedrooms": "2", "bathrooms": "2", "location": "Business Bay, Dubai", "developer": "Damac Properties", "description": "Luxury + Spacious 2BR | Prime Location | Listed 19 Days ago"},
+    {"project": "Safa Two", "property_type": "Apartment", "price": 3299000, "area_sqft": 1463, "bedrooms": "2", "bathrooms": "2", "location": "Business Bay, Dubai", "developer": "Damac Properties", "description": "Damac | Bargain | High floor | Listed 2 Days ago"},
+    {"project": "Safa Two", "property_type": "Apartment", "price": 3375900, "area_sqft": 1148, "bedrooms": "2", "bathrooms": "2", "location": "Business Bay, Dubai", "developer": "Damac Properties", "description": "Excellent Location | Branded Luxury Residence | Listed 4 days ago"},
+    {"project": "Safa Two", "property_type": "Apartment", "price": 3450000, "area_sqft": 1049, "bedrooms": "2", "bathrooms": "2", "location": "Business Bay, Dubai", "developer": "Damac Properties", "description": "Great Investment | Prime Spot | Listed 19 days ago"},
+    {"project": "Safa Two", "property_type": "Apartment", "price": 4300000, "area_sqft": 1420, "bedrooms": "2", "bathrooms": "2", "location": "Business Bay, Dubai", "developer": "Damac Properties", "description": "Exclusive | Luxury | High Floor | Listed 3 Days ago"},
+    {"project": "Safa Two", "property_type": "Apartment", "price": 4554200, "area_sqft": 1311, "bedrooms": "2", "bathrooms": "2", "location": "Business Bay, Dubai", "developer": "Damac Properties", "description": "Luxury Branded Apartment | Listed 4 Days ago"},
+    
+    # 2 Bedrooms with 3 Bathrooms
+    {"project": "Safa Two", "property_type": "Apartment", "price": 2600000, "area_sqft": 1172, "bedrooms": "2", "bathrooms": "3", "location": "Business Bay, Dubai", "developer": "Damac Properties", "description": "Branded Residence | Genuine Resale | Listed 13 Days ago"},
+    {"project": "Safa Two", "property_type": "Apartment", "price": 2700000, "area_sqft": 1124, "bedrooms": "2", "bathrooms": "3", "location": "Business Bay, Dubai", "developer": "Damac Properties", "description": "Luxurious | Burj Khalifa View | Listed 10 days ago"},
+    {"project": "Safa Two", "property_type": "Apartment", "price": 2700000, "area_sqft": 1294, "bedrooms": "2", "bathrooms": "3", "location": "Business Bay, Dubai", "developer": "Damac Properties", "description": "Listed 2 Months ago"},
+    {"project": "Safa Two", "property_type": "Apartment", "price": 2850000, "area_sqft": 1130, "bedrooms": "2", "bathrooms": "3", "location": "Business Bay, Dubai", "developer": "Damac Properties", "description": "Welcome agents | Price is negotiable | Listed 23 Days ago"},
+    {"project": "Safa Two", "property_type": "Apartment", "price": 2850000, "area_sqft": 1557, "bedrooms": "2", "bathrooms": "3", "location": "Business Bay, Dubai", "developer": "Damac Properties", "description": "BELOW ORIGINAL PRICE | HUGE PREMIUM LAYOUT | Listed 2 Months ago"},
+    {"project": "Safa Two", "property_type": "Apartment", "price": 3200000, "area_sqft": 1399, "bedrooms": "2", "bathrooms": "3", "location": "Business Bay, Dubai", "developer": "Damac Properties", "description": "Provident Estate | Listed 1 Month ago"},
+    {"project": "Safa Two", "property_type": "Apartment", "price": 3600000, "area_sqft": 1426, "bedrooms": "2", "bathrooms": "3", "location": "Business Bay, Dubai", "developer": "Damac Properties", "description": "Corner 2 beds, payment plan, Downtown view | Listed 1 Month ago"},
+    
+    # 3 Bedrooms
+    {"project": "Safa Two", "property_type": "Apartment", "price": 3269890, "area_sqft": 1493, "bedrooms": "3", "bathrooms": "4", "location": "Business Bay, Dubai", "developer": "Damac Properties", "description": "Skyline Views | Luxurious 3BR | Listed 5 days ago"},
+    {"project": "Safa Two", "property_type": "Apartment", "price": 3269990, "area_sqft": 1484, "bedrooms": "3", "bathrooms": "3", "location": "Business Bay, Dubai", "developer": "Damac Properties", "description": "Downtown Skyline Views | Luxury Living | Listed 9 Days ago"},
+    {"project": "Safa Two", "property_type": "Apartment", "price": 3800000, "area_sqft": 1503, "bedrooms": "3", "bathrooms": "3", "location": "Business Bay, Dubai", "developer": "Damac Properties", "description": "haus & haus Real Estate | Listed 1 Month ago"},
+    {"project": "Safa Two", "property_type": "Apartment", "price": 4250000, "area_sqft": 1735, "bedrooms": "3", "bathrooms": "3", "location": "Business Bay, Dubai", "developer": "Damac Properties", "description": "Exclusif 3 Bed, Corner, Tower A - Sea, Canal View |Listed 1 month ago "},
+    {"project": "Safa Two", "property_type": "Apartment", "price": 4477000, "area_sqft": 1523, "bedrooms": "3", "bathrooms": "3", "location": "Business Bay, Dubai", "developer": "Damac Properties", "description": "Exclusive 3 Bedroom | 70+ Floor | Safa Two Tower A| listed 3 months ago"},
+    {"project": "Safa Two", "property_type": "Apartment", "price": 4500000, "area_sqft": 2001, "bedrooms": "3", "bathrooms": "4", "location": "Business Bay, Dubai", "developer": "Damac Properties", "description": "Driven Properties | Listed 1 Month ago"},
+    {"project": "Safa Two", "property_type": "Apartment", "price": 4900000, "area_sqft": 1658, "bedrooms": "3", "bathrooms": "4", "location": "Business Bay, Dubai", "developer": "Damac Properties", "description": "High Floor | Corner Unit | Two balconies and study | Listed 19 Days ago"},
+    {"project": "Safa Two", "property_type": "Apartment", "price": 4995000, "area_sqft": 1710, "bedrooms": "3", "bathrooms": "4", "location": "Business Bay, Dubai", "developer": "Damac Properties", "description": "Premium View I Corner Unit I 3 BHK I At Safa Two | listed 1 Month ago"}
+]
+
+
+# Hard-coded property data from Safa One
+SAFA_ONE_DATA = [
+    # 1 Bedroom properties 
+    {"project": "Safa One", "property_type": "Apartment", "price": 1600000, "area_sqft": 838, "bedrooms": "1", "bathrooms": "2", "location": "Al Safa 1, Dubai", "developer": "Damac Properties", "description": "-14% Below Original Price | High Floor | Listed 14 Days ago"},
+    {"project": "Safa One", "property_type": "Apartment", "price": 1699990, "area_sqft": 840, "bedrooms": "1", "bathrooms": "2", "location": "Al Safa 1, Dubai", "developer": "Damac Properties", "description": "High Floor | Prime Location | Listed 2 Months ago"},
+    {"project": "Safa One", "property_type": "Apartment", "price": 1742182, "area_sqft": 838, "bedrooms": "1", "bathrooms": "1", "location": "Al Safa 1, Dubai", "developer": "Damac Properties", "description": "Sea, Burj Al Arab View | Prime Location | Lsted 4 Days ago"},
+    {"project": "Safa One", "property_type": "Apartment", "price": 1750000, "area_sqft": 836, "bedrooms": "1", "bathrooms": "1", "location": "Al Safa 1, Dubai", "developer": "Damac Properties", "description": "High Floor | Amazing View | Listed 1 Month ago"},
+    {"project": "Safa One", "property_type": "Apartment", "price": 1790000, "area_sqft": 838, "bedrooms": "1", "bathrooms": "2", "location": "Al Safa 1, Dubai", "developer": "Damac Properties", "description": "Below Original Price | High Floor | Listed 20 days ago"},
+    {"project": "Safa One", "property_type": "Apartment", "price": 1811000, "area_sqft": 838, "bedrooms": "1", "bathrooms": "2", "location": "Al Safa 1, Dubai", "developer": "Damac Properties", "description": "Amazing View | High Floor | Listed 3 months ago"},
+    {"project": "Safa One", "property_type": "Apartment", "price": 1811000, "area_sqft": 838, "bedrooms": "1", "bathrooms": "1", "location": "Al Safa 1, Dubai", "developer": "Damac Properties", "description": "Investor Deal | Spacious | Listed 11 Days ago"},
+    {"project": "Safa One", "property_type": "Apartment", "price": 1850000, "area_sqft": 836, "bedrooms": "1", "bathrooms": "1", "location": "Al Safa 1, Dubai", "developer": "Damac Properties", "description": "Urgent Sale | Listed 1 Month ago"},
+    {"project": "Safa One", "property_type": "Apartment", "price": 1873000, "area_sqft": 850, "bedrooms": "1", "bathrooms": "2", "location": "Al Safa 1, Dubai", "developer": "Damac Properties", "description": "Investor Deal | High Floor | Listed 1 month ago"},
+    {"project": "Safa One", "property_type": "Apartment", "price": 1873000, "area_sqft": 840, "bedrooms": "1", "bathrooms": "1", "location": "Al Safa 1, Dubai", "developer": "Damac Properties", "description": "Prime Location| Sea Views | Listed 1 Month ago"},
+    {"project": "Safa One", "property_type": "Apartment", "price": 2100000, "area_sqft": 850, "bedrooms": "1", "bathrooms": "2", "location": "Al Safa 1, Dubai", "developer": "Damac Properties", "description": "Prime Location | Burj Al Arab View | Listed 6 Months ago"},
+    {"project": "Safa One", "property_type": "Apartment", "price": 2200000, "area_sqft": 838, "bedrooms": "1", "bathrooms": "2", "location": "Al Safa 1, Dubai", "developer": "Damac Properties", "description": "Handover 2026 | Genuine Resale | Listed 1 Month ago"},
+    {"project": "Safa One", "property_type": "Apartment", "price": 2500000, "area_sqft": 838, "bedrooms": "1", "bathrooms": "2", "location": "Al Safa 1, Dubai", "developer": "Damac Properties", "description": "Safa One | 1 bed | Sea View | Listed 3 Months ago"},
+    
+    # 2 Bedroom properties
+    {"project": "Safa One", "property_type": "Apartment", "price": 2393000, "area_sqft": 1231, "bedrooms": "2", "bathrooms": "3", "location": "Al Safa 1, Dubai", "developer": "Damac Properties", "description": "Best Deal | Corner Unit | Listed 1 Month ago"},
+    {"project": "Safa One", "property_type": "Apartment", "price": 2393000, "area_sqft": 1231, "bedrooms": "2", "bathrooms": "3", "location": "Al Safa 1, Dubai", "developer": "Damac Properties", "description": "Exclusive Offer | High ROI | Listed 6 Months ago"},
+    {"project": "Safa One", "property_type": "Apartment", "price": 2480998, "area_sqft": 1231, "bedrooms": "2", "bathrooms": "2", "location": "Al Safa 1, Dubai", "developer": "Damac Properties", "description": "Full Sea and Burj Al Arab View | Listed 4 days ago"},
+    {"project": "Safa One", "property_type": "Apartment", "price": 2566000, "area_sqft": 1226, "bedrooms": "2", "bathrooms": "3", "location": "Al Safa 1, Dubai", "developer": "Damac Properties", "description": "Wasl Park View | High Floor | Listed 1 Month ago"},
+    {"project": "Safa One", "property_type": "Apartment", "price": 2600000, "area_sqft": 1222, "bedrooms": "2", "bathrooms": "3", "location": "Al Safa 1, Dubai", "developer": "Damac Properties", "description": "Exclusive Resale | 2BR in Al Safa One | Listed 2 Months ago"},
+    {"project": "Safa One", "property_type": "Apartment", "price": 2900000, "area_sqft": 1231, "bedrooms": "2", "bathrooms": "3", "location": "Al Safa 1, Dubai", "developer": "Damac Properties", "description": "Investor Deal I Mid Floor I Modern Living| Listed 1 Month ago"},
+    {"project": "Safa One", "property_type": "Apartment", "price": 3050000, "area_sqft": 1229, "bedrooms": "2", "bathrooms": "3", "location": "Al Safa 1, Dubai", "developer": "Damac Properties", "description": "Spacious Living I Good Location I Investor Deal| Listed 1 Month ago"},
+    {"project": "Safa One", "property_type": "Apartment", "price": 3050000, "area_sqft": 1223, "bedrooms": "2", "bathrooms": "2", "location": "Al Safa 1, Dubai", "developer": "Damac Properties", "description": "Stunning Views | 2BR-Luxury Layout | Listed 10 Days ago"},
+    {"project": "Safa One", "property_type": "Apartment", "price": 3100000, "area_sqft": 1221, "bedrooms": "2", "bathrooms": "3", "location": "Al Safa 1, Dubai", "developer": "Damac Properties", "description": "Investor Deal I Exclusive Luxury 2 BHK | Listed 2 Months ago"},
+    {"project": "Safa One", "property_type": "Apartment", "price": 3100000, "area_sqft": 1231, "bedrooms": "2", "bathrooms": "3", "location": "Al Safa 1, Dubai", "developer": "Damac Properties", "description": "Luxurious Living I Good Location I Investor Deal | Listed 1 Month ago"},
+    {"project": "Safa One", "property_type": "Apartment", "price": 3400000, "area_sqft": 1223, "bedrooms": "2", "bathrooms": "3", "location": "Al Safa 1, Dubai", "developer": "Damac Properties", "description": "Stunning View IHigh Floor |Resale w/ Payment Plan | Listed 6 Months ago"},
+    {"project": "Safa One", "property_type": "Apartment", "price": 3528000, "area_sqft": 1616, "bedrooms": "2", "bathrooms": "2", "location": "Al Safa 1, Dubai", "developer": "Damac Properties", "description": "Below Original Price | Park View | Listed 3 Months ago"},
+    {"project": "Safa One", "property_type": "Apartment", "price": 3725000, "area_sqft": 1586, "bedrooms": "2", "bathrooms": "4", "location": "Al Safa 1, Dubai", "developer": "Damac Properties", "description": "10% Below Original Price | Best Views |Listed 5 Days ago"},
+    {"project": "Safa One", "property_type": "Apartment", "price": 3900000, "area_sqft": 1221, "bedrooms": "2", "bathrooms": "2", "location": "Al Safa 1, Dubai", "developer": "Damac Properties", "description": "2-BR | High Floor | Full Sea View Ultra Luxurious | Listed 1 Month ago"},
+    {"project": "Safa One", "property_type": "Apartment", "price": 4210000, "area_sqft": 2099, "bedrooms": "2", "bathrooms": "2", "location": "Al Safa 1, Dubai", "developer": "Damac Properties", "description": "Prime Location| Sea Views | Listed 1 Month ago"},
+    {"project": "Safa One", "property_type": "Apartment", "price": 5000000, "area_sqft": 1943, "bedrooms": "2", "bathrooms": "3", "location": "Al Safa 1, Dubai", "developer": "Damac Properties", "description": "Spacious Living I Exclusive 2 BHK I Investor Deal | Listed 2 Months ago"},
+    
+    # 3 Bedroom properties
+    {"project": "Safa One", "property_type": "Apartment", "price": 4265508, "area_sqft": 2098, "bedrooms": "3", "bathrooms": "4", "location": "Al Safa 1, Dubai", "developer": "Damac Properties", "description": "Amazing View | High Floor | Listed 11 days ago"},
+    {"project": "Safa One", "property_type": "Apartment", "price": 5037944, "area_sqft": 2630, "bedrooms": "3", "bathrooms": "3", "location": "Al Safa 1, Dubai", "developer": "Damac Properties", "description": "Panoramic Sea View | Luxurious | Listed 4 Days ago"},
+    {"project": "Safa One", "property_type": "Apartment", "price": 5800000, "area_sqft": 2147, "bedrooms": "3", "bathrooms": "4", "location": "Al Safa 1, Dubai", "developer": "Damac Properties", "description": "Luxury 3 BHK I Best in Price I Investor Deal | Listed 2 months ago"},
+    
+    # 4 Bedroom properties
+    {"project": "Safa One", "property_type": "Apartment", "price": 7923000, "area_sqft": 2870, "bedrooms": "4", "bathrooms": "4", "location": "Al Safa 1, Dubai", "developer": "Damac Properties", "description": "Rare 4 Bed Duplex Townhouse | Listed 6 months ago"},
+    {"project": "Safa One", "property_type": "Apartment", "price": 30000000, "area_sqft": 6357, "bedrooms": "4", "bathrooms": "6", "location": "Al Safa 1, Dubai", "developer": "Damac Properties", "description": "Full Floor Penthouse | Panoramic View | Listed 8 Days ago"},
+    {"project": "Safa One", "property_type": "Apartment", "price": 25827000, "area_sqft": 6357, "bedrooms": "4", "bathrooms": "5", "location": "Al Safa 1, Dubai", "developer": "Damac Properties", "description": "Full Floor Penthouse | Panoramic View | Listed 8 Days ago"},
+    {"project": "Safa One", "property_type": "Apartment", "price": 7944000, "area_sqft": 2877, "bedrooms": "4", "bathrooms": "5", "location": "Al Safa 1, Dubai", "developer": "Damac Properties", "description": "Full Floor Penthouse | Panoramic View | Listed 1 Day ago"},
+    {"project": "Safa One", "property_type": "Apartment", "price": 7923000, "area_sqft": 2870, "bedrooms": "4", "bathrooms": "5", "location": "Al Safa 1, Dubai", "developer": "Damac Properties", "description": "Full Floor Penthouse | Panoramic View | Listed 11 Days ago"}
+]
+
+# Listing data by project name
+PROJECT_DATA = {
+    "Safa One": SAFA_ONE_DATA,
+    "Safa Two": SAFA_TWO_DATA
+}
+
+# Project information
+PROJECT_INFO = {
+    "Safa One": {
+        "location": "Al Safa 1, Dubai",
+        "latitude": 25.1867,
+        "longitude": 55.2386,
+        "developer": "Damac Properties",
+        "delivery_date": "Q2 2026",
+        "sales_started": "September 2022",
+        "payment_plan": "20/40/40",
+        "description": "Safa One by de GRISOGONO is an ultra-luxury residential project featuring one of the highest hanging gardens in the world. Located in the prestigious Al Safa area along Sheikh Zayed Road, it offers stunning views of Burj Al Arab, Palm Jumeirah, and Dubai's iconic skyline.",
+        "features": ["Hanging gardens", "Infinity pool", "Luxury spa", "Private beach access", "24/7 concierge", "Smart home technology", "Branded interiors by de GRISOGONO"]
+    },
+    "Safa Two": {
+        "location": "Business Bay, Dubai",
+        "latitude": 25.1879,
+        "longitude": 55.2606,
+        "developer": "Damac Properties",
+        "delivery_date": "Q2 2027",
+        "sales_started": "March 2023",
+        "payment_plan": "20/55/25",
+        "description": "Safa Two is a luxury residential development in Business Bay featuring de GRISOGONO interiors. The twin-tower project offers premium units with breathtaking views of Dubai Canal, Burj Khalifa, and the city skyline.",
+        "features": ["Luxury branded residences", "Premium views", "Infinity pools", "Spa and wellness center", "Fitness facilities", "Kids play area", "De GRISOGONO interiors"]
+    }
+}
+
+
+def analyze_data(property_data):
+    """Analyze the property data"""
+    # Convert to DataFrame
+    df = pd.DataFrame(property_data)
+    
+    # Validate first; quarantined rows are kept out of every statistic and the archive
+    validation = validate_listings(df)
+    df = validation['valid']
+    
+    # Calculate price per sqft
+    df['price_per_sqft'] = df['price'] / df['area_sqft']
+    
+    # Listing age, feature bullets and their HTML, derived from the descriptions in one pass
+    df = df.join(process_descriptions(df['description']))
+    
+    # Basic statistics overall
+    stats_overall = {
+        'total_listings': len(df),
+        'avg_price': df['price'].mean(),
+        'min_price': df['price'].min(),
+        'max_price': df['price'].max(),
+        'median_price': df['price'].median(),
+        'avg_price_per_sqft': df['price_per_sqft'].mean(),
+        'min_price_per_sqft': df['price_per_sqft'].min(),
+        'max_price_per_sqft': df['price_per_sqft'].max(),
+        'avg_area': df['area_sqft'].mean(),
+        'min_area': df['area_sqft'].min(),
+        'max_area': df['area_sqft'].max()
+    }
+    
+    # Group by bedroom type and calculate statistics
+    bedroom_stats = df.groupby('bedrooms').agg({
+        'price': ['count', 'min', 'max', 'mean', 'median'],
+        'area_sqft': ['min', 'max', 'mean'],
+        'price_per_sqft': ['min', 'max', 'mean']
+    }).reset_index()
+    
+    # Rename columns for clarity
+    bedroom_stats.columns = ['bedrooms', 'count', 'min_price', 'max_price', 'avg_price', 'median_price', 
+                            'min_area', 'max_area', 'avg_area', 'min_price_per_sqft', 
+                            'max_price_per_sqft', 'avg_price_per_sqft']
+    
+    # Sort by bedrooms (with studio first, then numeric)
+    bedroom_order = {'studio': 0, '1': 1, '2': 2, '3': 3, '4': 4}
+    bedroom_stats['bedroom_order'] = bedroom_stats['bedrooms'].map(bedroom_order)
+    bedroom_stats = bedroom_stats.sort_values('bedroom_order').drop('bedroom_order', axis=1)
+    
+    # Statistics by bathroom count
+    bathroom_stats = df.groupby(['bedrooms', 'bathrooms']).agg({
+        'price': ['count', 'min', 'max', 'mean'],
+        'area_sqft': ['min', 'max', 'mean'],
+        'price_per_sqft': 'mean'
+    }).reset_index()
+    
+    # Rename columns for clarity
+    bathroom_stats.columns = ['bedrooms', 'bathrooms', 'count', 'min_price', 'max_price', 'avg_price', 
+                             'min_area', 'max_area', 'avg_area', 'avg_price_per_sqft']
+    
+    # Sort by bedrooms and bathrooms
+    bathroom_stats['bedroom_order'] = bathroom_stats['bedrooms'].map(bedroom_order)
+    bathroom_stats = bathroom_stats.sort_values(['bedroom_order', 'bathrooms']).drop('bedroom_order', axis=1)
+    
+    # Statistics by listing age, in ordered buckets
+    listing_days_counts = DEFAULT_BUCKETS.histogram(df['listing_age_days'])
+    
+    return {
+        'dataframe': df,
+        'stats_overall': stats_overall,
+        'bedroom_stats': bedroom_stats,
+        'bathroom_stats': bathroom_stats,
+        'listing_days_stats': listing_days_counts,
+        'quarantine': validation['quarantine'],
+        'validation_issues': validation['issues']
+    }
+
+
+def get_listing_archive(project_name, property_data, analyze=analyze_data):
+    """Open the memory-mapped listings archive for a project, archiving new data first"""
+    version = data_version(property_data)
+    entry = next((s for s in list_snapshots(project_name) if s['version'] == version), None)
+    # Snapshots archived before validation or the description columns existed are written again
+    if (entry is None or entry.get('quarantined') is None
+            or not set(DESCRIPTION_COLUMNS) <= set(open_archive(project_name, entry['snapshot']).table.column_names)):
+        analysis = analyze(property_data)
+        return open_archive(project_name, write_archive(project_name, analysis['dataframe'], version,
+                                                        quarantined=len(analysis['quarantine'])))
+    return open_archive(project_name, entry['snapshot'])
+
+
+def ingest_projects(project_data=PROJECT_DATA):
+    """Archive and materialize any new project data, analyzing each new data version once
+
+    Returns the current data version of every project.
+    """
+    analyze = analyze_once(analyze_data)
+    versions = {}
+    for name, data in project_data.items():
+        get_listing_archive(name, data, analyze)
+        versions[name] = ingest(name, data, analyze, data_version(data))
+    return versions
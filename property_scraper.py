@@ -4,11 +4,37 @@ import matplotlib.pyplot as plt
 import seaborn as sns
 import numpy as np
 from datetime import datetime
+import copy
 import os
+import threading
 import plotly.express as px
 import plotly.graph_objects as go
 from plotly.subplots import make_subplots
-import re
+import plotly.io as pio
+from fair_value import FairValueModel, rank_underpriced
+from cache_backend import get_cache_backend, data_version, make_key
+from materialize import analyze_once, ingest, load_aggregates, bedroom_label
+from listing_store import open_archive, list_snapshots
+from listings_grid import SORT_COLUMNS, PAGE_SIZES, grid_window
+from lifecycle import build_lifecycle
+from cashflow import make_scenarios, evaluate_listings, cash_flow_schedule
+from monte_carlo import simulate_project
+from comparables import ComparablesIndex
+from text_search import SearchIndex
+from cube import DIMENSIONS, build_cube
+from shared_data import SharedDataset, get_shared_dataset, get_shared_dataset_nowait
+from sampling import preview_stats
+from charts import (format_currency, format_area, unit_type_table, simplified_unit_types, listing_days_chart,
+                    price_comparison_chart, listing_age_comparison_chart, listing_age_pie, investment_table,
+                    project_map, price_index_chart, PROJECT_COLORS)
+from geo import build_geo_grid, project_locations
+from price_index import SEGMENT_TYPES, update_price_index, index_series
+from listing_age import DEFAULT_EDGES, ListingAgeBuckets, parse_edges
+from components import inject_styles, metric_cards, comparison_card, summary_card, html_table
+from currency import (CURRENCIES, AREA_UNITS, AED_SQFT, display_units, column_factor, convert_frame, convert_stats,
+                      convert_aggregates)
+from warmup import current_prewarm
+from projects import SAFA_ONE_DATA, SAFA_TWO_DATA, PROJECT_DATA, PROJECT_INFO, analyze_data, get_listing_archive
 
 # Set page configuration
 st.set_page_config(
@@ -18,547 +44,199 @@ st.set_page_config(
     initial_sidebar_state="collapsed"
 )
 
-# Enhanced custom CSS styling
-st.markdown("""
-<style>
-    /* General typography */
-    body {
-        font-family: 'Segoe UI', Arial, sans-serif;
-    }
-    
-    /* Header styles */
-    .main-header {
-        font-size: 38px !important;
-        font-weight: 700;
-        color: #0d3b66;
-        margin-bottom: 30px;
-        text-align: center;
-        padding: 20px 0;
-        border-bottom: 2px solid #f0f2f6;
-        text-shadow: 1px 1px 2px rgba(0,0,0,0.1);
-    }
-    
-    .sub-header {
-        font-size: 24px;
-        font-weight: 600;
-        color: #0d3b66;
-        margin-top: 35px;
-        margin-bottom: 15px;
-        padding-bottom: 8px;
-        border-bottom: 1px solid #e0e7ff;
-    }
-    
-    .project-title {
-        font-size: 30px;
-        font-weight: 600;
-        color: #0d3b66;
-        margin: 25px 0 20px 0;
-        text-align: center;
-        padding: 10px 0;
-        border-bottom: 1px solid #e0e7ff;
-    }
-    
-    /* Card styles */
-    .metric-card {
-        background-color: #ffffff;
-        border-radius: 12px;
-        padding: 18px;
-        box-shadow: 0 4px 12px rgba(0, 0, 0, 0.08);
-        transition: transform 0.2s ease, box-shadow 0.2s ease;
-        height: 100%;
-        border: 1px solid #f0f2f6;
-    }
-    
-    .metric-card:hover {
-        transform: translateY(-3px);
-        box-shadow: 0 6px 16px rgba(0, 0, 0, 0.12);
-    }
-    
-    .metric-value {
-        font-size: 26px;
-        font-weight: 700;
-        color: #0d3b66;
-        margin-bottom: 5px;
-    }
-    
-    .metric-label {
-        font-size: 14px;
-        color: #64748b;
-        font-weight: 500;
-    }
-    
-    .info-box {
-        background-color: #f0f7ff;
-        border-left: 5px solid #0d3b66;
-        padding: 18px;
-        border-radius: 8px;
-        margin-bottom: 25px;
-        box-shadow: 0 2px 8px rgba(0, 0, 0, 0.05);
-    }
-    
-    .data-table {
-        border-radius: 12px;
-        overflow: hidden;
-        box-shadow: 0 4px 8px rgba(0, 0, 0, 0.08);
-        margin-top: 15px;
-        margin-bottom: 30px;
-    }
-    
-    .project-card {
-        background-color: white;
-        border-radius: 12px;
-        padding: 24px;
-        margin-bottom: 25px;
-        box-shadow: 0 4px 16px rgba(0, 0, 0, 0.08);
-        transition: transform 0.2s ease;
-        border: 1px solid #f0f2f6;
-        height: 100%;
-    }
-    
-    .project-card:hover {
-        transform: translateY(-5px);
-        box-shadow: 0 8px 24px rgba(0, 0, 0, 0.12);
-    }
-    
-    .project-image {
-        border-radius: 8px;
-        width: 100%;
-        margin-bottom: 20px;
-        transition: transform 0.3s ease;
-        box-shadow: 0 4px 12px rgba(0, 0, 0, 0.15);
-    }
-    
-    .project-image:hover {
-        transform: scale(1.02);
-    }
-    
-    /* Table styles */
-    .compare-table th {
-        background-color: #f0f7ff;
-        padding: 12px !important;
-    }
-    
-    .compare-table td {
-        padding: 12px !important;
-    }
-    
-    /* Tab styling */
-    .stTabs [data-baseweb="tab-list"] {
-        gap: 10px;
-    }
-    
-    .stTabs [data-baseweb="tab"] {
-        background-color: #f8fafc;
-        border-radius: 4px 4px 0 0;
-        padding: 8px 20px !important;
-        font-weight: 600;
-    }
-    
-    .stTabs [aria-selected="true"] {
-        background-color: #0d3b66 !important;
-        color: white !important;
-    }
-    
-    /* Button styling */
-    .stButton > button {
-        background-color: #0d3b66;
-        color: white;
-        font-weight: 600;
-        border-radius: 6px;
-        padding: 4px 15px;
-        border: none;
-        box-shadow: 0 3px 5px rgba(0, 0, 0, 0.15);
-    }
-    
-    .stButton > button:hover {
-        background-color: #0a2a4a;
-        box-shadow: 0 5px 10px rgba(0, 0, 0, 0.2);
-    }
-    
-    /* Selectbox styling */
-    .stSelectbox div[data-baseweb="select"] > div {
-        border-radius: 6px;
-        background-color: #f8fafc;
-        border-color: #e2e8f0;
-    }
-    
-    /* Dataframe styling */
-    .dataframe-container {
-        border-radius: 12px !important;
-        overflow: hidden !important;
-        margin-top: 15px;
-    }
-    
-    .dataframe-container [data-testid="stDataFrame"] div {
-        border-radius: 12px !important;
-    }
-    
-    .highlight {
-        font-weight: 600;
-        color: #0d3b66;
-    }
-    
-    .tab-content {
-        padding: 25px 0;
-    }
-    
-    .footer {
-        margin-top: 60px;
-        text-align: center;
-        color: #64748b;
-        font-size: 13px;
-        padding: 20px 0;
-        border-top: 1px solid #e2e8f0;
-    }
-    
-    /* Custom badges */
-    .badge {
-        display: inline-block;
-        padding: 3px 8px;
-        border-radius: 12px;
-        font-size: 12px;
-        font-weight: 600;
-        margin-right: 6px;
-    }
-    
-    .badge-blue {
-        background-color: #dbeafe;
-        color: #1e40af;
-    }
-    
-    .badge-green {
-        background-color: #dcfce7;
-        color: #166534;
-    }
-    
-    .badge-orange {
-        background-color: #ffedd5;
-        color: #9a3412;
-    }
-    
-    /* Feature list styling */
-    .feature-list {
-        list-style-type: none;
-        padding-left: 0;
-    }
-    
-    .feature-list li {
-        margin-bottom: 8px;
-        position: relative;
-        padding-left: 22px;
-    }
-    
-    .feature-list li:before {
-        content: "✓";
-        position: absolute;
-        left: 0;
-        color: #0d3b66;
-        font-weight: bold;
-    }
-    
-    /* Container styling */
-    .content-container {
-        background-color: #ffffff;
-        border-radius: 12px;
-        padding: 25px;
-        box-shadow: 0 4px 12px rgba(0, 0, 0, 0.05);
-        margin-bottom: 25px;
-    }
-    
-    /* Misc */
-    hr.divider {
-        margin: 30px 0;
-        border: none;
-        height: 1px;
-        background-color: #e2e8f0;
-    }
-    
-    .plotly-chart {
-        border-radius: 12px;
-        box-shadow: 0 4px 12px rgba(0, 0, 0, 0.08);
-        padding: 15px;
-        background-color: white;
-    }
-    
-    /* Listing days badge */
-    .listing-badge {
-        display: inline-block;
-        padding: 2px 6px;
-        background-color: #e0e7ff;
-        color: #1e40af;
-        border-radius: 4px;
-        font-size: 12px;
-        font-weight: 600;
-        margin-left: 6px;
-    }
-</style>
-""", unsafe_allow_html=True)
+# Global stylesheet
+inject_styles()
 
 # Create a directory for results
 RESULTS_DIR = "results"
 if not os.path.exists(RESULTS_DIR):
     os.makedirs(RESULTS_DIR)
 
-# Hard-coded property data from Safa Two
-SAFA_TWO_DATA = [
-    # Studios
-     {"project": "Safa Two", "property_type": "Apartment", "price": 949000, "area_sqft": 358, "bedrooms": "studio", "bathrooms": "1", "location": "Business Bay, Dubai", "developer": "Damac Properties", "description": "Spacious Layout | High Floor | Listed 6 Days ago"},
-    {"project": "Safa Two", "property_type": "Apartment", "price": 1280000, "area_sqft": 626, "bedrooms": "studio", "bathrooms": "1", "location": "Business Bay, Dubai", "developer": "Damac Properties", "description": "2% commission | 6% BELOW OP | Listed 2 Months ago"},
-    {"project": "Safa Two", "property_type": "Apartment", "price": 1320000, "area_sqft": 470, "bedrooms": "studio", "bathrooms": "1", "location": "Business Bay, Dubai", "developer": "Damac Properties", "description": "Stunning Views |Studio Apartment | Listed 1 Month ago"},
-    {"project": "Safa Two", "property_type": "Apartment", "price": 1507000, "area_sqft": 730, "bedrooms": "studio", "bathrooms": "1", "location": "Business Bay, Dubai", "developer": "Damac Properties", "description": "Branded and Spacious Studio | High Floor | Listed 5 Months ago"},
-    {"project": "Safa Two", "property_type": "Apartment", "price": 1715000, "area_sqft": 697, "bedrooms": "studio", "bathrooms": "1", "location": "Business Bay, Dubai", "developer": "Damac Properties", "description": "Canal View | Mid Floor | 3.75% Payment Plan | Listed 2 Months ago"},
-    
-    # 1 Bedroom
-    {"project": "Safa Two", "property_type": "Apartment", "price": 1490000, "area_sqft": 791, "bedrooms": "1", "bathrooms": "1", "location": "Business Bay, Dubai", "developer": "Damac Properties", "description": "Super Distress Deal | Premium project | Listed 2 Months ago"},
-    {"project": "Safa Two", "property_type": "Apartment", "price": 1595000, "area_sqft": 683, "bedrooms": "1", "bathrooms": "1", "location": "Business Bay, Dubai", "developer": "Damac Properties", "description": "Luxurious Design | Amazing View | Listed 23 Days Ago"},
-    {"project": "Safa Two", "property_type": "Apartment", "price": 1600000, "area_sqft": 789, "bedrooms": "1", "bathrooms": "1", "location": "Business Bay, Dubai", "developer": "Damac Properties", "description": "12% Under OP | Investor Deal | Premium View |Listed 1 Month ago"},
-    {"project": "Safa Two", "property_type": "Apartment", "price": 1634880, "area_sqft": 714, "bedrooms": "1", "bathrooms": "1", "location": "Business Bay, Dubai", "developer": "Damac Properties", "description": "Stunning Safa Views| High Floor | Listed 2 Months ago"},
-    {"project": "Safa Two", "property_type": "Apartment", "price": 1660000, "area_sqft": 713, "bedrooms": "1", "bathrooms": "1", "location": "Business Bay, Dubai", "developer": "Damac Properties", "description": "ULTRA LUXURY | INCREDIBLE VIEW | Listed 11 Days Ago "},
-    {"project": "Safa Two", "property_type": "Apartment", "price": 1700000, "area_sqft": 792, "bedrooms": "1", "bathrooms": "1", "location": "Business Bay, Dubai", "developer": "Damac Properties", "description": "BELOW OP | SEA VIEW | HIGH FLOOR | Listed 2 Months Ago"},
-    {"project": "Safa Two", "property_type": "Apartment", "price": 1700000, "area_sqft": 792, "bedrooms": "1", "bathrooms": "1", "location": "Business Bay, Dubai", "developer": "Damac Properties", "description": "SEA VIEW | HIGH FLOOR | Q2 2027 | Listed 10 Days Ago"},
-    {"project": "Safa Two", "property_type": "Apartment", "price": 1780000, "area_sqft": 830, "bedrooms": "1", "bathrooms": "1", "location": "Business Bay, Dubai", "developer": "Damac Properties", "description": "Prime location | Listed 24 Days Ago"},
-    {"project": "Safa Two", "property_type": "Apartment", "price": 1800000, "area_sqft": 744, "bedrooms": "1", "bathrooms": "1", "location": "Business Bay, Dubai", "developer": "Damac Properties", "description": "1 Bed | High Floor | Payment Plan | Listed 1 Month Ago"},
-    {"project": "Safa Two", "property_type": "Apartment", "price": 1825000, "area_sqft": 831, "bedrooms": "1", "bathrooms": "1", "location": "Business Bay, Dubai", "developer": "Damac Properties", "description": "INVESTOR DEAL | PRIME LOCATION | Listed 1 Month Ago"},
-    {"project": "Safa Two", "property_type": "Apartment", "price": 1843500, "area_sqft": 758, "bedrooms": "1", "bathrooms": "1", "location": "Business Bay, Dubai", "developer": "Damac Properties", "description": "Premium View | Luxurious | Listed 1 Month Ago"},
-    {"project": "Safa Two", "property_type": "Apartment", "price": 1850000, "area_sqft": 775, "bedrooms": "1", "bathrooms": "1", "location": "Business Bay, Dubai", "developer": "Damac Properties", "description": "1BR with Spectacular View | High Floor | Listed 26 Days Ago"},
-    {"project": "Safa Two", "property_type": "Apartment", "price": 1900000, "area_sqft": 745, "bedrooms": "1", "bathrooms": "1", "location": "Business Bay, Dubai", "developer": "Damac Properties", "description": "Sea view | Safa 2 | Q3 2027 | Listed 6 Days Ago"},
-    {"project": "Safa Two", "property_type": "Apartment", "price": 1900000, "area_sqft": 753, "bedrooms": "1", "bathrooms": "2", "location": "Business Bay, Dubai", "developer": "Damac Properties", "description": "Spacious >> Canal view >> Listed 8 Days Ago"},
-    {"project": "Safa Two", "property_type": "Apartment", "price": 1990000, "area_sqft": 771, "bedrooms": "1", "bathrooms": "1", "location": "Business Bay, Dubai", "developer": "Damac Properties", "description": "Branded and fully furnished | Listed 16 Days Ago"},
-    {"project": "Safa Two", "property_type": "Apartment", "price": 1999989, "area_sqft": 827, "bedrooms": "1", "bathrooms": "1", "location": "Business Bay, Dubai", "developer": "Damac Properties", "description": "High Floor | Motivated Seller | Listed 16 Days Ago"},
-    {"project": "Safa Two", "property_type": "Apartment", "price": 2000000, "area_sqft": 803, "bedrooms": "1", "bathrooms": "1", "location": "Business Bay, Dubai", "developer": "Damac Properties", "description": "Distressed Deal Motivated Seller | Listed 2 Months Ago"},
-    {"project": "Safa Two", "property_type": "Apartment", "price": 2000000, "area_sqft": 744, "bedrooms": "1", "bathrooms": "1", "location": "Business Bay, Dubai", "developer": "Damac Properties", "description": "Damac | Safa Two | High floor | Listed 1 Month Ago"},
-    {"project": "Safa Two", "property_type": "Apartment", "price": 2170000, "area_sqft": 775, "bedrooms": "1", "bathrooms": "1", "location": "Business Bay, Dubai", "developer": "Damac Properties", "description": "Higher Floor || Modern Unit 1 Bedroom || Listed 2 Months Ago"},
-    {"project": "Safa Two", "property_type": "Apartment", "price": 2175000, "area_sqft": 762, "bedrooms": "1", "bathrooms": "1", "location": "Business Bay, Dubai", "developer": "Damac Properties", "description": "LOW PRICE | PARK & SEA VIEW | Listed 1 Month Ago"},
-    {"project": "Safa Two", "property_type": "Apartment", "price": 2200000, "area_sqft": 812, "bedrooms": "1", "bathrooms": "1", "location": "Business Bay, Dubai", "developer": "Damac Properties", "description": " Listed 2 Days Ago"},
-    {"project": "Safa Two", "property_type": "Apartment", "price": 2200000, "area_sqft": 829, "bedrooms": "1", "bathrooms": "2", "location": "Business Bay, Dubai", "developer": "Damac Properties", "description": "Premium layout | High floor | Listed 19 Days Ago"},
-    {"project": "Safa Two", "property_type": "Apartment", "price": 2222000, "area_sqft": 744, "bedrooms": "1", "bathrooms": "1", "location": "Business Bay, Dubai", "developer": "Damac Properties", "description": "Damac | Safa Two | Sea view | Listed 20 Days Ago"},
-    {"project": "Safa Two", "property_type": "Apartment", "price": 2222000, "area_sqft": 771, "bedrooms": "1", "bathrooms": "1", "location": "Business Bay, Dubai", "developer": "Damac Properties", "description": "Damac | Safa Two | Sea view | High floor | Listed 3 Months Ago"},
-    
-    # 1 Bedroom with 2 Bathrooms
-    {"project": "Safa Two", "property_type": "Apartment", "price": 1599000, "area_sqft": 757, "bedrooms": "1", "bathrooms": "2", "location": "Business Bay, Dubai", "developer": "Damac Properties", "description": "High ROI | Burj-Palm Views| Listed 23 Days Ago"},
-    {"project": "Safa Two", "property_type": "Apartment", "price": 1650000, "area_sqft": 794, "bedrooms": "1", "bathrooms": "2", "location": "Business Bay, Dubai", "developer": "Damac Properties", "description": "Below OP | High Floor | City View | Listed 13 Days Ago"},
-    {"project": "Safa Two", "property_type": "Apartment", "price": 1690000, "area_sqft": 795, "bedrooms": "1", "bathrooms": "2", "location": "Business Bay, Dubai", "developer": "Damac Properties", "description": "Sea View | High Floor | LIsted 10 Days Ago "},
-    {"project": "Safa Two", "property_type": "Apartment", "price": 1800000, "area_sqft": 776, "bedrooms": "1", "bathrooms": "2", "location": "Business Bay, Dubai", "developer": "Damac Properties", "description": "High Floor | Sea View | Listed 1 Month Ago"},
-    {"project": "Safa Two", "property_type": "Apartment", "price": 1850000, "area_sqft": 776, "bedrooms": "1", "bathrooms": "2", "location": "Business Bay, Dubai", "developer": "Damac Properties", "description": "Sea View | Negotiable | Urgent Sale | Listed 2 Months Ago"},
-    {"project": "Safa Two", "property_type": "Apartment", "price": 1889999, "area_sqft": 774, "bedrooms": "1", "bathrooms": "2", "location": "Business Bay, Dubai", "developer": "Damac Properties", "description": "Original Price | Very High Floor | Listed 1 Month ago"},
-    {"project": "Safa Two", "property_type": "Apartment", "price": 1900000, "area_sqft": 688, "bedrooms": "1", "bathrooms": "2", "location": "Business Bay, Dubai", "developer": "Damac Properties", "description": "Multiple Units | 1-Bedroom Apartment | Listed 8 Days Ago"},
-    {"project": "Safa Two", "property_type": "Apartment", "price": 2800000, "area_sqft": 744, "bedrooms": "1", "bathrooms": "2", "location": "Business Bay, Dubai", "developer": "Damac Properties", "description": "Ultra Luxury Unit /Above 70th Floor / Listed 2 Days ago"},
-    
-    # 2 Bedrooms
-    {"project": "Safa Two", "property_type": "Apartment", "price": 2293200, "area_sqft": 1154, "bedrooms": "2", "bathrooms": "2", "location": "Business Bay, Dubai", "developer": "Damac Properties", "description": "Luxury 2-bedroom | Middle Floor | Lisetd 19 Days Ago"},
-    {"project": "Safa Two", "property_type": "Apartment", "price": 2405000, "area_sqft": 1208, "bedrooms": "2", "bathrooms": "2", "location": "Business Bay, Dubai", "developer": "Damac Properties", "description": "Sleek Design | Community View |Listed 2 Months ago"},
-    {"project": "Safa Two", "property_type": "Apartment", "price": 2436525, "area_sqft": 1172, "bedrooms": "2", "bathrooms": "2", "location": "Business Bay, Dubai", "developer": "Damac Properties", "description": "15% Below Original Price | Above 55TH Floor |Listed 12 Dasy Ago"},
-    {"project": "Safa Two", "property_type": "Apartment", "price": 2450000, "area_sqft": 1054, "bedrooms": "2", "bathrooms": "2", "location": "Business Bay, Dubai", "developer": "Damac Properties", "description": "Eminence Homes Real Estate| Lisetd 1 Month ago"},
-    {"project": "Safa Two", "property_type": "Apartment", "price": 2550000, "area_sqft": 1208, "bedrooms": "2", "bathrooms": "2", "location": "Business Bay, Dubai", "developer": "Damac Properties", "description": "Resale Payment Plan Branded Residence I High Floor | Listed 2 Months ago"},
-    {"project": "Safa Two", "property_type": "Apartment", "price": 2700000, "area_sqft": 1138, "bedrooms": "2", "bathrooms": "2", "location": "Business Bay, Dubai", "developer": "Damac Properties", "description": "Luxury Unit | Payment Plan | Exclusive Resale | Listed 10 Days ago"},
-    {"project": "Safa Two", "property_type": "Apartment", "price": 2750000, "area_sqft": 1355, "bedrooms": "2", "bathrooms": "2", "location": "Business Bay, Dubai", "developer": "Damac Properties", "description": "Distress | Lower OP | Damac Luxury 2br | Listed 4 Days ago"},
-    {"project": "Safa Two", "property_type": "Apartment", "price": 2850000, "area_sqft": 1138, "bedrooms": "2", "bathrooms": "2", "location": "Business Bay, Dubai", "developer": "Damac Properties", "description": "PERFECT LAYOUT l LUXURY UNIT | Listed 23 Days ago"},
-    {"project": "Safa Two", "property_type": "Apartment", "price": 2900000, "area_sqft": 1144, "bedrooms": "2", "bathrooms": "2", "location": "Business Bay, Dubai", "developer": "Damac Properties", "description": "Iconic Design | Unique Feature | Listed 1 Month ago"},
-    {"project": "Safa Two", "property_type": "Apartment", "price": 2900000, "area_sqft": 1172, "bedrooms": "2", "bathrooms": "2", "location": "Business Bay, Dubai", "developer": "Damac Properties", "description": "Resale| High floor| Dubai Canal and Park view| Listed 6 Months ago"},
-    {"project": "Safa Two", "property_type": "Apartment", "price": 3050000, "area_sqft": 1145, "bedrooms": "2", "bathrooms": "2", "location": "Business Bay, Dubai", "developer": "Damac Properties", "description": "Luxury + Spacious 2BR | Prime Location | Listed 19 Days ago"},
-    {"project": "Safa Two", "property_type": "Apartment", "price": 3299000, "area_sqft": 1463, "bedrooms": "2", "bathrooms": "2", "location": "Business Bay, Dubai", "developer": "Damac Properties", "description": "Damac | Bargain | High floor | Listed 2 Days ago"},
-    {"project": "Safa Two", "property_type": "Apartment", "price": 3375900, "area_sqft": 1148, "bedrooms": "2", "bathrooms": "2", "location": "Business Bay, Dubai", "developer": "Damac Properties", "description": "Excellent Location | Branded Luxury Residence | Listed 4 days ago"},
-    {"project": "Safa Two", "property_type": "Apartment", "price": 3450000, "area_sqft": 1049, "bedrooms": "2", "bathrooms": "2", "location": "Business Bay, Dubai", "developer": "Damac Properties", "description": "Great Investment | Prime Spot | Listed 19 days ago"},
-    {"project": "Safa Two", "property_type": "Apartment", "price": 4300000, "area_sqft": 1420, "bedrooms": "2", "bathrooms": "2", "location": "Business Bay, Dubai", "developer": "Damac Properties", "description": "Exclusive | Luxury | High Floor | Listed 3 Days ago"},
-    {"project": "Safa Two", "property_type": "Apartment", "price": 4554200, "area_sqft": 1311, "bedrooms": "2", "bathrooms": "2", "location": "Business Bay, Dubai", "developer": "Damac Properties", "description": "Luxury Branded Apartment | Listed 4 Days ago"},
-    
-    # 2 Bedrooms with 3 Bathrooms
-    {"project": "Safa Two", "property_type": "Apartment", "price": 2600000, "area_sqft": 1172, "bedrooms": "2", "bathrooms": "3", "location": "Business Bay, Dubai", "developer": "Damac Properties", "description": "Branded Residence | Genuine Resale | Listed 13 Days ago"},
-    {"project": "Safa Two", "property_type": "Apartment", "price": 2700000, "area_sqft": 1124, "bedrooms": "2", "bathrooms": "3", "location": "Business Bay, Dubai", "developer": "Damac Properties", "description": "Luxurious | Burj Khalifa View | Listed 10 days ago"},
-    {"project": "Safa Two", "property_type": "Apartment", "price": 2700000, "area_sqft": 1294, "bedrooms": "2", "bathrooms": "3", "location": "Business Bay, Dubai", "developer": "Damac Properties", "description": "Listed 2 Months ago"},
-    {"project": "Safa Two", "property_type": "Apartment", "price": 2850000, "area_sqft": 1130, "bedrooms": "2", "bathrooms": "3", "location": "Business Bay, Dubai", "developer": "Damac Properties", "description": "Welcome agents | Price is negotiable | Listed 23 Days ago"},
-    {"project": "Safa Two", "property_type": "Apartment", "price": 2850000, "area_sqft": 1557, "bedrooms": "2", "bathrooms": "3", "location": "Business Bay, Dubai", "developer": "Damac Properties", "description": "BELOW ORIGINAL PRICE | HUGE PREMIUM LAYOUT | Listed 2 Months ago"},
-    {"project": "Safa Two", "property_type": "Apartment", "price": 3200000, "area_sqft": 1399, "bedrooms": "2", "bathrooms": "3", "location": "Business Bay, Dubai", "developer": "Damac Properties", "description": "Provident Estate | Listed 1 Month ago"},
-    {"project": "Safa Two", "property_type": "Apartment", "price": 3600000, "area_sqft": 1426, "bedrooms": "2", "bathrooms": "3", "location": "Business Bay, Dubai", "developer": "Damac Properties", "description": "Corner 2 beds, payment plan, Downtown view | Listed 1 Month ago"},
-    
-    # 3 Bedrooms
-    {"project": "Safa Two", "property_type": "Apartment", "price": 3269890, "area_sqft": 1493, "bedrooms": "3", "bathrooms": "4", "location": "Business Bay, Dubai", "developer": "Damac Properties", "description": "Skyline Views | Luxurious 3BR | Listed 5 days ago"},
-    {"project": "Safa Two", "property_type": "Apartment", "price": 3269990, "area_sqft": 1484, "bedrooms": "3", "bathrooms": "3", "location": "Business Bay, Dubai", "developer": "Damac Properties", "description": "Downtown Skyline Views | Luxury Living | Listed 9 Days ago"},
-    {"project": "Safa Two", "property_type": "Apartment", "price": 3800000, "area_sqft": 1503, "bedrooms": "3", "bathrooms": "3", "location": "Business Bay, Dubai", "developer": "Damac Properties", "description": "haus & haus Real Estate | Listed 1 Month ago"},
-    {"project": "Safa Two", "property_type": "Apartment", "price": 4250000, "area_sqft": 1735, "bedrooms": "3", "bathrooms": "3", "location": "Business Bay, Dubai", "developer": "Damac Properties", "description": "Exclusif 3 Bed, Corner, Tower A - Sea, Canal View |Listed 1 month ago "},
-    {"project": "Safa Two", "property_type": "Apartment", "price": 4477000, "area_sqft": 1523, "bedrooms": "3", "bathrooms": "3", "location": "Business Bay, Dubai", "developer": "Damac Properties", "description": "Exclusive 3 Bedroom | 70+ Floor | Safa Two Tower A| listed 3 months ago"},
-    {"project": "Safa Two", "property_type": "Apartment", "price": 4500000, "area_sqft": 2001, "bedrooms": "3", "bathrooms": "4", "location": "Business Bay, Dubai", "developer": "Damac Properties", "description": "Driven Properties | Listed 1 Month ago"},
-    {"project": "Safa Two", "property_type": "Apartment", "price": 4900000, "area_sqft": 1658, "bedrooms": "3", "bathrooms": "4", "location": "Business Bay, Dubai", "developer": "Damac Properties", "description": "High Floor | Corner Unit | Two balconies and study | Listed 19 Days ago"},
-    {"project": "Safa Two", "property_type": "Apartment", "price": 4995000, "area_sqft": 1710, "bedrooms": "3", "bathrooms": "4", "location": "Business Bay, Dubai", "developer": "Damac Properties", "description": "Premium View I Corner Unit I 3 BHK I At Safa Two | listed 1 Month ago"}
-]
+# With at least this many listings in total, the dashboard opens on a sampled preview while the
+# exact aggregates are built in the background; the budget is per project, in seconds
+PREVIEW_MIN_ROWS = int(os.environ.get('SAFA_PREVIEW_MIN_ROWS', 200_000))
+PREVIEW_BUDGET_SECONDS = float(os.environ.get('SAFA_PREVIEW_BUDGET', 0.5))
+PREVIEW_POLL_SECONDS = 2
 
+@st.cache_resource
+def get_analysis_cache():
+    """Shared cache backend for analysis results and figure JSON (see SAFA_CACHE_* settings)"""
+    return get_cache_backend()
 
-# Hard-coded property data from Safa One
-SAFA_ONE_DATA = [
-    # 1 Bedroom properties 
-    {"project": "Safa One", "property_type": "Apartment", "price": 1600000, "area_sqft": 838, "bedrooms": "1", "bathrooms": "2", "location": "Al Safa 1, Dubai", "developer": "Damac Properties", "description": "-14% Below Original Price | High Floor | Listed 14 Days ago"},
-    {"project": "Safa One", "property_type": "Apartment", "price": 1699990, "area_sqft": 840, "bedrooms": "1", "bathrooms": "2", "location": "Al Safa 1, Dubai", "developer": "Damac Properties", "description": "High Floor | Prime Location | Listed 2 Months ago"},
-    {"project": "Safa One", "property_type": "Apartment", "price": 1742182, "area_sqft": 838, "bedrooms": "1", "bathrooms": "1", "location": "Al Safa 1, Dubai", "developer": "Damac Properties", "description": "Sea, Burj Al Arab View | Prime Location | Lsted 4 Days ago"},
-    {"project": "Safa One", "property_type": "Apartment", "price": 1750000, "area_sqft": 836, "bedrooms": "1", "bathrooms": "1", "location": "Al Safa 1, Dubai", "developer": "Damac Properties", "description": "High Floor | Amazing View | Listed 1 Month ago"},
-    {"project": "Safa One", "property_type": "Apartment", "price": 1790000, "area_sqft": 838, "bedrooms": "1", "bathrooms": "2", "location": "Al Safa 1, Dubai", "developer": "Damac Properties", "description": "Below Original Price | High Floor | Listed 20 days ago"},
-    {"project": "Safa One", "property_type": "Apartment", "price": 1811000, "area_sqft": 838, "bedrooms": "1", "bathrooms": "2", "location": "Al Safa 1, Dubai", "developer": "Damac Properties", "description": "Amazing View | High Floor | Listed 3 months ago"},
-    {"project": "Safa One", "property_type": "Apartment", "price": 1811000, "area_sqft": 838, "bedrooms": "1", "bathrooms": "1", "location": "Al Safa 1, Dubai", "developer": "Damac Properties", "description": "Investor Deal | Spacious | Listed 11 Days ago"},
-    {"project": "Safa One", "property_type": "Apartment", "price": 1850000, "area_sqft": 836, "bedrooms": "1", "bathrooms": "1", "location": "Al Safa 1, Dubai", "developer": "Damac Properties", "description": "Urgent Sale | Listed 1 Month ago"},
-    {"project": "Safa One", "property_type": "Apartment", "price": 1873000, "area_sqft": 850, "bedrooms": "1", "bathrooms": "2", "location": "Al Safa 1, Dubai", "developer": "Damac Properties", "description": "Investor Deal | High Floor | Listed 1 month ago"},
-    {"project": "Safa One", "property_type": "Apartment", "price": 1873000, "area_sqft": 840, "bedrooms": "1", "bathrooms": "1", "location": "Al Safa 1, Dubai", "developer": "Damac Properties", "description": "Prime Location| Sea Views | Listed 1 Month ago"},
-    {"project": "Safa One", "property_type": "Apartment", "price": 2100000, "area_sqft": 850, "bedrooms": "1", "bathrooms": "2", "location": "Al Safa 1, Dubai", "developer": "Damac Properties", "description": "Prime Location | Burj Al Arab View | Listed 6 Months ago"},
-    {"project": "Safa One", "property_type": "Apartment", "price": 2200000, "area_sqft": 838, "bedrooms": "1", "bathrooms": "2", "location": "Al Safa 1, Dubai", "developer": "Damac Properties", "description": "Handover 2026 | Genuine Resale | Listed 1 Month ago"},
-    {"project": "Safa One", "property_type": "Apartment", "price": 2500000, "area_sqft": 838, "bedrooms": "1", "bathrooms": "2", "location": "Al Safa 1, Dubai", "developer": "Damac Properties", "description": "Safa One | 1 bed | Sea View | Listed 3 Months ago"},
-    
-    # 2 Bedroom properties
-    {"project": "Safa One", "property_type": "Apartment", "price": 2393000, "area_sqft": 1231, "bedrooms": "2", "bathrooms": "3", "location": "Al Safa 1, Dubai", "developer": "Damac Properties", "description": "Best Deal | Corner Unit | Listed 1 Month ago"},
-    {"project": "Safa One", "property_type": "Apartment", "price": 2393000, "area_sqft": 1231, "bedrooms": "2", "bathrooms": "3", "location": "Al Safa 1, Dubai", "developer": "Damac Properties", "description": "Exclusive Offer | High ROI | Listed 6 Months ago"},
-    {"project": "Safa One", "property_type": "Apartment", "price": 2480998, "area_sqft": 1231, "bedrooms": "2", "bathrooms": "2", "location": "Al Safa 1, Dubai", "developer": "Damac Properties", "description": "Full Sea and Burj Al Arab View | Listed 4 days ago"},
-    {"project": "Safa One", "property_type": "Apartment", "price": 2566000, "area_sqft": 1226, "bedrooms": "2", "bathrooms": "3", "location": "Al Safa 1, Dubai", "developer": "Damac Properties", "description": "Wasl Park View | High Floor | Listed 1 Month ago"},
-    {"project": "Safa One", "property_type": "Apartment", "price": 2600000, "area_sqft": 1222, "bedrooms": "2", "bathrooms": "3", "location": "Al Safa 1, Dubai", "developer": "Damac Properties", "description": "Exclusive Resale | 2BR in Al Safa One | Listed 2 Months ago"},
-    {"project": "Safa One", "property_type": "Apartment", "price": 2900000, "area_sqft": 1231, "bedrooms": "2", "bathrooms": "3", "location": "Al Safa 1, Dubai", "developer": "Damac Properties", "description": "Investor Deal I Mid Floor I Modern Living| Listed 1 Month ago"},
-    {"project": "Safa One", "property_type": "Apartment", "price": 3050000, "area_sqft": 1229, "bedrooms": "2", "bathrooms": "3", "location": "Al Safa 1, Dubai", "developer": "Damac Properties", "description": "Spacious Living I Good Location I Investor Deal| Listed 1 Month ago"},
-    {"project": "Safa One", "property_type": "Apartment", "price": 3050000, "area_sqft": 1223, "bedrooms": "2", "bathrooms": "2", "location": "Al Safa 1, Dubai", "developer": "Damac Properties", "description": "Stunning Views | 2BR-Luxury Layout | Listed 10 Days ago"},
-    {"project": "Safa One", "property_type": "Apartment", "price": 3100000, "area_sqft": 1221, "bedrooms": "2", "bathrooms": "3", "location": "Al Safa 1, Dubai", "developer": "Damac Properties", "description": "Investor Deal I Exclusive Luxury 2 BHK | Listed 2 Months ago"},
-    {"project": "Safa One", "property_type": "Apartment", "price": 3100000, "area_sqft": 1231, "bedrooms": "2", "bathrooms": "3", "location": "Al Safa 1, Dubai", "developer": "Damac Properties", "description": "Luxurious Living I Good Location I Investor Deal | Listed 1 Month ago"},
-    {"project": "Safa One", "property_type": "Apartment", "price": 3400000, "area_sqft": 1223, "bedrooms": "2", "bathrooms": "3", "location": "Al Safa 1, Dubai", "developer": "Damac Properties", "description": "Stunning View IHigh Floor |Resale w/ Payment Plan | Listed 6 Months ago"},
-    {"project": "Safa One", "property_type": "Apartment", "price": 3528000, "area_sqft": 1616, "bedrooms": "2", "bathrooms": "2", "location": "Al Safa 1, Dubai", "developer": "Damac Properties", "description": "Below Original Price | Park View | Listed 3 Months ago"},
-    {"project": "Safa One", "property_type": "Apartment", "price": 3725000, "area_sqft": 1586, "bedrooms": "2", "bathrooms": "4", "location": "Al Safa 1, Dubai", "developer": "Damac Properties", "description": "10% Below Original Price | Best Views |Listed 5 Days ago"},
-    {"project": "Safa One", "property_type": "Apartment", "price": 3900000, "area_sqft": 1221, "bedrooms": "2", "bathrooms": "2", "location": "Al Safa 1, Dubai", "developer": "Damac Properties", "description": "2-BR | High Floor | Full Sea View Ultra Luxurious | Listed 1 Month ago"},
-    {"project": "Safa One", "property_type": "Apartment", "price": 4210000, "area_sqft": 2099, "bedrooms": "2", "bathrooms": "2", "location": "Al Safa 1, Dubai", "developer": "Damac Properties", "description": "Prime Location| Sea Views | Listed 1 Month ago"},
-    {"project": "Safa One", "property_type": "Apartment", "price": 5000000, "area_sqft": 1943, "bedrooms": "2", "bathrooms": "3", "location": "Al Safa 1, Dubai", "developer": "Damac Properties", "description": "Spacious Living I Exclusive 2 BHK I Investor Deal | Listed 2 Months ago"},
-    
-    # 3 Bedroom properties
-    {"project": "Safa One", "property_type": "Apartment", "price": 4265508, "area_sqft": 2098, "bedrooms": "3", "bathrooms": "4", "location": "Al Safa 1, Dubai", "developer": "Damac Properties", "description": "Amazing View | High Floor | Listed 11 days ago"},
-    {"project": "Safa One", "property_type": "Apartment", "price": 5037944, "area_sqft": 2630, "bedrooms": "3", "bathrooms": "3", "location": "Al Safa 1, Dubai", "developer": "Damac Properties", "description": "Panoramic Sea View | Luxurious | Listed 4 Days ago"},
-    {"project": "Safa One", "property_type": "Apartment", "price": 5800000, "area_sqft": 2147, "bedrooms": "3", "bathrooms": "4", "location": "Al Safa 1, Dubai", "developer": "Damac Properties", "description": "Luxury 3 BHK I Best in Price I Investor Deal | Listed 2 months ago"},
-    
-    # 4 Bedroom properties
-    {"project": "Safa One", "property_type": "Apartment", "price": 7923000, "area_sqft": 2870, "bedrooms": "4", "bathrooms": "4", "location": "Al Safa 1, Dubai", "developer": "Damac Properties", "description": "Rare 4 Bed Duplex Townhouse | Listed 6 months ago"},
-    {"project": "Safa One", "property_type": "Apartment", "price": 30000000, "area_sqft": 6357, "bedrooms": "4", "bathrooms": "6", "location": "Al Safa 1, Dubai", "developer": "Damac Properties", "description": "Full Floor Penthouse | Panoramic View | Listed 8 Days ago"},
-    {"project": "Safa One", "property_type": "Apartment", "price": 25827000, "area_sqft": 6357, "bedrooms": "4", "bathrooms": "5", "location": "Al Safa 1, Dubai", "developer": "Damac Properties", "description": "Full Floor Penthouse | Panoramic View | Listed 8 Days ago"},
-    {"project": "Safa One", "property_type": "Apartment", "price": 7944000, "area_sqft": 2877, "bedrooms": "4", "bathrooms": "5", "location": "Al Safa 1, Dubai", "developer": "Damac Properties", "description": "Full Floor Penthouse | Panoramic View | Listed 1 Day ago"},
-    {"project": "Safa One", "property_type": "Apartment", "price": 7923000, "area_sqft": 2870, "bedrooms": "4", "bathrooms": "5", "location": "Al Safa 1, Dubai", "developer": "Damac Properties", "description": "Full Floor Penthouse | Panoramic View | Listed 11 Days ago"}
-]
+def cached_figure(key_parts, build_figure):
+    """Build a Plotly figure through the shared cache, stored as figure JSON"""
+    fig_json = get_analysis_cache().get_or_compute(make_key('figure', *key_parts), lambda: build_figure().to_json())
+    return pio.from_json(fig_json)
 
-# Project information
-PROJECT_INFO = {
-    "Safa One": {
-        "location": "Al Safa 1, Dubai",
-        "developer": "Damac Properties",
-        "delivery_date": "Q2 2026",
-        "sales_started": "September 2022",
-        "payment_plan": "20/40/40",
-        "description": "Safa One by de GRISOGONO is an ultra-luxury residential project featuring one of the highest hanging gardens in the world. Located in the prestigious Al Safa area along Sheikh Zayed Road, it offers stunning views of Burj Al Arab, Palm Jumeirah, and Dubai's iconic skyline.",
-        "features": ["Hanging gardens", "Infinity pool", "Luxury spa", "Private beach access", "24/7 concierge", "Smart home technology", "Branded interiors by de GRISOGONO"]
-    },
-    "Safa Two": {
-        "location": "Business Bay, Dubai",
-        "developer": "Damac Properties",
-        "delivery_date": "Q2 2027",
-        "sales_started": "March 2023",
-        "payment_plan": "20/55/25",
-        "description": "Safa Two is a luxury residential development in Business Bay featuring de GRISOGONO interiors. The twin-tower project offers premium units with breathtaking views of Dubai Canal, Burj Khalifa, and the city skyline.",
-        "features": ["Luxury branded residences", "Premium views", "Infinity pools", "Spa and wellness center", "Fitness facilities", "Kids play area", "De GRISOGONO interiors"]
-    }
-}
+@st.cache_resource
+def get_listing_lifecycle(project_name, snapshot_ids):
+    """Build unit lifecycles from every archived snapshot of a project"""
+    snapshots = [(snapshot['snapshot_date'], open_archive(project_name, snapshot['snapshot']).to_pandas())
+                 for snapshot in list_snapshots(project_name) if snapshot['snapshot'] in snapshot_ids]
+    return build_lifecycle(snapshots)
 
-def extract_listing_days(description):
-    """Extract the listing days information from the property description"""
-    listing_pattern = r'[Ll]isted\s+(\d+)\s+([Dd]ays?|[Mm]onths?|[Ww]eeks?)\s+[Aa]go'
-    match = re.search(listing_pattern, description)
-    
-    if match:
-        number = match.group(1)
-        time_unit = match.group(2).lower()
-        
-        # Standardize the time unit
-        if 'day' in time_unit:
-            return f"{number} days"
-        elif 'week' in time_unit:
-            return f"{number} weeks"
-        elif 'month' in time_unit:
-            return f"{number} months"
-    
-    return None
+@st.cache_resource
+def get_price_index(snapshot_ids):
+    """Chained price/sq.ft index, extended with any snapshot dates not indexed yet"""
+    locations = {name: info['location'] for name, info in PROJECT_INFO.items()}
+    return update_price_index(list(PROJECT_DATA), locations)
 
-def analyze_data(property_data):
-    """Analyze the property data"""
-    # Convert to DataFrame
-    df = pd.DataFrame(property_data)
-    
-    # Calculate price per sqft
-    df['price_per_sqft'] = df['price'] / df['area_sqft']
-    
-    # Extract listing days
-    df['listing_days'] = df['description'].apply(extract_listing_days)
-    
-    # Basic statistics overall
-    stats_overall = {
-        'total_listings': len(df),
-        'avg_price': df['price'].mean(),
-        'min_price': df['price'].min(),
-        'max_price': df['price'].max(),
-        'median_price': df['price'].median(),
-        'avg_price_per_sqft': df['price_per_sqft'].mean(),
-        'min_price_per_sqft': df['price_per_sqft'].min(),
-        'max_price_per_sqft': df['price_per_sqft'].max(),
-        'avg_area': df['area_sqft'].mean(),
-        'min_area': df['area_sqft'].min(),
-        'max_area': df['area_sqft'].max()
-    }
-    
-    # Group by bedroom type and calculate statistics
-    bedroom_stats = df.groupby('bedrooms').agg({
-        'price': ['count', 'min', 'max', 'mean', 'median'],
-        'area_sqft': ['min', 'max', 'mean'],
-        'price_per_sqft': ['min', 'max', 'mean']
-    }).reset_index()
-    
-    # Rename columns for clarity
-    bedroom_stats.columns = ['bedrooms', 'count', 'min_price', 'max_price', 'avg_price', 'median_price', 
-                            'min_area', 'max_area', 'avg_area', 'min_price_per_sqft', 
-                            'max_price_per_sqft', 'avg_price_per_sqft']
-    
-    # Sort by bedrooms (with studio first, then numeric)
-    bedroom_order = {'studio': 0, '1': 1, '2': 2, '3': 3, '4': 4}
-    bedroom_stats['bedroom_order'] = bedroom_stats['bedrooms'].map(bedroom_order)
-    bedroom_stats = bedroom_stats.sort_values('bedroom_order').drop('bedroom_order', axis=1)
-    
-    # Statistics by bathroom count
-    bathroom_stats = df.groupby(['bedrooms', 'bathrooms']).agg({
-        'price': ['count', 'min', 'max', 'mean'],
-        'area_sqft': ['min', 'max', 'mean'],
-        'price_per_sqft': 'mean'
-    }).reset_index()
-    
-    # Rename columns for clarity
-    bathroom_stats.columns = ['bedrooms', 'bathrooms', 'count', 'min_price', 'max_price', 'avg_price', 
-                             'min_area', 'max_area', 'avg_area', 'avg_price_per_sqft']
-    
-    # Sort by bedrooms and bathrooms
-    bathroom_stats['bedroom_order'] = bathroom_stats['bedrooms'].map(bedroom_order)
-    bathroom_stats = bathroom_stats.sort_values(['bedroom_order', 'bathrooms']).drop('bedroom_order', axis=1)
-    
-    # Statistics by listing days
-    listing_days_counts = df['listing_days'].value_counts().reset_index()
-    listing_days_counts.columns = ['listing_period', 'count']
-    
-    return {
-        'dataframe': df,
-        'stats_overall': stats_overall,
-        'bedroom_stats': bedroom_stats,
-        'bathroom_stats': bathroom_stats,
-        'listing_days_stats': listing_days_counts
-    }
+@st.cache_resource
+def get_market_cube(snapshot_ids):
+    """Aggregation cube over every archived snapshot of every project"""
+    snapshots = [(snapshot['snapshot_date'], open_archive(name, snapshot['snapshot']).to_pandas())
+                 for name in PROJECT_DATA for snapshot in list_snapshots(name) if snapshot['snapshot'] in snapshot_ids]
+    return build_cube(snapshots)
+
+def load_dataset(key):
+    """Archive and materialize any new project data, then load it as a SharedDataset"""
+    # New data is analyzed once for both its archive and its aggregates
+    analyze = analyze_once(analyze_data)
+    return SharedDataset(
+        key,
+        {name: get_listing_archive(name, PROJECT_DATA[name], analyze) for name, _ in key},
+        {name: load_aggregates(name, ingest(name, PROJECT_DATA[name], analyze, version)) for name, version in key}
+    )
 
-def format_currency(value):
-    """Format currency values for display"""
-    if pd.isna(value):
-        return "N/A"
-    if isinstance(value, (int, float)):
-        if value >= 1000000:
-            return f"AED {value/1000000:.2f}M"
-        return f"AED {value:,.0f}"
-    return value
+def get_dataset():
+    """Process-wide, read-only listings and aggregates for the current data versions"""
+    key = tuple((name, data_version(data)) for name, data in PROJECT_DATA.items())
+    return get_shared_dataset(key, load_dataset)
+
+def get_dataset_if_ready():
+    """The shared dataset, or None while a large one is still being built in the background"""
+    if sum(len(data) for data in PROJECT_DATA.values()) < PREVIEW_MIN_ROWS:
+        return get_dataset()
+    key = tuple((name, data_version(data)) for name, data in PROJECT_DATA.items())
+    return get_shared_dataset_nowait(key, load_dataset)
+
+@st.cache_resource(max_entries=8)
+def get_preview(project_name, version):
+    """Stratified-sample estimate of a project's overview statistics within the preview latency budget"""
+    listings = pd.DataFrame(PROJECT_DATA[project_name], columns=['bedrooms', 'bathrooms', 'price', 'area_sqft'])
+    listings[['price', 'area_sqft']] = listings[['price', 'area_sqft']].apply(pd.to_numeric, errors='coerce')
+    listings = listings[(listings['price'] > 0) & (listings['area_sqft'] > 0)]
+    return preview_stats(listings, PREVIEW_BUDGET_SECONDS)
+
+def get_all_listings():
+    """All project listings from their archives, as one shared DataFrame"""
+    return get_dataset().listings
+
+@st.cache_resource
+def get_search_index(project_name, snapshot, listing_age_edges=DEFAULT_EDGES):
+    """Inverted index over a snapshot's descriptions plus bedroom and listing age postings"""
+    archive = open_archive(project_name, snapshot)
+    index = SearchIndex(archive.table.column('description').to_pylist())
+    index.add_field('bedrooms', archive.table.column('bedrooms').to_pylist())
+    buckets = ListingAgeBuckets(listing_age_edges)
+    age_days = np.asarray(archive.numeric('listing_age_days'), dtype=float)
+    for listing_age_filter in buckets.filters:
+        index.add_postings('listing_age', listing_age_filter, np.flatnonzero(buckets.filter_mask(age_days, listing_age_filter)))
+    return index
+
+@st.cache_resource
+def get_listing_age_stats(dataset_key, listing_age_edges):
+    """Listing age histograms per project for one set of bucket edges, from a single bucketing pass"""
+    listings = get_all_listings()
+    return ListingAgeBuckets(listing_age_edges).histograms(listings['listing_age_days'], listings['project'])
+
+def listing_position(project_name, row):
+    """Position of a project's archive row within get_all_listings()"""
+    return get_dataset().position(project_name, row)
+
+@st.cache_resource
+def get_comparables_index(data_versions):
+    """Nearest-neighbour index over all listings, rebuilt only when the data version changes"""
+    return ComparablesIndex(get_all_listings())
+
+@st.cache_resource(max_entries=32)
+def get_cash_flow_evaluation(rent_psf, appreciation, exit_years, discount_rate, data_versions):
+    """Evaluate every listing under a grid of scenarios around the chosen assumptions (data_versions keys the cache)"""
+    scenarios = make_scenarios(
+        rent_psf=[rent_psf * 0.8, rent_psf, rent_psf * 1.2],
+        appreciation=[appreciation - 0.02, appreciation, appreciation + 0.02],
+        exit_years=exit_years,
+        discount_rate=discount_rate
+    )
+    listings = get_all_listings()
+    return listings.join(evaluate_listings(listings, PROJECT_INFO, scenarios)['summary'])
 
-def format_area(value):
-    """Format area values for display"""
-    if pd.isna(value):
-        return "N/A"
-    if isinstance(value, (int, float)):
-        return f"{value:,.0f} sq.ft"
-    return value
+@st.cache_resource
+def get_listings_csv(project_name, dataset_key):
+    """A project's listings as CSV bytes, also saved to the results directory"""
+    listings = get_dataset().project_listings(project_name).drop(columns=['features', 'features_html'])
+    csv_bytes = listings.to_csv(index=False).encode()
+    with open(os.path.join(RESULTS_DIR, f"{project_name.lower().replace(' ', '_')}_properties.csv"), 'wb') as f:
+        f.write(csv_bytes)
+    return csv_bytes
+
+def get_project_aggregates(project_name, property_data, units=AED_SQFT):
+    """Precomputed aggregates for a project from the shared dataset, in the chosen display units"""
+    dataset = get_dataset()
+    if units == AED_SQFT:
+        return dataset.aggregates[project_name]
+    return get_converted_aggregates(project_name, dataset.key, units)
+
+@st.cache_resource(max_entries=32)
+def get_converted_aggregates(project_name, dataset_key, units):
+    """A project's aggregates with only the price and area columns rescaled, once per data and FX version"""
+    return convert_aggregates(get_dataset().aggregates[project_name], units)
+
+@st.cache_resource
+def get_geo_grid(data_versions):
+    """Geohash grid and project locations for the map, built once per data version"""
+    listings = get_all_listings()
+    return build_geo_grid(listings, PROJECT_INFO), project_locations(listings, PROJECT_INFO)
+
+@st.cache_resource
+def get_fair_value_state():
+    """Fair-value model kept across data versions, with the lock that guards its updates"""
+    return FairValueModel(), threading.Lock()
+
+@st.cache_resource
+def get_fair_value_model(data_versions):
+    """Fold the snapshots of a new data version into the shared fair-value model
+
+    Only snapshots the model has not seen are added to its normal equations; each data
+    version gets its own copy so later updates never change a model a session is using.
+    """
+    model, lock = get_fair_value_state()
+    dataset = get_dataset()
+    with lock:
+        model.update({archive.snapshot: dataset.project_listings(name) for name, archive in dataset.archives.items()})
+        return copy.deepcopy(model)
+
+def prewarm_steps():
+    """Warm-up steps run by warmup.prewarm before a worker takes traffic, as (name, build) pairs
+
+    The shared data, models and indexes are built one step at a time so their load times are
+    reported separately; rendering the default page last fills the figure cache.
+    """
+    def snapshot_ids():
+        return tuple(snapshot['snapshot'] for name in PROJECT_DATA for snapshot in list_snapshots(name))
+    
+    return [
+        ('dataset', get_dataset),
+        ('fair_value_model', lambda: get_fair_value_model(get_dataset().versions)),
+        ('comparables_index', lambda: get_comparables_index(get_dataset().versions)),
+        ('geo_grid', lambda: get_geo_grid(get_dataset().versions)),
+        ('listing_age_stats', lambda: get_listing_age_stats(get_dataset().key, DEFAULT_EDGES)),
+        ('search_indexes', lambda: [get_search_index(name, archive.snapshot, DEFAULT_EDGES)
+                                    for name, archive in get_dataset().archives.items()]),
+        ('price_index', lambda: get_price_index(snapshot_ids())),
+        ('market_cube', lambda: get_market_cube(snapshot_ids())),
+        ('default_page', main)
+    ]
+
+
+def rent_psf_input(key, units, default=120.0, max_value=1000.0, step=10.0):
+    """Net rent input in the display units; returns AED/sq.ft/year, the unit the models take"""
+    factor = column_factor('price_per_sqft', units)
+    # Keyed by the units so switching them restarts from the converted default
+    rent = st.number_input(f"Net Rent ({units.currency}/{units.area_unit}/year)", min_value=0.0,
+                           max_value=float(round(max_value * factor)), value=float(round(default * factor)),
+                           step=float(max(round(step * factor), 1)), key=f"{key}_{units.currency}_{units.area_unit}")
+    return rent / factor
 
 def display_project_info(project, project_data):
     """Display project information in a stylish card"""
@@ -587,63 +265,42 @@ def display_project_info(project, project_data):
         </div>
         """, unsafe_allow_html=True)
 
-def display_project_analysis(project_name, property_data):
+def display_project_analysis(project_name, property_data, units=AED_SQFT, listing_age_edges=DEFAULT_EDGES):
     """Display analysis for a specific project"""
-    # Analyze data
-    analysis_results = analyze_data(property_data)
+    # Precomputed aggregates for the summary sections, memory-mapped listings for the table
+    aggregates = get_project_aggregates(project_name, property_data, units)
+    archive = get_listing_archive(project_name, property_data)
     
     # Display overall statistics
-    stats = analysis_results['stats_overall']
+    stats = aggregates['stats_overall']
     
     st.markdown(f'<div class="sub-header">Overview</div>', unsafe_allow_html=True)
     
-    col1, col2, col3, col4 = st.columns(4)
-    with col1:
-        st.markdown(f"""
-        <div class="metric-card">
-            <div class="metric-value">{stats['total_listings']}</div>
-            <div class="metric-label">Total Listings</div>
-        </div>
-        """, unsafe_allow_html=True)
-    with col2:
-        st.markdown(f"""
-        <div class="metric-card">
-            <div class="metric-value">{format_currency(stats['avg_price'])}</div>
-            <div class="metric-label">Average Price</div>
-        </div>
-        """, unsafe_allow_html=True)
-    with col3:
-        st.markdown(f"""
-        <div class="metric-card">
-            <div class="metric-value">{format_area(stats['avg_area'])}</div>
-            <div class="metric-label">Average Area</div>
-        </div>
-        """, unsafe_allow_html=True)
-    with col4:
-        st.markdown(f"""
-        <div class="metric-card">
-            <div class="metric-value">AED {stats['avg_price_per_sqft']:,.0f}</div>
-            <div class="metric-label">Average Price/sq.ft</div>
-        </div>
-        """, unsafe_allow_html=True)
-    
+    metric_cards([
+        (stats['total_listings'], "Total Listings"),
+        (format_currency(stats['avg_price'], units.currency), "Average Price"),
+        (format_area(stats['avg_area'], units.area_unit), "Average Area"),
+        (f"{units.currency} {stats['avg_price_per_sqft']:,.0f}", f"Average Price/{units.area_unit}")
+    ])
+
+    # Listings held back by validation, and warnings on the listings that were kept
+    quarantine = aggregates['quarantine']
+    data_warnings = aggregates['validation_issues'][~aggregates['validation_issues']['quarantined']]
+    if len(quarantine) or len(data_warnings):
+        with st.expander(f"Data quality: {len(quarantine)} listing(s) quarantined, {len(data_warnings)} warning(s)"):
+            if len(quarantine):
+                st.table(quarantine[['bedrooms', 'bathrooms', 'area_sqft', 'price', 'reasons']].assign(
+                    bedrooms=quarantine['bedrooms'].map(bedroom_label),
+                    area_sqft=quarantine['area_sqft'].map(lambda x: format_area(x, units.area_unit)),
+                    price=quarantine['price'].map(lambda x: format_currency(x, units.currency))))
+            if len(data_warnings):
+                st.table(data_warnings['check'].value_counts().rename_axis('Check').reset_index(name='Listings'))
+
     # Statistics by bedroom type
     st.markdown(f'<div class="sub-header">Unit Types Summary</div>', unsafe_allow_html=True)
     
     # Format the bedroom statistics table
-    bedroom_stats = analysis_results['bedroom_stats'].copy()
-    for col in ['min_price', 'max_price', 'avg_price', 'median_price']:
-        bedroom_stats[col] = bedroom_stats[col].apply(format_currency)
-    
-    for col in ['min_area', 'max_area', 'avg_area']:
-        bedroom_stats[col] = bedroom_stats[col].apply(format_area)
-    
-    for col in ['min_price_per_sqft', 'max_price_per_sqft', 'avg_price_per_sqft']:
-        bedroom_stats[col] = bedroom_stats[col].apply(lambda x: f"AED {x:,.0f}")
-    
-    bedroom_stats.columns = ['Bedrooms', 'Count', 'Min Price', 'Max Price', 'Avg Price', 'Median Price', 
-                           'Min Area', 'Max Area', 'Avg Area', 'Min Price/sq.ft', 
-                           'Max Price/sq.ft', 'Avg Price/sq.ft']
+    bedroom_stats = unit_type_table(aggregates['bedroom_stats'], units)
     
     st.markdown('<div class="data-table">', unsafe_allow_html=True)
     st.table(bedroom_stats)
@@ -653,160 +310,151 @@ def display_project_analysis(project_name, property_data):
     st.markdown(f'<div class="sub-header">Simplified Unit Types</div>', unsafe_allow_html=True)
     
     # Create a simplified dataframe for the unit types
-    simplified_df = pd.DataFrame({
-        'Unit Type': [],
-        'Size Range (sq.ft)': [],
-        'Price Range (AED)': [],
-        'Average Price/sq.ft': [],
-        'Available Units': []
-    })
-    
-    # Add row for each bedroom type if it exists in the data
-    for bed_type in ['studio', '1', '2', '3', '4']:
-        if bed_type in analysis_results['bedroom_stats']['bedrooms'].values:
-            bed_data = analysis_results['bedroom_stats'][analysis_results['bedroom_stats']['bedrooms'] == bed_type]
-            
-            # Format the bedroom display name
-            if bed_type == 'studio':
-                display_name = 'Studio'
-            else:
-                display_name = f"{bed_type} Bedroom"
-                
-            # Create a new row
-            new_row = pd.DataFrame({
-                'Unit Type': [display_name],
-                'Size Range (sq.ft)': [f"{bed_data['min_area'].values[0]:.0f} - {bed_data['max_area'].values[0]:.0f}"],
-                'Price Range (AED)': [f"AED {bed_data['min_price'].values[0]/1000000:.2f}M - {bed_data['max_price'].values[0]/1000000:.2f}M"],
-                'Average Price/sq.ft': [f"AED {bed_data['avg_price_per_sqft'].values[0]:.0f}"],
-                'Available Units': [f"{bed_data['count'].values[0]:.0f}"]
-            })
-            
-            # Append to simplified dataframe
-            simplified_df = pd.concat([simplified_df, new_row], ignore_index=True)
+    simplified_df = simplified_unit_types(aggregates['bedroom_stats'], units)
     
     st.markdown('<div class="data-table">', unsafe_allow_html=True)
     st.table(simplified_df)
     st.markdown('</div>', unsafe_allow_html=True)
     
+    # Fair value analysis
+    st.markdown(f'<div class="sub-header">Fair Value Analysis</div>', unsafe_allow_html=True)
+    
+    dataset = get_dataset()
+    fair_value_model = get_fair_value_model(dataset.versions)
+    underpriced = convert_frame(rank_underpriced(dataset.project_listings(project_name), fair_value_model, top_n=10), units)
+    
+    fair_value_df = pd.DataFrame({
+        'Bedrooms': underpriced['bedrooms'],
+        'Area': underpriced['area_sqft'].apply(format_area, area_unit=units.area_unit),
+        'Price': underpriced['price'].apply(format_currency, currency=units.currency),
+        'Fair Price': underpriced['fair_price'].apply(format_currency, currency=units.currency),
+        'Difference': underpriced['residual_pct'].apply(lambda x: f"{x:+.1f}%"),
+        'Description': underpriced['description']
+    })
+    
+    st.markdown('<div class="data-table">', unsafe_allow_html=True)
+    st.caption("Listings ranked by asking price relative to a hedonic fair price (area, bedrooms, bathrooms, view and floor features)")
+    st.table(fair_value_df.reset_index(drop=True))
+    st.markdown('</div>', unsafe_allow_html=True)
+    
     # Listing days analysis
     st.markdown(f'<div class="sub-header">Listing Days Analysis</div>', unsafe_allow_html=True)
     
-    # Create listing days chart
-    if not analysis_results['listing_days_stats'].empty:
-        fig = px.bar(
-            analysis_results['listing_days_stats'], 
-            x='listing_period', 
-            y='count',
-            color_discrete_sequence=['#0d3b66'],
-            labels={'listing_period': 'Listing Period', 'count': 'Number of Properties'},
-            title=f'Distribution of Properties by Listing Period in {project_name}'
-        )
-        
-        fig.update_layout(
-            font_family="Arial",
-            title_font_size=18,
-            title_font_color='#1E3A8A',
-            plot_bgcolor='#f8fafc',
-            paper_bgcolor='white',
-            height=400,
-            xaxis_title="Listing Period",
-            yaxis_title="Number of Properties"
-        )
+    # Create listing days chart from the shared listing age histograms
+    listing_days_stats = get_listing_age_stats(get_dataset().key, listing_age_edges).get(project_name)
+    if listing_days_stats is not None and listing_days_stats['count'].sum():
+        fig = cached_figure(('listing_days', project_name, aggregates['data_version']) + listing_age_edges,
+                            lambda: listing_days_chart(listing_days_stats, project_name))
         
         st.plotly_chart(fig, use_container_width=True)
     else:
         st.info("Listing days data not available for analysis.")
     
+    # Listing lifecycle across archived snapshots
+    st.markdown(f'<div class="sub-header">Listing Lifecycle</div>', unsafe_allow_html=True)
+    
+    snapshot_ids = tuple(snapshot['snapshot'] for snapshot in list_snapshots(project_name))
+    lifecycle = get_listing_lifecycle(project_name, snapshot_ids)
+    unit_lifecycles = lifecycle['units']
+    absorption = lifecycle['absorption']
+    
+    price_cuts = lifecycle['price_events'][lifecycle['price_events']['change_pct'] < 0]
+    monthly_absorption = absorption['delisted'].sum() / absorption['inventory_months'].sum() if absorption['inventory_months'].sum() else None
+    median_days = unit_lifecycles.loc[unit_lifecycles['active'], 'days_on_market'].median()
+    lifecycle_metrics = [
+        (f"{median_days:.0f} days" if pd.notna(median_days) else "—", "Median Days on Market"),
+        (f"{len(price_cuts)}", "Price Cuts"),
+        (f"{len(lifecycle['delistings'])}", "Delisted Units"),
+        (f"{monthly_absorption:.1%}" if monthly_absorption is not None else "N/A", "Monthly Absorption Rate")
+    ]
+    metric_cards(lifecycle_metrics)
+    
+    if len(snapshot_ids) < 2:
+        st.info("Price changes, delistings and absorption rates appear once more than one data snapshot has been archived.")
+    else:
+        absorption_df = absorption.copy(deep=False)
+        absorption_df['bedrooms'] = absorption_df['bedrooms'].apply(lambda x: 'Studio' if x == 'studio' else f"{x} Bedroom")
+        absorption_df['monthly_absorption_rate'] = absorption_df['monthly_absorption_rate'].apply(lambda x: "N/A" if pd.isna(x) else f"{x:.1%}")
+        absorption_df = absorption_df[['bedrooms', 'delisted', 'monthly_absorption_rate']]
+        absorption_df.columns = ['Unit Type', 'Delisted Units', 'Monthly Absorption Rate']
+        st.markdown('<div class="data-table">', unsafe_allow_html=True)
+        st.table(absorption_df)
+        st.markdown('</div>', unsafe_allow_html=True)
+    
     # Property listings
+    display_listings(project_name, archive, units, listing_age_edges)
+
+@st.fragment
+def display_listings(project_name, archive, units=AED_SQFT, listing_age_edges=DEFAULT_EDGES):
+    """Filterable, paged listings table and comparables for a project
+
+    Runs as a fragment, so changing a filter, the page or the selected listing reruns only
+    this section instead of the whole dashboard.
+    """
     st.markdown(f'<div class="sub-header">Property Listings</div>', unsafe_allow_html=True)
     
     # Add filters
-    col1, col2, col3 = st.columns(3)
+    col1, col2, col3, col4 = st.columns(4)
     with col1:
         bedroom_filter = st.selectbox(f"Filter {project_name} by Bedrooms", 
-                                     ["All"] + list(analysis_results['dataframe']['bedrooms'].unique()),
+                                     ["All"] + archive.unique('bedrooms'),
                                      key=f"{project_name}_bedroom_filter")
     with col2:
-        price_sort = st.selectbox(f"Sort {project_name} by Price", 
+        sort_by = st.selectbox(f"Sort {project_name} by", 
+                               list(SORT_COLUMNS),
+                               key=f"{project_name}_sort_column")
+    with col3:
+        price_sort = st.selectbox(f"Sort Order", 
                                  ["Low to High", "High to Low"],
                                  key=f"{project_name}_price_sort")
-    with col3:
+    with col4:
         listing_age_filter = st.selectbox(f"Filter by Listing Age", 
-                               ["All", "Last Week", "Last Month", "Last 3 Months", "Older than 3 Months"],
+                               ["All"] + ListingAgeBuckets(listing_age_edges).filters,
                                key=f"{project_name}_listing_filter")
     
-    # Apply filters and sorting
-    filtered_df = analysis_results['dataframe']
-    if bedroom_filter != "All":
-        filtered_df = filtered_df[filtered_df['bedrooms'] == bedroom_filter]
+    search_query = st.text_input(f"Search {project_name} Descriptions",
+                                 placeholder='e.g. "sea view" high*  OR  penthouse -duplex',
+                                 key=f"{project_name}_search")
     
-    # Apply listing age filter
+    # Search and filters combine through posting-list intersection on the search index
+    filters = {}
+    if bedroom_filter != "All":
+        filters['bedrooms'] = bedroom_filter
     if listing_age_filter != "All":
-        def filter_by_listing_age(listing_days):
-            if pd.isna(listing_days):
-                return False
-            
-            # Extract number and period
-            parts = listing_days.split()
-            if len(parts) != 2:
-                return False
-                
-            number = int(parts[0])
-            period = parts[1]
-            
-            if listing_age_filter == "Last Week":
-                if period == "days":
-                    return number <= 7
-                return False
-            elif listing_age_filter == "Last Month":
-                if period == "days":
-                    return number <= 30
-                elif period == "weeks":
-                    return number <= 4
-                return False
-            elif listing_age_filter == "Last 3 Months":
-                if period == "days":
-                    return number <= 90
-                elif period == "weeks":
-                    return number <= 12
-                elif period == "months":
-                    return number <= 3
-                return False
-            elif listing_age_filter == "Older than 3 Months":
-                if period == "months":
-                    return number > 3
-                return False
-            
-            return True
-        
-        filtered_df = filtered_df[filtered_df['listing_days'].apply(filter_by_listing_age)]
-    
-    if price_sort == "Low to High":
-        filtered_df = filtered_df.sort_values('price')
-    else:
-        filtered_df = filtered_df.sort_values('price', ascending=False)
-    
-    # Format DataFrame for display
-    display_df = filtered_df.copy()
-    display_df['price'] = display_df['price'].apply(format_currency)
-    display_df['area_sqft'] = display_df['area_sqft'].apply(format_area)
-    display_df['price_per_sqft'] = display_df['price_per_sqft'].apply(lambda x: f"AED {x:,.0f}")
-    
-    # Format description to highlight listing days
-    def highlight_listing_days(description):
-        listing_pattern = r'([Ll]isted\s+\d+\s+[Dd]ays?|[Mm]onths?|[Ww]eeks?\s+[Aa]go)'
-        if re.search(listing_pattern, description):
-            highlighted = re.sub(listing_pattern, r'<span class="listing-badge">\1</span>', description)
-            return highlighted
-        return description
-    
-    display_df['features'] = display_df['description'].apply(lambda x: x.replace(' | ', '<br>• '))
-    display_df['features'] = display_df['features'].apply(lambda x: '• ' + x)
-    display_df['features'] = display_df['features'].apply(highlight_listing_days)
-    
-    # Select columns for display
-    display_df = display_df[['bedrooms', 'bathrooms', 'price', 'area_sqft', 'price_per_sqft', 'features', 'listing_days']]
-    display_df.columns = ['Bedrooms', 'Bathrooms', 'Price', 'Area', 'Price/sq.ft', 'Features', 'Listing Age']
+        filters['listing_age'] = listing_age_filter
+    row_mask = np.zeros(archive.num_rows, dtype=bool)
+    row_mask[get_search_index(project_name, archive.snapshot, listing_age_edges).search(search_query, filters)] = True
+    
+    # Page through the presorted rows so only the visible window is sent to the browser
+    total_rows = int(row_mask.sum())
+    page_key = f"{project_name}_grid_page"
+    grid_state = (bedroom_filter, listing_age_filter, search_query, sort_by, price_sort)
+    if st.session_state.get(f"{page_key}_state") != grid_state:
+        st.session_state[f"{page_key}_state"] = grid_state
+        st.session_state[page_key] = 1
+    
+    page_col1, page_col2, _ = st.columns([1, 1, 2])
+    with page_col1:
+        page_size = st.selectbox("Rows per Page", PAGE_SIZES, index=1, key=f"{project_name}_page_size")
+    num_pages = max(1, -(-total_rows // page_size))
+    st.session_state[page_key] = min(st.session_state.get(page_key, 1), num_pages)
+    with page_col2:
+        page = st.number_input(f"Page (of {num_pages})", min_value=1, max_value=num_pages, step=1, key=page_key)
+    
+    offset = (page - 1) * page_size
+    window_indices, total_rows = grid_window(archive, row_mask, SORT_COLUMNS[sort_by],
+                                             descending=price_sort == "High to Low",
+                                             offset=offset, limit=page_size)
+    
+    # Format the visible rows for display
+    display_df = convert_frame(archive.take(window_indices), units)
+    display_df['price'] = display_df['price'].apply(format_currency, currency=units.currency)
+    display_df['area_sqft'] = display_df['area_sqft'].apply(format_area, area_unit=units.area_unit)
+    display_df['price_per_sqft'] = display_df['price_per_sqft'].apply(lambda x: f"{units.currency} {x:,.0f}")
+    
+    # Select columns for display; the highlighted feature list is precomputed per data version
+    display_df = display_df[['bedrooms', 'bathrooms', 'price', 'area_sqft', 'price_per_sqft', 'features_html', 'listing_days']]
+    display_df.columns = ['Bedrooms', 'Bathrooms', 'Price', 'Area', f"Price/{units.area_unit}", 'Features', 'Listing Age']
     
     # Display the data with html formatting enabled
     st.markdown('<div class="dataframe-container">', unsafe_allow_html=True)
@@ -816,126 +464,62 @@ def display_project_analysis(project_name, property_data):
         st.warning(f"No properties match your current filters in {project_name}. Try adjusting your selection.")
     else:
         # Format and display the dataframe
-        st.write(f"Showing {len(display_df)} properties")
-        
-        # Create a custom HTML table for better display of features
-        html_table = '<table class="dataframe" style="width:100%;">'
-        
-        # Add header
-        html_table += '<thead><tr>'
-        for col in display_df.columns:
-            if col != 'Listing Age':  # We'll incorporate this into Features
-                html_table += f'<th>{col}</th>'
-        html_table += '</tr></thead>'
+        st.write(f"Showing {offset + 1}-{offset + len(display_df)} of {total_rows} properties")
         
-        # Add rows
-        html_table += '<tbody>'
-        for _, row in display_df.iterrows():
-            html_table += '<tr>'
-            for col in display_df.columns:
-                if col == 'Listing Age':
-                    continue  # Skip as we're incorporating this into Features
-                elif col == 'Features':
-                    html_table += f'<td style="max-width:300px;">{row[col]}</td>'
-                else:
-                    html_table += f'<td>{row[col]}</td>'
-            html_table += '</tr>'
-        html_table += '</tbody></table>'
-        
-        st.markdown(html_table, unsafe_allow_html=True)
+        # Listing age is already highlighted inside the features
+        table_df = display_df.drop(columns=['Listing Age'])
+        st.markdown(html_table(list(table_df.columns), table_df.itertuples(index=False, name=None),
+                               wide_column='Features'), unsafe_allow_html=True)
     
     st.markdown('</div>', unsafe_allow_html=True)
+    
+    # Comparable listings for a listing on the current page
+    if len(window_indices):
+        st.markdown(f'<div class="sub-header">Comparable Listings</div>', unsafe_allow_html=True)
+        
+        page_rows = convert_frame(archive.take(window_indices, columns=['bedrooms', 'area_sqft', 'price']), units)
+        labels = {
+            int(row): f"{'Studio' if r.bedrooms == 'studio' else r.bedrooms + ' BR'} · {format_area(r.area_sqft, units.area_unit)} · {format_currency(r.price, units.currency)}"
+            for row, r in zip(window_indices, page_rows.itertuples())
+        }
+        selected_row = st.selectbox(f"Find comparables for a {project_name} listing", list(labels),
+                                    format_func=labels.get, key=f"{project_name}_comparable_listing")
+        
+        comparables = convert_frame(get_comparables_index(get_dataset().versions).query(listing_position(project_name, selected_row), k=5), units)
+        comparables_df = pd.DataFrame({
+            'Project': comparables['project'],
+            'Bedrooms': comparables['bedrooms'],
+            'Bathrooms': comparables['bathrooms'],
+            'Price': comparables['price'].apply(format_currency, currency=units.currency),
+            'Area': comparables['area_sqft'].apply(format_area, area_unit=units.area_unit),
+            f"Price/{units.area_unit}": comparables['price_per_sqft'].apply(lambda x: f"{units.currency} {x:,.0f}"),
+            'Description': comparables['description']
+        })
+        st.table(comparables_df.reset_index(drop=True))
 
-def display_comparison(safa_one_analysis, safa_two_analysis):
+def display_comparison(safa_one_analysis, safa_two_analysis, units=AED_SQFT, listing_age_edges=DEFAULT_EDGES):
     """Display comparison between Safa One and Safa Two"""
     st.markdown('<div class="sub-header">Project Comparison</div>', unsafe_allow_html=True)
     
     # Price comparison
-    col1, col2 = st.columns(2)
-    
-    with col1:
-        st.markdown("""
-        <div class="metric-card">
-            <h3 style="color: #1E3A8A; margin-bottom: 10px;">Safa One Averages</h3>
-        """, unsafe_allow_html=True)
-        
-        safa_one_stats = safa_one_analysis['stats_overall']
-        st.markdown(f"""
-            <p><span class="highlight">Average Price:</span> {format_currency(safa_one_stats['avg_price'])}</p>
-            <p><span class="highlight">Average Area:</span> {format_area(safa_one_stats['avg_area'])}</p>
-            <p><span class="highlight">Average Price/sq.ft:</span> AED {safa_one_stats['avg_price_per_sqft']:,.0f}</p>
-        </div>
-        """, unsafe_allow_html=True)
-    
-    with col2:
-        st.markdown("""
-        <div class="metric-card">
-            <h3 style="color: #1E3A8A; margin-bottom: 10px;">Safa Two Averages</h3>
-        """, unsafe_allow_html=True)
-        
-        safa_two_stats = safa_two_analysis['stats_overall']
-        st.markdown(f"""
-            <p><span class="highlight">Average Price:</span> {format_currency(safa_two_stats['avg_price'])}</p>
-            <p><span class="highlight">Average Area:</span> {format_area(safa_two_stats['avg_area'])}</p>
-            <p><span class="highlight">Average Price/sq.ft:</span> AED {safa_two_stats['avg_price_per_sqft']:,.0f}</p>
-        </div>
-        """, unsafe_allow_html=True)
+    for col, (project_name, analysis) in zip(st.columns(2), [("Safa One", safa_one_analysis), ("Safa Two", safa_two_analysis)]):
+        stats = analysis['stats_overall']
+        with col:
+            st.markdown(summary_card(f"{project_name} Averages", (
+                ("Average Price", format_currency(stats['avg_price'], units.currency)),
+                ("Average Area", format_area(stats['avg_area'], units.area_unit)),
+                (f"Average Price/{units.area_unit}", f"{units.currency} {stats['avg_price_per_sqft']:,.0f}")
+            )), unsafe_allow_html=True)
     
     # Compare price per sqft by bedroom type
-    st.markdown('<h3 style="color: #1E3A8A; margin-top: 20px;">Price per Sq.Ft Comparison by Bedroom Type</h3>', unsafe_allow_html=True)
-    
-    # Create comparison dataframe
-    comparison_data = []
-    
-    # Process Safa One data
-    for _, row in safa_one_analysis['bedroom_stats'].iterrows():
-        bedroom_type = row['bedrooms']
-        comparison_data.append({
-            'Project': 'Safa One',
-            'Bedroom Type': 'Studio' if bedroom_type == 'studio' else f"{bedroom_type} Bedroom",
-            'Avg Price/sq.ft': row['avg_price_per_sqft'],
-            'Min Price/sq.ft': row['min_price_per_sqft'],
-            'Max Price/sq.ft': row['max_price_per_sqft']
-        })
-    
-    # Process Safa Two data
-    for _, row in safa_two_analysis['bedroom_stats'].iterrows():
-        bedroom_type = row['bedrooms']
-        comparison_data.append({
-            'Project': 'Safa Two',
-            'Bedroom Type': 'Studio' if bedroom_type == 'studio' else f"{bedroom_type} Bedroom",
-            'Avg Price/sq.ft': row['avg_price_per_sqft'],
-            'Min Price/sq.ft': row['min_price_per_sqft'],
-            'Max Price/sq.ft': row['max_price_per_sqft']
-        })
+    st.markdown(f'<h3 style="color: #1E3A8A; margin-top: 20px;">Price per {units.area_unit} Comparison by Bedroom Type</h3>', unsafe_allow_html=True)
     
-    comparison_df = pd.DataFrame(comparison_data)
+    # Create comparison dataframe from the precomputed rows
+    comparison_df = pd.concat([safa_one_analysis['comparison_rows'], safa_two_analysis['comparison_rows']], ignore_index=True)
     
     # Create comparison chart
-    fig = px.bar(
-        comparison_df, 
-        x='Bedroom Type', 
-        y='Avg Price/sq.ft', 
-        color='Project',
-        barmode='group',
-        title='Average Price per Sq.Ft Comparison',
-        labels={'Avg Price/sq.ft': 'Average Price per Sq.Ft (AED)'},
-        color_discrete_map={'Safa One': '#1E3A8A', 'Safa Two': '#3B82F6'}
-    )
-    
-    # Format axes and layout
-    fig.update_layout(
-        font_family="Arial",
-        title_font_size=20,
-        title_font_color='#1E3A8A',
-        legend_title_font_color='#1E3A8A',
-        plot_bgcolor='#EFF6FF',
-        paper_bgcolor='white',
-        height=500
-    )
-    
-    fig.update_yaxes(tickformat=',', title_font=dict(size=14, color='#1F2937'))
-    fig.update_xaxes(title_font=dict(size=14, color='#1F2937'))
+    fig = cached_figure(('price_comparison', safa_one_analysis['data_version'], safa_two_analysis['data_version']) + units,
+                        lambda: price_comparison_chart(comparison_df, units))
     
     st.plotly_chart(fig, use_container_width=True)
     
@@ -943,35 +527,12 @@ def display_comparison(safa_one_analysis, safa_two_analysis):
     st.markdown('<h3 style="color: #1E3A8A; margin-top: 20px;">Listing Age Comparison</h3>', unsafe_allow_html=True)
     
     # Create a combined dataframe for listing age
-    safa_one_listing = safa_one_analysis['listing_days_stats'].copy()
-    safa_one_listing['Project'] = 'Safa One'
-    
-    safa_two_listing = safa_two_analysis['listing_days_stats'].copy()
-    safa_two_listing['Project'] = 'Safa Two'
-    
-    combined_listing = pd.concat([safa_one_listing, safa_two_listing])
-    
-    if not combined_listing.empty:
-        fig = px.bar(
-            combined_listing,
-            x='listing_period',
-            y='count',
-            color='Project',
-            barmode='group',
-            title='Distribution of Listings by Age',
-            labels={'listing_period': 'Listing Period', 'count': 'Number of Properties'},
-            color_discrete_map={'Safa One': '#1E3A8A', 'Safa Two': '#3B82F6'}
-        )
-        
-        fig.update_layout(
-            font_family="Arial",
-            title_font_size=18,
-            title_font_color='#1E3A8A',
-            legend_title_font_color='#1E3A8A',
-            plot_bgcolor='#EFF6FF',
-            paper_bgcolor='white',
-            height=450
-        )
+    listing_age_stats = get_listing_age_stats(get_dataset().key, listing_age_edges)
+    combined_listing = pd.concat([stats.assign(Project=name) for name, stats in listing_age_stats.items()])
+    
+    if combined_listing['count'].sum():
+        fig = cached_figure(('listing_age_comparison', safa_one_analysis['data_version'], safa_two_analysis['data_version']) + listing_age_edges,
+                            lambda: listing_age_comparison_chart(combined_listing))
         
         st.plotly_chart(fig, use_container_width=True)
     else:
@@ -981,42 +542,311 @@ def display_comparison(safa_one_analysis, safa_two_analysis):
     st.markdown('<h3 style="color: #1E3A8A; margin-top: 20px;">Investment Comparison</h3>', unsafe_allow_html=True)
     
     # Create comparison table
-    investment_data = {
-        'Metric': [
-            'Expected Delivery', 
-            'Payment Plan',
-            'Avg. 1BR Price',
-            'Avg. 2BR Price',
-            'Avg. 3BR Price',
-            'Price per Sq.Ft Range',
-            'Location'
-        ],
-        'Safa One': [
-            PROJECT_INFO['Safa One']['delivery_date'],
-            PROJECT_INFO['Safa One']['payment_plan'],
-            format_currency(safa_one_analysis['bedroom_stats'].loc[safa_one_analysis['bedroom_stats']['bedrooms'] == '1', 'avg_price'].values[0]) if '1' in safa_one_analysis['bedroom_stats']['bedrooms'].values else 'N/A',
-            format_currency(safa_one_analysis['bedroom_stats'].loc[safa_one_analysis['bedroom_stats']['bedrooms'] == '2', 'avg_price'].values[0]) if '2' in safa_one_analysis['bedroom_stats']['bedrooms'].values else 'N/A',
-            format_currency(safa_one_analysis['bedroom_stats'].loc[safa_one_analysis['bedroom_stats']['bedrooms'] == '3', 'avg_price'].values[0]) if '3' in safa_one_analysis['bedroom_stats']['bedrooms'].values else 'N/A',
-            f"AED {safa_one_stats['min_price_per_sqft']:,.0f} - {safa_one_stats['max_price_per_sqft']:,.0f}",
-            PROJECT_INFO['Safa One']['location']
-        ],
-        'Safa Two': [
-            PROJECT_INFO['Safa Two']['delivery_date'],
-            PROJECT_INFO['Safa Two']['payment_plan'],
-            format_currency(safa_two_analysis['bedroom_stats'].loc[safa_two_analysis['bedroom_stats']['bedrooms'] == '1', 'avg_price'].values[0]) if '1' in safa_two_analysis['bedroom_stats']['bedrooms'].values else 'N/A',
-            format_currency(safa_two_analysis['bedroom_stats'].loc[safa_two_analysis['bedroom_stats']['bedrooms'] == '2', 'avg_price'].values[0]) if '2' in safa_two_analysis['bedroom_stats']['bedrooms'].values else 'N/A',
-            format_currency(safa_two_analysis['bedroom_stats'].loc[safa_two_analysis['bedroom_stats']['bedrooms'] == '3', 'avg_price'].values[0]) if '3' in safa_two_analysis['bedroom_stats']['bedrooms'].values else 'N/A',
-            f"AED {safa_two_stats['min_price_per_sqft']:,.0f} - {safa_two_stats['max_price_per_sqft']:,.0f}",
-            PROJECT_INFO['Safa Two']['location']
-        ]
+    investment_df = investment_table(
+        {name: PROJECT_INFO[name] for name in ['Safa One', 'Safa Two']},
+        {'Safa One': safa_one_analysis['investment_summary'], 'Safa Two': safa_two_analysis['investment_summary']},
+        units
+    )
+    
+    st.markdown('<div class="compare-table">', unsafe_allow_html=True)
+    st.table(investment_df.set_index('Metric'))
+    st.markdown('</div>', unsafe_allow_html=True)
+    
+    # Payment plan cash flows and returns
+    st.markdown('<h3 style="color: #1E3A8A; margin-top: 20px;">Payment Plan Returns</h3>', unsafe_allow_html=True)
+    
+    col1, col2, col3, col4 = st.columns(4)
+    with col1:
+        rent_psf = rent_psf_input("cashflow_rent_psf", units)
+    with col2:
+        appreciation = st.number_input("Annual Appreciation (%)", min_value=-10.0, max_value=30.0, value=5.0, step=0.5, key="cashflow_appreciation")
+    with col3:
+        exit_years = st.number_input("Exit After Handover (years)", min_value=1, max_value=20, value=5, step=1, key="cashflow_exit_years")
+    with col4:
+        discount_rate = st.number_input("Discount Rate (%)", min_value=0.0, max_value=30.0, value=8.0, step=0.5, key="cashflow_discount_rate")
+    
+    data_versions = (safa_one_analysis['data_version'], safa_two_analysis['data_version'])
+    returns = get_cash_flow_evaluation(float(rent_psf), appreciation / 100, int(exit_years), discount_rate / 100, data_versions)
+    st.caption("IRR and NPV per listing across rent (±20%) and appreciation (±2 pts) scenarios around these assumptions, "
+               "with the purchase price paid according to each project's payment plan")
+    
+    project_returns = returns.groupby('project').agg(
+        median_irr=('median_irr', 'median'),
+        p10_irr=('p10_irr', 'median'),
+        median_npv=('median_npv', 'median')
+    ).reset_index()
+    project_returns['median_irr'] = project_returns['median_irr'].apply(lambda x: f"{x:.1%}")
+    project_returns['p10_irr'] = project_returns['p10_irr'].apply(lambda x: f"{x:.1%}")
+    project_returns['median_npv'] = (project_returns['median_npv'] * units.price_factor).apply(format_currency, currency=units.currency)
+    project_returns.columns = ['Project', 'Median IRR', 'Downside IRR (P10)', 'Median NPV']
+    st.table(project_returns.set_index('Project'))
+    
+    top_returns = returns.sort_values('median_irr', ascending=False).head(10)
+    top_returns_display = convert_frame(top_returns, units)
+    top_returns_df = pd.DataFrame({
+        'Project': top_returns_display['project'],
+        'Bedrooms': top_returns_display['bedrooms'],
+        'Price': top_returns_display['price'].apply(format_currency, currency=units.currency),
+        'Area': top_returns_display['area_sqft'].apply(format_area, area_unit=units.area_unit),
+        'Median IRR': top_returns_display['median_irr'].apply(lambda x: f"{x:.1%}"),
+        'Median NPV': (top_returns_display['median_npv'] * units.price_factor).apply(format_currency, currency=units.currency)
+    })
+    st.markdown('<h4 style="color: #1E3A8A;">Highest Return Listings</h4>', unsafe_allow_html=True)
+    st.table(top_returns_df.reset_index(drop=True))
+    
+    # Dated schedule for the best-ranked listing
+    best = top_returns.iloc[0]
+    schedule = cash_flow_schedule(best['price'], best['area_sqft'], best['project'], PROJECT_INFO, {
+        'rent_psf': float(rent_psf), 'appreciation': appreciation / 100,
+        'exit_years': int(exit_years), 'discount_rate': discount_rate / 100
+    })
+    schedule['date'] = schedule['date'].dt.strftime('%b %Y')
+    for col in ['payment', 'rent', 'sale', 'net_cash_flow']:
+        schedule[col] = (schedule[col] * units.price_factor).apply(lambda x: f"{units.currency} {x:,.0f}" if x else "-")
+    schedule.columns = ['Date', 'Payment', 'Rent', 'Sale', 'Net Cash Flow']
+    best_price = format_currency(best['price'] * units.price_factor, units.currency)
+    with st.expander(f"Cash flow schedule: {best['project']} {best['bedrooms']} BR at {best_price}"):
+        st.table(schedule.set_index('Date'))
+
+def display_scenario_simulation(units=AED_SQFT):
+    """Display Monte Carlo return distributions for each project"""
+    st.markdown('<div class="sub-header">Scenario Simulation</div>', unsafe_allow_html=True)
+    
+    col1, col2, col3, col4, col5 = st.columns(5)
+    with col1:
+        n_paths = st.selectbox("Simulated Paths", [10_000, 100_000, 1_000_000], index=1,
+                               format_func=lambda x: f"{x:,}", key="simulation_paths")
+    with col2:
+        appreciation_mean = st.number_input("Expected Appreciation (%)", min_value=-10.0, max_value=30.0, value=5.0, step=0.5, key="simulation_appreciation",
+                                            help="Used for projects whose price history is too short to fit")
+    with col3:
+        appreciation_vol = st.number_input("Appreciation Volatility (%)", min_value=0.0, max_value=50.0, value=12.0, step=1.0, key="simulation_volatility",
+                                           help="Used for projects whose price history is too short to fit")
+    with col4:
+        rent_psf = rent_psf_input("simulation_rent", units, max_value=500.0, step=5.0)
+    with col5:
+        exit_years = st.slider("Exit Window (years)", min_value=1, max_value=20, value=(3, 10), key="simulation_exit_years")
+    
+    assumptions = {
+        'appreciation_mean': appreciation_mean / 100,
+        'appreciation_vol': appreciation_vol / 100,
+        'rent_psf': float(rent_psf),
+        'exit_min_years': int(exit_years[0]),
+        'exit_max_years': int(exit_years[1])
     }
+    workers = int(os.environ.get('SAFA_SIMULATION_WORKERS', 1))
+    
+    # Drift and volatility are fitted per project on its chained price/sq.ft index
+    archives = {name: get_listing_archive(name, data) for name, data in PROJECT_DATA.items()}
+    snapshot_ids = tuple(snapshot['snapshot'] for name in PROJECT_DATA for snapshot in list_snapshots(name))
+    project_index = index_series(get_price_index(snapshot_ids), 'project')
+    
+    summary_rows = []
+    distributions = []
+    for project_name, archive in archives.items():
+        start_ppsf = archive.numeric('price_per_sqft')
+        history = project_index[project_index['segment'] == project_name].set_index('period')['index']
+        result = simulate_project(start_ppsf, assumptions, n_paths=n_paths, workers=workers, cache=get_analysis_cache(),
+                                  price_history=history)
+        distributions.append(result['distribution'].assign(Project=project_name))
+        summary_rows.append({
+            'Project': project_name,
+            'Appreciation': f"{result['assumptions']['appreciation_mean']:.1%} ± {result['assumptions']['appreciation_vol']:.1%}"
+                            + (" (fitted)" if result['fitted'] else " (assumed)"),
+            'Mean Annual Return': f"{result['mean_return']:.1%}",
+            'Median Annual Return': f"{result['quantiles'][0.5]:.1%}",
+            '5th - 95th Percentile': f"{result['quantiles'][0.05]:.1%} to {result['quantiles'][0.95]:.1%}",
+            'Probability of Loss': f"{result['probability_of_loss']:.1%}",
+            f"Avg Exit Price/{units.area_unit}": f"{units.currency} {result['mean_exit_ppsf'] * column_factor('price_per_sqft', units):,.0f}"
+        })
     
-    investment_df = pd.DataFrame(investment_data)
+    fig = px.line(
+        pd.concat(distributions, ignore_index=True),
+        x='annual_return',
+        y='probability',
+        color='Project',
+        title='Simulated Distribution of Annualized Returns',
+        labels={'annual_return': 'Annualized Return', 'probability': 'Share of Paths'},
+        color_discrete_map={'Safa One': '#1E3A8A', 'Safa Two': '#3B82F6'}
+    )
+    
+    fig.update_layout(
+        font_family="Arial",
+        title_font_size=18,
+        title_font_color='#1E3A8A',
+        legend_title_font_color='#1E3A8A',
+        plot_bgcolor='#EFF6FF',
+        paper_bgcolor='white',
+        height=450
+    )
+    fig.update_xaxes(tickformat='.0%')
+    
+    st.plotly_chart(fig, use_container_width=True)
     
     st.markdown('<div class="compare-table">', unsafe_allow_html=True)
-    st.table(investment_df.set_index('Metric'))
+    st.table(pd.DataFrame(summary_rows).set_index('Project'))
     st.markdown('</div>', unsafe_allow_html=True)
 
+# Measures offered by the drill-down explorer
+DRILLDOWN_MEASURES = {
+    'count': 'Listings',
+    'avg_price': 'Avg Price',
+    'min_price': 'Min Price',
+    'max_price': 'Max Price',
+    'avg_area_sqft': 'Avg Area',
+    'avg_price_per_sqft': 'Avg Price/sq.ft',
+    'min_price_per_sqft': 'Min Price/sq.ft',
+    'max_price_per_sqft': 'Max Price/sq.ft',
+    'std_price_per_sqft': 'Price/sq.ft Std Dev'
+}
+
+def display_market_drilldown(units=AED_SQFT):
+    """Display the drill-down explorer backed by the listings cube"""
+    st.markdown('<div class="sub-header">Market Drill-down</div>', unsafe_allow_html=True)
+    
+    for name, data in PROJECT_DATA.items():
+        get_listing_archive(name, data)
+    snapshot_ids = tuple(snapshot['snapshot'] for name in PROJECT_DATA for snapshot in list_snapshots(name))
+    cube = get_market_cube(snapshot_ids)
+    
+    col1, col2 = st.columns(2)
+    with col1:
+        path = st.multiselect("Drill-down Path", list(DIMENSIONS), default=['project', 'bedrooms', 'view'],
+                              format_func=DIMENSIONS.get, key="drilldown_path")
+    with col2:
+        measures = st.multiselect("Measures", list(DRILLDOWN_MEASURES), default=['count', 'avg_price', 'avg_price_per_sqft'],
+                                  format_func=DRILLDOWN_MEASURES.get, key="drilldown_measures")
+    if not path or not measures:
+        st.info("Choose at least one dimension and one measure to explore the listings.")
+        return
+    
+    # Each selected value narrows the next level; the first level left at "All" is the one shown
+    selections = []
+    selection_cols = st.columns(len(path))
+    for depth, dimension in enumerate(path[:-1]):
+        with selection_cols[depth]:
+            options = ["All"] + cube.values(dimension, dict(zip(path, selections)))
+            choice = st.selectbox(f"{DIMENSIONS[dimension]}", options, key=f"drilldown_{dimension}")
+        if choice == "All":
+            break
+        selections.append(choice)
+    
+    level, result = cube.drill_down(path, selections, measures)
+    result = convert_frame(result, units)
+    measure_labels = {measure: label.replace('sq.ft', units.area_unit) for measure, label in DRILLDOWN_MEASURES.items()}
+    breadcrumb = ' › '.join(['All'] + selections)
+    st.write(f"{breadcrumb} › by {DIMENSIONS[level]}")
+    if cube.latest_only([level], dict(zip(path, selections))):
+        st.caption("Figures use each project's latest snapshot; add Snapshot Date to the path to compare snapshots.")
+    
+    chart_measure = next((measure for measure in measures if measure != 'count'), measures[0])
+    fig = px.bar(
+        result,
+        x=level,
+        y=chart_measure,
+        title=f"{measure_labels[chart_measure]} by {DIMENSIONS[level]}",
+        labels={level: DIMENSIONS[level], chart_measure: measure_labels[chart_measure]},
+        color_discrete_sequence=['#1E3A8A']
+    )
+    fig.update_layout(
+        font_family="Arial",
+        title_font_size=18,
+        title_font_color='#1E3A8A',
+        plot_bgcolor='#EFF6FF',
+        paper_bgcolor='white',
+        height=400
+    )
+    st.plotly_chart(fig, use_container_width=True)
+    
+    table = result.rename(columns=dict(DIMENSIONS, **measure_labels))
+    for measure in measures:
+        label = measure_labels[measure]
+        if measure == 'count':
+            continue
+        elif measure.endswith('price_per_sqft'):
+            table[label] = table[label].apply(lambda x: f"{units.currency} {x:,.0f}")
+        elif measure.endswith('area_sqft'):
+            table[label] = table[label].apply(format_area, area_unit=units.area_unit)
+        else:
+            table[label] = table[label].apply(format_currency, currency=units.currency)
+    st.table(table.set_index(DIMENSIONS[level]))
+
+def display_price_index():
+    """Display the chained price/sq.ft index per market, location or project segment"""
+    st.markdown('<div class="sub-header">Price Index</div>', unsafe_allow_html=True)
+    
+    for name, data in PROJECT_DATA.items():
+        get_listing_archive(name, data)
+    snapshot_ids = tuple(snapshot['snapshot'] for name in PROJECT_DATA for snapshot in list_snapshots(name))
+    index = get_price_index(snapshot_ids)
+    
+    col1, col2 = st.columns(2)
+    with col1:
+        segment_type = st.selectbox("Index Segment", list(SEGMENT_TYPES), format_func=SEGMENT_TYPES.get,
+                                    key="price_index_segment")
+    with col2:
+        bedroom_types = sorted(index.loc[index['bedrooms'] != 'All', 'bedrooms'].unique(), key=lambda x: (x != 'studio', x))
+        bedrooms = st.selectbox("Index Unit Type", ['All'] + bedroom_types,
+                                format_func=lambda x: 'All Unit Types' if x == 'All' else bedroom_label(x),
+                                key="price_index_bedrooms")
+    
+    series = index_series(index, segment_type, bedrooms)
+    if series['period'].nunique() < 2:
+        st.info("The index starts at 100 on the first snapshot date and moves once more snapshots are archived.")
+    fig = cached_figure(('price_index', segment_type, bedrooms) + snapshot_ids,
+                        lambda: price_index_chart(series, f"{SEGMENT_TYPES[segment_type]} Price/sq.ft Index"))
+    st.plotly_chart(fig, use_container_width=True)
+
+@st.fragment(run_every=PREVIEW_POLL_SECONDS)
+def display_preview(units=AED_SQFT):
+    """Approximate overview from stratified samples, shown until the exact aggregates are ready
+
+    Polls the background build and reruns the whole app once it finishes, so the exact
+    dashboard replaces the preview without any action from the user.
+    """
+    if get_dataset_if_ready() is not None:
+        st.rerun()
+    
+    previews = {name: get_preview(name, data_version(data)) for name, data in PROJECT_DATA.items()}
+    sample_size = sum(preview['sample_size'] for preview in previews.values())
+    total_listings = sum(preview['total_listings'] for preview in previews.values())
+    st.info(f"Preview from a stratified sample of {sample_size:,} of {total_listings:,} listings; "
+            f"± is a 95% margin of error and ≈ marks sample values. Exact values are being computed "
+            f"and will replace these automatically.")
+    
+    comparison_rows = []
+    for name, preview in previews.items():
+        stats = convert_stats(preview['stats_overall'], units)
+        st.markdown(f'<div class="sub-header">{name} Overview (Preview)</div>', unsafe_allow_html=True)
+        metric_cards([
+            (f"{stats['total_listings']:,}", "Total Listings"),
+            (f"{format_currency(stats['avg_price'], units.currency)} ± {stats['avg_price_moe']:,.0f}", "Average Price"),
+            (f"{format_area(stats['avg_area'], units.area_unit)} ± {stats['avg_area_moe']:,.0f}", "Average Area"),
+            (f"{units.currency} {stats['avg_price_per_sqft']:,.0f} ± {stats['avg_price_per_sqft_moe']:,.0f}",
+             f"Average Price/{units.area_unit}")
+        ])
+        
+        bedroom_stats = convert_frame(preview['bedroom_stats'], units)
+        rows = tuple((
+            bedroom_label(row.bedrooms),
+            f"{row.count:,}",
+            f"{format_currency(row.avg_price, units.currency)} ± {row.avg_price_moe:,.0f}",
+            f"≈ {format_currency(row.median_price, units.currency)}",
+            f"{format_area(row.avg_area, units.area_unit)} ± {row.avg_area_moe:,.0f}",
+            f"{units.currency} {row.avg_price_per_sqft:,.0f} ± {row.avg_price_per_sqft_moe:,.0f}"
+        ) for row in bedroom_stats.itertuples())
+        st.markdown(html_table(('Bedrooms', 'Count', 'Avg Price', 'Median Price', 'Avg Area',
+                                f'Avg Price/{units.area_unit}'), rows), unsafe_allow_html=True)
+        comparison_rows.append(pd.DataFrame({
+            'Project': name,
+            'Bedroom Type': bedroom_stats['bedrooms'].map(bedroom_label),
+            'Avg Price/sq.ft': bedroom_stats['avg_price_per_sqft'],
+            'Margin of Error': bedroom_stats['avg_price_per_sqft_moe']
+        }))
+    
+    fig = price_comparison_chart(pd.concat(comparison_rows, ignore_index=True), units, error_column='Margin of Error')
+    st.plotly_chart(fig, use_container_width=True)
+
 # Main function to run the Streamlit app
 def main():
     # Header
@@ -1035,9 +865,36 @@ def main():
         "Overview", "Safa One Analysis", "Safa Two Analysis", "Project Comparison"
     ])
     
-    # Analyze data
-    safa_one_analysis = analyze_data(SAFA_ONE_DATA)
-    safa_two_analysis = analyze_data(SAFA_TWO_DATA)
+    # Display currency and area unit; prices and areas are converted from AED and sq.ft
+    with st.sidebar:
+        currency = st.selectbox("Currency", CURRENCIES, key="display_currency")
+        area_unit = st.radio("Area Unit", list(AREA_UNITS), key="display_area_unit")
+        units = display_units(currency, area_unit)
+        if units.rates_date:
+            st.caption(f"FX rates as of {units.rates_date:%d %b %Y}")
+        
+        # Listing age buckets shared by the age charts and the listing age filters
+        edges_text = st.text_input("Listing Age Buckets (days)", ", ".join(str(edge) for edge in DEFAULT_EDGES),
+                                   key="listing_age_edges")
+        try:
+            listing_age_edges = parse_edges(edges_text)
+        except ValueError:
+            st.warning("Enter positive whole numbers of days, e.g. 7, 30, 90. Using the default buckets.")
+            listing_age_edges = DEFAULT_EDGES
+        st.caption(" · ".join(ListingAgeBuckets(listing_age_edges).labels))
+    
+    # Large datasets open on a sampled preview until the exact aggregates are built
+    if get_dataset_if_ready() is None:
+        with tab_overview:
+            display_preview(units)
+        for tab in (tab_safa_one, tab_safa_two, tab_comparison):
+            with tab:
+                st.info("This section loads once the exact values are ready.")
+        return
+    
+    # Load precomputed aggregates
+    safa_one_analysis = get_project_aggregates("Safa One", SAFA_ONE_DATA, units)
+    safa_two_analysis = get_project_aggregates("Safa Two", SAFA_TWO_DATA, units)
     
     # Overview tab
     with tab_overview:
@@ -1074,92 +931,42 @@ def main():
         safa_one_stats = safa_one_analysis['stats_overall']
         safa_two_stats = safa_two_analysis['stats_overall']
         
-        col1, col2, col3 = st.columns(3)
-        
-        with col1:
-            st.markdown("""
-            <div class="metric-card">
-                <h3 style="color: #1E3A8A; text-align: center; margin-bottom: 15px;">Average Price</h3>
-                <div style="display: flex; justify-content: space-between;">
-                    <div>
-                        <p style="font-weight: 600; color: #1E3A8A;">Safa One</p>
-                        <p style="font-size: 20px;">{}</p>
-                    </div>
-                    <div>
-                        <p style="font-weight: 600; color: #3B82F6;">Safa Two</p>
-                        <p style="font-size: 20px;">{}</p>
-                    </div>
-                </div>
-            </div>
-            """.format(
-                format_currency(safa_one_stats['avg_price']),
-                format_currency(safa_two_stats['avg_price'])
-            ), unsafe_allow_html=True)
+        quick_comparison = [
+            ("Average Price", format_currency(safa_one_stats['avg_price'], units.currency),
+             format_currency(safa_two_stats['avg_price'], units.currency)),
+            ("Average Area", format_area(safa_one_stats['avg_area'], units.area_unit),
+             format_area(safa_two_stats['avg_area'], units.area_unit)),
+            (f"Avg Price/{units.area_unit}", f"{units.currency} {safa_one_stats['avg_price_per_sqft']:,.0f}",
+             f"{units.currency} {safa_two_stats['avg_price_per_sqft']:,.0f}")
+        ]
+        for col, (title, safa_one_value, safa_two_value) in zip(st.columns(3), quick_comparison):
+            with col:
+                st.markdown(comparison_card(title, (
+                    ("Safa One", PROJECT_COLORS['Safa One'], safa_one_value),
+                    ("Safa Two", PROJECT_COLORS['Safa Two'], safa_two_value)
+                )), unsafe_allow_html=True)
         
-        with col2:
-            st.markdown("""
-            <div class="metric-card">
-                <h3 style="color: #1E3A8A; text-align: center; margin-bottom: 15px;">Average Area</h3>
-                <div style="display: flex; justify-content: space-between;">
-                    <div>
-                        <p style="font-weight: 600; color: #1E3A8A;">Safa One</p>
-                        <p style="font-size: 20px;">{}</p>
-                    </div>
-                    <div>
-                        <p style="font-weight: 600; color: #3B82F6;">Safa Two</p>
-                        <p style="font-size: 20px;">{}</p>
-                    </div>
-                </div>
-            </div>
-            """.format(
-                format_area(safa_one_stats['avg_area']),
-                format_area(safa_two_stats['avg_area'])
-            ), unsafe_allow_html=True)
+        # Project locations, with listings binned into geohash cells
+        st.markdown('<div class="sub-header">Project Map</div>', unsafe_allow_html=True)
         
-        with col3:
-            st.markdown("""
-            <div class="metric-card">
-                <h3 style="color: #1E3A8A; text-align: center; margin-bottom: 15px;">Avg Price/sq.ft</h3>
-                <div style="display: flex; justify-content: space-between;">
-                    <div>
-                        <p style="font-weight: 600; color: #1E3A8A;">Safa One</p>
-                        <p style="font-size: 20px;">AED {:,.0f}</p>
-                    </div>
-                    <div>
-                        <p style="font-weight: 600; color: #3B82F6;">Safa Two</p>
-                        <p style="font-size: 20px;">AED {:,.0f}</p>
-                    </div>
-                </div>
-            </div>
-            """.format(
-                safa_one_stats['avg_price_per_sqft'],
-                safa_two_stats['avg_price_per_sqft']
-            ), unsafe_allow_html=True)
+        data_versions = get_dataset().versions
+        grid, projects = get_geo_grid(data_versions)
+        fig = cached_figure(('project_map',) + data_versions + units,
+                            lambda: project_map(convert_frame(grid, units), projects, units))
+        st.plotly_chart(fig, use_container_width=True)
         
         # Listing age analysis
         st.markdown('<div class="sub-header">Listing Age Analysis</div>', unsafe_allow_html=True)
         
         # Create listing age distribution charts
+        listing_age_stats = get_listing_age_stats(get_dataset().key, listing_age_edges)
         col1, col2 = st.columns(2)
         
         with col1:
             st.markdown('<h4 style="color: #1E3A8A; text-align: center;">Safa One Listings by Age</h4>', unsafe_allow_html=True)
             
-            if not safa_one_analysis['listing_days_stats'].empty:
-                fig1 = px.pie(
-                    safa_one_analysis['listing_days_stats'],
-                    values='count',
-                    names='listing_period',
-                    title='Safa One Listings by Age',
-                    color_discrete_sequence=px.colors.sequential.Blues_r
-                )
-                
-                fig1.update_layout(
-                    font_family="Arial",
-                    title_font_color='#1E3A8A',
-                    legend_title_text='Listing Period',
-                    height=400
-                )
+            if listing_age_stats['Safa One']['count'].sum():
+                fig1 = listing_age_pie(listing_age_stats['Safa One'], 'Safa One')
                 
                 st.plotly_chart(fig1, use_container_width=True)
             else:
@@ -1168,21 +975,8 @@ def main():
         with col2:
             st.markdown('<h4 style="color: #1E3A8A; text-align: center;">Safa Two Listings by Age</h4>', unsafe_allow_html=True)
             
-            if not safa_two_analysis['listing_days_stats'].empty:
-                fig2 = px.pie(
-                    safa_two_analysis['listing_days_stats'],
-                    values='count',
-                    names='listing_period',
-                    title='Safa Two Listings by Age',
-                    color_discrete_sequence=px.colors.sequential.Blues_r
-                )
-                
-                fig2.update_layout(
-                    font_family="Arial",
-                    title_font_color='#1E3A8A',
-                    legend_title_text='Listing Period',
-                    height=400
-                )
+            if listing_age_stats['Safa Two']['count'].sum():
+                fig2 = listing_age_pie(listing_age_stats['Safa Two'], 'Safa Two')
                 
                 st.plotly_chart(fig2, use_container_width=True)
             else:
@@ -1196,7 +990,7 @@ def main():
         display_project_info("Safa One", PROJECT_INFO["Safa One"])
         
         # Display analysis
-        display_project_analysis("Safa One", SAFA_ONE_DATA)
+        display_project_analysis("Safa One", SAFA_ONE_DATA, units, listing_age_edges)
     
     # Safa Two tab
     with tab_safa_two:
@@ -1206,14 +1000,14 @@ def main():
         display_project_info("Safa Two", PROJECT_INFO["Safa Two"])
         
         # Display analysis
-        display_project_analysis("Safa Two", SAFA_TWO_DATA)
+        display_project_analysis("Safa Two", SAFA_TWO_DATA, units, listing_age_edges)
     
     # Comparison tab
     with tab_comparison:
         st.markdown('<div class="project-title">Safa One vs Safa Two</div>', unsafe_allow_html=True)
         
         # Display comparison
-        display_comparison(safa_one_analysis, safa_two_analysis)
+        display_comparison(safa_one_analysis, safa_two_analysis, units, listing_age_edges)
         
         # Investment insights
         st.markdown("""
@@ -1230,6 +1024,15 @@ def main():
             </ul>
         </div>
         """, unsafe_allow_html=True)
+        
+        # Simulated return distributions
+        display_scenario_simulation(units)
+        
+        # Drill-down over any grouping of the listings
+        display_market_drilldown(units)
+        
+        # Price/sq.ft index over the snapshot history
+        display_price_index()
     
     # Footer
     st.markdown("""
@@ -1239,34 +1042,33 @@ def main():
     </div>
     """, unsafe_allow_html=True)
     
-    # Save to CSV
-    safa_one_path = os.path.join(RESULTS_DIR, "safa_one_properties.csv")
-    safa_two_path = os.path.join(RESULTS_DIR, "safa_two_properties.csv")
-    
-    safa_one_analysis['dataframe'].to_csv(safa_one_path, index=False)
-    safa_two_analysis['dataframe'].to_csv(safa_two_path, index=False)
-    
-    # Download links for CSVs
+    # Download links for CSVs, written once per data version and shared by every session
+    dataset = get_dataset()
     col1, col2 = st.columns(2)
     
     with col1:
-        with open(safa_one_path, 'rb') as f:
-            st.download_button(
-                label="Download Safa One Data",
-                data=f.read(),
-                file_name="safa_one_properties.csv",
-                mime="text/csv"
-            )
+        st.download_button(
+            label="Download Safa One Data",
+            data=get_listings_csv("Safa One", dataset.key),
+            file_name="safa_one_properties.csv",
+            mime="text/csv"
+        )
     
     with col2:
-        with open(safa_two_path, 'rb') as f:
-            st.download_button(
-                label="Download Safa Two Data",
-                data=f.read(),
-                file_name="safa_two_properties.csv",
-                mime="text/csv"
-            )
+        st.download_button(
+            label="Download Safa Two Data",
+            data=get_listings_csv("Safa Two", dataset.key),
+            file_name="safa_two_properties.csv",
+            mime="text/csv"
+        )
 
 # Run the Streamlit app
 if __name__ == "__main__":
-    main()
+    health = current_prewarm()
+    if health is None:
+        main()
+    else:
+        # Executed by warmup.prewarm at process start: build the caches step by step, timing each
+        for name, build in prewarm_steps():
+            health.run_step(name, build)
+        health.mark_ready(get_dataset().versions, get_analysis_cache().metrics())
@@ -0,0 +1,242 @@
+import argparse
+import html
+import json
+import os
+import time
+from concurrent.futures import ProcessPoolExecutor
+from datetime import date
+
+import pandas as pd
+import plotly.offline
+
+from cache_backend import get_cache_backend, make_key
+from charts import (format_area, format_currency, investment_table, listing_age_comparison_chart, listing_age_pie,
+                    listing_days_chart, price_comparison_chart, simplified_unit_types, unit_type_table)
+from materialize import project_slug
+
+REPORTS_DIR = os.path.join('results', 'reports')
+PLOTLY_ASSET = 'plotly.min.js'
+
+REPORT_CSS = """
+body { font-family: Arial, sans-serif; color: #1F2937; margin: 0 auto; max-width: 1100px; padding: 24px; }
+h1 { color: #1E3A8A; border-bottom: 3px solid #1E3A8A; padding-bottom: 8px; }
+h2 { color: #1E3A8A; margin-top: 32px; }
+.info-box { background: #EFF6FF; border-left: 5px solid #3B82F6; padding: 12px 18px; border-radius: 4px; }
+.metrics { display: flex; gap: 16px; margin: 16px 0; }
+.metric-card { flex: 1; background: #F8FAFC; border-radius: 8px; padding: 14px; text-align: center; box-shadow: 0 1px 3px rgba(0,0,0,.12); }
+.metric-value { font-size: 1.5rem; font-weight: bold; color: #1E3A8A; }
+.metric-label { font-size: .9rem; color: #6B7280; }
+table { border-collapse: collapse; width: 100%; margin: 12px 0; font-size: .9rem; }
+th { background: #1E3A8A; color: white; padding: 8px; text-align: left; }
+td { padding: 6px 8px; border-bottom: 1px solid #E5E7EB; }
+tr:nth-child(even) td { background: #F9FAFB; }
+.footer { margin-top: 40px; color: #6B7280; font-size: .8rem; text-align: center; }
+"""
+
+# The plotly.js bundle is read once per process and shared by every report it renders
+_plotly_js = None
+
+
+def plotly_js():
+    """The plotly.js bundle inlined into self-contained reports"""
+    global _plotly_js
+    if _plotly_js is None:
+        _plotly_js = plotly.offline.get_plotlyjs()
+    return _plotly_js
+
+
+def figure_html(key_parts, build_figure, cache=None):
+    """HTML fragment for a Plotly figure, cached by its data version"""
+    render = lambda: build_figure().to_html(full_html=False, include_plotlyjs=False,
+                                            div_id='fig-' + '-'.join(project_slug(str(p)) for p in key_parts))
+    if cache is None:
+        return render()
+    return cache.get_or_compute(make_key('report_figure', *key_parts), render)
+
+
+def _table_html(df, index=False):
+    return df.to_html(index=index, border=0, escape=True)
+
+
+def _metric_cards(stats):
+    cards = [
+        (stats['total_listings'], 'Total Listings'),
+        (format_currency(stats['avg_price']), 'Average Price'),
+        (format_area(stats['avg_area']), 'Average Area'),
+        (f"AED {stats['avg_price_per_sqft']:,.0f}", 'Average Price/sq.ft')
+    ]
+    return '<div class="metrics">' + ''.join(
+        f'<div class="metric-card"><div class="metric-value">{html.escape(str(value))}</div>'
+        f'<div class="metric-label">{label}</div></div>' for value, label in cards) + '</div>'
+
+
+def _page(title, body, plotlyjs):
+    if plotlyjs == 'inline':
+        script = f'<script type="text/javascript">{plotly_js()}</script>'
+    else:
+        script = f'<script src="{PLOTLY_ASSET}"></script>'
+    return (f'<!DOCTYPE html><html><head><meta charset="utf-8"><title>{html.escape(title)}</title>'
+            f'<style>{REPORT_CSS}</style>{script}</head><body>{body}'
+            f'<div class="footer">Generated {date.today().isoformat()} • This report is based on current property '
+            f'listings and is for informational purposes only.</div></body></html>')
+
+
+def render_project_report(project_name, project_info, aggregates, cache=None, plotlyjs='inline'):
+    """Static HTML report for one project from its materialized aggregates"""
+    version = aggregates['data_version']
+    listing_days_stats = aggregates['listing_days_stats']
+    sections = [
+        f'<h1>{html.escape(project_name)} Analysis</h1>',
+        f'<div class="info-box"><p>{html.escape(project_info["description"])}</p>'
+        f'<p><b>Location:</b> {html.escape(project_info["location"])} • <b>Developer:</b> {html.escape(project_info["developer"])} • '
+        f'<b>Expected Delivery:</b> {html.escape(project_info["delivery_date"])} • '
+        f'<b>Payment Plan:</b> {html.escape(project_info["payment_plan"])}</p></div>',
+        '<h2>Overview</h2>',
+        _metric_cards(aggregates['stats_overall']),
+        '<h2>Unit Types Summary</h2>',
+        _table_html(unit_type_table(aggregates['bedroom_stats'])),
+        '<h2>Simplified Unit Types</h2>',
+        _table_html(simplified_unit_types(aggregates['bedroom_stats']))
+    ]
+    if not listing_days_stats.empty:
+        sections += [
+            '<h2>Listing Days Analysis</h2>',
+            figure_html(('listing_days', project_name, version),
+                        lambda: listing_days_chart(listing_days_stats, project_name), cache),
+            figure_html(('listing_age_pie', project_name, version),
+                        lambda: listing_age_pie(listing_days_stats, project_name), cache)
+        ]
+    return _page(f"{project_name} Report", ''.join(sections), plotlyjs)
+
+
+def render_comparison_report(project_infos, aggregates_by_project, cache=None, plotlyjs='inline'):
+    """Static HTML report comparing every project, with links to the per-project reports"""
+    versions = tuple(aggregates['data_version'] for aggregates in aggregates_by_project.values())
+    comparison_rows = pd.concat([aggregates['comparison_rows'] for aggregates in aggregates_by_project.values()],
+                                ignore_index=True)
+    combined_listing = pd.concat([aggregates['listing_days_stats'].assign(Project=name)
+                                  for name, aggregates in aggregates_by_project.items()], ignore_index=True)
+    summaries = {name: aggregates['investment_summary'] for name, aggregates in aggregates_by_project.items()}
+
+    links = ''.join(f'<li><a href="{project_slug(name)}.html">{html.escape(name)}</a></li>' for name in aggregates_by_project)
+    sections = [
+        '<h1>Project Comparison</h1>',
+        f'<ul>{links}</ul>',
+        '<h2>Price per Sq.Ft Comparison by Bedroom Type</h2>',
+        figure_html(('price_comparison',) + versions, lambda: price_comparison_chart(comparison_rows), cache)
+    ]
+    if not combined_listing.empty:
+        sections += [
+            '<h2>Listing Age Comparison</h2>',
+            figure_html(('listing_age_comparison',) + versions, lambda: listing_age_comparison_chart(combined_listing), cache)
+        ]
+    sections += ['<h2>Investment Comparison</h2>',
+                 _table_html(investment_table(project_infos, summaries).set_index('Metric'), index=True)]
+    return _page("Project Comparison", ''.join(sections), plotlyjs)
+
+
+def write_pdf_report(path, project_name, project_info, aggregates):
+    """PDF version of a project report, drawn with matplotlib so it needs no browser or image exporter"""
+    import matplotlib
+    matplotlib.use('Agg')
+    import matplotlib.pyplot as plt
+    from matplotlib.backends.backend_pdf import PdfPages
+
+    stats = aggregates['stats_overall']
+    with PdfPages(path) as pdf:
+        fig = plt.figure(figsize=(11.69, 8.27))
+        fig.suptitle(f"{project_name} Analysis", fontsize=20, color='#1E3A8A', x=0.05, ha='left')
+        fig.text(0.05, 0.86, f"{project_info['location']} • {project_info['developer']} • Delivery "
+                 f"{project_info['delivery_date']} • Payment plan {project_info['payment_plan']}", fontsize=10)
+        fig.text(0.05, 0.81, f"{stats['total_listings']} listings • Average price {format_currency(stats['avg_price'])} • "
+                 f"Average area {format_area(stats['avg_area'])} • Average AED {stats['avg_price_per_sqft']:,.0f}/sq.ft",
+                 fontsize=11, color='#1E3A8A')
+        ax = fig.add_axes([0.05, 0.35, 0.9, 0.4])
+        ax.axis('off')
+        table = simplified_unit_types(aggregates['bedroom_stats'])
+        cells = ax.table(cellText=table.values, colLabels=table.columns, loc='upper center', cellLoc='left')
+        cells.auto_set_font_size(False)
+        cells.set_fontsize(9)
+        cells.scale(1, 1.6)
+
+        listing_days_stats = aggregates['listing_days_stats']
+        if not listing_days_stats.empty:
+            ax = fig.add_axes([0.08, 0.06, 0.86, 0.26])
+            ax.bar(listing_days_stats['listing_period'], listing_days_stats['count'], color='#0d3b66')
+            ax.set_title('Properties by Listing Period', color='#1E3A8A', fontsize=11)
+            ax.tick_params(axis='x', labelrotation=45, labelsize=8)
+        pdf.savefig(fig)
+        plt.close(fig)
+
+
+def _render_job(project_name, project_info, aggregates, output_dir, plotlyjs, pdf):
+    cache = get_cache_backend()
+    path = os.path.join(output_dir, f"{project_slug(project_name)}.html")
+    with open(path, 'w', encoding='utf-8') as f:
+        f.write(render_project_report(project_name, project_info, aggregates, cache, plotlyjs))
+    if pdf:
+        write_pdf_report(os.path.join(output_dir, f"{project_slug(project_name)}.pdf"), project_name, project_info, aggregates)
+    return project_name
+
+
+def _read_report_manifest(output_dir):
+    try:
+        with open(os.path.join(output_dir, 'manifest.json')) as f:
+            return json.load(f)
+    except FileNotFoundError:
+        return {}
+
+
+def generate_reports(project_infos, aggregates_by_project, output_dir=REPORTS_DIR, workers=1,
+                     pdf=False, shared_assets=False, force=False):
+    """Render per-project reports and a comparison report, in parallel across projects
+
+    Reports whose project data version (and options) match the previous run are skipped.
+    With shared_assets the plotly.js bundle is written once next to the reports instead of
+    being inlined into each file. Returns the names of the projects that were rendered.
+    """
+    os.makedirs(output_dir, exist_ok=True)
+    plotlyjs = 'shared' if shared_assets else 'inline'
+    if shared_assets and not os.path.exists(os.path.join(output_dir, PLOTLY_ASSET)):
+        with open(os.path.join(output_dir, PLOTLY_ASSET), 'w', encoding='utf-8') as f:
+            f.write(plotly_js())
+
+    manifest = _read_report_manifest(output_dir)
+    stamp = lambda version: f"{version}:{plotlyjs}:{'pdf' if pdf else 'html'}"
+    jobs = [(name, project_infos[name], aggregates, output_dir, plotlyjs, pdf)
+            for name, aggregates in aggregates_by_project.items()
+            if force or manifest.get(name) != stamp(aggregates['data_version'])]
+
+    if workers > 1 and len(jobs) > 1:
+        with ProcessPoolExecutor(max_workers=workers) as pool:
+            rendered = list(pool.map(_render_job, *zip(*jobs)))
+    else:
+        rendered = [_render_job(*job) for job in jobs]
+
+    with open(os.path.join(output_dir, 'index.html'), 'w', encoding='utf-8') as f:
+        f.write(render_comparison_report(project_infos, aggregates_by_project, get_cache_backend(), plotlyjs))
+
+    manifest.update({name: stamp(aggregates['data_version']) for name, aggregates in aggregates_by_project.items()})
+    with open(os.path.join(output_dir, 'manifest.json'), 'w') as f:
+        json.dump(manifest, f, indent=2)
+    return rendered
+
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description="Render static project reports")
+    parser.add_argument('--output', default=REPORTS_DIR)
+    parser.add_argument('--workers', type=int, default=os.cpu_count() or 1)
+    parser.add_argument('--pdf', action='store_true', help="Also write a PDF per project")
+    parser.add_argument('--shared-assets', action='store_true', help="Reference one plotly.js file instead of inlining it")
+    parser.add_argument('--force', action='store_true', help="Re-render reports whose data has not changed")
+    args = parser.parse_args()
+
+    from materialize import load_aggregates
+    from projects import PROJECT_INFO, ingest_projects
+
+    start = time.perf_counter()
+    aggregates_by_project = {name: load_aggregates(name, version) for name, version in ingest_projects().items()}
+    rendered = generate_reports(PROJECT_INFO, aggregates_by_project, args.output, args.workers,
+                                args.pdf, args.shared_assets, args.force)
+    print(f"Rendered {len(rendered)} of {len(aggregates_by_project)} project reports to {args.output} "
+          f"in {time.perf_counter() - start:.2f}s")
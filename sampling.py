@@ -0,0 +1,157 @@
+import time
+
+import numpy as np
+import pandas as pd
+
+# Listings are sampled within each bedroom/bathroom combination
+STRATA = ['bedrooms', 'bathrooms']
+
+# First sample size; each refinement round quadruples it while the latency budget allows
+INITIAL_SAMPLE_SIZE = 2_000
+GROWTH_FACTOR = 4
+MIN_PER_STRATUM = 2
+
+# Two-sided 95% normal quantile for the margins of error
+Z_95 = 1.96
+
+ESTIMATED_COLUMNS = ['price', 'area_sqft', 'price_per_sqft']
+
+
+class StratifiedSampler:
+    """Nested stratified samples of a listings frame, proportional to each stratum's size
+
+    Rows are shuffled once within every stratum, so a larger sample always contains the
+    smaller ones and growing the sample only adds rows. Every stratum gets at least
+    MIN_PER_STRATUM rows (or all of them) so its variance can be estimated.
+    """
+
+    def __init__(self, df, strata=STRATA, seed=0):
+        self.df = df
+        # Stratum code per row from the per-column codes, keeping only combinations that occur
+        codes = np.zeros(len(df), dtype=np.int64)
+        uniques = []
+        for column in strata:
+            column_codes, column_uniques = pd.factorize(df[column].astype(str), sort=True)
+            codes = codes * len(column_uniques) + column_codes
+            uniques.append(column_uniques)
+        occurring = np.flatnonzero(np.bincount(codes))
+        remap = np.zeros(codes.max() + 1 if len(codes) else 1, dtype=np.min_scalar_type(len(occurring)))
+        remap[occurring] = np.arange(len(occurring))
+        self.codes = remap[codes]
+        self.strata = pd.MultiIndex.from_product(uniques, names=strata)[occurring]
+        self.population = np.bincount(self.codes, minlength=len(occurring))
+
+        # Rows grouped by stratum, in random order within each stratum (a stable sort of a
+        # random permutation by the small integer stratum codes)
+        permutation = np.random.default_rng(seed).permutation(len(df))
+        self._order = permutation[np.argsort(self.codes[permutation], kind='stable')]
+        self._starts = np.concatenate([[0], np.cumsum(self.population)[:-1]])
+
+    def allocation(self, sample_size):
+        """Rows to draw from each stratum for a total of about sample_size"""
+        share = np.floor(self.population * min(sample_size / max(len(self.df), 1), 1.0)).astype(np.int64)
+        return np.minimum(np.maximum(share, MIN_PER_STRATUM), self.population)
+
+    def sample(self, sample_size):
+        """Positions of a stratified sample of about sample_size rows, with their strata"""
+        take = self.allocation(sample_size)
+        positions = np.concatenate([self._order[start:start + n] for start, n in zip(self._starts, take)])
+        return positions, take
+
+
+def _weighted_median(values, weights):
+    order = np.argsort(values)
+    cumulative = np.cumsum(weights[order])
+    return values[order][np.searchsorted(cumulative, cumulative[-1] / 2)]
+
+
+def estimate_stats(sampler, sample_size):
+    """Approximate stats_overall and bedroom_stats from one stratified sample
+
+    Means are stratified estimates with a 95% margin of error (`*_moe`), including the
+    finite population correction; listing counts are exact, since strata sizes are known.
+    Medians, minima and maxima come from the sample and are approximate, without error bars.
+    """
+    positions, take = sampler.sample(sample_size)
+    df = sampler.df
+    sample = pd.DataFrame({
+        'stratum': sampler.codes[positions],
+        'price': df['price'].to_numpy(dtype=float)[positions],
+        'area_sqft': df['area_sqft'].to_numpy(dtype=float)[positions]
+    })
+    sample['price_per_sqft'] = sample['price'] / sample['area_sqft']
+    sample['weight'] = (sampler.population / np.maximum(take, 1))[sample['stratum']]
+
+    per_stratum = sample.groupby('stratum')[ESTIMATED_COLUMNS].agg(['mean', 'var'])
+    strata = pd.DataFrame(sampler.strata.tolist(), columns=STRATA).loc[per_stratum.index]
+    population = sampler.population[per_stratum.index]
+    drawn = take[per_stratum.index]
+    fpc = np.where(population > 0, 1 - drawn / np.maximum(population, 1), 0)
+
+    def estimate(group_rows):
+        """Stratified mean and margin of error of each estimated column over some strata"""
+        weights = population[group_rows] / population[group_rows].sum()
+        result = {}
+        for column in ESTIMATED_COLUMNS:
+            means = per_stratum[(column, 'mean')].to_numpy()[group_rows]
+            variances = np.nan_to_num(per_stratum[(column, 'var')].to_numpy()[group_rows])
+            standard_error = np.sqrt(np.sum(weights ** 2 * fpc[group_rows] * variances / drawn[group_rows]))
+            result[column] = (float(np.sum(weights * means)), float(Z_95 * standard_error))
+        return result
+
+    def approximate(rows):
+        values, weights = rows['price'].to_numpy(), rows['weight'].to_numpy()
+        return {
+            'min_price': values.min(), 'max_price': values.max(),
+            'median_price': _weighted_median(values, weights),
+            'min_area': rows['area_sqft'].min(), 'max_area': rows['area_sqft'].max(),
+            'min_price_per_sqft': rows['price_per_sqft'].min(), 'max_price_per_sqft': rows['price_per_sqft'].max()
+        }
+
+    all_rows = np.arange(len(per_stratum))
+    means = estimate(all_rows)
+    stats_overall = dict(approximate(sample), total_listings=int(population.sum()))
+    for column, name in [('price', 'avg_price'), ('area_sqft', 'avg_area'), ('price_per_sqft', 'avg_price_per_sqft')]:
+        stats_overall[name], stats_overall[f"{name}_moe"] = means[column]
+
+    bedroom_rows = []
+    bedrooms = strata['bedrooms'].to_numpy()
+    for bedroom_type in pd.unique(bedrooms):
+        group_rows = np.flatnonzero(bedrooms == bedroom_type)
+        means = estimate(group_rows)
+        row = {'bedrooms': bedroom_type, 'count': int(population[group_rows].sum())}
+        row.update(approximate(sample[sample['stratum'].isin(per_stratum.index[group_rows])]))
+        for column, name in [('price', 'avg_price'), ('area_sqft', 'avg_area'), ('price_per_sqft', 'avg_price_per_sqft')]:
+            row[name], row[f"{name}_moe"] = means[column]
+        bedroom_rows.append(row)
+    bedroom_stats = pd.DataFrame(bedroom_rows)
+    # Studio first, then by bedroom count (so 10 sorts after 9)
+    bedroom_stats = bedroom_stats.sort_values(
+        'bedrooms', key=lambda bedrooms: pd.to_numeric(bedrooms.replace('studio', '0'), errors='coerce'))
+
+    return {
+        'stats_overall': stats_overall,
+        'bedroom_stats': bedroom_stats.reset_index(drop=True),
+        'sample_size': len(positions),
+        'total_listings': int(population.sum())
+    }
+
+
+def preview_stats(df, budget_seconds, initial_size=INITIAL_SAMPLE_SIZE, seed=0):
+    """The most precise stratified estimate that fits in the latency budget
+
+    Starts from a small sample and quadruples it while the projected time of the next round
+    still fits in what is left of the budget, stopping once the sample is the whole frame.
+    """
+    start = time.perf_counter()
+    sampler = StratifiedSampler(df, seed=seed)
+    sample_size = initial_size
+    while True:
+        round_start = time.perf_counter()
+        estimate = estimate_stats(sampler, sample_size)
+        round_seconds = time.perf_counter() - round_start
+        remaining = budget_seconds - (time.perf_counter() - start)
+        if estimate['sample_size'] >= len(df) or round_seconds * GROWTH_FACTOR > remaining:
+            estimate['seconds'] = time.perf_counter() - start
+            return estimate
+        sample_size *= GROWTH_FACTOR
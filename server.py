@@ -0,0 +1,41 @@
+from contextlib import asynccontextmanager
+
+import streamlit as st
+from starlette.responses import JSONResponse
+from starlette.routing import Mount, Route
+
+import api
+from warmup import APP_PATH, start_prewarm, worker_health
+
+# ASGI entry point for the dashboard: `uvicorn server:app --port 8501`, one process per worker.
+# Each worker warms its caches at startup and reports readiness on /readyz, so the load
+# balancer only routes sessions to workers whose caches are warm. /api serves the same
+# numbers as JSON or Arrow (see api.py).
+
+
+@asynccontextmanager
+async def lifespan(app):
+    """Start warming this worker's caches in the background; remove its health file on shutdown"""
+    health = start_prewarm(APP_PATH)
+    yield
+    health.close()
+
+
+async def healthz(request):
+    """Liveness: always 200 while the process serves, with warm-up status, data versions and load times"""
+    health = worker_health()
+    return JSONResponse(health.as_dict() if health else {'status': 'starting'})
+
+
+async def readyz(request):
+    """Readiness: 200 once every cache is warm, 503 while warming or after a failed warm-up"""
+    health = worker_health()
+    status = health.as_dict() if health else {'status': 'starting'}
+    return JSONResponse(status, status_code=200 if health and health.ready else 503)
+
+
+app = st.App(APP_PATH, lifespan=lifespan, routes=[
+    Route('/healthz', healthz),
+    Route('/readyz', readyz),
+    Mount('/api', routes=api.routes)
+])
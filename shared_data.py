@@ -0,0 +1,113 @@
+import threading
+from collections import OrderedDict
+from types import MappingProxyType
+
+import numpy as np
+import pandas as pd
+
+# Datasets kept per process; older data versions are dropped once no new session asks for them
+MAX_DATASETS = 2
+
+_datasets = OrderedDict()
+_datasets_lock = threading.Lock()
+
+# Keys being built on a background thread, and the errors of background builds that failed
+_building = set()
+_build_errors = {}
+
+
+def _read_only(aggregates):
+    return MappingProxyType({name: MappingProxyType(value) if isinstance(value, dict) else value
+                             for name, value in aggregates.items()})
+
+
+class SharedDataset:
+    """Read-only listings and aggregates shared by every session in the process
+
+    Built once per set of data versions. Sessions keep only their widget state and row
+    positions into `listings`. The frames are shared, never modified in place: anything a
+    session formats is a shallow copy, which copy-on-write keeps from duplicating the data.
+    """
+
+    def __init__(self, key, archives, aggregates):
+        self.key = key
+        self.archives = dict(archives)
+        self.aggregates = MappingProxyType({name: _read_only(value) for name, value in aggregates.items()})
+
+        frames = [archive.to_pandas() for archive in self.archives.values()]
+        sizes = [len(frame) for frame in frames]
+        self.offsets = dict(zip(self.archives, np.concatenate([[0], np.cumsum(sizes)[:-1]]).astype(int)))
+        self.sizes = dict(zip(self.archives, sizes))
+        self.listings = pd.concat(frames, ignore_index=True)
+
+    @property
+    def versions(self):
+        return tuple(version for _, version in self.key)
+
+    def position(self, project_name, row):
+        """Position of a project's archive row within the combined listings"""
+        return self.offsets[project_name] + int(row)
+
+    def project_listings(self, project_name):
+        """The combined listings restricted to one project, without copying them"""
+        start = self.offsets[project_name]
+        return self.listings.iloc[start:start + self.sizes[project_name]]
+
+    def rows(self, positions, columns=None):
+        """Materialize only the selected rows of the combined listings"""
+        listings = self.listings if columns is None else self.listings[columns]
+        return listings.take(np.asarray(positions, dtype=np.int64))
+
+
+def get_shared_dataset(key, load):
+    """Return the process-wide dataset for a key, building it with load(key) on first use
+
+    Concurrent first requests for the same key wait for one build instead of each loading
+    their own copy.
+    """
+    with _datasets_lock:
+        entry = _datasets.get(key)
+        if entry is None:
+            entry = {'lock': threading.Lock(), 'dataset': None}
+            _datasets[key] = entry
+        _datasets.move_to_end(key)
+
+    with entry['lock']:
+        if entry['dataset'] is None:
+            entry['dataset'] = load(key)
+
+    with _datasets_lock:
+        while len(_datasets) > MAX_DATASETS:
+            _datasets.popitem(last=False)
+    return entry['dataset']
+
+
+def get_shared_dataset_nowait(key, load):
+    """Return the dataset for a key if it is already built, else build it in the background
+
+    Returns None while the build runs, so a caller can render something else meanwhile and
+    ask again later. A failed background build is raised on the next call.
+    """
+    with _datasets_lock:
+        entry = _datasets.get(key)
+        if entry is not None and entry['dataset'] is not None:
+            _datasets.move_to_end(key)
+            return entry['dataset']
+        if key in _build_errors:
+            raise _build_errors.pop(key)
+        if key in _building:
+            return None
+        _building.add(key)
+
+    def build():
+        try:
+            get_shared_dataset(key, load)
+        except Exception as exc:
+            with _datasets_lock:
+                _build_errors[key] = exc
+        finally:
+            with _datasets_lock:
+                _building.discard(key)
+
+    threading.Thread(target=build, name='dataset-build', daemon=True).start()
+    return None
@@ -0,0 +1,58 @@
+import numpy as np
+import pandas as pd
+
+from alerts import AlertWatcher, WebhookOutbox, load_rules, parse_below_op
+
+RULES = [{'rule': 'ppsf_below_percentile', 'percentile': 10}]
+
+
+def make_snapshot(prices, area=1_000.0):
+    prices = np.asarray(prices, dtype=float)
+    return pd.DataFrame({
+        'project': 'Safa One',
+        'bedrooms': '1',
+        'bathrooms': '1',
+        'area_sqft': area,
+        'price': prices,
+        'price_per_sqft': prices / area,
+        'listing_age_days': 30.0,
+        'description': 'Pool view'
+    })
+
+
+def assert_reference_matches(watcher, df):
+    np.testing.assert_array_equal(watcher.ppsf_by_type['1'], np.sort(df['price_per_sqft'].to_numpy()))
+
+
+def test_price_cut_alerts_then_sale_updates_the_reference():
+    watcher = AlertWatcher(['Safa One'], WebhookOutbox(), RULES)
+    prices = np.arange(20) * 50_000.0 + 2_000_000
+    first = make_snapshot(prices)
+    assert watcher.ingest('Safa One', 's1', first, evaluate=False) == []
+
+    # The dearest unit is cut to the cheapest price/sq.ft in the market
+    cut = make_snapshot(np.r_[prices[:-1], 1_500_000])
+    alerts = watcher.ingest('Safa One', 's2', cut)
+    assert [alert['price'] for alert in alerts] == [1_500_000]
+    assert alerts[0]['unit_key'] == watcher.active['Safa One']['unit_key'].iloc[-1]
+    assert_reference_matches(watcher, cut)
+
+    # The repriced unit sells: no alert, and its current value leaves the reference
+    sold = make_snapshot(prices[:-1])
+    assert watcher.ingest('Safa One', 's3', sold) == []
+    assert_reference_matches(watcher, sold)
+    assert watcher.metrics['ppsf_below_percentile(percentile=10)'].rows == 1
+
+
+def test_unchanged_units_are_not_evaluated_again():
+    watcher = AlertWatcher(['Safa One'], WebhookOutbox(), RULES)
+    prices = np.arange(20) * 50_000.0 + 2_000_000
+    watcher.ingest('Safa One', 's1', make_snapshot(prices), evaluate=False)
+    alerts = watcher.ingest('Safa One', 's2', make_snapshot(np.r_[prices, 1_000_000]))
+    assert [alert['price'] for alert in alerts] == [1_000_000]
+    assert watcher.metrics['ppsf_below_percentile(percentile=10)'].rows == 1
+
+
+def test_rules_and_parsing():
+    assert parse_below_op(['12% below OP', '5 % under original price', 'Sea view'])[:2].tolist() == [12, 5]
+    assert [rule['rule'] for rule in load_rules()] == ['ppsf_below_percentile', 'below_original_price', 'new_listing']
@@ -0,0 +1,73 @@
+import asyncio
+import json
+import os
+
+import pyarrow as pa
+import pytest
+
+from api import ARROW_MEDIA_TYPE, app
+
+
+@pytest.fixture(scope='module', autouse=True)
+def ingested(tmp_path_factory):
+    from projects import PROJECT_DATA, ingest_projects
+
+    cwd = os.getcwd()
+    os.chdir(tmp_path_factory.mktemp('api'))
+    try:
+        ingest_projects({'Safa One': PROJECT_DATA['Safa One']})
+        yield
+    finally:
+        os.chdir(cwd)
+
+
+def get(path, query='', headers=()):
+    """Drive the ASGI app directly and return (status, headers, body)"""
+    scope = {'type': 'http', 'asgi': {'version': '3.0'}, 'http_version': '1.1', 'method': 'GET',
+             'scheme': 'http', 'server': ('testserver', 80), 'client': ('testclient', 50000),
+             'root_path': '', 'path': path, 'raw_path': path.encode(), 'query_string': query.encode(),
+             'headers': [(name.encode(), value.encode()) for name, value in headers]}
+    messages = []
+
+    async def receive():
+        return {'type': 'http.request', 'body': b'', 'more_body': False}
+
+    async def send(message):
+        messages.append(message)
+
+    asyncio.run(app(scope, receive, send))
+    response_headers = {name.decode(): value.decode() for name, value in messages[0]['headers']}
+    return messages[0]['status'], response_headers, b''.join(message.get('body', b'') for message in messages[1:])
+
+
+def test_projects_and_conditional_requests():
+    status, headers, body = get('/api/projects')
+    assert status == 200
+    assert [row['project'] for row in json.loads(body)['rows']] == ['Safa One']
+
+    status, _, body = get('/api/projects', headers=[('if-none-match', headers['etag'])])
+    assert status == 304 and body == b''
+
+
+def test_listings_are_sorted_and_paged():
+    status, _, body = get('/api/projects/Safa One/listings', 'sort=price&limit=5')
+    result = json.loads(body)
+    prices = [row['price'] for row in result['rows']]
+    assert status == 200 and len(prices) == 5 and prices == sorted(prices)
+    assert result['total'] >= 5 and result['limit'] == 5
+
+    status, headers, body = get('/api/projects/Safa One/listings', 'sort=price&limit=5&format=arrow')
+    table = pa.ipc.open_stream(body).read_all()
+    assert headers['content-type'] == ARROW_MEDIA_TYPE
+    assert table.column('price').to_pylist() == prices
+    assert json.loads(table.schema.metadata[b'total']) == result['total']
+
+
+def test_comparables_and_errors():
+    status, _, body = get('/api/projects/Safa One/listings/0/comparables', 'k=3')
+    assert status == 200 and len(json.loads(body)['rows']) == 3
+
+    assert get('/api/projects/Elsewhere/stats')[0] == 404
+    assert get('/api/projects/Safa One/listings/999999/comparables')[0] == 404
+    assert get('/api/projects/Safa One/listings', 'sort=bedrooms')[0] == 400
+    assert get('/api/projects/Safa One/listings', 'min_price=cheap')[0] == 400
@@ -0,0 +1,84 @@
+import time
+
+import pandas as pd
+import pytest
+
+from cache_backend import MemoryCache, SQLiteCache, SharedDirectoryCache, data_version, make_key
+
+
+@pytest.fixture(params=['memory', 'sqlite', 'directory'])
+def cache(request, tmp_path):
+    if request.param == 'memory':
+        return MemoryCache(max_bytes=10_000)
+    if request.param == 'sqlite':
+        return SQLiteCache(str(tmp_path / 'cache.sqlite'), max_bytes=10_000)
+    return SharedDirectoryCache(str(tmp_path / 'cache'), max_bytes=10_000)
+
+
+def test_get_or_compute_computes_once(cache):
+    calls = []
+    compute = lambda: calls.append(1) or {'value': 42}
+    assert cache.get_or_compute('key', compute) == {'value': 42}
+    assert cache.get_or_compute('key', compute) == {'value': 42}
+    assert len(calls) == 1
+    assert cache.stats.hits == 1 and cache.stats.misses == 1
+
+
+def test_expired_entries_are_misses(cache):
+    cache.set('key', 'value', ttl=0.01)
+    time.sleep(0.05)
+    assert cache.get('key') is None
+    assert cache.stats.expirations == 1
+
+
+def test_evicts_down_to_budget(cache):
+    for i in range(10):
+        cache.set(f"key-{i}", b'x' * 2_000)
+        time.sleep(0.01)
+    assert cache.size_bytes() <= 10_000 + 1_000
+    assert cache.get('key-9') is not None
+    assert cache.get('key-0') is None
+
+
+def test_directory_cache_drops_expired_entries_before_older_live_ones(tmp_path):
+    cache = SharedDirectoryCache(str(tmp_path / 'cache'), max_bytes=5_000)
+    cache.set('old-live', b'x' * 2_000)
+    time.sleep(0.02)
+    cache.set('new-expiring', b'x' * 2_000, ttl=0.01)
+    time.sleep(0.05)
+    cache.set('newest', b'x' * 2_000)
+    assert cache.get('old-live') is not None
+    assert cache.stats.expirations == 1
+
+
+def test_sqlite_hits_do_not_write(tmp_path):
+    cache = SQLiteCache(str(tmp_path / 'cache.sqlite'))
+    cache.set('key', 'value')
+    with cache._connection() as conn:
+        changes = conn.total_changes
+        for _ in range(5):
+            assert cache.get('key') == 'value'
+        assert conn.total_changes == changes
+
+
+def test_sqlite_access_times_are_flushed_with_the_next_store(tmp_path):
+    cache = SQLiteCache(str(tmp_path / 'cache.sqlite'))
+    cache.set('key', 'value')
+    with cache._connection() as conn:
+        stored_at = conn.execute("SELECT accessed_at FROM cache_entries WHERE key = 'key'").fetchone()[0]
+        time.sleep(0.01)
+        cache.get('key')
+        cache.set('other', 'value')
+        accessed_at = conn.execute("SELECT accessed_at FROM cache_entries WHERE key = 'key'").fetchone()[0]
+    assert accessed_at > stored_at
+
+
+def test_data_version_changes_with_content():
+    df = pd.DataFrame({'price': [1, 2]})
+    assert data_version(df) == data_version(df.copy())
+    assert data_version(df) != data_version(df.assign(price=[1, 3]))
+    assert data_version([{'price': 1}]) != data_version([{'price': 2}])
+
+
+def test_make_key_includes_schema_version():
+    assert make_key('figure', 'a', 1).startswith('figure:v')
@@ -0,0 +1,61 @@
+import numpy as np
+import pandas as pd
+import pytest
+
+from cashflow import (PERIODS_PER_YEAR, cash_flow_schedule, evaluate_listings, make_scenarios, parse_delivery_date,
+                      parse_payment_plan, project_profiles)
+
+PROJECT_INFO = {
+    'Safa One': {'delivery_date': 'Q4 2025', 'payment_plan': '20/40/40'},
+    'Safa Two': {'delivery_date': 'Q2 2027', 'payment_plan': '20/55/25'}
+}
+VALUATION_DATE = '2024-01-01'
+
+
+def listing_flows(price, area, project, scenario):
+    scenarios = pd.DataFrame([scenario])
+    _, A, B, _ = project_profiles({project: PROJECT_INFO[project]}, scenarios, pd.Timestamp(VALUATION_DATE))
+    return price * A[0, 0] + area * B[0, 0]
+
+
+def present_value(flows, annual_rate):
+    return np.sum(flows * (1 + annual_rate) ** (-np.arange(len(flows)) / PERIODS_PER_YEAR))
+
+
+def test_parsers():
+    np.testing.assert_allclose(parse_payment_plan('20/55/25'), [0.2, 0.55, 0.25])
+    assert parse_delivery_date('Q2 2027') == pd.Timestamp('2027-06-30')
+    with pytest.raises(ValueError):
+        parse_payment_plan('50/40')
+
+
+def test_npv_and_irr_match_the_cash_flows():
+    listings = pd.DataFrame({
+        'project': ['Safa One', 'Safa Two', 'Safa Two'],
+        'price': [1_500_000.0, 2_000_000.0, 3_500_000.0],
+        'area_sqft': [800.0, 1_100.0, 1_400.0]
+    })
+    scenarios = make_scenarios(appreciation=[0.02, 0.06], exit_years=[3, 5])
+    evaluation = evaluate_listings(listings, PROJECT_INFO, scenarios, VALUATION_DATE)
+    assert evaluation['npv'].shape == evaluation['irr'].shape == (3, 4)
+
+    for row, listing in listings.iterrows():
+        for s, scenario in scenarios.iterrows():
+            flows = listing_flows(listing['price'], listing['area_sqft'], listing['project'], scenario)
+            assert evaluation['npv'][row, s] == pytest.approx(present_value(flows, scenario['discount_rate']))
+            # The interpolated IRR zeroes the NPV to well within a basis point of the price
+            assert abs(present_value(flows, evaluation['irr'][row, s])) < 1e-4 * listing['price']
+
+
+def test_unknown_project_is_rejected():
+    listings = pd.DataFrame({'project': ['Elsewhere'], 'price': [1.0], 'area_sqft': [1.0]})
+    with pytest.raises(ValueError, match='Elsewhere'):
+        evaluate_listings(listings, PROJECT_INFO, valuation_date=VALUATION_DATE)
+
+
+def test_schedule_pays_the_price_and_sells_at_exit():
+    schedule = cash_flow_schedule(1_000_000, 700, 'Safa Two', PROJECT_INFO, {'appreciation': 0.0},
+                                  valuation_date=VALUATION_DATE)
+    assert schedule['payment'].sum() == pytest.approx(-1_000_000)
+    assert schedule['sale'].sum() == pytest.approx(1_000_000)
+    assert schedule['rent'].sum() == pytest.approx(700 * 120.0 * 5)
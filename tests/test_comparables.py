@@ -0,0 +1,54 @@
+import numpy as np
+import pandas as pd
+
+from comparables import ComparablesIndex
+
+
+def make_listings(n=120, seed=0):
+    rng = np.random.default_rng(seed)
+    area = rng.uniform(500, 2500, n)
+    price = area * rng.uniform(1_500, 3_000, n)
+    return pd.DataFrame({
+        'project': rng.choice(['Safa One', 'Safa Two'], n),
+        'bedrooms': rng.choice(['studio', '1', '2'], n),
+        'bathrooms': rng.integers(1, 4, n).astype(str),
+        'area_sqft': area,
+        'price': price,
+        'price_per_sqft': price / area,
+        'description': rng.choice(['Sea view | High floor', 'Pool view', 'Canal view | Low floor'], n)
+    })
+
+
+def brute_force(index, position, k):
+    same_type = np.flatnonzero(index.listings['bedrooms'].to_numpy() == index.listings.at[position, 'bedrooms'])
+    same_type = same_type[same_type != position]
+    distances = np.linalg.norm(index.points[same_type] - index.points[position], axis=1)
+    return same_type[np.argsort(distances, kind='stable')[:k]], np.sort(distances)[:k]
+
+
+def test_query_matches_brute_force():
+    index = ComparablesIndex(make_listings())
+    for position in [0, 17, 64]:
+        result = index.query(position, k=5)
+        expected, distances = brute_force(index, position, 5)
+        assert result.index.tolist() == expected.tolist()
+        np.testing.assert_allclose(result['distance'].to_numpy(), distances)
+        assert (result['bedrooms'] == index.listings.at[position, 'bedrooms']).all()
+
+
+def test_annotate_agrees_with_query():
+    index = ComparablesIndex(make_listings(seed=1))
+    annotated = index.annotate(k=4)
+    for position in [3, 50, 99]:
+        assert annotated.at[position, 'comparables'].tolist() == index.query(position, k=4).index.tolist()
+        expected = index.listings['price_per_sqft'].to_numpy()[brute_force(index, position, 4)[0]]
+        assert annotated.at[position, 'comparable_median_ppsf'] == np.median(expected)
+
+
+def test_small_partition_pads_with_missing():
+    listings = make_listings(n=30)
+    listings.loc[0, 'bedrooms'] = '4'
+    listings.loc[1, 'bedrooms'] = '4'
+    annotated = ComparablesIndex(listings).annotate(k=3)
+    assert annotated.at[0, 'comparables'].tolist() == [1, -1, -1]
+    assert len(ComparablesIndex(listings).query(0, k=3)) == 1
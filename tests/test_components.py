@@ -0,0 +1,44 @@
+import pytest
+from streamlit import config
+from streamlit.testing.v1 import AppTest
+
+from components import STYLESHEET_PATH, comparison_card, html_table, metric_card, summary_card
+
+
+def test_cards():
+    assert metric_card('AED 1.2M', 'Avg Price') == ('<div class="metric-card"><div class="metric-value">AED 1.2M</div>'
+                                                    '<div class="metric-label">Avg Price</div></div>')
+    card = comparison_card('Avg Price', (('Safa One', '#f00', '1.2M'), ('Safa Two', '#00f', '1.5M')))
+    assert card.count('<p style="font-size: 20px;">') == 2 and 'color: #00f;">Safa Two' in card
+    card = summary_card('Averages', (('Price', '1.2M'), ('Area', '800')))
+    assert card.endswith('<p><span class="highlight">Area:</span> 800</p></div>')
+
+
+def test_html_table_widens_one_column():
+    table = html_table(('Price', 'Description'), (('1.2M', 'Sea view'), ('1.5M', 'Corner unit')), 'Description')
+    assert table.count('<tr>') == 3
+    assert '<td>1.5M</td><td style="max-width:300px;">Corner unit</td>' in table
+    assert 'max-width' not in html_table(('Price',), (('1.2M',),), 'Description')
+
+
+def app_styles():
+    from components import inject_styles
+    inject_styles()
+
+
+@pytest.mark.parametrize('static_serving', [True, False])
+def test_stylesheet_is_linked_or_inlined(static_serving):
+    previous = config.get_option('server.enableStaticServing')
+    config.set_option('server.enableStaticServing', static_serving)
+    try:
+        app = AppTest.from_function(app_styles)
+        app.run()
+    finally:
+        config.set_option('server.enableStaticServing', previous)
+
+    markdown = app.markdown[0].value
+    if static_serving:
+        assert markdown == '<link rel="stylesheet" href="app/static/styles.css">'
+    else:
+        with open(STYLESHEET_PATH) as f:
+            assert markdown == f"<style>\n{f.read()}</style>" and '.metric-card' in markdown
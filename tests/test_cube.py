@@ -0,0 +1,66 @@
+import numpy as np
+import pandas as pd
+import pytest
+
+from cube import build_cube
+
+
+def make_listings(project, prices, bedrooms, descriptions=None):
+    prices = np.asarray(prices, dtype=float)
+    return pd.DataFrame({
+        'project': project,
+        'bedrooms': bedrooms,
+        'bathrooms': '1',
+        'area_sqft': 1_000.0,
+        'price': prices,
+        'price_per_sqft': prices / 1_000.0,
+        'listing_age_days': 10.0,
+        'description': descriptions or ['Pool view'] * len(prices)
+    })
+
+
+@pytest.fixture
+def cube():
+    return build_cube([
+        ('2024-01-01', make_listings('Safa One', [1e6, 2e6, 3e6], ['1', '2', '2'])),
+        ('2024-02-01', make_listings('Safa One', [1e6, 2.5e6], ['1', '2'], ['Sea view | High floor', 'Pool view'])),
+        ('2024-01-15', make_listings('Safa Two', [4e6], ['3']))
+    ])
+
+
+def test_defaults_to_each_projects_latest_snapshot(cube):
+    result = cube.query(['project'], ['count', 'avg_price'])
+    assert result.values.tolist() == [['Safa One', 2, 1.75e6], ['Safa Two', 1, 4e6]]
+    assert cube.values('bedrooms') == ['1', '2', '3']
+
+
+def test_snapshot_filter_or_grouping_reads_every_snapshot(cube):
+    by_snapshot = cube.query(['snapshot_date'], ['count'])
+    assert by_snapshot.values.tolist() == [['2024-01-01', 3], ['2024-01-15', 1], ['2024-02-01', 2]]
+    older = cube.query(['bedrooms'], ['count', 'max_price'], {'snapshot_date': '2024-01-01'})
+    assert older.values.tolist() == [['1', 1, 1e6], ['2', 2, 3e6]]
+
+
+def test_rollups_match_the_listings(cube):
+    result = cube.query([], ['count', 'sum_price', 'std_price', 'min_price_per_sqft'])
+    prices = np.array([1e6, 2.5e6, 4e6])
+    assert result.iloc[0].tolist() == pytest.approx([3, prices.sum(), prices.std(), 1_000])
+
+
+def test_drill_down(cube):
+    level, result = cube.drill_down(['project', 'view'], ['Safa One'], ['count'])
+    assert level == 'view'
+    assert result.values.tolist() == [['Other', 1], ['Sea View', 1]]
+    with pytest.raises(ValueError):
+        cube.query(['colour'])
+
+
+def test_later_snapshot_of_the_same_day_replaces_the_earlier_one(cube):
+    cube.add(make_listings('Safa One', [1.2e6, 2.6e6, 3e6], ['1', '2', '3']), '2024-02-01')
+    assert cube.query(['project'], ['count']).values.tolist() == [['Safa One', 3], ['Safa Two', 1]]
+    by_snapshot = cube.query(['snapshot_date'], ['count'], {'project': 'Safa One'})
+    assert by_snapshot.values.tolist() == [['2024-01-01', 3], ['2024-02-01', 3]]
+
+    same_day = make_listings('Safa One', [1e6, 2e6], ['1', '2'])
+    same_day_cube = build_cube([('2024-03-01', same_day), ('2024-03-01', same_day)])
+    assert same_day_cube.query(['project'], ['count']).values.tolist() == [['Safa One', 2]]
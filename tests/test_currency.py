@@ -0,0 +1,62 @@
+import pandas as pd
+import pytest
+
+from currency import AED_SQFT, SQFT_PER_SQM, convert_aggregates, convert_frame, display_units, fx_rates
+
+
+def write_rates(path, rows):
+    pd.DataFrame(rows, columns=['date', 'currency', 'aed_per_unit']).to_csv(path, index=False)
+    return str(path)
+
+
+def test_rates_as_of_a_date(tmp_path):
+    path = write_rates(tmp_path / 'fx.csv', [('2025-01-01', 'USD', 3.6725), ('2025-01-01', 'EUR', 4.0),
+                                             ('2025-07-01', 'EUR', 4.3)])
+    assert fx_rates('2025-03-01', path) == (pd.Timestamp('2025-01-01').date(), {'USD': 3.6725, 'EUR': 4.0})
+    # A currency missing from the latest day keeps its last known rate
+    assert fx_rates('2025-08-01', path)[1] == {'USD': 3.6725, 'EUR': 4.3}
+    with pytest.raises(ValueError):
+        fx_rates('2024-12-31', path)
+    with pytest.raises(ValueError, match='GBP'):
+        display_units('GBP', on_date='2025-08-01', path=path)
+
+
+def test_convert_frame_scales_price_and_area_columns(tmp_path):
+    path = write_rates(tmp_path / 'fx.csv', [('2025-01-01', 'USD', 4.0)])
+    units = display_units('USD', 'm²', on_date='2025-01-01', path=path)
+    df = pd.DataFrame({'bedrooms': ['1'], 'price': [1_000_000.0], 'area_sqft': [1_076.39],
+                       'price_per_sqft': [929.0], 'count': [3]})
+
+    converted = convert_frame(df, units)
+    assert converted['price'].iloc[0] == pytest.approx(250_000.0)
+    assert converted['area_sqft'].iloc[0] == pytest.approx(100.0)
+    assert converted['price_per_sqft'].iloc[0] == pytest.approx(929.0 / 4.0 * SQFT_PER_SQM)
+    assert converted['count'].iloc[0] == 3 and df['price'].iloc[0] == 1_000_000.0
+    assert convert_frame(df, AED_SQFT) is df
+
+
+def test_convert_aggregates_scales_stats_dicts(tmp_path):
+    path = write_rates(tmp_path / 'fx.csv', [('2025-01-01', 'USD', 4.0)])
+    units = display_units('USD', on_date='2025-01-01', path=path)
+    aggregates = {'stats_overall': {'total_listings': 5, 'avg_price': 1_000_000.0},
+                  'bedroom_stats': pd.DataFrame({'avg_price': [400_000.0]}), 'data_version': 'v1'}
+
+    converted = convert_aggregates(aggregates, units)
+    assert converted['stats_overall'] == {'total_listings': 5, 'avg_price': 250_000.0}
+    assert converted['bedroom_stats']['avg_price'].tolist() == [100_000.0]
+    assert converted['data_version'] == 'v1'
+
+
+def test_project_map_is_labelled_in_the_display_units(tmp_path):
+    from charts import project_map
+    from geo import build_geo_grid, project_locations
+
+    info = {'Safa One': {'location': 'Al Safa 1, Dubai', 'latitude': 25.1795, 'longitude': 55.2366}}
+    listings = pd.DataFrame({'project': ['Safa One'], 'price': [4e6], 'price_per_sqft': [2_000.0]})
+    path = write_rates(tmp_path / 'fx.csv', [('2025-01-01', 'USD', 4.0)])
+    units = display_units('USD', 'm²', on_date='2025-01-01', path=path)
+
+    grid = convert_frame(build_geo_grid(listings, info), units)
+    fig = project_map(grid, project_locations(listings, info), units)
+    assert grid['avg_price'].iloc[0] == pytest.approx(1e6)
+    assert fig.layout.coloraxis.colorbar.title.text == 'Avg Price/m² (USD)'
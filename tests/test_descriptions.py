@@ -0,0 +1,21 @@
+import numpy as np
+import pandas as pd
+
+from descriptions import DESCRIPTION_COLUMNS, process_descriptions
+
+
+def test_process_descriptions():
+    descriptions = pd.Series(['Sea View | High Floor | Listed 2 Months ago', 'Listed 1 day Ago', None,
+                              '<b>Deal</b> | listed 3 Weeks ago '], index=[10, 11, 12, 13])
+    result = process_descriptions(descriptions)
+
+    assert result.columns.tolist() == DESCRIPTION_COLUMNS
+    assert result.index.tolist() == [10, 11, 12, 13]
+    assert result['listing_days'].tolist() == ['2 months', '1 days', None, '3 weeks']
+    np.testing.assert_array_equal(result['listing_age_days'], [60, 1, np.nan, 21])
+    assert result['features'][10] == ['Sea View', 'High Floor', 'Listed 2 Months ago']
+    assert result['features'][12] == []
+    assert result['features_html'][10] == ('• Sea View<br>• High Floor<br>• '
+                                           '<span class="listing-badge">Listed 2 Months ago</span>')
+    assert result['features_html'][13].startswith('• &lt;b&gt;Deal&lt;/b&gt;<br>')
+    assert result['features_html'][12] == ''
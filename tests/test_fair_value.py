@@ -0,0 +1,67 @@
+import numpy as np
+import pandas as pd
+import pytest
+
+from fair_value import FairValueModel, rank_underpriced
+
+
+def make_listings(n=200, seed=0, project='Safa One'):
+    rng = np.random.default_rng(seed)
+    area = rng.uniform(600, 3000, n)
+    bedrooms = rng.choice(['studio', '1', '2', '3'], n)
+    bathrooms = rng.integers(1, 4, n)
+    sea = rng.random(n) < 0.3
+    price = 50_000 + 2_000 * area + 100_000 * bathrooms + 300_000 * sea + rng.normal(0, 10_000, n)
+    return pd.DataFrame({
+        'project': project,
+        'area_sqft': area,
+        'bedrooms': bedrooms,
+        'bathrooms': bathrooms.astype(str),
+        'price': price,
+        'description': np.where(sea, 'Full sea view', 'Pool view')
+    })
+
+
+def test_partial_fit_matches_full_fit():
+    listings = make_listings()
+    full = FairValueModel().fit(listings)
+    incremental = FairValueModel().partial_fit(listings.iloc[:80]).partial_fit(listings.iloc[80:])
+    np.testing.assert_allclose(incremental.coefficients, full.coefficients, rtol=1e-9)
+
+
+def test_update_folds_in_only_new_snapshots():
+    first, second = make_listings(seed=1), make_listings(seed=2)
+    model = FairValueModel().update({'snap-1': first})
+    model.update({'snap-1': first, 'snap-2': second})
+    assert model.n_obs.tolist() == [len(first) + len(second)]
+    np.testing.assert_allclose(model.coefficients, FairValueModel().fit(pd.concat([first, second])).coefficients)
+
+
+def test_ridge_does_not_depend_on_feature_scale():
+    listings = make_listings()
+    predicted = FairValueModel().fit(listings).predict(listings)['fair_price']
+
+    # The same listings with area in thousands of sq.ft and price scaled to match
+    rescaled = listings.assign(area_sqft=listings['area_sqft'] / 1000)
+    rescaled_predicted = FairValueModel().fit(rescaled).predict(rescaled)['fair_price']
+    np.testing.assert_allclose(rescaled_predicted, predicted, rtol=1e-6)
+
+
+def test_recovers_hedonic_premiums():
+    model = FairValueModel().fit(make_listings(n=2000))
+    coefficients = dict(zip(['intercept', 'area_sqft', 'bedroom_count', 'bathroom_count'], model.coefficients[0]))
+    assert coefficients['area_sqft'] == pytest.approx(2_000, rel=0.01)
+    assert coefficients['bathroom_count'] == pytest.approx(100_000, rel=0.05)
+
+
+def test_rank_underpriced_puts_discounted_listing_first():
+    listings = make_listings()
+    listings.loc[5, 'price'] *= 0.6
+    ranked = rank_underpriced(listings, FairValueModel().fit(listings), top_n=3)
+    assert ranked.index[0] == 5
+
+
+def test_predict_unknown_project_raises():
+    model = FairValueModel().fit(make_listings())
+    with pytest.raises(ValueError):
+        model.predict(make_listings(project='Unknown'))
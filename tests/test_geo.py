@@ -0,0 +1,37 @@
+import numpy as np
+import pandas as pd
+import pytest
+
+from geo import build_geo_grid, geohash_cells, project_locations
+
+PROJECT_INFO = {
+    'Safa One': {'location': 'Al Safa 1, Dubai', 'latitude': 25.1795, 'longitude': 55.2366},
+    'Safa Two': {'location': 'Business Bay, Dubai', 'latitude': 25.1866, 'longitude': 55.2606},
+    'Elsewhere': {'location': 'Unknown', 'latitude': 24.0, 'longitude': 54.0}
+}
+
+
+def test_geohash_reference_points():
+    geohashes, center_lat, center_lon = geohash_cells([57.64911, -25.382708], [10.40744, -49.265506], precision=11)
+    assert geohashes.tolist() == ['u4pruydqqvj', '6gkzwgjzn82']
+    assert center_lat[0] == pytest.approx(57.64911, abs=1e-5)
+    assert center_lon[0] == pytest.approx(10.40744, abs=1e-5)
+
+
+def test_grid_aggregates_per_cell():
+    listings = pd.DataFrame({
+        'project': ['Safa One', 'Safa One', 'Safa Two', 'Nowhere'],
+        'price': [1e6, 3e6, 2e6, 5e6],
+        'price_per_sqft': [1_000.0, 3_000.0, 2_000.0, 5_000.0]
+    })
+    grid = build_geo_grid(listings, PROJECT_INFO).set_index('projects')
+    assert grid['listings'].to_dict() == {'Safa One': 2, 'Safa Two': 1}
+    assert grid.loc['Safa One', 'avg_price_per_sqft'] == 2_000
+    assert len(set(grid['geohash'])) == 2 and grid['geohash'].str.len().eq(6).all()
+
+
+def test_project_locations_include_projects_without_listings():
+    listings = pd.DataFrame({'project': ['Safa Two'], 'price': [2e6], 'price_per_sqft': [2_000.0]})
+    locations = project_locations(listings, PROJECT_INFO).set_index('project')
+    assert locations['listings'].to_dict() == {'Safa One': 0, 'Safa Two': 1, 'Elsewhere': 0}
+    assert np.isnan(locations.loc['Safa One', 'avg_price_per_sqft'])
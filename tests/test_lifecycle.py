@@ -0,0 +1,57 @@
+import numpy as np
+import pandas as pd
+
+from lifecycle import build_lifecycle, carry_unit_keys, merge_snapshots, unit_keys
+
+
+def make_snapshot(prices, area=800.0, bedrooms='1', ages=None):
+    prices = np.asarray(prices, dtype=float)
+    return pd.DataFrame({
+        'project': 'Safa One',
+        'bedrooms': bedrooms,
+        'area_sqft': area,
+        'price': prices,
+        'listing_age_days': np.zeros(len(prices)) if ages is None else ages
+    })
+
+
+def test_duplicate_units_keep_their_keys_when_one_price_moves():
+    first = make_snapshot([1_000_000, 1_200_000])
+    previous = pd.DataFrame({'unit_key': unit_keys(first), 'price': first['price']})
+    # The dearer unit is cut below the cheaper one; ranking again would swap both keys
+    second = make_snapshot([900_000, 1_000_000])
+    keys = carry_unit_keys(previous, second)
+    assert keys.tolist() == [previous['unit_key'][1], previous['unit_key'][0]]
+
+
+def test_new_units_fill_free_suffixes():
+    first = make_snapshot([1_000_000, 1_200_000, 1_400_000])
+    previous = pd.DataFrame({'unit_key': unit_keys(first), 'price': first['price']})
+    keys = carry_unit_keys(previous, make_snapshot([1_000_000, 1_400_000, 2_000_000, 1_100_000]))
+    assert keys.tolist() == ['Safa One|1|800#1', 'Safa One|1|800#3', 'Safa One|1|800#4', 'Safa One|1|800#2']
+    assert len(set(keys)) == len(keys)
+
+
+def test_merge_snapshots_on_sorted_keys():
+    prev = pd.DataFrame({'unit_key': ['a', 'c', 'd', 'f']})
+    curr = pd.DataFrame({'unit_key': ['b', 'c', 'f', 'g']})
+    prev_idx, curr_idx, gone, new = merge_snapshots(prev, curr)
+    assert prev_idx.tolist() == [1, 3] and curr_idx.tolist() == [1, 2]
+    assert gone.tolist() == [0, 2] and new.tolist() == [0, 3]
+
+
+def test_price_cut_is_one_event_not_a_delisting():
+    lifecycle = build_lifecycle([
+        ('2024-01-01', make_snapshot([1_000_000, 1_200_000], ages=[10, 20])),
+        ('2024-01-31', make_snapshot([900_000, 1_000_000])),
+        ('2024-03-01', make_snapshot([1_000_000]))
+    ])
+    events = lifecycle['price_events']
+    assert events[['old_price', 'new_price']].values.tolist() == [[1_200_000, 900_000]]
+    assert lifecycle['delistings']['price'].tolist() == [900_000]
+
+    units = lifecycle['units'].set_index('unit_key')
+    assert units['active'].tolist() == [True, False]
+    assert units['days_on_market'].tolist() == [70, 80]
+    absorption = lifecycle['absorption'].iloc[0]
+    assert absorption['delisted'] == 1
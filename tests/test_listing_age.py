@@ -0,0 +1,37 @@
+import numpy as np
+import pytest
+
+from listing_age import UNKNOWN_BUCKET, ListingAgeBuckets, parse_edges
+
+AGES = [0, 7, 8, 30, 31, 90, 91, np.nan]
+
+
+def test_labels_and_edges():
+    buckets = ListingAgeBuckets((30, 7, 90))
+    assert buckets.order == ['Up to 1 week', '1 week - 1 month', '1 month - 3 months', 'Over 3 months', UNKNOWN_BUCKET]
+    assert buckets.filters == ['Last 1 week', 'Last 1 month', 'Last 3 months', 'Older than 3 months']
+    assert parse_edges('90; 7, 30,') == (7, 30, 90)
+    with pytest.raises(ValueError):
+        parse_edges('0, 7')
+
+
+def test_upper_edges_are_inclusive():
+    buckets = ListingAgeBuckets()
+    assert buckets.assign(AGES).tolist() == [0, 0, 1, 1, 2, 2, 3, 4]
+    assert buckets.label([np.nan])[0] == UNKNOWN_BUCKET
+
+
+def test_filters_and_histograms():
+    buckets = ListingAgeBuckets()
+    assert buckets.filter_mask(AGES, 'Last 1 month').tolist() == [True] * 4 + [False] * 4
+    assert buckets.filter_mask(AGES, 'Older than 3 months').tolist() == [False] * 6 + [True, False]
+    assert buckets.filter_mask(AGES, 'All').all()
+
+    histogram = buckets.histogram(AGES)
+    assert histogram['count'].tolist() == [2, 2, 2, 1, 1]
+    assert histogram['cumulative_share'].iloc[-1] == 1.0
+
+    groups = ['a', 'b'] * 4
+    histograms = buckets.histograms(AGES, groups)
+    assert histograms['a']['count'].tolist() == [1, 1, 1, 1, 0]
+    assert histograms['b']['count'].tolist() == [1, 1, 1, 0, 1]
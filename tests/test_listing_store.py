@@ -0,0 +1,55 @@
+import threading
+
+import numpy as np
+import pandas as pd
+
+from listing_store import current_archive_version, list_projects, list_snapshots, open_archive, write_archive
+
+
+def make_listings(n=5, offset=0):
+    return pd.DataFrame({
+        'bedrooms': ['1'] * n,
+        'price': np.arange(n, dtype=float) * 100_000 + 1_000_000 + offset,
+        'area_sqft': np.full(n, 800.0),
+        'description': [f"Listing {i}" for i in range(n)]
+    })
+
+
+def test_round_trip(tmp_path):
+    listings = make_listings()
+    snapshot = write_archive('Safa One', listings, 'v1', '2024-01-01', base_dir=tmp_path, quarantined=2)
+    archive = open_archive('Safa One', base_dir=tmp_path)
+
+    assert archive.snapshot == snapshot and archive.version == 'v1'
+    np.testing.assert_array_equal(archive.numeric('price'), listings['price'].to_numpy())
+    assert archive.take([4, 0], ['description'])['description'].tolist() == ['Listing 4', 'Listing 0']
+    assert archive.equals_mask('bedrooms', '1').all()
+    assert list_snapshots('Safa One', tmp_path)[0]['quarantined'] == 2
+    assert list_projects(tmp_path) == ['Safa One']
+
+
+def test_latest_snapshot_is_current(tmp_path):
+    write_archive('Safa One', make_listings(), 'v2', '2024-02-01', base_dir=tmp_path)
+    write_archive('Safa One', make_listings(), 'v1', '2024-01-01', base_dir=tmp_path)
+    assert [s['version'] for s in list_snapshots('Safa One', tmp_path)] == ['v1', 'v2']
+    assert current_archive_version('Safa One', tmp_path) == 'v2'
+
+
+def test_rewrite_is_not_served_from_the_old_mapping(tmp_path):
+    write_archive('Safa One', make_listings(), 'v1', '2024-01-01', base_dir=tmp_path)
+    assert open_archive('Safa One', base_dir=tmp_path).num_rows == 5
+    write_archive('Safa One', make_listings(n=3), 'v1', '2024-01-01', base_dir=tmp_path)
+    assert open_archive('Safa One', base_dir=tmp_path).num_rows == 3
+
+
+def test_concurrent_writers_keep_every_snapshot(tmp_path):
+    def write(day):
+        write_archive('Safa One', make_listings(offset=day), f"v{day}", f"2024-01-{day:02d}", base_dir=tmp_path)
+
+    threads = [threading.Thread(target=write, args=(day,)) for day in range(1, 13)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    assert len(list_snapshots('Safa One', tmp_path)) == 12
+    assert current_archive_version('Safa One', tmp_path) == 'v12'
@@ -0,0 +1,49 @@
+import numpy as np
+import pandas as pd
+
+from listing_store import open_archive, write_archive
+from listings_grid import grid_window, listing_age_to_days
+
+
+def make_listings(prices, ages):
+    prices = np.asarray(prices, dtype=float)
+    return pd.DataFrame({
+        'price': prices,
+        'area_sqft': np.full(len(prices), 1_000.0),
+        'price_per_sqft': prices / 1_000.0,
+        'listing_age_days': np.asarray(ages, dtype=float)
+    })
+
+
+def test_listing_age_to_days():
+    np.testing.assert_array_equal(listing_age_to_days(['3 days', '2 weeks', '1 months', 'soon']),
+                                  [3, 14, 30, np.nan])
+
+
+def test_window_sorts_filters_and_pages(tmp_path):
+    write_archive('Safa One', make_listings([5, 1, 4, 2, 3], [1, np.nan, 3, 4, 5]), 'v1', base_dir=tmp_path)
+    archive = open_archive('Safa One', base_dir=tmp_path)
+    everything = np.ones(archive.num_rows, dtype=bool)
+
+    rows, total = grid_window(archive, everything, 'price', offset=1, limit=2)
+    assert rows.tolist() == [3, 4] and total == 5
+    rows, _ = grid_window(archive, everything, 'price', descending=True)
+    assert rows.tolist() == [0, 2, 4, 3, 1]
+
+    # Rows without a listing age sort last in both directions
+    rows, _ = grid_window(archive, everything, 'listing_age_days', descending=True)
+    assert rows.tolist() == [4, 3, 2, 0, 1]
+
+    mask = np.array([True, False, True, False, True])
+    rows, total = grid_window(archive, mask, 'price')
+    assert rows.tolist() == [4, 2, 0] and total == 3
+
+
+def test_rewritten_snapshot_is_sorted_again(tmp_path):
+    write_archive('Safa One', make_listings([1, 2, 3], [1, 2, 3]), 'v1', '2024-01-01', base_dir=tmp_path)
+    archive = open_archive('Safa One', base_dir=tmp_path)
+    assert grid_window(archive, np.ones(3, dtype=bool), 'price')[0].tolist() == [0, 1, 2]
+
+    write_archive('Safa One', make_listings([3, 2, 1, 0], [1, 2, 3, 4]), 'v1', '2024-01-01', base_dir=tmp_path)
+    archive = open_archive('Safa One', base_dir=tmp_path)
+    assert grid_window(archive, np.ones(4, dtype=bool), 'price')[0].tolist() == [3, 2, 1, 0]
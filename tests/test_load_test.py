@@ -0,0 +1,26 @@
+import pytest
+
+import load_test
+from load_test import current_rss_mb, latency_summary, run_load_test
+
+
+def test_latency_summary():
+    timings = [('initial_load', 2.0)] + [('price_sort', 0.01 * i) for i in range(1, 101)] + [('switch_tab', 0.5)]
+    summary = latency_summary(timings)
+    assert summary.loc['price_sort', 'reruns'] == 100
+    assert summary.loc['price_sort', 'p50_ms'] == pytest.approx(505)
+    assert summary.loc['all reruns', 'reruns'] == 101
+    assert summary.loc['all reruns', 'max_ms'] == pytest.approx(1000)
+    assert summary.loc['initial_load', 'max_ms'] == pytest.approx(2000)
+
+
+def test_run_load_test_collects_every_user(monkeypatch):
+    def simulate_user(user_id, actions, think_time, seed, timeout):
+        return [('initial_load', 1.0)] + [('switch_tab', 0.1)] * actions, user_id % 2
+
+    monkeypatch.setattr(load_test, 'simulate_user', simulate_user)
+    report = run_load_test(users=3, workers=1, actions=4)
+    workers = report['workers'].iloc[0]
+    assert workers['users'] == 3 and workers['reruns'] == 15 and workers['errors'] == 1
+    assert report['latency'].loc['all reruns', 'reruns'] == 12
+    assert current_rss_mb() > 0
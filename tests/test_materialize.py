@@ -0,0 +1,77 @@
+import sys
+
+import pandas as pd
+
+import materialize
+from materialize import analyze_once, current_version, ingest, is_materialized, load_aggregates
+
+
+def make_analysis():
+    bedroom_stats = pd.DataFrame({
+        'bedrooms': ['studio', '1'], 'count': [2, 3], 'avg_price': [900_000.0, 1_400_000.0],
+        'avg_price_per_sqft': [2_000.0, 1_900.0], 'min_price_per_sqft': [1_800.0, 1_700.0],
+        'max_price_per_sqft': [2_200.0, 2_100.0]
+    })
+    return {
+        'stats_overall': {'total_listings': 5, 'avg_price': 1_200_000.0,
+                          'min_price_per_sqft': 1_700.0, 'max_price_per_sqft': 2_200.0},
+        'bedroom_stats': bedroom_stats,
+        'bathroom_stats': pd.DataFrame({'bathrooms': ['1', '2'], 'count': [2, 3]}),
+        'listing_days_stats': pd.DataFrame({'bucket': ['0-30'], 'count': [5]}),
+        'quarantine': pd.DataFrame({'price': [0.0], 'issue': ['non-positive price']}),
+        'validation_issues': pd.DataFrame({'issue': ['non-positive price'], 'count': [1]})
+    }
+
+
+class CountingAnalyze:
+    def __init__(self):
+        self.calls = 0
+
+    def __call__(self, property_data):
+        self.calls += 1
+        return make_analysis()
+
+
+def test_ingest_round_trip(tmp_path):
+    analyze = CountingAnalyze()
+    ingest('Safa One', [], analyze, 'v1', base_dir=tmp_path)
+    ingest('Safa One', [], analyze, 'v1', base_dir=tmp_path)
+    assert analyze.calls == 1
+    assert current_version('Safa One', tmp_path) == 'v1'
+
+    aggregates = load_aggregates('Safa One', base_dir=tmp_path)
+    assert aggregates['stats_overall']['total_listings'] == 5
+    assert aggregates['investment_summary']['avg_1br_price'] == 1_400_000.0
+    assert aggregates['comparison_rows']['Bedroom Type'].tolist() == ['Studio', '1 Bedroom']
+
+
+def test_schema_change_rematerializes(tmp_path, monkeypatch):
+    analyze = CountingAnalyze()
+    ingest('Safa One', [], analyze, 'v1', base_dir=tmp_path)
+
+    monkeypatch.setattr(materialize, 'MATERIALIZE_SCHEMA_VERSION', materialize.MATERIALIZE_SCHEMA_VERSION + 1)
+    assert not is_materialized('Safa One', 'v1', tmp_path)
+    assert current_version('Safa One', tmp_path) is None
+
+    ingest('Safa One', [], analyze, 'v1', base_dir=tmp_path)
+    assert analyze.calls == 2
+    assert current_version('Safa One', tmp_path) == 'v1'
+
+
+def test_analyze_once_shares_the_analysis():
+    analyze = CountingAnalyze()
+    shared = analyze_once(analyze)
+    first, second = [{'price': 1}], [{'price': 2}]
+    assert shared(first) is shared(first)
+    shared(second)
+    assert analyze.calls == 2
+
+
+def test_ingest_projects_without_the_dashboard(tmp_path, monkeypatch):
+    from projects import PROJECT_DATA, ingest_projects
+
+    monkeypatch.chdir(tmp_path)
+    versions = ingest_projects({'Safa One': PROJECT_DATA['Safa One']})
+    assert current_version('Safa One') == versions['Safa One']
+    assert load_aggregates('Safa One')['stats_overall']['total_listings'] > 0
+    assert 'property_scraper' not in sys.modules
@@ -0,0 +1,55 @@
+import numpy as np
+import pandas as pd
+import pytest
+
+from cache_backend import MemoryCache
+from monte_carlo import fit_appreciation, simulate_project
+
+
+def test_projects_with_different_prices_get_different_returns():
+    # At the same rent per sq.ft, the project with cheaper price/sq.ft earns the higher yield
+    cheap = simulate_project(np.full(50, 1_500.0), n_paths=20_000)
+    dear = simulate_project(np.full(50, 3_000.0), n_paths=20_000)
+    assert cheap['mean_return'] > dear['mean_return'] + 0.01
+    assert cheap['probability_of_loss'] < dear['probability_of_loss']
+
+
+def test_fitted_history_drives_appreciation():
+    dates = pd.date_range('2022-01-01', periods=9, freq='QS')
+    rising = pd.Series(100 * 1.10 ** (np.arange(9) / 4), index=dates)
+    falling = pd.Series(100 * 0.95 ** (np.arange(9) / 4), index=dates)
+
+    fitted = fit_appreciation(rising)
+    assert fitted['appreciation_mean'] == pytest.approx(np.log(1.10), abs=0.005)
+    assert fitted['appreciation_vol'] < 0.01
+
+    up = simulate_project(np.full(50, 2_000.0), n_paths=20_000, price_history=rising)
+    down = simulate_project(np.full(50, 2_000.0), n_paths=20_000, price_history=falling)
+    assert up['fitted'] and down['fitted']
+    assert up['mean_exit_ppsf'] > 2_000 > down['mean_exit_ppsf']
+    assert up['mean_return'] > down['mean_return']
+
+
+def test_short_history_falls_back_to_the_assumptions():
+    history = pd.Series([100.0, 120.0], index=pd.to_datetime(['2024-01-01', '2024-02-01']))
+    assert fit_appreciation(history) == {}
+    result = simulate_project([2_000.0], {'appreciation_mean': 0.03}, n_paths=1_000, price_history=history)
+    assert not result['fitted'] and result['assumptions']['appreciation_mean'] == 0.03
+
+
+def test_chunking_is_reproducible_and_cached():
+    start_ppsf = np.linspace(1_500, 2_500, 20)
+    whole = simulate_project(start_ppsf, n_paths=30_000, chunk_size=30_000, seed=3)
+    again = simulate_project(start_ppsf, n_paths=30_000, chunk_size=30_000, seed=3)
+    assert whole['mean_return'] == again['mean_return']
+    assert whole['distribution']['probability'].sum() == pytest.approx(1)
+
+    cache = MemoryCache()
+    first = simulate_project(start_ppsf, n_paths=5_000, chunk_size=1_000, cache=cache)
+    second = simulate_project(start_ppsf, n_paths=5_000, chunk_size=1_000, cache=cache)
+    assert cache.stats.hits == 1 and second['mean_return'] == first['mean_return']
+    # Another chunk size splits the random streams differently, so it is not served from the cache
+    rechunked = simulate_project(start_ppsf, n_paths=5_000, chunk_size=2_500, cache=cache)
+    assert cache.stats.hits == 1 and rechunked['mean_return'] != first['mean_return']
+    with pytest.raises(ValueError):
+        simulate_project([])
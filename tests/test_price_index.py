@@ -0,0 +1,82 @@
+import numpy as np
+import pandas as pd
+import pytest
+
+from listing_store import list_snapshots, write_archive
+from price_index import INDEX_BASE, index_series, load_price_index, update_price_index
+
+LOCATIONS = {'Safa One': 'Business Bay', 'Safa Two': 'Business Bay'}
+
+
+def make_listings(project, price_per_sqft):
+    return pd.DataFrame({'project': project, 'bedrooms': ['1', '2'],
+                         'price_per_sqft': np.full(2, float(price_per_sqft))})
+
+
+def project_index(archive_dir, index_dir, project='Safa One'):
+    index = update_price_index([project], LOCATIONS, archive_dir, index_dir)
+    return index_series(index, 'project', segments=[project])['index'].tolist()
+
+
+def test_chained_index_and_carried_projects(tmp_path):
+    archive_dir, index_dir = tmp_path / 'archive', tmp_path / 'index'
+    write_archive('Safa One', make_listings('Safa One', 2_000), 'a', '2024-01-01', base_dir=archive_dir)
+    write_archive('Safa Two', make_listings('Safa Two', 1_000), 'b', '2024-01-01', base_dir=archive_dir)
+    write_archive('Safa One', make_listings('Safa One', 2_200), 'c', '2024-02-01', base_dir=archive_dir)
+
+    index = update_price_index(['Safa One', 'Safa Two'], LOCATIONS, archive_dir, index_dir)
+    one = index_series(index, 'project', segments=['Safa One'])['index'].tolist()
+    assert one == pytest.approx([INDEX_BASE, 110.0])
+    # Safa Two was not re-scraped in February and counts at its January listings
+    two = index_series(index, 'project', segments=['Safa Two'])['index'].tolist()
+    assert two == pytest.approx([INDEX_BASE, INDEX_BASE])
+
+    # Nothing new to index: the stored index is returned without being rewritten
+    modified = (index_dir / 'price_index.feather').stat().st_mtime_ns
+    update_price_index(['Safa One', 'Safa Two'], LOCATIONS, archive_dir, index_dir)
+    assert (index_dir / 'price_index.feather').stat().st_mtime_ns == modified
+
+
+def test_second_snapshot_on_an_indexed_day_replaces_the_period(tmp_path):
+    archive_dir, index_dir = tmp_path / 'archive', tmp_path / 'index'
+    write_archive('Safa One', make_listings('Safa One', 2_000), 'ffff', '2024-01-01', base_dir=archive_dir)
+    write_archive('Safa One', make_listings('Safa One', 2_000), 'ffff', '2024-02-01', base_dir=archive_dir)
+    assert project_index(archive_dir, index_dir) == pytest.approx([INDEX_BASE, INDEX_BASE])
+
+    # A later scrape of the same day whose version hash sorts before the first one
+    write_archive('Safa One', make_listings('Safa One', 2_400), '0000', '2024-02-01', base_dir=archive_dir)
+    assert list_snapshots('Safa One', archive_dir)[-1]['version'] == '0000'
+    assert project_index(archive_dir, index_dir) == pytest.approx([INDEX_BASE, 120.0])
+    assert load_price_index(index_dir)['period'].value_counts().tolist() == [9, 9]
+
+
+def test_unit_type_mix_is_not_a_price_change(tmp_path):
+    archive_dir, index_dir = tmp_path / 'archive', tmp_path / 'index'
+
+    def listings(one_bedroom, two_bedroom, one_bedroom_ppsf=1_000.0):
+        return pd.DataFrame({'project': 'Safa One', 'bedrooms': ['1'] * one_bedroom + ['2'] * two_bedroom,
+                             'price_per_sqft': [one_bedroom_ppsf] * one_bedroom + [2_000.0] * two_bedroom})
+
+    write_archive('Safa One', listings(10, 10), 'a', '2024-01-01', base_dir=archive_dir)
+    # Mostly two-bedroom listings at unchanged prices
+    write_archive('Safa One', listings(2, 18), 'b', '2024-02-01', base_dir=archive_dir)
+    # One-bedroom prices up 10%
+    write_archive('Safa One', listings(2, 18, 1_100.0), 'c', '2024-03-01', base_dir=archive_dir)
+
+    index = update_price_index(['Safa One'], LOCATIONS, archive_dir, index_dir)
+    for segment_type, segment in [('market', 'All'), ('location', 'Business Bay'), ('project', 'Safa One')]:
+        series = index_series(index, segment_type, segments=[segment])['index'].tolist()
+        # February's one-bedroom weight (2 of 20 listings) carries the March change
+        assert series == pytest.approx([INDEX_BASE, INDEX_BASE, INDEX_BASE * 1.1 ** 0.1])
+    assert index_series(index, 'project', '1', ['Safa One'])['index'].tolist() == pytest.approx([100.0, 100.0, 110.0])
+
+
+def test_index_from_another_schema_is_rebuilt(tmp_path, monkeypatch):
+    import price_index
+
+    archive_dir, index_dir = tmp_path / 'archive', tmp_path / 'index'
+    write_archive('Safa One', make_listings('Safa One', 2_000), 'a', '2024-01-01', base_dir=archive_dir)
+    update_price_index(['Safa One'], LOCATIONS, archive_dir, index_dir)
+    monkeypatch.setattr(price_index, 'INDEX_SCHEMA_VERSION', price_index.INDEX_SCHEMA_VERSION + 1)
+    assert load_price_index(index_dir).empty
+    assert len(update_price_index(['Safa One'], LOCATIONS, archive_dir, index_dir)) == 9
@@ -0,0 +1,39 @@
+import os
+
+import pytest
+
+from materialize import load_aggregates
+from projects import PROJECT_INFO, ingest_projects
+from reports import PLOTLY_ASSET, generate_reports
+
+
+@pytest.fixture
+def aggregates_by_project(tmp_path, monkeypatch):
+    monkeypatch.chdir(tmp_path)
+    return {name: load_aggregates(name, version) for name, version in ingest_projects().items()}
+
+
+def test_reports_skip_unchanged_projects(aggregates_by_project, tmp_path):
+    output = str(tmp_path / 'reports')
+    assert generate_reports(PROJECT_INFO, aggregates_by_project, output, shared_assets=True) == ['Safa One', 'Safa Two']
+    assert generate_reports(PROJECT_INFO, aggregates_by_project, output, shared_assets=True) == []
+    assert generate_reports(PROJECT_INFO, aggregates_by_project, output, shared_assets=True, force=True) == [
+        'Safa One', 'Safa Two']
+    # Changing the options renders again
+    assert len(generate_reports(PROJECT_INFO, aggregates_by_project, output)) == 2
+
+    with open(os.path.join(output, 'safa_one.html'), encoding='utf-8') as f:
+        report = f.read()
+    assert 'Safa One Analysis' in report and 'Unit Types Summary' in report
+    assert os.path.exists(os.path.join(output, PLOTLY_ASSET))
+    with open(os.path.join(output, 'index.html'), encoding='utf-8') as f:
+        assert '<a href="safa_two.html">Safa Two</a>' in f.read()
+
+
+def test_shared_assets_are_referenced_not_inlined(aggregates_by_project, tmp_path):
+    shared, inline = str(tmp_path / 'shared'), str(tmp_path / 'inline')
+    generate_reports(PROJECT_INFO, aggregates_by_project, shared, shared_assets=True)
+    generate_reports(PROJECT_INFO, aggregates_by_project, inline)
+    shared_size = os.path.getsize(os.path.join(shared, 'safa_one.html'))
+    assert f'<script src="{PLOTLY_ASSET}"></script>' in open(os.path.join(shared, 'safa_one.html'), encoding='utf-8').read()
+    assert os.path.getsize(os.path.join(inline, 'safa_one.html')) > shared_size + 1_000_000
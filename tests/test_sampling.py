@@ -0,0 +1,41 @@
+import numpy as np
+import pandas as pd
+import pytest
+
+from sampling import MIN_PER_STRATUM, StratifiedSampler, estimate_stats, preview_stats
+
+
+def make_listings(n=2_000, seed=1):
+    rng = np.random.default_rng(seed)
+    bedrooms = rng.choice(['studio', '1', '2', '10'], size=n, p=[0.3, 0.4, 0.25, 0.05])
+    area = rng.uniform(400, 2_000, size=n)
+    return pd.DataFrame({'bedrooms': bedrooms, 'bathrooms': rng.choice(['1', '2'], size=n),
+                         'area_sqft': area, 'price': area * rng.uniform(1_500, 2_500, size=n)})
+
+
+def test_samples_are_nested_and_cover_every_stratum():
+    sampler = StratifiedSampler(make_listings())
+    small, take = sampler.sample(100)
+    large, _ = sampler.sample(400)
+    assert set(small) <= set(large)
+    assert (take >= np.minimum(MIN_PER_STRATUM, sampler.population)).all()
+
+
+def test_full_sample_is_exact():
+    df = make_listings()
+    stats = estimate_stats(StratifiedSampler(df), len(df))
+    assert stats['stats_overall']['avg_price'] == pytest.approx(df['price'].mean())
+    assert stats['stats_overall']['avg_price_moe'] == pytest.approx(0.0, abs=1e-6)
+    assert stats['total_listings'] == len(df)
+
+    bedroom_stats = stats['bedroom_stats']
+    # Studio first, then by bedroom count rather than alphabetically
+    assert bedroom_stats['bedrooms'].tolist() == ['studio', '1', '2', '10']
+    counts = df['bedrooms'].value_counts()
+    assert bedroom_stats['count'].tolist() == [counts[b] for b in ['studio', '1', '2', '10']]
+
+
+def test_preview_stops_at_the_whole_frame():
+    df = make_listings(500)
+    preview = preview_stats(df, budget_seconds=60, initial_size=50)
+    assert preview['sample_size'] == len(df) and preview['seconds'] >= 0
@@ -0,0 +1,92 @@
+import threading
+import time
+
+import pandas as pd
+import pytest
+
+import shared_data
+from shared_data import SharedDataset, get_shared_dataset, get_shared_dataset_nowait
+
+
+class FakeArchive:
+    def __init__(self, frame):
+        self.frame = frame
+
+    def to_pandas(self):
+        return self.frame
+
+
+def make_dataset(key):
+    archives = {'Safa One': FakeArchive(pd.DataFrame({'price': [1.0, 2.0]})),
+                'Safa Two': FakeArchive(pd.DataFrame({'price': [3.0, 4.0, 5.0]}))}
+    return SharedDataset(key, archives, {'Safa One': {'stats_overall': {'total_listings': 2}}})
+
+
+@pytest.fixture(autouse=True)
+def empty_registry():
+    shared_data._datasets.clear()
+    yield
+    shared_data._datasets.clear()
+
+
+def test_combined_listings_and_positions():
+    dataset = make_dataset((('Safa One', 'v1'), ('Safa Two', 'v2')))
+    assert dataset.versions == ('v1', 'v2')
+    assert dataset.offsets == {'Safa One': 0, 'Safa Two': 2}
+    assert dataset.project_listings('Safa Two')['price'].tolist() == [3.0, 4.0, 5.0]
+    assert dataset.rows([dataset.position('Safa Two', 1), 0])['price'].tolist() == [4.0, 1.0]
+    with pytest.raises(TypeError):
+        dataset.aggregates['Safa One']['stats_overall']['total_listings'] = 0
+
+
+def test_concurrent_requests_share_one_build():
+    calls = []
+
+    def load(key):
+        calls.append(key)
+        time.sleep(0.05)
+        return make_dataset(key)
+
+    results = []
+    threads = [threading.Thread(target=lambda: results.append(get_shared_dataset('k', load))) for _ in range(8)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    assert calls == ['k']
+    assert all(result is results[0] for result in results)
+
+
+def test_only_recent_keys_are_kept():
+    for key in ['a', 'b', 'c']:
+        get_shared_dataset(key, make_dataset)
+    assert list(shared_data._datasets) == ['b', 'c']
+
+
+def test_nowait_builds_in_the_background_and_reports_errors():
+    release = threading.Event()
+
+    def load(key):
+        release.wait(5)
+        return make_dataset(key)
+
+    assert get_shared_dataset_nowait('slow', load) is None
+    assert get_shared_dataset_nowait('slow', load) is None
+    release.set()
+    for _ in range(100):
+        dataset = get_shared_dataset_nowait('slow', load)
+        if dataset is not None:
+            break
+        time.sleep(0.02)
+    assert dataset is get_shared_dataset('slow', load)
+
+    def fail(key):
+        raise RuntimeError('no data')
+
+    assert get_shared_dataset_nowait('broken', fail) is None
+    for _ in range(100):
+        if 'broken' in shared_data._build_errors:
+            break
+        time.sleep(0.02)
+    with pytest.raises(RuntimeError, match='no data'):
+        get_shared_dataset_nowait('broken', fail)
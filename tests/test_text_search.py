@@ -0,0 +1,43 @@
+import pytest
+
+from text_search import SearchIndex, tokenize
+
+DESCRIPTIONS = [
+    'Full Sea View | High Floor | Listed 2 Days ago',
+    'Canal view | Low floor',
+    'SEA VIEW | 12% below OP',
+    'Pool view | High floor | Payment plan'
+]
+
+
+@pytest.fixture
+def index():
+    index = SearchIndex(DESCRIPTIONS)
+    index.add_field('bedrooms', ['1', '2', '1', 'studio'])
+    return index
+
+
+def test_tokenize():
+    assert tokenize('SEA VIEW | 12% below OP 3.75%') == ['sea', 'view', '12%', 'below', 'op', '3.75%']
+
+
+def test_terms_phrases_and_prefixes(index):
+    assert index.search('view').tolist() == [0, 1, 2, 3]
+    assert index.search('"sea view"').tolist() == [0, 2]
+    assert index.search('"view sea"').tolist() == []
+    assert index.search('flo*').tolist() == [0, 1, 3]
+    assert index.search('high floor').tolist() == [0, 3]
+
+
+def test_or_not_and_filters(index):
+    assert index.search('canal OR pool').tolist() == [1, 3]
+    assert index.search('view -sea').tolist() == [1, 3]
+    assert index.search('view NOT "high floor"').tolist() == [1, 2]
+    assert index.search('view', {'bedrooms': '1'}).tolist() == [0, 2]
+    assert index.search('', {'bedrooms': '3'}).tolist() == []
+
+
+@pytest.mark.parametrize('query', ['" "', '""', '"-"', '|', '-', '*', 'NOT |', '" | "'])
+def test_terms_without_tokens_are_ignored(index, query):
+    assert index.search(query).tolist() == [0, 1, 2, 3]
+    assert index.search(f'sea {query} view').tolist() == [0, 2]
@@ -0,0 +1,57 @@
+import numpy as np
+import pandas as pd
+import pytest
+
+from validation import find_issues, validate_listings
+
+
+def make_listings(n=12):
+    area = np.linspace(700, 900, n)
+    return pd.DataFrame({
+        'project': 'Safa One',
+        'price': area * 2_000,
+        'area_sqft': area,
+        'bedrooms': '1',
+        'bathrooms': '1',
+        'description': 'Sea view | Listed 3 days ago'
+    })
+
+
+def test_clean_listings_pass():
+    result = validate_listings(make_listings())
+    assert len(result['valid']) == 12 and result['quarantine'].empty and result['issues'].empty
+
+
+def test_bad_rows_are_quarantined_with_reasons():
+    listings = make_listings()
+    listings.loc[0, 'price'] = None
+    listings.loc[1, 'bathrooms'] = 'two'
+    listings.loc[2, 'bedrooms'] = 'loft'
+    listings.loc[3, 'area_sqft'] = 50
+    listings.loc[4, 'price'] = listings.loc[4, 'area_sqft'] * 6_000
+    result = validate_listings(listings)
+
+    assert len(result['valid']) == 7
+    reasons = result['quarantine']['reasons'].tolist()
+    assert 'price is missing' in reasons[0]
+    assert 'bathrooms is not a number' in reasons[1]
+    assert 'bedrooms must be one of' in reasons[2]
+    assert 'area_sqft 50 outside 200-20,000' in reasons[3]
+    assert 'is above the 1 bedroom median' in reasons[4]
+
+
+def test_warnings_keep_the_row():
+    listings = make_listings()
+    listings.loc[0, 'description'] = 'Lsted 4 Days ago'
+    listings.loc[1, ['area_sqft', 'price']] = listings.loc[2, ['area_sqft', 'price']].to_numpy()
+    listings.loc[1, 'bathrooms'] = '2'
+    issues = find_issues(listings)
+    assert issues[['row', 'check']].values.tolist() == [
+        [0, 'listing_age_unparsed'], [1, 'conflicting_bathrooms'], [2, 'conflicting_bathrooms']]
+    assert not issues['quarantined'].any()
+    assert len(validate_listings(listings)['valid']) == 12
+
+
+def test_missing_columns_are_rejected():
+    with pytest.raises(ValueError, match='description'):
+        find_issues(make_listings().drop(columns='description'))
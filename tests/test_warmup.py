@@ -0,0 +1,58 @@
+import json
+import os
+
+from warmup import FAILED, READY, WARMING, WorkerHealth, prewarm, read_worker_statuses
+
+READY_APP = """
+from warmup import current_prewarm
+
+health = current_prewarm()
+health.run_step('load', lambda: sum(range(10)))
+health.mark_ready(['v1'], cache={'hits': 0})
+"""
+
+
+def write_app(tmp_path, source):
+    path = tmp_path / 'app.py'
+    path.write_text(source)
+    return str(path)
+
+
+def test_status_file_follows_the_warm_up(tmp_path):
+    health = WorkerHealth(str(tmp_path))
+    with open(health.path) as f:
+        assert json.load(f)['status'] == WARMING
+
+    assert health.run_step('load', lambda: 42) == 42
+    health.mark_ready(['v1', 'v2'])
+    with open(health.path) as f:
+        status = json.load(f)
+    assert health.ready and status['status'] == READY
+    assert status['data_versions'] == ['v1', 'v2'] and set(status['steps']) == {'imports', 'load'}
+
+    health.close()
+    assert not os.path.exists(health.path)
+
+
+def test_prewarm_runs_the_app_script(tmp_path):
+    health = prewarm(write_app(tmp_path, READY_APP), WorkerHealth(str(tmp_path)))
+    assert health.ready and health.as_dict()['steps']['load'] >= 0
+
+
+def test_prewarm_failures_are_reported(tmp_path):
+    health = prewarm(write_app(tmp_path, "raise RuntimeError('no data')"), WorkerHealth(str(tmp_path)))
+    assert health.as_dict()['status'] == FAILED and 'no data' in health.as_dict()['error']
+
+    health = prewarm(write_app(tmp_path, "x = 1"), WorkerHealth(str(tmp_path)))
+    assert health.as_dict()['status'] == FAILED and 'without running' in health.as_dict()['error']
+
+
+def test_read_worker_statuses_marks_dead_workers(tmp_path):
+    WorkerHealth(str(tmp_path)).mark_ready(['v1'])
+    with open(tmp_path / 'worker-999999999.json', 'w') as f:
+        json.dump({'pid': 999999999, 'status': READY}, f)
+
+    statuses = {status['pid']: status for status in read_worker_statuses(str(tmp_path))}
+    assert statuses[os.getpid()]['alive'] and statuses[os.getpid()]['status'] == READY
+    assert not statuses[999999999]['alive']
+    assert read_worker_statuses(str(tmp_path / 'missing')) == []
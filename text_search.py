@@ -0,0 +1,128 @@
+import bisect
+import re
+from collections import defaultdict
+
+import numpy as np
+
+TOKEN_PATTERN = re.compile(r'[a-z0-9]+(?:\.[0-9]+)?%?')
+QUERY_PATTERN = re.compile(r'"([^"]*)"|(\S+)')
+
+# Positions are packed with the doc id into one integer so phrase matching is a sorted intersection
+MAX_POSITIONS = 1 << 16
+
+EMPTY = np.array([], dtype=np.int64)
+
+
+def tokenize(text):
+    """Lower-case word tokens of a description ("SEA VIEW | High Floor" -> sea, view, high, floor)"""
+    return TOKEN_PATTERN.findall(text.lower())
+
+
+class SearchIndex:
+    """Positional inverted index over listing descriptions
+
+    Supports bare terms, "quoted phrases", prefix* terms, OR between groups and NOT / -term
+    exclusions; terms inside a group are AND-ed. Structured filters (bedrooms, listing age) are
+    stored as posting lists too, so a search and its filters combine by posting-list intersection.
+    """
+
+    def __init__(self, descriptions):
+        self.num_docs = len(descriptions)
+        doc_lists = defaultdict(list)
+        position_lists = defaultdict(list)
+        for doc_id, description in enumerate(descriptions):
+            for position, token in enumerate(tokenize(description or '')[:MAX_POSITIONS]):
+                doc_lists[token].append(doc_id)
+                position_lists[token].append(doc_id * MAX_POSITIONS + position)
+
+        self.vocabulary = sorted(doc_lists)
+        self.postings = {token: np.unique(np.array(docs, dtype=np.int64)) for token, docs in doc_lists.items()}
+        self.positions = {token: np.array(packed, dtype=np.int64) for token, packed in position_lists.items()}
+        self.fields = defaultdict(dict)
+
+    def add_field(self, name, values):
+        """Index a categorical field given one value per document"""
+        values = np.asarray(values, dtype=object)
+        for value in dict.fromkeys(values):
+            self.fields[name][value] = np.flatnonzero(values == value)
+
+    def add_postings(self, name, value, doc_ids):
+        """Register an explicit posting list for a field value (for overlapping filter options)"""
+        self.fields[name][value] = np.unique(np.asarray(doc_ids, dtype=np.int64))
+
+    def _term(self, term):
+        if term.endswith('*') and len(term) > 1:
+            prefix = term[:-1].lower()
+            start = bisect.bisect_left(self.vocabulary, prefix)
+            matches = []
+            for token in self.vocabulary[start:]:
+                if not token.startswith(prefix):
+                    break
+                matches.append(self.postings[token])
+            return np.unique(np.concatenate(matches)) if matches else EMPTY
+        tokens = tokenize(term)
+        if len(tokens) > 1:
+            return self._phrase(tokens)
+        return self.postings.get(tokens[0], EMPTY) if tokens else EMPTY
+
+    def _phrase(self, tokens):
+        """Documents containing the tokens at consecutive positions"""
+        if not tokens or any(token not in self.positions for token in tokens):
+            return EMPTY
+        candidates = self.positions[tokens[0]]
+        for offset, token in enumerate(tokens[1:], start=1):
+            # Shift the next token's positions back so matches line up with the phrase start
+            candidates = np.intersect1d(candidates, self.positions[token] - offset, assume_unique=True)
+            if not len(candidates):
+                return EMPTY
+        return np.unique(candidates // MAX_POSITIONS)
+
+    def _group(self, terms):
+        included, excluded = None, []
+        negate_next = False
+        for phrase, word in terms:
+            term = phrase if phrase else word
+            if not phrase and term.upper() == 'AND':
+                continue
+            if not phrase and term.upper() == 'NOT':
+                negate_next = True
+                continue
+            if not phrase and term.startswith('-') and len(term) > 1:
+                term, negate_next = term[1:], True
+            if not tokenize(term.rstrip('*')):
+                # Punctuation such as "|" or an empty phrase matches no token; ignore the term
+                negate_next = False
+                continue
+            postings = self._phrase(tokenize(term)) if phrase else self._term(term)
+            if negate_next:
+                excluded.append(postings)
+                negate_next = False
+            else:
+                included = postings if included is None else np.intersect1d(included, postings, assume_unique=True)
+        if included is None:
+            included = np.arange(self.num_docs, dtype=np.int64)
+        for postings in excluded:
+            included = np.setdiff1d(included, postings, assume_unique=True)
+        return included
+
+    def search(self, query='', filters=None):
+        """Sorted ids of documents matching the query and every (field, value) filter"""
+        terms = QUERY_PATTERN.findall(query or '')
+        groups, current = [], []
+        for phrase, word in terms:
+            if not phrase and word.upper() == 'OR':
+                groups.append(current)
+                current = []
+            else:
+                current.append((phrase, word))
+        groups.append(current)
+
+        non_empty = [group for group in groups if group]
+        if non_empty:
+            result = np.unique(np.concatenate([self._group(group) for group in non_empty]))
+        else:
+            result = np.arange(self.num_docs, dtype=np.int64)
+
+        for name, value in (filters or {}).items():
+            result = np.intersect1d(result, self.fields[name].get(value, EMPTY), assume_unique=True)
+        return result
@@ -0,0 +1,108 @@
+import numpy as np
+import pandas as pd
+
+from descriptions import LISTING_AGE_PATTERN
+
+# Columns every listing must carry, with the check applied to each
+REQUIRED_COLUMNS = ['project', 'price', 'area_sqft', 'bedrooms', 'bathrooms', 'description']
+BEDROOM_TYPES = ['studio', '1', '2', '3', '4', '5', '6']
+
+# Plausible ranges for numeric fields (inclusive)
+RANGES = {
+    'price': (100_000, 100_000_000),
+    'area_sqft': (200, 20_000),
+    'bathrooms': (1, 8),
+    'price_per_sqft': (500, 10_000)
+}
+
+# Price/sq.ft outliers: robust z-score of log price/sq.ft within project and unit type
+OUTLIER_Z = 2.5
+OUTLIER_MIN_SCALE = 0.08     # Floor on the robust log-scale (~8%) so tight segments do not flag small premiums
+OUTLIER_MIN_SEGMENT = 8      # Smaller segments (e.g. a handful of penthouses) are too small to judge
+
+# Anything that looks like a listing age ("Lsted 4 Days ago", "Listed 12 Dasy Ago") but fails the strict pattern
+LOOSE_LISTING_AGE_PATTERN = r'\bl\w{0,6}\s+\d+\s+\w+\s+ago\b'
+
+# Checks whose failures remove the row from analysis; the others are reported but keep the row
+QUARANTINE_CHECKS = {'missing_value', 'invalid_number', 'invalid_bedrooms', 'out_of_range', 'price_per_sqft_outlier'}
+
+
+def _flag(issues, mask, check, reason):
+    """Record one issue per flagged position; reason is a string or a function of the flagged positions"""
+    rows = np.flatnonzero(mask)
+    if len(rows):
+        reasons = reason(rows) if callable(reason) else [reason] * len(rows)
+        issues.extend(zip(rows.tolist(), [check] * len(rows), reasons))
+
+
+def find_issues(df):
+    """Run every check on a listings frame and return one row per (listing, issue)"""
+    missing_columns = [column for column in REQUIRED_COLUMNS if column not in df.columns]
+    if missing_columns:
+        raise ValueError(f"Listings are missing required column(s): {', '.join(missing_columns)}")
+
+    issues = []
+
+    # Types and missing values
+    for column in REQUIRED_COLUMNS:
+        _flag(issues, df[column].isna().to_numpy(), 'missing_value', f"{column} is missing")
+    numeric = {column: pd.to_numeric(df[column], errors='coerce').to_numpy(dtype=float)
+               for column in ['price', 'area_sqft', 'bathrooms']}
+    for column, values in numeric.items():
+        invalid = np.isnan(values) & df[column].notna().to_numpy()
+        _flag(issues, invalid, 'invalid_number', f"{column} is not a number")
+    bedrooms = df['bedrooms'].astype(str).str.lower()
+    _flag(issues, ~bedrooms.isin(BEDROOM_TYPES).to_numpy(), 'invalid_bedrooms',
+          f"bedrooms must be one of {', '.join(BEDROOM_TYPES)}")
+
+    # Ranges
+    numeric['price_per_sqft'] = numeric['price'] / numeric['area_sqft']
+    for column, (low, high) in RANGES.items():
+        values = numeric[column]
+        out_of_range = (values < low) | (values > high)
+        _flag(issues, out_of_range, 'out_of_range', lambda rows, column=column, values=values, low=low, high=high: [
+            f"{column} {values[row]:,.0f} outside {low:,}-{high:,}" for row in rows])
+
+    # Price/sq.ft plausibility per project and unit type
+    log_ppsf = pd.Series(np.log(numeric['price_per_sqft']), index=df.index)
+    segment = log_ppsf.groupby([df['project'].to_numpy(), bedrooms.to_numpy()]).ngroup().to_numpy()
+    median = log_ppsf.groupby(segment).transform('median').to_numpy()
+    mad = (log_ppsf - median).abs().groupby(segment).transform('median').to_numpy()
+    size = np.bincount(segment)[segment]
+    z = (log_ppsf.to_numpy() - median) / np.maximum(1.4826 * mad, OUTLIER_MIN_SCALE)
+    outlier = (np.abs(z) > OUTLIER_Z) & (size >= OUTLIER_MIN_SEGMENT)
+    _flag(issues, outlier, 'price_per_sqft_outlier', lambda rows: [
+        f"price/sq.ft {numeric['price_per_sqft'][row]:,.0f} is {'above' if z[row] > 0 else 'below'} the "
+        f"{bedrooms.iat[row]} bedroom median of {np.exp(median[row]):,.0f} (robust z {z[row]:+.1f})" for row in rows])
+
+    # Listing ages that are present but unreadable, e.g. typos in "Listed" or the unit
+    description = df['description'].fillna('').astype(str)
+    unparsed = (description.str.contains(LOOSE_LISTING_AGE_PATTERN, case=False, regex=True)
+                & description.str.extract(LISTING_AGE_PATTERN)[0].isna()).to_numpy()
+    _flag(issues, unparsed, 'listing_age_unparsed', "listing age in the description could not be parsed")
+
+    # The same unit (project, bedrooms, area and price) listed with different bathroom counts
+    unit = [df['project'].to_numpy(), bedrooms.to_numpy(), numeric['area_sqft'], numeric['price']]
+    bathroom_counts = df['bathrooms'].groupby(unit).transform('nunique').to_numpy()
+    _flag(issues, bathroom_counts > 1, 'conflicting_bathrooms', "same unit is listed with different bathroom counts")
+
+    issues = pd.DataFrame(issues, columns=['row', 'check', 'reason'])
+    issues['quarantined'] = issues['check'].isin(QUARANTINE_CHECKS)
+    return issues.sort_values(['row', 'check'], kind='stable').reset_index(drop=True)
+
+
+def validate_listings(df):
+    """Split listings into rows fit for analysis and a quarantine table with reasons
+
+    Returns a dict with 'valid' (the rows that passed every quarantine check), 'quarantine'
+    (the failing rows with their joined reasons) and 'issues' (every finding, including the
+    warnings that do not quarantine a row).
+    """
+    df = df.reset_index(drop=True)
+    issues = find_issues(df)
+    quarantined_rows = issues.loc[issues['quarantined'], 'row'].unique()
+
+    reasons = issues[issues['quarantined']].groupby('row')['reason'].agg('; '.join)
+    quarantine = df.iloc[quarantined_rows].assign(reasons=reasons.reindex(quarantined_rows).to_numpy())
+    valid = df.drop(index=quarantined_rows).reset_index(drop=True)
+    return {'valid': valid, 'quarantine': quarantine.reset_index(drop=True), 'issues': issues}
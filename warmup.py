@@ -0,0 +1,171 @@
+import argparse
+import copy
+import json
+import os
+import sys
+import threading
+import time
+import traceback
+from datetime import datetime
+
+APP_PATH = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'property_scraper.py')
+HEALTH_DIR = os.path.join('results', 'health')
+
+WARMING, READY, FAILED = 'warming', 'ready', 'failed'
+
+# Health of the worker this process is warming, and the prewarm running on the current thread
+_worker_health = None
+_local = threading.local()
+
+
+class WorkerHealth:
+    """Warm-up status of one worker process, mirrored to a JSON file in HEALTH_DIR
+
+    Reports whether the caches are warming, ready or failed, the data versions they were
+    built for, how long each warm-up step took and the figure cache counters. The file is
+    replaced atomically on every change, so a probe never reads a half-written status.
+    """
+
+    def __init__(self, base_dir=HEALTH_DIR):
+        self.path = os.path.join(base_dir, f"worker-{os.getpid()}.json")
+        self._lock = threading.Lock()
+        self._started = time.perf_counter()
+        self._status = {
+            'pid': os.getpid(),
+            'status': WARMING,
+            'started_at': datetime.now().isoformat(timespec='seconds'),
+            'ready_at': None,
+            'warmup_seconds': None,
+            'data_versions': None,
+            'steps': {},
+            'cache': None,
+            'error': None
+        }
+        self.write()
+
+    @property
+    def ready(self):
+        return self._status['status'] == READY
+
+    def as_dict(self):
+        with self._lock:
+            return copy.deepcopy(self._status)
+
+    def run_step(self, name, build):
+        """Run one warm-up step and record its duration in seconds"""
+        with self._lock:
+            if not self._status['steps']:
+                # Everything before the first step: imports, page setup and module-level loading
+                self._status['steps']['imports'] = round(time.perf_counter() - self._started, 3)
+        start = time.perf_counter()
+        result = build()
+        self._update(lambda status: status['steps'].__setitem__(name, round(time.perf_counter() - start, 3)))
+        return result
+
+    def mark_ready(self, data_versions, cache=None):
+        """Record that every step finished for these data versions"""
+        def update(status):
+            status.update(status=READY, ready_at=datetime.now().isoformat(timespec='seconds'),
+                          warmup_seconds=round(time.perf_counter() - self._started, 3),
+                          data_versions=list(data_versions), cache=cache)
+        self._update(update)
+
+    def mark_failed(self, error):
+        self._update(lambda status: status.update(status=FAILED, error=error))
+
+    def _update(self, change):
+        with self._lock:
+            change(self._status)
+        self.write()
+
+    def write(self):
+        status = self.as_dict()
+        os.makedirs(os.path.dirname(self.path), exist_ok=True)
+        tmp_path = self.path + f".{os.getpid()}.tmp"
+        with open(tmp_path, 'w') as f:
+            json.dump(status, f, indent=2)
+        os.replace(tmp_path, self.path)
+
+    def close(self):
+        """Remove the status file when the worker shuts down"""
+        if os.path.exists(self.path):
+            os.remove(self.path)
+
+
+def current_prewarm():
+    """The WorkerHealth of the prewarm executing the app script on this thread, if any"""
+    return getattr(_local, 'health', None)
+
+
+def worker_health():
+    """The WorkerHealth of this process once start_prewarm has been called"""
+    return _worker_health
+
+
+def prewarm(app_path=APP_PATH, health=None):
+    """Execute the app script once, outside any browser session, to build its caches
+
+    The script runs as __main__ just as Streamlit runs it for a session, so the
+    st.cache_resource entries it fills are the ones later sessions hit. Seeing
+    current_prewarm(), the script runs its warm-up steps through `health` and marks it ready.
+    """
+    health = health or WorkerHealth()
+    _local.health = health
+    try:
+        with open(app_path) as f:
+            code = compile(f.read(), app_path, 'exec')
+        exec(code, {'__name__': '__main__', '__file__': app_path, '__builtins__': __builtins__})
+        if not health.ready:
+            health.mark_failed("the app script finished without running its warm-up steps")
+    except Exception:
+        health.mark_failed(traceback.format_exc(limit=5))
+    finally:
+        _local.health = None
+    return health
+
+
+def start_prewarm(app_path=APP_PATH, base_dir=HEALTH_DIR):
+    """Warm this process's caches on a background thread, so health checks answer meanwhile"""
+    global _worker_health
+    _worker_health = WorkerHealth(base_dir)
+    threading.Thread(target=prewarm, args=(app_path, _worker_health), name='prewarm', daemon=True).start()
+    return _worker_health
+
+
+def _process_alive(pid):
+    try:
+        os.kill(pid, 0)
+    except ProcessLookupError:
+        return False
+    except PermissionError:
+        pass
+    return True
+
+
+def read_worker_statuses(base_dir=HEALTH_DIR):
+    """Status of every worker that wrote a health file, with whether its process still runs"""
+    if not os.path.isdir(base_dir):
+        return []
+    statuses = []
+    for name in sorted(os.listdir(base_dir)):
+        if name.startswith('worker-') and name.endswith('.json'):
+            with open(os.path.join(base_dir, name)) as f:
+                status = json.load(f)
+            status['alive'] = _process_alive(status['pid'])
+            statuses.append(status)
+    return statuses
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Report worker warm-up status from the health files")
+    parser.add_argument('--health-dir', default=HEALTH_DIR)
+    parser.add_argument('--pid', type=int, help="only report this worker")
+    parser.add_argument('--check', action='store_true',
+                        help="exit 0 only if the worker (or, without --pid, any live worker) is ready")
+    args = parser.parse_args()
+
+    statuses = [status for status in read_worker_statuses(args.health_dir)
+                if args.pid is None or status['pid'] == args.pid]
+    print(json.dumps(statuses, indent=2))
+    if args.check:
+        sys.exit(0 if any(status['alive'] and status['status'] == READY for status in statuses) else 1)